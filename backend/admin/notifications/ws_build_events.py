@@ -4,17 +4,87 @@
 import asyncio
 import json
 import logging
+import time
+from collections import deque
+from typing import Dict, List, Tuple
 
 from fastapi import WebSocket
 
 logger = logging.getLogger("ws_build_events")
 
 
+class _Subscriber:
+    """
+    Eigene Sende-Queue + Task pro WebSocket.
+
+    Der Build wartet nie auf langsame Clients: Log-Frames landen in einer
+    begrenzten Queue; ist sie voll, wird der älteste Log-Frame verworfen
+    (Status-/Complete-Events werden nie verworfen).
+    """
+
+    def __init__(self, websocket: WebSocket, max_frames: int):
+        self.websocket = websocket
+        self.max_frames = max_frames
+        self.frames: deque = deque()  # (payload, droppable)
+        self.dropped = 0
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def push(self, payload: dict, droppable: bool):
+        if droppable and len(self.frames) >= self.max_frames:
+            for i, (_, can_drop) in enumerate(self.frames):
+                if can_drop:
+                    del self.frames[i]
+                    self.dropped += 1
+                    break
+        self.frames.append((payload, droppable))
+        self.wakeup.set()
+
+
 class BuildEventManager:
 
-    def __init__(self):
+    def __init__(self, max_frames: int = 256):
         # build_id → set(websockets)
         self.active_build_streams = {}
+        # websocket → Subscriber (Sende-Queue)
+        self._subscribers: Dict[WebSocket, _Subscriber] = {}
+        self.max_frames = max_frames
+
+    # ---------------------------------------------------------
+    # SENDE-QUEUES
+    # ---------------------------------------------------------
+    async def _sender(self, subscriber: _Subscriber, build_id: str):
+        while True:
+            await subscriber.wakeup.wait()
+            subscriber.wakeup.clear()
+            while subscriber.frames:
+                payload, _ = subscriber.frames.popleft()
+                if subscriber.dropped:
+                    payload = {**payload, "dropped_frames": subscriber.dropped}
+                    subscriber.dropped = 0
+                try:
+                    await subscriber.websocket.send_text(json.dumps(payload))
+                except Exception as e:
+                    logger.warning(f"Failed to send to client: {e}")
+                    self._remove(subscriber.websocket, build_id)
+                    return
+
+    def _remove(self, websocket: WebSocket, build_id: str):
+        subscriber = self._subscribers.pop(websocket, None)
+        if subscriber and subscriber.task and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+        if build_id in self.active_build_streams:
+            self.active_build_streams[build_id].discard(websocket)
+            if len(self.active_build_streams[build_id]) == 0:
+                del self.active_build_streams[build_id]
+
+    def _publish(self, build_id: str, payload: dict, droppable: bool = False):
+        """Frame an alle Clients des Builds einreihen (blockiert nie)."""
+        for websocket in self.active_build_streams.get(build_id, ()):
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is not None:
+                subscriber.push(payload, droppable)
 
     # ---------------------------------------------------------
     # CLIENT VERBINDEN
@@ -27,6 +97,10 @@ class BuildEventManager:
 
         self.active_build_streams[build_id].add(websocket)
 
+        subscriber = _Subscriber(websocket, self.max_frames)
+        subscriber.task = asyncio.create_task(self._sender(subscriber, build_id))
+        self._subscribers[websocket] = subscriber
+
         await websocket.send_text(
             json.dumps(
                 {
@@ -46,10 +120,7 @@ class BuildEventManager:
     # ---------------------------------------------------------
     async def disconnect(self, websocket: WebSocket, build_id: str):
         if build_id in self.active_build_streams:
-            self.active_build_streams[build_id].discard(websocket)
-
-            if len(self.active_build_streams[build_id]) == 0:
-                del self.active_build_streams[build_id]
+            self._remove(websocket, build_id)
 
             logger.info(f"Client disconnected from build {build_id}")
 
@@ -60,29 +131,28 @@ class BuildEventManager:
         """
         Sende Live-Log Zeile an alle verbundenen Clients.
         """
-        if build_id not in self.active_build_streams:
-            return
+        self.publish_logs(build_id, [(time.time(), text)])
 
-        dead = set()
+    def publish_logs(self, build_id: str, lines: List[Tuple[float, str]]):
+        """
+        Sende mehrere Log-Zeilen als EIN Frame (text = Zeilen mit \\n).
 
-        for ws in self.active_build_streams[build_id]:
-            try:
-                await ws.send_text(
-                    json.dumps(
-                        {
-                            "type": "log",
-                            "text": text,
-                            "timestamp": asyncio.get_event_loop().time(),
-                        }
-                    )
-                )
-            except Exception as e:
-                logger.warning(f"Failed to send to client: {e}")
-                dead.add(ws)
+        Args:
+            lines: [(unix_timestamp, text), ...]
+        """
+        if build_id not in self.active_build_streams or not lines:
+            return
 
-        # Tote Verbindungen entfernen
-        for ws in dead:
-            self.active_build_streams[build_id].discard(ws)
+        self._publish(
+            build_id,
+            {
+                "type": "log",
+                "text": "\n".join(text for _, text in lines),
+                "lines": [{"text": text, "timestamp": ts} for ts, text in lines],
+                "timestamp": lines[-1][0],
+            },
+            droppable=True,
+        )
 
     # ---------------------------------------------------------
     # STATUS UPDATE
@@ -91,30 +161,12 @@ class BuildEventManager:
         """
         Sende Status-Update an alle Clients.
         """
-        if build_id not in self.active_build_streams:
-            return
+        payload = {"type": "status", "status": status, "timestamp": time.time()}
 
-        dead = set()
+        if progress is not None:
+            payload["progress"] = progress
 
-        for ws in self.active_build_streams[build_id]:
-            try:
-                payload = {
-                    "type": "status",
-                    "status": status,
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                if progress is not None:
-                    payload["progress"] = progress
-
-                await ws.send_text(json.dumps(payload))
-            except Exception as e:
-                logger.warning(f"Failed to send status: {e}")
-                dead.add(ws)
-
-        # Tote Verbindungen entfernen
-        for ws in dead:
-            self.active_build_streams[build_id].discard(ws)
+        self._publish(build_id, payload)
 
     # ---------------------------------------------------------
     # ERROR EVENT
@@ -123,29 +175,7 @@ class BuildEventManager:
         """
         Sende Error-Event an alle Clients.
         """
-        if build_id not in self.active_build_streams:
-            return
-
-        dead = set()
-
-        for ws in self.active_build_streams[build_id]:
-            try:
-                await ws.send_text(
-                    json.dumps(
-                        {
-                            "type": "error",
-                            "error": error,
-                            "timestamp": asyncio.get_event_loop().time(),
-                        }
-                    )
-                )
-            except Exception as e:
-                logger.warning(f"Failed to send error: {e}")
-                dead.add(ws)
-
-        # Tote Verbindungen entfernen
-        for ws in dead:
-            self.active_build_streams[build_id].discard(ws)
+        self._publish(build_id, {"type": "error", "error": error, "timestamp": time.time()})
 
     # ---------------------------------------------------------
     # BUILD COMPLETE
@@ -154,30 +184,12 @@ class BuildEventManager:
         """
         Sende Build-Completion Event.
         """
-        if build_id not in self.active_build_streams:
-            return
-
-        dead = set()
-
-        for ws in self.active_build_streams[build_id]:
-            try:
-                payload = {
-                    "type": "complete",
-                    "success": success,
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                if artifacts:
-                    payload["artifacts"] = artifacts
+        payload = {"type": "complete", "success": success, "timestamp": time.time()}
 
-                await ws.send_text(json.dumps(payload))
-            except Exception as e:
-                logger.warning(f"Failed to send completion: {e}")
-                dead.add(ws)
+        if artifacts:
+            payload["artifacts"] = artifacts
 
-        # Tote Verbindungen entfernen
-        for ws in dead:
-            self.active_build_streams[build_id].discard(ws)
+        self._publish(build_id, payload)
 
     # ---------------------------------------------------------
     # GET ACTIVE STREAMS
@@ -83,9 +83,14 @@ try:
     from admin.notifications.ws_manager import ws_manager_v2
     from auth import require_admin
     from db import get_db
-    from models import Project
-    from models import Session as ChatSession
-    from models import User
+    import models
+    from models import ChatSession, Message, User
+
+    from admin.stats import admin_stats
+
+    # Projekte liegen (noch) nicht in der DB
+    Project = getattr(models, "Project", None)
+    admin_stats.install(User, ChatSession, Message, Project)
 except ImportError:
     # Fallback wenn Module nicht verfügbar
     get_db = None
@@ -147,34 +152,24 @@ async def get_dashboard_stats(db: Session = Depends(get_db), _=Depends(require_a
         - Project & Session Counts
         - WebSocket Connections
         - Mailer Status
+
+    Zähler kommen aus admin_counters (materialisiert), Polling aus dem TTL-Cache.
     """
     if not db or not User:
         raise HTTPException(status_code=503, detail="Database not available")
 
-    # User Stats
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_suspended == False).count()
-    suspended_users = db.query(User).filter(User.is_suspended == True).count()
-
-    # Project Stats
-    total_projects = db.query(Project).count() if Project else 0
-
-    # Session Stats
-    total_sessions = db.query(ChatSession).count() if ChatSession else 0
-
-    # Message Count (approximation from sessions)
-    total_messages = db.query(func.sum(ChatSession.message_count)).scalar() or 0 if ChatSession else 0
+    counters = admin_stats.dashboard_counts(db)
 
     # WebSocket Stats
     ws_stats = await ws_manager_v2.get_stats()
 
     return DashboardStats(
-        total_users=total_users,
-        active_users=active_users,
-        suspended_users=suspended_users,
-        total_projects=total_projects,
-        total_sessions=total_sessions,
-        total_messages=total_messages,
+        total_users=counters["users"],
+        active_users=counters["users"] - counters["suspended_users"],
+        suspended_users=counters["suspended_users"],
+        total_projects=counters["projects"],
+        total_sessions=counters["sessions"],
+        total_messages=counters["messages"],
         websocket_connections=ws_stats["active_connections"],
         mailer_enabled=mailer_v2.enabled,
         last_updated=datetime.utcnow().isoformat(),
@@ -271,50 +266,14 @@ async def get_users_overview(
         - limit: Max Anzahl (max 200)
         - offset: Pagination offset
         - suspended_only: Nur gesperrte User
+
+    Eine Query: users LEFT JOIN user_activity (statt 3 Queries pro User).
     """
     if not db or not User:
         raise HTTPException(status_code=503, detail="Database not available")
 
-    # Base Query
-    query = db.query(User)
-
-    # Filter suspended
-    if suspended_only:
-        query = query.filter(User.is_suspended == True)
-
-    # Pagination
-    users = query.offset(offset).limit(limit).all()
-
-    # Build Overview
-    result = []
-    for user in users:
-        # Count Projects & Sessions
-        project_count = db.query(Project).filter(Project.user_id == user.id).count() if Project else 0
-
-        session_count = db.query(ChatSession).filter(ChatSession.user_id == user.id).count() if ChatSession else 0
-
-        # Last Active (from last session)
-        last_session = (
-            db.query(ChatSession).filter(ChatSession.user_id == user.id).order_by(ChatSession.updated_at.desc()).first()
-            if ChatSession
-            else None
-        )
-
-        last_active = last_session.updated_at.isoformat() if last_session else None
-
-        result.append(
-            UserOverview(
-                id=user.id,
-                email=user.email,
-                created_at=user.created_at.isoformat(),
-                is_suspended=user.is_suspended,
-                project_count=project_count,
-                session_count=session_count,
-                last_active=last_active,
-            )
-        )
-
-    return result
+    rows = admin_stats.users_overview(db, limit=limit, offset=offset, suspended_only=suspended_only)
+    return [UserOverview(**row) for row in rows]
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,320 @@
+# -------------------------------------------------------------
+# VIBEAI – ADMIN STATS (MATERIALISIERT + TTL CACHE)
+# -------------------------------------------------------------
+"""
+Dashboard-Zahlen und User-Übersicht ohne N+1.
+
+Vorher:
+- /admin/users/overview: 3 Queries PRO User (Projekte, Sessions, letzte Session)
+- /admin/dashboard/stats: 6 einzelne count() bei jedem Refresh
+
+Jetzt:
+- admin_counters: globale Zähler (users, suspended_users, sessions, messages, projects)
+- user_activity: pro User project_count, session_count, last_active
+- beide werden beim Flush inkrementell mitgeschrieben (gleiche Transaktion)
+  und periodisch per GROUP BY komplett neu aufgebaut (Drift durch Writes
+  ohne Hooks, z.B. andere Prozesse oder Raw SQL)
+- Übersicht = EINE Query (users LEFT JOIN user_activity)
+- Dashboard = EINE Query, Polling trifft den TTL-Cache
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, delete, event, func, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+
+from models import AdminCounter, UserActivity
+
+COUNTERS = ("users", "suspended_users", "sessions", "messages", "projects")
+
+
+class AdminStats:
+    """
+    Materialisierte Admin-Statistiken.
+    """
+
+    def __init__(self, cache_ttl: float = 5.0, rebuild_interval: float = 600.0):
+        """
+        Args:
+            cache_ttl: Sekunden, die Dashboard-Zahlen aus dem Cache kommen
+            rebuild_interval: Sekunden bis zum nächsten kompletten Rebuild
+        """
+        self.cache_ttl = cache_ttl
+        self.rebuild_interval = rebuild_interval
+
+        self.user_model = None
+        self.session_model = None
+        self.message_model = None
+        self.project_model = None
+
+        self._rebuilt_at: Dict[str, float] = {}  # Engine-URL → Zeitpunkt
+        self._cache: Dict[str, tuple] = {}  # Engine-URL → (expires, counters)
+        self._lock = threading.Lock()
+        self._installed = False
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "rebuilds": 0, "incremental_flushes": 0}
+
+    # ---------------------------------------------------------
+    # SETUP
+    # ---------------------------------------------------------
+    def install(self, user_model, session_model, message_model=None, project_model=None):
+        """Models registrieren + Flush-Hook (einmalig)."""
+        self.user_model = user_model
+        self.session_model = session_model
+        self.message_model = message_model
+        self.project_model = project_model
+
+        if not self._installed:
+            event.listen(Session, "after_flush", self._after_flush)
+            self._installed = True
+
+    @staticmethod
+    def _bind_key(connection) -> str:
+        return str(connection.engine.url)
+
+    def ensure_ready(self, db: Session):
+        """Tabellen anlegen und bei Bedarf (erstes Mal / Intervall) neu aufbauen."""
+        connection = db.connection()
+        key = self._bind_key(connection)
+        rebuilt_at = self._rebuilt_at.get(key)
+        if rebuilt_at is not None and time.monotonic() - rebuilt_at < self.rebuild_interval:
+            return
+
+        AdminCounter.__table__.create(bind=connection, checkfirst=True)
+        UserActivity.__table__.create(bind=connection, checkfirst=True)
+        self.rebuild(db)
+
+    # ---------------------------------------------------------
+    # FULL REBUILD (GROUP BY)
+    # ---------------------------------------------------------
+    def rebuild(self, db: Session):
+        """Alle Zähler aus den Basistabellen neu berechnen (eine Transaktion)."""
+        User, ChatSession = self.user_model, self.session_model
+
+        def count_of(model):
+            return select(func.count()).select_from(model).scalar_subquery() if model is not None else literal(0)
+
+        # Globale Zähler: ein Round-Trip
+        row = db.execute(
+            select(
+                count_of(User),
+                select(func.count()).select_from(User).where(User.is_suspended.is_(True)).scalar_subquery(),
+                count_of(ChatSession),
+                count_of(self.message_model),
+                count_of(self.project_model),
+            )
+        ).one()
+
+        db.execute(delete(AdminCounter))
+        db.execute(insert(AdminCounter), [{"name": name, "value": value or 0} for name, value in zip(COUNTERS, row)])
+
+        # Pro User: users LEFT JOIN (sessions GROUP BY user_id) LEFT JOIN (projects GROUP BY user_id)
+        sessions = (
+            select(
+                ChatSession.user_id.label("user_id"),
+                func.count().label("session_count"),
+                func.max(ChatSession.updated_at).label("last_active"),
+            )
+            .group_by(ChatSession.user_id)
+            .subquery()
+        )
+        columns = [User.id, func.coalesce(sessions.c.session_count, 0), sessions.c.last_active]
+        query = select(*columns).outerjoin(sessions, sessions.c.user_id == User.id)
+
+        if self.project_model is not None:
+            Project = self.project_model
+            projects = (
+                select(Project.user_id.label("user_id"), func.count().label("project_count"))
+                .group_by(Project.user_id)
+                .subquery()
+            )
+            query = query.add_columns(func.coalesce(projects.c.project_count, 0)).outerjoin(
+                projects, projects.c.user_id == User.id
+            )
+        else:
+            query = query.add_columns(literal(0))
+
+        db.execute(delete(UserActivity))
+        db.execute(
+            insert(UserActivity).from_select(["user_id", "session_count", "last_active", "project_count"], query)
+        )
+        db.commit()
+
+        key = self._bind_key(db.connection())
+        with self._lock:
+            self._rebuilt_at[key] = time.monotonic()
+            self._cache.pop(key, None)
+        self.stats["rebuilds"] += 1
+
+    # ---------------------------------------------------------
+    # INCREMENTAL (after_flush, gleiche Transaktion)
+    # ---------------------------------------------------------
+    def _after_flush(self, session: Session, flush_context):
+        if self.user_model is None:
+            return
+
+        counters = defaultdict(int)
+        users = defaultdict(lambda: {"session_count": 0, "project_count": 0, "last_active": None})
+        removed_users = []
+
+        def touch(user_id, last_active):
+            entry = users[user_id]
+            if last_active and (entry["last_active"] is None or last_active > entry["last_active"]):
+                entry["last_active"] = last_active
+
+        for obj in session.new:
+            if isinstance(obj, self.user_model):
+                counters["users"] += 1
+                counters["suspended_users"] += 1 if obj.is_suspended else 0
+            elif isinstance(obj, self.session_model):
+                counters["sessions"] += 1
+                users[obj.user_id]["session_count"] += 1
+                touch(obj.user_id, obj.updated_at or obj.created_at or datetime.utcnow())
+            elif self.message_model is not None and isinstance(obj, self.message_model):
+                counters["messages"] += 1
+            elif self.project_model is not None and isinstance(obj, self.project_model):
+                counters["projects"] += 1
+                users[obj.user_id]["project_count"] += 1
+
+        for obj in session.dirty:
+            if isinstance(obj, self.user_model):
+                history = inspect(obj).attrs.is_suspended.history
+                if history.has_changes():
+                    was = bool(history.deleted and history.deleted[0])
+                    counters["suspended_users"] += int(bool(obj.is_suspended)) - int(was)
+            elif isinstance(obj, self.session_model):
+                touch(obj.user_id, obj.updated_at)
+
+        for obj in session.deleted:
+            if isinstance(obj, self.user_model):
+                counters["users"] -= 1
+                counters["suspended_users"] -= 1 if obj.is_suspended else 0
+                removed_users.append(obj.id)
+            elif isinstance(obj, self.session_model):
+                counters["sessions"] -= 1
+                users[obj.user_id]["session_count"] -= 1
+            elif self.message_model is not None and isinstance(obj, self.message_model):
+                counters["messages"] -= 1
+            elif self.project_model is not None and isinstance(obj, self.project_model):
+                counters["projects"] -= 1
+                users[obj.user_id]["project_count"] -= 1
+
+        counters = {name: delta for name, delta in counters.items() if delta}
+        if not counters and not users and not removed_users:
+            return
+
+        connection = session.connection()
+        # Stats-Tabellen gibt es erst nach ensure_ready() – bis dahin holt der Rebuild alles nach
+        if self._bind_key(connection) not in self._rebuilt_at:
+            return
+
+        for name, delta in counters.items():
+            connection.execute(
+                update(AdminCounter).where(AdminCounter.name == name).values(value=AdminCounter.value + delta)
+            )
+
+        for user_id, entry in users.items():
+            self._bump_user(connection, user_id, **entry)
+
+        if removed_users:
+            connection.execute(delete(UserActivity).where(UserActivity.user_id.in_(removed_users)))
+
+        self.stats["incremental_flushes"] += 1
+
+    @staticmethod
+    def _bump_user(connection, user_id: int, session_count: int, project_count: int, last_active: Optional[datetime]):
+        values = {
+            "session_count": UserActivity.session_count + session_count,
+            "project_count": UserActivity.project_count + project_count,
+        }
+        if last_active is not None:
+            values["last_active"] = case(
+                (UserActivity.last_active.is_(None), last_active),
+                (UserActivity.last_active < last_active, last_active),
+                else_=UserActivity.last_active,
+            )
+        result = connection.execute(update(UserActivity).where(UserActivity.user_id == user_id).values(**values))
+        if result.rowcount == 0:
+            connection.execute(
+                insert(UserActivity).values(
+                    user_id=user_id,
+                    session_count=max(session_count, 0),
+                    project_count=max(project_count, 0),
+                    last_active=last_active,
+                )
+            )
+
+    # ---------------------------------------------------------
+    # READ
+    # ---------------------------------------------------------
+    def dashboard_counts(self, db: Session) -> Dict[str, int]:
+        """Globale Zähler – eine Query, Polling aus dem TTL-Cache."""
+        key = self._bind_key(db.connection())
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self.stats["cache_hits"] += 1
+                return dict(cached[1])
+
+        self.stats["cache_misses"] += 1
+        self.ensure_ready(db)
+        counters = dict.fromkeys(COUNTERS, 0)
+        counters.update(db.execute(select(AdminCounter.name, AdminCounter.value)).all())
+
+        with self._lock:
+            self._cache[key] = (now + self.cache_ttl, counters)
+        return dict(counters)
+
+    def users_overview(self, db: Session, limit: int = 50, offset: int = 0, suspended_only: bool = False) -> List[Dict]:
+        """User-Seite inkl. Projekt-/Session-Anzahl und letzter Aktivität – eine Query."""
+        self.ensure_ready(db)
+        User = self.user_model
+
+        query = (
+            select(
+                User.id,
+                User.email,
+                User.created_at,
+                User.is_suspended,
+                func.coalesce(UserActivity.project_count, 0),
+                func.coalesce(UserActivity.session_count, 0),
+                UserActivity.last_active,
+            )
+            .outerjoin(UserActivity, UserActivity.user_id == User.id)
+            .order_by(User.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        if suspended_only:
+            query = query.where(User.is_suspended.is_(True))
+
+        return [
+            {
+                "id": row[0],
+                "email": row[1],
+                "created_at": row[2].isoformat() if row[2] else None,
+                "is_suspended": bool(row[3]),
+                "project_count": row[4],
+                "session_count": row[5],
+                "last_active": row[6].isoformat() if row[6] else None,
+            }
+            for row in db.execute(query).all()
+        ]
+
+    def invalidate(self):
+        """Cache leeren und nächsten Zugriff zum Rebuild zwingen."""
+        with self._lock:
+            self._cache.clear()
+            self._rebuilt_at.clear()
+
+
+# Singleton Instance
+admin_stats = AdminStats(
+    cache_ttl=float(os.getenv("ADMIN_STATS_CACHE_TTL", 5)),
+    rebuild_interval=float(os.getenv("ADMIN_STATS_REBUILD_INTERVAL", 600)),
+)
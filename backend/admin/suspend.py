@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 sys.path.append(str(Path(__file__).parent.parent))
 
 from auth import require_admin
+from auth_cache import auth_cache
 from db import get_db
 from models import User
 
@@ -27,6 +28,7 @@ async def suspend_user_account(user_id: str, db=Depends(get_db), _=Depends(requi
     # Benutzer sperren
     user.is_suspended = True
     db.commit()
+    auth_cache.invalidate_user(user.id)
 
     return {"status": "success", "user_id": user_id, "suspended": True}
 
@@ -40,6 +42,7 @@ async def unsuspend_user_account(user_id: str, db=Depends(get_db), _=Depends(req
 
     user.is_suspended = False
     db.commit()
+    auth_cache.invalidate_user(user.id)
 
     return {"status": "success", "user_id": user_id, "suspended": False}
 
@@ -153,6 +156,7 @@ async def suspend_user_v2(
         user.unsuspend_at = datetime.utcnow() + timedelta(days=request.duration_days)
 
     db.commit()
+    auth_cache.invalidate_user(user.id)
 
     # Email Notification
     if request.notify_user and mailer_v2:
@@ -217,6 +221,7 @@ async def unsuspend_user_v2(
     user.unsuspend_at = None
 
     db.commit()
+    auth_cache.invalidate_user(user.id)
 
     # Email Notification
     if request.notify_user and mailer_v2:
@@ -335,6 +340,7 @@ async def batch_suspend_users(
             user.suspended_at = datetime.utcnow()
             user.suspend_reason = reason
             db.commit()
+            auth_cache.invalidate_user(user.id)
 
             # Email
             if notify_users and mailer_v2:
@@ -424,6 +430,8 @@ async def cleanup_expired_suspensions(db: DBSession = Depends(get_db), _=Depends
         unsuspended_count += 1
 
     db.commit()
+    for user in expired_users:
+        auth_cache.invalidate_user(user.id)
 
     return {
         "status": "success",
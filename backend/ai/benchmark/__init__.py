@@ -10,12 +10,16 @@ from .benchmark_engine import (
     get_ranking,
     run_benchmark,
 )
+from .benchmark_runner import BenchmarkRunner, BenchmarkStore, MockProvider
 
 __all__ = [
     "benchmark_engine",
     "BenchmarkEngine",
     "BenchmarkResult",
     "run_benchmark",
+    "BenchmarkRunner",
+    "BenchmarkStore",
+    "MockProvider",
     "get_best_models",
     "get_ranking",
 ]
\ No newline at end of file
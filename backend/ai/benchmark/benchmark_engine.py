@@ -4,12 +4,14 @@
 Measures speed, cost, and quality to update rankings
 """
 
+import asyncio
+import os
 import statistics
-import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from ai.benchmark.benchmark_runner import BenchmarkRunner, BenchmarkStore, CallSample, MockProvider, RunSummary
 from ai.pricing.pricing_table import MODEL_PRICING, pricing_db
 
 
@@ -27,6 +29,26 @@ class BenchmarkResult:
     actual_cost: float
     estimated_cost: float
     cost_accuracy: float
+    p50_latency_ms: float = 0.0
+    p90_latency_ms: float = 0.0
+    p99_latency_ms: float = 0.0
+    ttft_p50_ms: float = 0.0
+    tokens_per_sec: float = 0.0
+    overhead_p50_ms: Optional[float] = None
+    mode: str = "live"
+
+
+def _quality_score(output_length: int) -> int:
+    """Quality score (1-10 based on output length)"""
+    if output_length > 200:
+        return 10
+    elif output_length > 100:
+        return 8
+    elif output_length > 50:
+        return 6
+    elif output_length > 10:
+        return 4
+    return 2
 
 
 class BenchmarkEngine:
@@ -45,97 +67,44 @@ class BenchmarkEngine:
         ]
 
         self.benchmark_history: Dict[str, List[BenchmarkResult]] = {}
-
-    def run(self, model_id: str, call_fn: Optional[callable] = None, num_iterations: int = 3) -> BenchmarkResult:
-        """
-        Run benchmark for a model
-
-        Args:
-            model_id: Model to benchmark
-            call_fn: Optional function to call the model
-            num_iterations: Number of test iterations
-
-        Returns:
-            BenchmarkResult
-        """
-
-        latencies = []
-        successes = 0
-        total_tests = 0
+        self.concurrency = int(os.getenv("BENCHMARK_CONCURRENCY", 4))
+        self.warmup = int(os.getenv("BENCHMARK_WARMUP", 1))
+        self.store = BenchmarkStore()
+        # Offline/CI mode (no call_fn); scale < 1 speeds up CI runs
+        self.mock = MockProvider(time_scale=float(os.getenv("BENCHMARK_MOCK_TIME_SCALE", 1.0)))
+
+    def _prompts(self, num_iterations: int) -> List[str]:
+        """Fixed prompt order → comparable runs"""
+        return [self.test_prompts[i % len(self.test_prompts)] for i in range(max(1, num_iterations))]
+
+    def _to_result(self, summary: RunSummary, samples: List[CallSample], prompts: List[str]) -> BenchmarkResult:
+        model_id = summary.model_id
         quality_scores = []
         actual_costs = []
         estimated_costs = []
 
-        # Select random prompts for this run
-        import random
-
-        test_prompts = random.sample(self.test_prompts, min(num_iterations, len(self.test_prompts)))
-
-        for prompt in test_prompts:
-            total_tests += 1
-
-            try:
-                start_time = time.time()
-
-                # Call model (if call_fn provided)
-                if call_fn:
-                    result = call_fn(model_id, prompt)
-                    output_length = len(result) if result else 0
-                else:
-                    # Simulate call
-                    time.sleep(0.1)
-                    output_length = 100
-
-                latency_ms = (time.time() - start_time) * 1000
-                latencies.append(latency_ms)
-
-                # Quality score (1-10 based on output length)
-                if output_length > 200:
-                    quality = 10
-                elif output_length > 100:
-                    quality = 8
-                elif output_length > 50:
-                    quality = 6
-                elif output_length > 10:
-                    quality = 4
-                else:
-                    quality = 2
-
-                quality_scores.append(quality)
-                successes += 1
-
-                # Calculate actual cost
-                input_tokens = len(prompt.split()) * 1.3  # Rough estimate
-                output_tokens = output_length / 4  # Rough estimate
-
-                actual_cost = pricing_db.calculate_cost(
-                    model_id=model_id,
-                    input_tokens=int(input_tokens),
-                    output_tokens=int(output_tokens),
-                )
-                actual_costs.append(actual_cost)
-
-                # Estimated cost
-                estimated_cost = pricing_db.calculate_cost(
-                    model_id=model_id,
-                    input_tokens=int(input_tokens),
-                    output_tokens=int(output_tokens),
-                )
-                estimated_costs.append(estimated_cost)
-
-            except Exception:
+        for sample, prompt in zip(samples, prompts):
+            if not sample.success:
                 # Failed test
                 quality_scores.append(0)
                 continue
 
-        # Calculate results
-        success_rate = (successes / total_tests * 100) if total_tests > 0 else 0
+            quality_scores.append(_quality_score(sample.output_length))
 
-        avg_latency = statistics.mean(latencies) if latencies else 0
-        min_latency = min(latencies) if latencies else 0
-        max_latency = max(latencies) if latencies else 0
+            # Calculate actual cost
+            input_tokens = len(prompt.split()) * 1.3  # Rough estimate
+            output_tokens = sample.output_length / 4  # Rough estimate
 
-        avg_quality = statistics.mean(quality_scores) if quality_scores else 0
+            actual_costs.append(
+                pricing_db.calculate_cost(
+                    model_id=model_id, input_tokens=int(input_tokens), output_tokens=int(output_tokens)
+                )
+            )
+            estimated_costs.append(
+                pricing_db.calculate_cost(
+                    model_id=model_id, input_tokens=int(input_tokens), output_tokens=int(output_tokens)
+                )
+            )
 
         total_actual_cost = sum(actual_costs) if actual_costs else 0
         total_estimated_cost = sum(estimated_costs) if estimated_costs else 0
@@ -146,40 +115,97 @@ class BenchmarkEngine:
             else 100
         )
 
-        result = BenchmarkResult(
+        return BenchmarkResult(
             model_id=model_id,
             timestamp=datetime.now(),
-            avg_latency_ms=avg_latency,
-            min_latency_ms=min_latency,
-            max_latency_ms=max_latency,
-            success_rate=success_rate,
-            quality_score=avg_quality,
+            avg_latency_ms=summary.mean_latency_ms,
+            min_latency_ms=summary.min_latency_ms,
+            max_latency_ms=summary.max_latency_ms,
+            success_rate=summary.success_rate,
+            quality_score=statistics.mean(quality_scores) if quality_scores else 0,
             actual_cost=total_actual_cost,
             estimated_cost=total_estimated_cost,
             cost_accuracy=cost_accuracy,
+            p50_latency_ms=summary.p50_latency_ms,
+            p90_latency_ms=summary.p90_latency_ms,
+            p99_latency_ms=summary.p99_latency_ms,
+            ttft_p50_ms=summary.ttft_p50_ms,
+            tokens_per_sec=summary.tokens_per_sec,
+            overhead_p50_ms=summary.overhead_p50_ms,
+            mode=summary.mode,
         )
 
-        # Store in history
-        if model_id not in self.benchmark_history:
-            self.benchmark_history[model_id] = []
-        self.benchmark_history[model_id].append(result)
+    async def run_models_async(
+        self,
+        model_ids: List[str],
+        call_fn: Optional[callable] = None,
+        num_iterations: int = 3,
+        concurrency: Optional[int] = None,
+        warmup: Optional[int] = None,
+        persist: Optional[bool] = None,
+    ) -> Dict[str, BenchmarkResult]:
+        """
+        Benchmark models concurrently.
 
-        return result
+        Args:
+            model_ids: Models to benchmark
+            call_fn: Optional function to call the model (sync/async, str or
+                     async token stream). None → deterministic mock provider
+            num_iterations: Measured calls per model (after warmup)
+            concurrency: Max. parallel calls across all models
+            warmup: Unrecorded warmup calls per model
+            persist: Append results to the benchmark store
+                     (None → only live runs; mock runs stay out of the store)
 
-    def run_all_models(self, call_fn: Optional[callable] = None, num_iterations: int = 3) -> Dict[str, BenchmarkResult]:
-        """Run benchmark for all models"""
+        Returns:
+            {model_id: BenchmarkResult}
+        """
+        if persist is None:
+            persist = call_fn is not None
+
+        runner = BenchmarkRunner(
+            call_fn=call_fn,
+            concurrency=concurrency or self.concurrency,
+            warmup=self.warmup if warmup is None else warmup,
+            store=self.store if persist else None,
+            mock=self.mock,
+        )
+        prompts = self._prompts(num_iterations)
+        measured = await runner.run_many(model_ids, prompts)
 
         results = {}
+        for model_id, (samples, summary) in measured.items():
+            result = self._to_result(summary, samples, prompts)
+            self.benchmark_history.setdefault(model_id, []).append(result)
+            results[model_id] = result
+        return results
 
-        for model_id in MODEL_PRICING.keys():
-            try:
-                result = self.run(model_id, call_fn, num_iterations)
-                results[model_id] = result
-            except Exception as e:
-                print(f"Failed to benchmark {model_id}: {e}")
-                continue
+    async def run_async(self, model_id: str, call_fn: Optional[callable] = None, num_iterations: int = 3, **kwargs) -> BenchmarkResult:
+        """Run benchmark for a model (async)"""
+        results = await self.run_models_async([model_id], call_fn, num_iterations, **kwargs)
+        return results[model_id]
 
-        return results
+    async def run_all_models_async(self, call_fn: Optional[callable] = None, num_iterations: int = 3, **kwargs) -> Dict[str, BenchmarkResult]:
+        """Run benchmark for all models (concurrently)"""
+        return await self.run_models_async(list(MODEL_PRICING.keys()), call_fn, num_iterations, **kwargs)
+
+    def run(self, model_id: str, call_fn: Optional[callable] = None, num_iterations: int = 3) -> BenchmarkResult:
+        """
+        Run benchmark for a model (sync wrapper, not inside a running event loop)
+
+        Args:
+            model_id: Model to benchmark
+            call_fn: Optional function to call the model
+            num_iterations: Number of test iterations
+
+        Returns:
+            BenchmarkResult
+        """
+        return asyncio.run(self.run_async(model_id, call_fn, num_iterations))
+
+    def run_all_models(self, call_fn: Optional[callable] = None, num_iterations: int = 3) -> Dict[str, BenchmarkResult]:
+        """Run benchmark for all models (sync wrapper)"""
+        return asyncio.run(self.run_all_models_async(call_fn, num_iterations))
 
     def get_benchmark_history(self, model_id: str, limit: Optional[int] = None) -> List[BenchmarkResult]:
         """Get benchmark history for a model"""
@@ -336,10 +362,11 @@ if __name__ == "__main__":
     # Demo
     print("📊 Benchmark Engine Demo\n")
 
-    print("1. Simulated Benchmark (without actual calls):")
+    print("1. Mock Benchmark (deterministic, without actual calls):")
     result = benchmark_engine.run("openai:gpt-4o", call_fn=None, num_iterations=3)
     print(f"   Model: {result.model_id}")
-    print(f"   Avg Latency: {result.avg_latency_ms:.2f}ms")
+    print(f"   Latency p50/p90/p99: {result.p50_latency_ms:.0f}/{result.p90_latency_ms:.0f}/{result.p99_latency_ms:.0f}ms")
+    print(f"   TTFT p50: {result.ttft_p50_ms:.0f}ms, {result.tokens_per_sec:.0f} tokens/s")
     print(f"   Quality Score: {result.quality_score:.1f}/10")
     print(f"   Success Rate: {result.success_rate:.1f}%")
     print(f"   Cost: €{result.actual_cost:.6f}")
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+⭐ BLOCK F — ASYNC BENCHMARK RUNNER
+Concurrent model benchmarks with latency percentiles, TTFT and tokens/sec.
+
+- Configurable concurrency + warmup iterations (warmup is not recorded)
+- perf_counter_ns timing, p50/p90/p99 latency, time-to-first-token
+- Streaming call_fn (async iterator) or plain call_fn (sync / async → str)
+- Deterministic MockProvider for offline CI runs; its simulated latency
+  is known exactly, so the difference is our own harness overhead
+- Results persisted to an append-only JSONL store, with regression checks
+  against the previous run
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile with linear interpolation (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ============================================================================
+# MOCK PROVIDER (deterministic, offline)
+# ============================================================================
+
+
+class MockStream:
+    """Async token stream of a simulated model call"""
+
+    def __init__(self, ttft_s: float, token_delay_s: float, tokens: List[str]):
+        self.ttft_s = ttft_s
+        self.token_delay_s = token_delay_s
+        self.tokens = tokens
+        # Exact simulated duration → measured - expected = harness overhead
+        self.expected_ns = int((ttft_s + token_delay_s * (len(tokens) - 1)) * 1e9)
+
+    def __aiter__(self):
+        return self._generate()
+
+    async def _generate(self):
+        # Absolute deadlines, so sleep overshoot does not add up per token
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i, token in enumerate(self.tokens):
+            deadline = started + self.ttft_s + self.token_delay_s * i
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            yield token
+
+
+class MockProvider:
+    """
+    Deterministic fake provider.
+
+    Latency profile per model is derived from a hash of model_id + seed, so
+    the same model always behaves the same – across runs and machines.
+    """
+
+    def __init__(self, seed: int = 42, time_scale: float = 1.0, failure_rate: float = 0.0):
+        """
+        Args:
+            seed: Seed for latency profiles and token counts
+            time_scale: Multiplier for all delays (e.g. 0.01 in CI)
+            failure_rate: Share of calls that raise (deterministic per prompt)
+        """
+        self.seed = seed
+        self.time_scale = time_scale
+        self.failure_rate = failure_rate
+
+    def _rng(self, *parts: str) -> random.Random:
+        digest = hashlib.sha256("|".join((str(self.seed),) + parts).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def stream(self, model_id: str, prompt: str, iteration: int = 0) -> MockStream:
+        profile = self._rng(model_id)
+        base_ttft = profile.uniform(0.15, 0.6)
+        token_delay = profile.uniform(0.005, 0.03)
+
+        call = self._rng(model_id, prompt, str(iteration))
+        if call.random() < self.failure_rate:
+            raise RuntimeError(f"Mock provider error for {model_id}")
+
+        num_tokens = call.randint(40, 120)
+        ttft = base_ttft * call.uniform(0.8, 1.4)
+        tokens = [f"tok{i} " for i in range(num_tokens)]
+        return MockStream(ttft * self.time_scale, token_delay * self.time_scale, tokens)
+
+    async def __call__(self, model_id: str, prompt: str, iteration: int = 0) -> MockStream:
+        return self.stream(model_id, prompt, iteration)
+
+
+# ============================================================================
+# SAMPLES + RESULT STORE
+# ============================================================================
+
+
+@dataclass
+class CallSample:
+    """One measured model call"""
+
+    success: bool
+    latency_ns: int = 0
+    ttft_ns: int = 0
+    output_tokens: int = 0
+    output_length: int = 0
+    overhead_ns: Optional[int] = None
+    error: str = ""
+
+
+@dataclass
+class RunSummary:
+    """Aggregated metrics for one model in one run"""
+
+    model_id: str
+    mode: str
+    iterations: int
+    concurrency: int
+    success_rate: float
+    p50_latency_ms: float
+    p90_latency_ms: float
+    p99_latency_ms: float
+    mean_latency_ms: float
+    min_latency_ms: float
+    max_latency_ms: float
+    ttft_p50_ms: float
+    ttft_p90_ms: float
+    tokens_per_sec: float
+    overhead_p50_ms: Optional[float] = None
+    run_id: str = ""
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+def summarize(model_id: str, samples: List[CallSample], mode: str, concurrency: int) -> RunSummary:
+    ok = [s for s in samples if s.success]
+    latencies = [s.latency_ns / 1e6 for s in ok]
+    ttfts = [s.ttft_ns / 1e6 for s in ok]
+    overheads = [s.overhead_ns / 1e6 for s in ok if s.overhead_ns is not None]
+
+    # Tokens/sec over the generation phase (after the first token)
+    rates = []
+    for s in ok:
+        generation_ns = s.latency_ns - s.ttft_ns
+        if s.output_tokens > 1 and generation_ns > 0:
+            rates.append((s.output_tokens - 1) / (generation_ns / 1e9))
+        elif s.output_tokens and s.latency_ns:
+            rates.append(s.output_tokens / (s.latency_ns / 1e9))
+
+    return RunSummary(
+        model_id=model_id,
+        mode=mode,
+        iterations=len(samples),
+        concurrency=concurrency,
+        success_rate=(len(ok) / len(samples) * 100) if samples else 0,
+        p50_latency_ms=percentile(latencies, 50),
+        p90_latency_ms=percentile(latencies, 90),
+        p99_latency_ms=percentile(latencies, 99),
+        mean_latency_ms=sum(latencies) / len(latencies) if latencies else 0,
+        min_latency_ms=min(latencies) if latencies else 0,
+        max_latency_ms=max(latencies) if latencies else 0,
+        ttft_p50_ms=percentile(ttfts, 50),
+        ttft_p90_ms=percentile(ttfts, 90),
+        tokens_per_sec=percentile(rates, 50),
+        overhead_p50_ms=percentile(overheads, 50) if overheads else None,
+    )
+
+
+class BenchmarkStore:
+    """Append-only JSONL store for benchmark runs"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(os.getenv("BENCHMARK_DIR", "./data/benchmarks"), "results.jsonl")
+
+    def save(self, summaries: List[RunSummary]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for summary in summaries:
+                f.write(json.dumps(asdict(summary)) + "\n")
+
+    def load(self, model_id: Optional[str] = None, mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if model_id and entry.get("model_id") != model_id:
+                    continue
+                if mode and entry.get("mode") != mode:
+                    continue
+                entries.append(entry)
+        return entries
+
+    def detect_regressions(
+        self,
+        summaries: List[RunSummary],
+        tolerance: float = 0.2,
+        min_delta_ms: float = 1.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare against the previous stored run (same model + mode).
+
+        Regression = metric > baseline * (1 + tolerance) AND more than
+        min_delta_ms worse (guards against noise on very small values).
+        """
+        regressions = []
+        for summary in summaries:
+            previous = [
+                e for e in self.load(summary.model_id, summary.mode) if e.get("run_id") != summary.run_id
+            ]
+            if not previous:
+                continue
+            baseline = previous[-1]
+
+            for metric in ("p50_latency_ms", "p90_latency_ms", "ttft_p50_ms", "overhead_p50_ms"):
+                old, new = baseline.get(metric), getattr(summary, metric)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + tolerance) and new - old > min_delta_ms:
+                    regressions.append(
+                        {"model_id": summary.model_id, "metric": metric, "baseline": old, "current": new}
+                    )
+        return regressions
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+
+class BenchmarkRunner:
+    """
+    Async benchmark runner.
+
+    call_fn(model_id, prompt) may be sync or async and may return a string
+    or an async iterator of chunks (streaming → TTFT is measured).
+    Without call_fn the deterministic MockProvider is used.
+    """
+
+    def __init__(
+        self,
+        call_fn: Optional[Callable] = None,
+        concurrency: int = 4,
+        warmup: int = 1,
+        store: Optional[BenchmarkStore] = None,
+        mock: Optional[MockProvider] = None,
+    ):
+        self.mock = mock or (MockProvider() if call_fn is None else None)
+        self.call_fn = call_fn or self.mock
+        self.mode = "mock" if call_fn is None else "live"
+        self.concurrency = max(1, concurrency)
+        self.warmup = max(0, warmup)
+        self.store = store
+
+    async def _call(self, model_id: str, prompt: str, iteration: int) -> CallSample:
+        start = time.perf_counter_ns()
+        try:
+            if self.call_fn is self.mock:
+                result = await self.mock(model_id, prompt, iteration)
+            elif inspect.iscoroutinefunction(self.call_fn):
+                result = await self.call_fn(model_id, prompt)
+            else:
+                result = await asyncio.to_thread(self.call_fn, model_id, prompt)
+                if inspect.isawaitable(result):
+                    result = await result
+
+            ttft_ns = 0
+            tokens = 0
+            if hasattr(result, "__aiter__"):
+                chunks = []
+                async for chunk in result:
+                    if not ttft_ns:
+                        ttft_ns = time.perf_counter_ns() - start
+                    chunks.append(chunk)
+                    tokens += 1
+                text = "".join(str(c) for c in chunks)
+            else:
+                text = result or ""
+                tokens = max(1, len(text) // 4) if text else 0
+
+            latency_ns = time.perf_counter_ns() - start
+            expected_ns = getattr(result, "expected_ns", None)
+            return CallSample(
+                success=True,
+                latency_ns=latency_ns,
+                ttft_ns=ttft_ns or latency_ns,
+                output_tokens=tokens,
+                output_length=len(text),
+                overhead_ns=latency_ns - expected_ns if expected_ns is not None else None,
+            )
+        except Exception as e:
+            return CallSample(success=False, latency_ns=time.perf_counter_ns() - start, error=str(e))
+
+    async def measure(self, model_id: str, prompts: List[str], semaphore: asyncio.Semaphore) -> List[CallSample]:
+        """Warmup (not recorded), then all prompts with bounded concurrency."""
+        for i in range(self.warmup):
+            async with semaphore:
+                await self._call(model_id, prompts[i % len(prompts)], -1 - i)
+
+        async def one(i: int, prompt: str):
+            async with semaphore:
+                return await self._call(model_id, prompt, i)
+
+        return list(await asyncio.gather(*(one(i, p) for i, p in enumerate(prompts))))
+
+    async def run(self, model_id: str, prompts: List[str]) -> RunSummary:
+        summaries = await self.run_many([model_id], prompts)
+        return summaries[model_id][1]
+
+    async def run_many(self, model_ids: List[str], prompts: List[str]) -> Dict[str, tuple]:
+        """
+        Benchmark several models at once (shared concurrency limit).
+
+        Returns:
+            {model_id: (samples, summary)}
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        run_id = uuid.uuid4().hex[:12]
+
+        all_samples = await asyncio.gather(*(self.measure(m, prompts, semaphore) for m in model_ids))
+
+        results = {}
+        for model_id, samples in zip(model_ids, all_samples):
+            summary = summarize(model_id, samples, self.mode, self.concurrency)
+            summary.run_id = run_id
+            results[model_id] = (samples, summary)
+
+        if self.store:
+            self.store.save([summary for _, summary in results.values()])
+        return results
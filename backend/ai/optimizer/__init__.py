@@ -2,5 +2,6 @@
 # VIBEAI – OPTIMIZER MODULE
 # -------------------------------------------------------------
 from .project_optimizer import project_optimizer
+from .project_scanner import project_scanner
 
-__all__ = ["project_optimizer"]
\ No newline at end of file
+__all__ = ["project_optimizer", "project_scanner"]
\ No newline at end of file
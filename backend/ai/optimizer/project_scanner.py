@@ -0,0 +1,348 @@
+# -------------------------------------------------------------
+# VIBEAI – SHARED PROJECT SCANNER
+# -------------------------------------------------------------
+"""
+Gemeinsamer Datei-Scanner für den ProjectOptimizer.
+
+Vorher: analyze / suggest_refactoring / find_dead_code / optimize_performance
+liefen jeweils selbst per os.walk über das ganze Projekt – inklusive
+node_modules, .dart_tool und build – und lasen jede Datei komplett,
+um sie danach auf 10k Zeichen zu kürzen.
+
+Jetzt:
+- Ein Walk mit Pruning (eingebaute Ignore-Liste + .gitignore)
+- Es werden nur die ersten max_chars Zeichen gelesen
+- Reads laufen parallel in einem Thread-Pool
+- Ergebnis wird pro Projekt gecacht; gültig, solange sich weder
+  Verzeichnis-mtimes (neue/gelöschte Dateien) noch mtime/Größe der
+  gelesenen Dateien geändert haben
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("project_scanner")
+
+# Verzeichnisse, die nie Quellcode des Projekts enthalten
+DEFAULT_IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    ".dart_tool",
+    ".pub-cache",
+    "build",
+    "dist",
+    ".next",
+    ".nuxt",
+    "out",
+    "coverage",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    "venv",
+    ".venv",
+    "env",
+    ".gradle",
+    ".idea",
+    ".vscode",
+    "Pods",
+    "DerivedData",
+    "target",
+    "vendor",
+    "bin",
+    "obj",
+}
+
+
+# ============================================================================
+# .GITIGNORE
+# ============================================================================
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Übersetzt ein .gitignore Glob in eine Regex (ohne Anker)."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex += f"[{body}]"
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
+
+
+class GitIgnore:
+    """
+    Minimaler .gitignore Matcher (Negation, Verzeichnis-Regeln, Anker, **).
+
+    Regeln aus Unterordnern gelten relativ zu ihrem Ordner; die letzte
+    passende Regel gewinnt – wie bei git.
+    """
+
+    def __init__(self):
+        # (base_dir, regex, negate, dir_only)
+        self.rules: List[Tuple[str, re.Pattern, bool, bool]] = []
+
+    def add_file(self, path: str, base_dir: str = ""):
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                self.add_patterns(f.read().splitlines(), base_dir)
+        except OSError:
+            pass
+
+    def add_patterns(self, lines: Iterable[str], base_dir: str = ""):
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            if "/" in line:
+                # Enthält "/" → relativ zum Ordner der .gitignore verankert
+                regex = "^" + _glob_to_regex(line.lstrip("/")) + "$"
+            else:
+                # Nur Name → passt in jeder Tiefe
+                regex = "^(?:.*/)?" + _glob_to_regex(line) + "$"
+
+            self.rules.append((base_dir, re.compile(regex), negate, dir_only))
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for base_dir, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base_dir:
+                if not rel_path.startswith(base_dir + "/"):
+                    continue
+                path = rel_path[len(base_dir) + 1 :]
+            else:
+                path = rel_path
+            if regex.match(path):
+                ignored = not negate
+        return ignored
+
+
+# ============================================================================
+# SCANNER
+# ============================================================================
+
+
+@dataclass
+class ProjectScan:
+    """Ergebnis eines Scans"""
+
+    root: str
+    # relativer Pfad → Inhalt (max. max_chars Zeichen)
+    files: Dict[str, str] = field(default_factory=dict)
+    # Baumstruktur (alle nicht ignorierten Dateien + Ordner)
+    structure: List[str] = field(default_factory=list)
+    # Gültigkeit: Ordner → mtime_ns, gelesene Datei / .gitignore → (mtime_ns, size)
+    dir_mtimes: Dict[str, int] = field(default_factory=dict)
+    file_stats: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+class ProjectScanner:
+    """
+    Ignore-aware, größenbegrenzter, paralleler Datei-Scanner mit Cache.
+    """
+
+    def __init__(self, max_workers: int = 16, max_projects: int = 32):
+        """
+        Args:
+            max_workers: Threads für parallele Reads
+            max_projects: Anzahl gecachter Projekt-Scans (LRU)
+        """
+        self.ignored_dirs = set(DEFAULT_IGNORED_DIRS)
+        self.max_projects = max_projects
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="project-scan")
+        self._cache: "OrderedDict[tuple, ProjectScan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"scans": 0, "cache_hits": 0, "files_read": 0, "files_reused": 0}
+
+    # ---------------------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------------------
+    def scan(self, project_path: str, extensions: Iterable[str], max_chars: int = 10000) -> ProjectScan:
+        """
+        Scannt ein Projekt (oder liefert den gecachten Scan).
+
+        Args:
+            project_path: Projekt-Ordner
+            extensions: Dateiendungen, deren Inhalt gelesen wird
+            max_chars: Max. Zeichen pro Datei (Rest wird nicht gelesen)
+        """
+        root = os.path.abspath(project_path)
+        key = (root, tuple(sorted(extensions)), max_chars)
+
+        with self._lock:
+            cached = self._cache.get(key)
+
+        if cached is not None and self._is_fresh(cached):
+            self.stats["cache_hits"] += 1
+            with self._lock:
+                self._cache.move_to_end(key)
+            return cached
+
+        scan = self._scan(root, tuple(extensions), max_chars, previous=cached)
+        with self._lock:
+            self._cache[key] = scan
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_projects:
+                self._cache.popitem(last=False)
+        return scan
+
+    def invalidate(self, project_path: Optional[str] = None):
+        """Cache leeren (ein Projekt oder alle)."""
+        root = os.path.abspath(project_path) if project_path else None
+        with self._lock:
+            for key in list(self._cache):
+                if root is None or key[0] == root:
+                    del self._cache[key]
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _is_fresh(self, scan: ProjectScan) -> bool:
+        """Nur stat() – kein Walk, kein Read."""
+        try:
+            for rel_dir, mtime in scan.dir_mtimes.items():
+                if os.stat(os.path.join(scan.root, rel_dir)).st_mtime_ns != mtime:
+                    return False
+            for rel_path, (mtime, size) in scan.file_stats.items():
+                st = os.stat(os.path.join(scan.root, rel_path))
+                if st.st_mtime_ns != mtime or st.st_size != size:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def _scan(self, root: str, extensions: tuple, max_chars: int, previous: Optional[ProjectScan]) -> ProjectScan:
+        self.stats["scans"] += 1
+        scan = ProjectScan(root=root)
+        gitignore = GitIgnore()
+        to_read: List[Tuple[str, str]] = []
+
+        for current, dirs, files in os.walk(root):
+            rel_dir = os.path.relpath(current, root).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir
+
+            try:
+                scan.dir_mtimes[rel_dir or "."] = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+
+            if ".gitignore" in files:
+                ignore_path = os.path.join(current, ".gitignore")
+                try:
+                    st = os.stat(ignore_path)
+                    # In-place Änderung ändert die Ordner-mtime nicht → eigener Eintrag
+                    scan.file_stats[f"{rel_dir}/.gitignore" if rel_dir else ".gitignore"] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+                gitignore.add_file(ignore_path, rel_dir)
+
+            def rel(name: str) -> str:
+                return f"{rel_dir}/{name}" if rel_dir else name
+
+            dirs[:] = sorted(
+                d for d in dirs if d not in self.ignored_dirs and not gitignore.is_ignored(rel(d), True)
+            )
+            files = sorted(f for f in files if not gitignore.is_ignored(rel(f), False))
+
+            level = rel_dir.count("/") + 1 if rel_dir else 0
+            scan.structure.append(f"{' ' * 2 * level}{os.path.basename(current)}/")
+            sub_indent = " " * 2 * (level + 1)
+
+            for name in files:
+                scan.structure.append(f"{sub_indent}{name}")
+                if name.endswith(extensions):
+                    to_read.append((rel(name), os.path.join(current, name)))
+
+        # Unveränderte Dateien aus dem vorherigen Scan übernehmen
+        pending = []
+        for rel_path, file_path in to_read:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if previous and previous.file_stats.get(rel_path) == stat_key and rel_path in previous.files:
+                scan.files[rel_path] = previous.files[rel_path]
+                scan.file_stats[rel_path] = stat_key
+                self.stats["files_reused"] += 1
+            else:
+                pending.append((rel_path, file_path, stat_key))
+
+        for (rel_path, _, stat_key), content in zip(
+            pending, self._executor.map(lambda job: self._read_head(job[1], max_chars), pending)
+        ):
+            if content is None:
+                logger.warning(f"⚠️ Could not read {rel_path}")
+                continue
+            scan.files[rel_path] = content
+            scan.file_stats[rel_path] = stat_key
+            self.stats["files_read"] += 1
+
+        # Reihenfolge wie beim Walk (Sample-Dateien bleiben stabil)
+        scan.files = {rel_path: scan.files[rel_path] for rel_path, _ in to_read if rel_path in scan.files}
+        return scan
+
+    @staticmethod
+    def _read_head(file_path: str, max_chars: int) -> Optional[str]:
+        """Liest nur max_chars + 1 Zeichen (Text-Modus dekodiert inkrementell)."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read(max_chars + 1)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        if len(content) > max_chars:
+            content = content[:max_chars] + "\n... (truncated)"
+        return content
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "cached_projects": len(self._cache)}
+
+
+# Singleton Instance
+project_scanner = ProjectScanner()
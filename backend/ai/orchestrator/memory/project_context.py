@@ -13,8 +13,9 @@ Persistent storage for full project lifecycle:
 - Project metadata and history
 
 Storage Strategy:
-- Memory: Fast in-memory cache for active projects
+- Memory: LRU cache for active projects (bounded by entries + bytes)
 - Disk: Persistent JSON files in /tmp/vibeai_contexts/
+  (core context, content-addressed code blobs, per-user summary index)
 
 Features:
 - Multi-user support
@@ -25,11 +26,100 @@ Features:
 - Global statistics
 """
 
+import hashlib
 import json
+import os
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+def _atomic_write_json(file_path: Path, data, indent: Optional[int] = 2) -> int:
+    """Schreibt JSON atomar (tmp + rename). Gibt Bytes zurück."""
+    payload = json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, file_path)
+    return len(payload)
+
+
+class BlobStore:
+    """
+    Content-addressed Storage für Code-Artefakte.
+
+    blobs/<sha256[:2]>/<sha256>.json – identischer Code (z.B. aktueller
+    Stand + letzter History-Eintrag) wird nur einmal gespeichert.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def put(self, value) -> str:
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str):
+        with open(self._path(digest), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def size(self, digest: str) -> int:
+        try:
+            return self._path(digest).stat().st_size
+        except OSError:
+            return 0
+
+
+class LazyCodeMap(MutableMapping):
+    """
+    context["code"] – framework → Code, Blobs werden erst beim Zugriff
+    geladen. Verhält sich für Aufrufer wie ein dict
+    (ctx.get("code", {}).get("react"), bool(ctx["code"]), ...).
+    """
+
+    def __init__(self, blobs: BlobStore, refs: Optional[Dict[str, str]] = None):
+        self._blobs = blobs
+        self.refs: Dict[str, str] = dict(refs or {})
+        self._loaded: Dict[str, object] = {}
+        self.loaded_bytes = 0
+
+    def __getitem__(self, framework: str):
+        if framework not in self._loaded:
+            digest = self.refs[framework]
+            self._loaded[framework] = self._blobs.get(digest)
+            self.loaded_bytes += self._blobs.size(digest)
+        return self._loaded[framework]
+
+    def __setitem__(self, framework: str, code):
+        self.refs[framework] = self._blobs.put(code)
+        self._loaded[framework] = code
+
+    def __delitem__(self, framework: str):
+        del self.refs[framework]
+        self._loaded.pop(framework, None)
+
+    def __iter__(self):
+        return iter(self.refs)
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __repr__(self):
+        return f"LazyCodeMap({list(self.refs)})"
+
 
 class ProjectContext:
     """
@@ -41,12 +131,34 @@ class ProjectContext:
     - Build system state
     - Preview server management
     - Deployment tracking
+
+    Storage layout (storage_path):
+    - {user}_{project}.json  → Kern-Context (ohne Code-Inhalte)
+    - blobs/                 → Code + History, content-addressed, lazy geladen
+    - index/{user}.json      → Summary-Index für list_projects/get_summary
+
+    Memory: LRU-Cache, begrenzt nach Anzahl und (geschätzter) Größe.
     """
 
-    def __init__(self):
-        self.contexts: Dict[str, Dict] = {}
-        self.storage_path = Path("/tmp/vibeai_contexts")
+    def __init__(
+        self,
+        storage_path: str = "/tmp/vibeai_contexts",
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.contexts: "OrderedDict[str, Dict]" = OrderedDict()
+        self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
+        self.blobs = BlobStore(self.storage_path / "blobs")
+        self.index_path = self.storage_path / "index"
+        self.index_path.mkdir(exist_ok=True)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizes: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[str, Dict]] = {}
+        self.hits = 0
+        self.misses = 0
 
     def _get_key(self, user_id: str, project_id: str) -> str:
         """Get unique key for user+project."""
@@ -125,15 +237,23 @@ class ProjectContext:
 
         # Try memory cache first (fast)
         if key in self.contexts:
+            self.hits += 1
+            self.contexts.move_to_end(key)
             return self.contexts[key]
 
+        self.misses += 1
+
         # Try disk persistence
         file_path = self.storage_path / f"{key}.json"
         if file_path.exists():
             with open(file_path, "r", encoding="utf-8") as f:
                 context = json.load(f)
-                self.contexts[key] = context
-                return context
+            self._sizes[key] = file_path.stat().st_size
+            if self._attach_code(context):
+                # Altes Format (Code inline) → einmalig migrieren
+                self._save(key, context, touch=False)
+            self._cache(key, context)
+            return context
 
         # Create new context with full structure
         now = datetime.utcnow().isoformat()
@@ -154,8 +274,8 @@ class ProjectContext:
             # UI/UX
             "screens": [],
             "components": [],
-            # Code
-            "code": {},
+            # Code (Inhalte in blobs/, lazy geladen)
+            "code": LazyCodeMap(self.blobs),
             "code_history": [],
             # Build
             "build_id": None,
@@ -178,8 +298,8 @@ class ProjectContext:
             "status": "active",
         }
 
-        self.contexts[key] = context
         self._save(key, context)
+        self._cache(key, context)
 
         return context
 
@@ -189,8 +309,8 @@ class ProjectContext:
         context = self.load(user_id, project_id)
 
         context.update(updates)
-        self.contexts[key] = context
         self._save(key, context)
+        self._cache(key, context)
 
         return context
 
@@ -228,7 +348,8 @@ class ProjectContext:
         """
         Add generated code for framework.
 
-        Maintains code history (last 10 versions).
+        Maintains code history (last 10 versions). History-Einträge
+        referenzieren den Code-Blob per Hash (siehe get_code_history).
 
         Args:
             framework: react | flutter | vue | html
@@ -236,19 +357,17 @@ class ProjectContext:
         """
         context = self.load(user_id, project_id)
 
-        if "code" not in context:
-            context["code"] = {}
         if "code_history" not in context:
             context["code_history"] = []
 
-        # Store current code
+        # Store current code (schreibt den Blob)
         context["code"][framework] = code
 
-        # Add to history
+        # Add to history (nur Referenz, gleicher Blob wie der aktuelle Code)
         context["code_history"].append(
             {
                 "framework": framework,
-                "code": code,
+                "code_ref": context["code"].refs[framework],
                 "timestamp": datetime.utcnow().isoformat(),
             }
         )
@@ -259,6 +378,20 @@ class ProjectContext:
 
         return self.update(user_id, project_id, context)
 
+    def get_code_history(self, user_id: str, project_id: str, framework: Optional[str] = None) -> List[Dict]:
+        """
+        Get code history with code loaded from blob storage.
+        """
+        context = self.load(user_id, project_id)
+        history = []
+        for entry in context.get("code_history", []):
+            if framework and entry.get("framework") != framework:
+                continue
+            item = {k: v for k, v in entry.items() if k != "code_ref"}
+            item["code"] = self.blobs.get(entry["code_ref"])
+            history.append(item)
+        return history
+
     def set_project_path(self, user_id: str, project_id: str, path: str) -> Dict:
         """Set project file system path."""
         return self.update(user_id, project_id, {"project_path": path})
@@ -277,47 +410,7 @@ class ProjectContext:
 
         Returns lightweight project summaries sorted by update time.
         """
-        projects = []
-
-        # Check memory cache
-        for key in self.contexts.keys():
-            if key.startswith(f"{user_id}_"):
-                ctx = self.contexts[key]
-                projects.append(
-                    {
-                        "project_id": ctx.get("project_id"),
-                        "name": ctx.get("name", ctx.get("project_id")),
-                        "framework": ctx.get("framework"),
-                        "created_at": ctx.get("created_at"),
-                        "updated_at": ctx.get("updated_at"),
-                        "screens_count": len(ctx.get("screens", [])),
-                        "has_code": bool(ctx.get("code")),
-                        "build_status": ctx.get("last_build_status"),
-                        "deployment_url": ctx.get("deployment_url"),
-                        "status": ctx.get("status", "active"),
-                    }
-                )
-
-        # Check disk for projects not in memory
-        for file_path in self.storage_path.glob(f"{user_id}_*.json"):
-            key = file_path.stem
-            if key not in self.contexts:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    ctx = json.load(f)
-                    projects.append(
-                        {
-                            "project_id": ctx.get("project_id"),
-                            "name": ctx.get("name", ctx.get("project_id")),
-                            "framework": ctx.get("framework"),
-                            "created_at": ctx.get("created_at"),
-                            "updated_at": ctx.get("updated_at"),
-                            "screens_count": len(ctx.get("screens", [])),
-                            "has_code": bool(ctx.get("code")),
-                            "build_status": ctx.get("last_build_status"),
-                            "deployment_url": ctx.get("deployment_url"),
-                            "status": ctx.get("status", "active"),
-                        }
-                    )
+        projects = [dict(summary) for summary in self._get_index(user_id).values()]
 
         # Sort by most recently updated
         projects.sort(key=lambda p: p.get("updated_at", ""), reverse=True)
@@ -329,14 +422,18 @@ class ProjectContext:
         key = self._get_key(user_id, project_id)
 
         # Remove from memory
-        if key in self.contexts:
-            del self.contexts[key]
+        self._uncache(key)
 
         # Remove from disk
         file_path = self.storage_path / f"{key}.json"
         if file_path.exists():
             file_path.unlink()
 
+        # Remove from summary index (Blobs bleiben, evtl. geteilt)
+        index = self._get_index(user_id)
+        if index.pop(project_id, None) is not None:
+            self._write_index(user_id)
+
         return True
 
     def exists(self, user_id: str, project_id: str) -> bool:
@@ -355,47 +452,171 @@ class ProjectContext:
         """
         Get lightweight project summary.
 
-        Returns essential info without full context.
+        Returns essential info without full context (aus dem Summary-Index).
         """
-        context = self.load(user_id, project_id)
+        summary = self._get_index(user_id).get(project_id)
+        if summary is None:
+            # Neues Projekt → wird angelegt und indiziert
+            self.load(user_id, project_id)
+            summary = self._get_index(user_id)[project_id]
 
         return {
-            "project_id": context.get("project_id"),
-            "name": context.get("name"),
-            "framework": context.get("framework"),
-            "screens_count": len(context.get("screens", [])),
-            "has_code": bool(context.get("code")),
-            "deployment_url": context.get("deployment_url"),
-            "created_at": context.get("created_at"),
-            "updated_at": context.get("updated_at"),
-            "status": context.get("status", "active"),
+            "project_id": summary.get("project_id"),
+            "name": summary.get("name"),
+            "framework": summary.get("framework"),
+            "screens_count": summary.get("screens_count", 0),
+            "has_code": summary.get("has_code", False),
+            "deployment_url": summary.get("deployment_url"),
+            "created_at": summary.get("created_at"),
+            "updated_at": summary.get("updated_at"),
+            "status": summary.get("status", "active"),
         }
 
     def clear_cache(self):
         """Clear in-memory cache (disk remains intact)."""
         self.contexts.clear()
+        self._sizes.clear()
+        self._indexes.clear()
 
     def get_stats(self) -> Dict:
         """Get global statistics about all projects."""
         total_files = len(list(self.storage_path.glob("*.json")))
         cached_projects = len(self.contexts)
 
+        lookups = self.hits + self.misses
+
         return {
             "total_projects": total_files,
             "cached_projects": cached_projects,
+            "cached_bytes": self._cached_bytes(),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
             "storage_path": str(self.storage_path),
-            "cache_hit_ratio": (cached_projects / total_files if total_files > 0 else 0),
+            "cache_hit_ratio": (self.hits / lookups if lookups > 0 else 0),
         }
 
-    def _save(self, key: str, context: Dict) -> None:
-        """Save context to disk with auto-timestamp update."""
+    # ---------------------------------------------------------
+    # LRU CACHE
+    # ---------------------------------------------------------
+    def _entry_size(self, key: str) -> int:
+        context = self.contexts.get(key)
+        code = context.get("code") if context else None
+        return self._sizes.get(key, 0) + (code.loaded_bytes if isinstance(code, LazyCodeMap) else 0)
+
+    def _cached_bytes(self) -> int:
+        return sum(self._entry_size(key) for key in self.contexts)
+
+    def _cache(self, key: str, context: Dict) -> None:
+        """Context als zuletzt benutzt cachen und LRU-Einträge verdrängen."""
+        self.contexts[key] = context
+        self.contexts.move_to_end(key)
+
+        # Disk ist immer aktuell (_save bei jeder Änderung) → Verdrängen ist verlustfrei
+        total = self._cached_bytes()
+        while len(self.contexts) > 1 and (len(self.contexts) > self.max_entries or total > self.max_bytes):
+            oldest = next(iter(self.contexts))
+            total -= self._entry_size(oldest)
+            self._uncache(oldest)
+
+    def _uncache(self, key: str) -> None:
+        self.contexts.pop(key, None)
+        self._sizes.pop(key, None)
+
+    # ---------------------------------------------------------
+    # SUMMARY INDEX
+    # ---------------------------------------------------------
+    def _summarize(self, context: Dict) -> Dict:
+        return {
+            "project_id": context.get("project_id"),
+            "name": context.get("name", context.get("project_id")),
+            "framework": context.get("framework"),
+            "created_at": context.get("created_at"),
+            "updated_at": context.get("updated_at"),
+            "screens_count": len(context.get("screens", [])),
+            "has_code": bool(context.get("code")),
+            "build_status": context.get("last_build_status"),
+            "deployment_url": context.get("deployment_url"),
+            "status": context.get("status", "active"),
+        }
+
+    def _get_index(self, user_id: str) -> Dict[str, Dict]:
+        """Summary-Index eines Users (project_id → Summary)."""
+        if user_id in self._indexes:
+            return self._indexes[user_id]
+
+        index_file = self.index_path / f"{user_id}.json"
+        if index_file.exists():
+            with open(index_file, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        else:
+            # Einmaliger Rebuild aus vorhandenen Context-Dateien (Altbestand)
+            index = {}
+            for file_path in self.storage_path.glob(f"{user_id}_*.json"):
+                with open(file_path, "r", encoding="utf-8") as f:
+                    ctx = json.load(f)
+                if ctx.get("user_id", user_id) != user_id:
+                    continue
+                summary = self._summarize(ctx)
+                summary["has_code"] = bool(ctx.get("code") or ctx.get("code_refs"))
+                index[ctx.get("project_id")] = summary
+            self._indexes[user_id] = index
+            self._write_index(user_id)
+
+        self._indexes[user_id] = index
+        return index
+
+    def _write_index(self, user_id: str) -> None:
+        _atomic_write_json(self.index_path / f"{user_id}.json", self._indexes[user_id], indent=None)
+
+    # ---------------------------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------------------------
+    def _attach_code(self, context: Dict) -> bool:
+        """
+        Ersetzt "code_refs" durch eine LazyCodeMap.
+
+        Returns:
+            True wenn der Context noch im alten Format (Code inline) war
+        """
+        migrated = False
+        code = LazyCodeMap(self.blobs, context.pop("code_refs", None))
+
+        # Altes Format: Code + History inline
+        for framework, value in (context.get("code") or {}).items():
+            code[framework] = value
+            migrated = True
+        for entry in context.get("code_history", []):
+            if "code" in entry:
+                entry["code_ref"] = self.blobs.put(entry.pop("code"))
+                migrated = True
+
+        context["code"] = code
+        return migrated
+
+    def _save(self, key: str, context: Dict, touch: bool = True) -> None:
+        """Save core context + summary index (Code liegt in blobs/)."""
         # Auto-update timestamp
-        context["updated_at"] = datetime.utcnow().isoformat()
+        if touch:
+            context["updated_at"] = datetime.utcnow().isoformat()
+
+        code = context.get("code")
+        if not isinstance(code, LazyCodeMap):
+            # z.B. update(..., {"code": {...}}) mit normalem dict
+            lazy = LazyCodeMap(self.blobs)
+            for framework, value in (code or {}).items():
+                lazy[framework] = value
+            context["code"] = code = lazy
+
+        core = {k: v for k, v in context.items() if k != "code"}
+        core["code_refs"] = code.refs
 
         file_path = self.storage_path / f"{key}.json"
+        self._sizes[key] = _atomic_write_json(file_path, core)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(context, f, indent=2)
+        user_id = context.get("user_id")
+        if user_id is not None:
+            self._get_index(user_id)[context.get("project_id")] = self._summarize(context)
+            self._write_index(user_id)
 
 
 # Global instance
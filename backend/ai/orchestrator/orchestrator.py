@@ -78,7 +78,7 @@ class AgentOrchestrator:
                 screen = project_context.get_last_screen(user_id, project_id)
                 framework = ctx.get("framework", "flutter")
                 code = await self.agents["code"].generate_code(screen, framework)
-                project_context.add_code(user_id, project_id, code)
+                project_context.add_code(user_id, project_id, framework, code)
                 return {
                     "agent": "code_agent",
                     "intent": "code",
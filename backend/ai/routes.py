@@ -15,7 +15,7 @@ from ai.budget.budget_engine import BudgetPeriod, budget_engine
 from ai.fallback.fallback_system import fallback_system
 from ai.model_selector import OptimizationStrategy, SelectionCriteria, model_selector
 from ai.pricing.pricing_table import MODEL_PRICING, PROVIDER_STATUS, pricing_db
-from ai.providers.model_clients import call_model_with_metadata
+from ai.providers.model_clients import call_model, call_model_with_metadata
 
 router = APIRouter(prefix="/ai-intelligence", tags=["AI Intelligence"])
 
@@ -60,6 +60,7 @@ class AICallRequest(BaseModel):
 class BenchmarkRequest(BaseModel):
     model_id: Optional[str] = None
     num_iterations: int = 3
+    mock: bool = False  # Offline/CI: deterministic mock provider, not persisted
 
 
 # ==================== Pricing Endpoints ====================
@@ -373,25 +374,37 @@ async def check_provider_health(provider: str):
 async def run_benchmark(request: BenchmarkRequest):
     """Run benchmark for model(s)"""
 
+    # Live provider calls by default; mock only on explicit request (never persisted)
+    call_fn = None if request.mock else call_model
+
     if request.model_id:
         # Single model
-        result = benchmark_engine.run(request.model_id, num_iterations=request.num_iterations)
+        result = await benchmark_engine.run_async(request.model_id, call_fn, num_iterations=request.num_iterations)
         return {
             "model_id": result.model_id,
             "avg_latency_ms": result.avg_latency_ms,
+            "p50_latency_ms": result.p50_latency_ms,
+            "p90_latency_ms": result.p90_latency_ms,
+            "p99_latency_ms": result.p99_latency_ms,
+            "ttft_p50_ms": result.ttft_p50_ms,
+            "tokens_per_sec": result.tokens_per_sec,
             "quality_score": result.quality_score,
             "success_rate": result.success_rate,
             "cost": result.actual_cost,
+            "mode": result.mode,
             "timestamp": result.timestamp.isoformat(),
         }
     else:
         # All models
-        results = benchmark_engine.run_all_models(num_iterations=request.num_iterations)
+        results = await benchmark_engine.run_all_models_async(call_fn, num_iterations=request.num_iterations)
         return {
             "total_models": len(results),
+            "mode": "mock" if request.mock else "live",
             "results": {
                 model_id: {
                     "avg_latency_ms": result.avg_latency_ms,
+                    "p50_latency_ms": result.p50_latency_ms,
+                    "p99_latency_ms": result.p99_latency_ms,
                     "quality_score": result.quality_score,
                     "success_rate": result.success_rate,
                 }
@@ -7,19 +7,23 @@ TeamEngine - Multi-model AI collaboration system
 Features:
 - Multiple AI models working together
 - Specialized agent roles
-- Parallel task execution
+- Parallel task execution (async provider clients, truly concurrent)
+- Per-provider concurrency limits and per-agent timeouts
 - Result aggregation
 - Model fallback handling
-- Consensus building
+- Consensus building (incl. streaming quorum mode)
 """
 
 import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 import anthropic
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from core.provider_clients.http_pool import http_pool
 
 # Load agent profiles
 PROFILES_PATH = os.path.join(os.path.dirname(__file__), "agent_profiles.json")
@@ -34,11 +38,22 @@ class TeamEngine:
     Coordinates multiple AI models working together on tasks
     """
 
-    def __init__(self):
+    # Max. gleichzeitige Requests pro Provider (überschreibbar)
+    DEFAULT_PROVIDER_LIMITS = {"openai": 8, "anthropic": 4, "google": 4, "ollama": 2}
+
+    # Timeout pro Agent-Call in Sekunden (agent_profiles.json: "timeout")
+    DEFAULT_AGENT_TIMEOUT = 60.0
+
+    def __init__(self, provider_limits: Optional[Dict[str, int]] = None, agent_timeout: Optional[float] = None):
         # Initialize API clients (lazy loading)
         self.openai_client = None
         self.anthropic_client = None
 
+        # Concurrency limiter pro Provider
+        self.provider_limits = {**self.DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.agent_timeout = agent_timeout or self.DEFAULT_AGENT_TIMEOUT
+
         # Agent configuration
         self.agents = AGENT_CONFIG["agents"]
         self.collaboration_modes = AGENT_CONFIG["collaboration_modes"]
@@ -60,7 +75,11 @@ class TeamEngine:
         }
 
     async def collaborate(
-        self, prompt: str, agents: Optional[List[str]] = None, mode: str = "parallel"
+        self,
+        prompt: str,
+        agents: Optional[List[str]] = None,
+        mode: str = "parallel",
+        quorum: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Coordinate multiple agents to collaborate on a task
@@ -68,7 +87,8 @@ class TeamEngine:
         Args:
             prompt: Task description
             agents: List of agent keys to use (None = all agents)
-            mode: Collaboration mode (parallel, sequential, consensus)
+            mode: Collaboration mode (parallel, sequential, consensus, quorum)
+            quorum: Successful answers needed in quorum mode (default: majority)
 
         Returns:
             Dict with responses from all agents
@@ -118,6 +138,14 @@ class TeamEngine:
             # Select best response (simplified voting)
             results["consensus"] = self._build_consensus(results)
 
+        elif mode == "quorum":
+            # Return as soon as enough agents answered, cancel the rest
+            async for event in self.stream_collaborate(prompt, agents, quorum=quorum):
+                if event["type"] == "agent_result":
+                    results[event["agent"]] = event["result"]
+                elif event["type"] == "consensus":
+                    results["consensus"] = event["consensus"]
+
         return {
             "success": True,
             "mode": mode,
@@ -126,6 +154,54 @@ class TeamEngine:
             "summary": self._summarize_results(results),
         }
 
+    async def stream_collaborate(
+        self, prompt: str, agents: Optional[List[str]] = None, quorum: Optional[int] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Streaming consensus: yields each agent result as soon as it arrives.
+
+        Once `quorum` agents answered successfully, a consensus event is
+        yielded and the remaining agents are cancelled.
+
+        Yields:
+            {"type": "agent_result", "agent": ..., "result": {...}}
+            {"type": "consensus", "consensus": {...}, "quorum": int, "elapsed": float}
+        """
+        self._ensure_clients()
+
+        if agents is None:
+            agents = ["frontend", "backend", "designer", "testing"]
+        if quorum is None:
+            quorum = len(agents) // 2 + 1
+        quorum = max(1, min(quorum, len(agents)))
+
+        start = time.perf_counter()
+        tasks = {asyncio.create_task(self.ask(agent_key, prompt)): agent_key for agent_key in agents}
+        answered: Dict[str, Any] = {}
+
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                agent_key = result.get("agent")
+                yield {"type": "agent_result", "agent": agent_key, "result": result}
+
+                if result.get("success"):
+                    answered[agent_key] = result
+                if len(answered) >= quorum:
+                    break
+
+            consensus = self._build_consensus(answered)
+            yield {
+                "type": "consensus",
+                "consensus": consensus,
+                "quorum": quorum,
+                "elapsed": round(time.perf_counter() - start, 3),
+            }
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     async def ask(self, agent_key: str, prompt: str) -> Dict[str, Any]:
         """
         Args:
@@ -138,7 +214,7 @@ class TeamEngine:
         self._ensure_clients()
 
         if agent_key not in self.agents:
-            return {"success": False, "error": f"Unknown agent: {agent_key}"}
+            return {"success": False, "agent": agent_key, "error": f"Unknown agent: {agent_key}"}
 
         agent_config = self.agents[agent_key]
         model = agent_config["model"]
@@ -147,17 +223,10 @@ class TeamEngine:
         system_prompt = agent_config["prompt_prefix"]
         full_prompt = f"{system_prompt}\n\nTask: {prompt}"
 
+        timeout = agent_config.get("timeout", self.agent_timeout)
+
         try:
-            # Route to appropriate model
-            if "claude" in model:
-                response = await self._call_claude(model, full_prompt, agent_config)
-            elif "gemini" in model:
-                response = await self._call_gemini(model, full_prompt, agent_config)
-            elif "ollama" in model:
-                response = await self._call_ollama(model, full_prompt, agent_config)
-            else:
-                # Default to OpenAI
-                response = await self._call_openai(model, full_prompt, agent_config)
+            response = await self._call_model(model, full_prompt, agent_config, timeout)
 
             return {
                 "success": True,
@@ -169,16 +238,18 @@ class TeamEngine:
             }
 
         except Exception as e:
-            print(f"❌ Error from {agent_key}: {e}")
+            error = "Timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+            print(f"❌ Error from {agent_key}: {error}")
 
             # Try fallback model
             fallback_model = agent_config.get("fallback")
             if fallback_model:
                 try:
-                    response = await self._call_openai(fallback_model, full_prompt, agent_config)
+                    response = await self._call_model(fallback_model, full_prompt, agent_config, timeout)
                     return {
                         "success": True,
                         "agent": agent_key,
+                        "agent_name": agent_config["name"],
                         "model": fallback_model,
                         "response": response,
                         "fallback_used": True,
@@ -186,7 +257,7 @@ class TeamEngine:
                 except Exception:
                     pass
 
-            return {"success": False, "agent": agent_key, "error": str(e)}
+            return {"success": False, "agent": agent_key, "error": error}
 
     async def route_task(self, task_type: str, prompt: str) -> Dict[str, Any]:
         """
@@ -215,10 +286,41 @@ class TeamEngine:
     # MODEL API CALLS
     # ========================================
 
+    @staticmethod
+    def _provider_for(model: str) -> str:
+        if "claude" in model:
+            return "anthropic"
+        if "gemini" in model:
+            return "google"
+        if "ollama" in model:
+            return "ollama"
+        # Default to OpenAI
+        return "openai"
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.provider_limits.get(provider, 4))
+        return self._semaphores[provider]
+
+    async def _call_model(self, model: str, prompt: str, config: Dict, timeout: float) -> str:
+        """
+        Route to the provider client, limited per provider and per agent timeout.
+        """
+        provider = self._provider_for(model)
+        call = {
+            "anthropic": self._call_claude,
+            "google": self._call_gemini,
+            "ollama": self._call_ollama,
+            "openai": self._call_openai,
+        }[provider]
+
+        async with self._semaphore(provider):
+            return await asyncio.wait_for(call(model, prompt, config), timeout=timeout)
+
     async def _call_openai(self, model: str, prompt: str, config: Dict) -> str:
         """Call OpenAI API"""
 
-        response = self.openai_client.chat.completions.create(
+        response = await self.openai_client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=config.get("temperature", 0.4),
@@ -230,7 +332,7 @@ class TeamEngine:
     async def _call_claude(self, model: str, prompt: str, config: Dict) -> str:
         """Call Anthropic Claude API"""
 
-        response = self.anthropic_client.messages.create(
+        response = await self.anthropic_client.messages.create(
             model=model,
             max_tokens=config.get("max_tokens", 2000),
             temperature=config.get("temperature", 0.4),
@@ -242,14 +344,13 @@ class TeamEngine:
     async def _call_gemini(self, model: str, prompt: str, config: Dict) -> str:
         """Call Google Gemini API"""
 
-        # Simplified - would use actual Gemini SDK
         try:
             import google.generativeai as genai
 
             genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
             model_instance = genai.GenerativeModel(model)
-            response = model_instance.generate_content(prompt)
+            response = await model_instance.generate_content_async(prompt)
 
             return response.text
         except Exception:
@@ -259,19 +360,17 @@ class TeamEngine:
     async def _call_ollama(self, model: str, prompt: str, config: Dict) -> str:
         """Call Ollama local model"""
 
-        # Simplified - would use actual Ollama API
         try:
-            import requests
-
             model_name = model.split(":")[-1]
 
-            response = requests.post(
+            response = await http_pool.post(
+                "ollama",
                 "http://localhost:11434/api/generate",
                 json={"model": model_name, "prompt": prompt, "stream": False},
                 timeout=30,
             )
 
-            if response.ok:
+            if response.is_success:
                 return response.json().get("response", "")
             else:
                 raise Exception("Ollama API error")
@@ -321,9 +420,9 @@ class TeamEngine:
     def _ensure_clients(self):
         """Initialize clients on first use"""
         if self.openai_client is None:
-            self.openai_client = OpenAI()
+            self.openai_client = AsyncOpenAI()
         if self.anthropic_client is None:
-            self.anthropic_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            self.anthropic_client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
 
 # Singleton instance
@@ -6,15 +6,18 @@ Team API Routes - Multi-agent collaboration endpoints
 
 Endpoints:
 - POST /team/collaborate - Multi-agent collaboration
+- POST /team/collaborate/stream - Streaming quorum consensus (SSE)
 - POST /team/ask - Ask specific agent
 - POST /team/route - Auto-route task to specialists
 - GET /team/agents - List all agents
 - GET /team/health - Health check
 """
 
+import json
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from .team_engine import team_engine
@@ -30,6 +33,7 @@ class CollaborateRequest(BaseModel):
     prompt: str
     agents: Optional[List[str]] = None
     mode: str = "parallel"
+    quorum: Optional[int] = None
     project_id: Optional[str] = None
 
 
@@ -59,7 +63,8 @@ async def collaborate(request: Request):
     {
         "prompt": "Build a login form with validation",
         "agents": ["frontend", "backend", "designer"],
-        "mode": "parallel|sequential|consensus",
+        "mode": "parallel|sequential|consensus|quorum",
+        "quorum": 2,
         "project_id": "demo-project"
     }
 
@@ -82,18 +87,51 @@ async def collaborate(request: Request):
     prompt = body.get("prompt")
     agents = body.get("agents")
     mode = body.get("mode", "parallel")
+    quorum = body.get("quorum")
 
     if not prompt:
         raise HTTPException(status_code=400, detail="Missing prompt")
 
-    if mode not in ["parallel", "sequential", "consensus"]:
+    if mode not in ["parallel", "sequential", "consensus", "quorum"]:
         raise HTTPException(status_code=400, detail="Invalid mode")
 
-    result = await team_engine.collaborate(prompt=prompt, agents=agents, mode=mode)
+    result = await team_engine.collaborate(prompt=prompt, agents=agents, mode=mode, quorum=quorum)
 
     return result
 
 
+@router.post("/collaborate/stream")
+async def collaborate_stream(request: Request):
+    """
+    Streaming quorum consensus via Server-Sent Events
+
+    Request body:
+    {
+        "prompt": "Build a login form with validation",
+        "agents": ["frontend", "backend", "designer"],
+        "quorum": 2
+    }
+
+    Events:
+    data: {"type": "agent_result", "agent": "frontend", "result": {...}}
+    data: {"type": "consensus", "consensus": {...}, "quorum": 2, "elapsed": 1.23}
+    """
+
+    body = await request.json()
+
+    prompt = body.get("prompt")
+    if not prompt:
+        raise HTTPException(status_code=400, detail="Missing prompt")
+
+    async def event_generator():
+        async for event in team_engine.stream_collaborate(
+            prompt, agents=body.get("agents"), quorum=body.get("quorum")
+        ):
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @router.post("/ask")
 async def ask_agent(request: Request):
     """
@@ -220,6 +258,7 @@ async def health_check():
             "parallel_execution",
             "sequential_workflow",
             "consensus_building",
+            "quorum_streaming",
             "task_routing",
             "model_fallback",
         ],
@@ -0,0 +1,326 @@
+"""
+VIBEAI AUTH CACHE
+
+Verifizierte Tokens + User-Rows für get_current_user cachen.
+
+Vorher pro Request: jwt.decode + Blacklist-Check + SELECT auf users.
+Jetzt:
+- Token-Cache (kurze TTL, nie länger als das Token selbst gültig ist)
+- User-Cache: Spalten-Snapshot, wird per Session.merge(load=False)
+  ohne SELECT an die Request-Session gehängt
+- Blacklist: lokaler Bloom-Filter als Vorfilter → Redis wird nur gefragt,
+  wenn das Token vielleicht gesperrt ist
+- Invalidierung: Suspend, Rollenwechsel (jedes UPDATE auf User) und
+  Logout werden per Redis Pub/Sub an alle Worker verteilt
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+logger = logging.getLogger("auth_cache")
+
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+
+# ============================================================================
+# BLOOM FILTER (Blacklist-Vorfilter)
+# ============================================================================
+
+
+class BloomFilter:
+    """
+    Einfacher Bloom-Filter (Double Hashing über blake2b).
+
+    Keine False Negatives: "nicht enthalten" ist sicher, "enthalten" muss
+    gegen die echte Blacklist bestätigt werden.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+
+# ============================================================================
+# AUTH CACHE
+# ============================================================================
+
+
+class AuthCache:
+    """
+    Prozess-lokaler Cache für verifizierte Tokens und User-Rows.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        token_ttl: float = 30.0,
+        user_ttl: float = 30.0,
+        max_entries: int = 10_000,
+        local_blacklist: Optional[set] = None,
+    ):
+        """
+        Args:
+            redis_client: Sync Redis Client (Blacklist + Pub/Sub), None = nur lokal
+            token_ttl: Sekunden, die ein verifiziertes Token gecacht wird
+            user_ttl: Sekunden, die ein User-Snapshot gecacht wird
+            max_entries: LRU-Grenze pro Cache
+            local_blacklist: Blacklist-Set ohne Redis
+        """
+        self.redis = redis_client
+        self.token_ttl = token_ttl
+        self.user_ttl = user_ttl
+        self.max_entries = max_entries
+        self.local_blacklist = local_blacklist if local_blacklist is not None else set()
+
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._users: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bloom = BloomFilter()
+
+        self._source = f"{os.getpid()}-{id(self)}"
+        self._subscriber = None
+        self._listeners = []
+
+        self.stats = {
+            "token_hits": 0,
+            "token_misses": 0,
+            "user_hits": 0,
+            "user_misses": 0,
+            "blacklist_lookups": 0,
+            "invalidations": 0,
+        }
+
+    # ---------------------------------------------------------
+    # LRU HELPERS
+    # ---------------------------------------------------------
+    def _get(self, store: OrderedDict, key, hit: str, miss: str):
+        with self._lock:
+            entry = store.get(key)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    del store[key]
+                self.stats[miss] += 1
+                return None
+            store.move_to_end(key)
+            self.stats[hit] += 1
+            return entry[0]
+
+    def _put(self, store: OrderedDict, key, value, expires_at: float):
+        with self._lock:
+            store[key] = (value, expires_at)
+            store.move_to_end(key)
+            while len(store) > self.max_entries:
+                store.popitem(last=False)
+
+    # ---------------------------------------------------------
+    # TOKENS
+    # ---------------------------------------------------------
+    def get_token(self, token: str) -> Optional[Dict]:
+        """Verifizierter Payload oder None (→ jwt.decode nötig)."""
+        return self._get(self._tokens, token, "token_hits", "token_misses")
+
+    def put_token(self, token: str, payload: Dict):
+        expires_at = time.time() + self.token_ttl
+        if payload.get("exp"):
+            expires_at = min(expires_at, float(payload["exp"]))
+        self._put(self._tokens, token, payload, expires_at)
+
+    def invalidate_token(self, token: str, publish: bool = True):
+        with self._lock:
+            self._tokens.pop(token, None)
+        if publish:
+            self._publish({"type": "token", "token": token})
+
+    # ---------------------------------------------------------
+    # BLACKLIST
+    # ---------------------------------------------------------
+    def blacklist(self, token: str, expires_in: int = 3600):
+        """Token sperren (Logout) und alle Worker informieren."""
+        if self.redis is not None:
+            self.redis.setex(f"blacklist:{token}", expires_in, "1")
+        else:
+            self.local_blacklist.add(token)
+
+        self.bloom.add(token)
+        self.invalidate_token(token, publish=False)
+        self._publish({"type": "blacklist", "token": token})
+
+    def is_blacklisted(self, token: str) -> bool:
+        """Bloom-Filter zuerst; nur bei Treffer die echte Blacklist fragen."""
+        self.ensure_subscriber()
+        if token not in self.bloom:
+            return False
+
+        self.stats["blacklist_lookups"] += 1
+        if self.redis is not None:
+            try:
+                return bool(self.redis.exists(f"blacklist:{token}"))
+            except Exception as e:
+                logger.warning(f"Blacklist lookup failed, treating token as revoked: {e}")
+                return True
+        return token in self.local_blacklist
+
+    # ---------------------------------------------------------
+    # USERS
+    # ---------------------------------------------------------
+    def get_user(self, user_id) -> Optional[Dict]:
+        return self._get(self._users, user_id, "user_hits", "user_misses")
+
+    def put_user(self, user_id, snapshot: Dict):
+        self._put(self._users, user_id, snapshot, time.time() + self.user_ttl)
+
+    def invalidate_user(self, user_id, publish: bool = True):
+        with self._lock:
+            self._users.pop(user_id, None)
+        self.stats["invalidations"] += 1
+        for listener in self._listeners:
+            listener(user_id)
+        if publish:
+            self._publish({"type": "user", "user_id": user_id})
+
+    def load_user(self, db: Session, user_model, user_id):
+        """
+        User aus Cache (ohne SELECT) oder DB laden.
+
+        Der Snapshot wird per merge(load=False) an die Request-Session
+        gehängt → Änderungen am User werden normal committed.
+        """
+        snapshot = self.get_user(user_id)
+        if snapshot is not None:
+            user = user_model(**snapshot)
+            make_transient_to_detached(user)
+            return db.merge(user, load=False)
+
+        user = db.query(user_model).filter(user_model.id == user_id).first()
+        if user is not None:
+            mapper = inspect(user).mapper
+            self.put_user(user_id, {attr.key: getattr(user, attr.key) for attr in mapper.column_attrs})
+        return user
+
+    def on_invalidate(self, listener: Callable[[Any], None]):
+        """Listener für User-Invalidierungen (z.B. WebSocket-Sessions schließen)."""
+        self._listeners.append(listener)
+
+    # ---------------------------------------------------------
+    # PUB/SUB
+    # ---------------------------------------------------------
+    def _publish(self, message: Dict):
+        if self.redis is None:
+            return
+        message["source"] = self._source
+        try:
+            self.redis.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Auth invalidation publish failed: {e}")
+
+    def _handle_message(self, raw):
+        try:
+            message = json.loads(raw["data"])
+        except (TypeError, ValueError, KeyError):
+            return
+        if message.get("source") == self._source:
+            return
+
+        if message.get("type") == "user":
+            self.invalidate_user(message.get("user_id"), publish=False)
+        elif message.get("type") == "token":
+            self.invalidate_token(message.get("token"), publish=False)
+        elif message.get("type") == "blacklist":
+            self.bloom.add(message.get("token"))
+            self.invalidate_token(message.get("token"), publish=False)
+
+    def ensure_subscriber(self):
+        """Startet den Pub/Sub Listener (einmal pro Prozess) und lädt die Blacklist in den Bloom-Filter."""
+        if self.redis is None or self._subscriber is not None:
+            return
+        try:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._handle_message})
+            self._subscriber = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+            for key in self.redis.scan_iter(match="blacklist:*", count=1000):
+                self.bloom.add(key.split(":", 1)[1])
+        except Exception as e:
+            logger.warning(f"Auth cache subscriber unavailable: {e}")
+            self._subscriber = False
+
+    # ---------------------------------------------------------
+    # SQLALCHEMY HOOKS
+    # ---------------------------------------------------------
+    def install_model_hooks(self, user_model):
+        """
+        Jedes UPDATE/DELETE auf user_model (Suspend, Rollenwechsel,
+        Passwort, ...) invalidiert den Cache – sofort und nach Commit.
+        """
+
+        def on_change(mapper, connection, target):
+            self.invalidate_user(target.id)
+            session = object_session(target)
+            if session is not None:
+                session.info.setdefault("auth_cache_invalidate", set()).add(target.id)
+
+        def after_commit(session):
+            for user_id in session.info.pop("auth_cache_invalidate", ()):
+                self.invalidate_user(user_id)
+
+        event.listen(user_model, "after_update", on_change)
+        event.listen(user_model, "after_delete", on_change)
+        event.listen(Session, "after_commit", after_commit)
+
+    def configure(self, redis_client=None, local_blacklist: Optional[set] = None):
+        """Redis/Blacklist nachträglich setzen (auth_production beim Import)."""
+        self.redis = redis_client
+        if local_blacklist is not None:
+            self.local_blacklist = local_blacklist
+        self._subscriber = None
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "cached_tokens": len(self._tokens),
+            "cached_users": len(self._users),
+            "bloom_entries": self.bloom.count,
+        }
+
+
+# Singleton Instance
+auth_cache = AuthCache(
+    token_ttl=float(os.getenv("AUTH_CACHE_TOKEN_TTL", 30)),
+    user_ttl=float(os.getenv("AUTH_CACHE_USER_TTL", 30)),
+)
@@ -37,7 +37,9 @@ from pydantic import BaseModel, EmailStr, validator
 from sqlalchemy.orm import Session
 
 # Imports from backend modules
+from auth_cache import auth_cache
 from db import AuditLog, User, get_db
+from password_hasher import BCRYPT_ROUNDS, password_hasher
 from sessions import session_store
 
 # ============================================================================
@@ -70,6 +72,10 @@ except ImportError:
 # Token Blacklist (Production: Redis)
 token_blacklist: set = set()  # In-Memory fallback
 
+# Token/User Cache für get_current_user (Bloom-Vorfilter + Pub/Sub Invalidierung)
+auth_cache.configure(redis_client if USE_REDIS else None, local_blacklist=token_blacklist)
+auth_cache.install_model_hooks(User)
+
 # ============================================================================
 # PYDANTIC SCHEMAS
 # ============================================================================
@@ -147,11 +153,12 @@ class TwoFactorVerifyRequest(BaseModel):
 def hash_password(password: str) -> str:
     """
     Production-grade Bcrypt password hashing.
+    CPU-teuer → in Route-Handlern nur über password_hasher.run() aufrufen.
     """
     try:
         import bcrypt
 
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
     except ImportError:
         # Fallback SHA-256 (NOT recommended for production!)
         salt = secrets.token_hex(16)
@@ -210,8 +217,8 @@ def verify_token(token: str, expected_type: str = "access") -> Dict:
     """
     Verifiziert JWT Token.
     """
-    # Check blacklist
-    if token in token_blacklist:
+    # Check blacklist (Bloom-Filter, Redis nur bei möglichem Treffer)
+    if auth_cache.is_blacklisted(token):
         raise HTTPException(401, "Token has been revoked")
 
     try:
@@ -295,12 +302,9 @@ def reset_rate_limit(identifier: str):
 def blacklist_token(token: str, expires_in: int = 3600):
     """
     Blacklist Token bei Logout.
-    Production: Redis mit Expiry
+    Production: Redis mit Expiry, alle Worker werden per Pub/Sub informiert
     """
-    if USE_REDIS and redis_client:
-        redis_client.setex(f"blacklist:{token}", expires_in, "1")
-    else:
-        token_blacklist.add(token)
+    auth_cache.blacklist(token, expires_in)
 
 
 # ============================================================================
@@ -316,13 +320,16 @@ async def get_current_user(
     Extrahiert aktuellen User aus JWT Token.
     """
     token = credentials.credentials
-    payload = verify_token(token, "access")
+    payload = auth_cache.get_token(token)
+    if payload is None:
+        payload = verify_token(token, "access")
+        auth_cache.put_token(token, payload)
 
     user_id = payload.get("user_id")
     if not user_id:
         raise HTTPException(401, "Invalid token payload")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = auth_cache.load_user(db, User, user_id)
     if not user:
         raise HTTPException(404, "User not found")
 
@@ -602,8 +609,8 @@ async def register(data: RegisterRequest, request: Request, db: Session = Depend
     if existing_email:
         raise HTTPException(400, "Email already registered")
 
-    # Hash password
-    hashed_password = hash_password(data.password)
+    # Hash password (Hash-Pool, blockiert den Event-Loop nicht)
+    hashed_password = await password_hasher.run(hash_password, data.password)
 
     # Create user
     new_user = User(
@@ -657,7 +664,13 @@ async def login(data: LoginRequest, request: Request, db: Session = Depends(get_
     # Find user
     user = db.query(User).filter((User.username == identifier) | (User.email == identifier)).first()
 
-    if not user or not verify_password(data.password, user.password):
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await password_hasher.verify_and_rehash(
+            verify_password, hash_password, data.password, user.password
+        )
+
+    if not valid:
         # Audit log failed attempt
         log_auth_event(
             db,
@@ -679,6 +692,11 @@ async def login(data: LoginRequest, request: Request, db: Session = Depends(get_
         # Frontend should then call /auth/2fa/verify with code
         return {"requires_2fa": True, "user_id": user.id}
 
+    # Rehash bei geänderten Cost-Parametern (BCRYPT_ROUNDS)
+    if new_hash:
+        user.password = new_hash
+        db.commit()
+
     # Reset rate limit on success
     reset_rate_limit(identifier)
 
@@ -841,7 +859,7 @@ async def confirm_password_reset(data: PasswordResetConfirm, db: Session = Depen
         raise HTTPException(404, "User not found")
 
     # Hash new password
-    user.password = hash_password(data.new_password)
+    user.password = await password_hasher.run(hash_password, data.new_password)
     db.commit()
 
     # Audit log
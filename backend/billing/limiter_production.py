@@ -1,8 +1,9 @@
 import logging
+import math
 import time
 import os
 from collections import defaultdict
-from typing import Dict
+from typing import Dict, List
 
 from fastapi import HTTPException
 
@@ -18,6 +19,7 @@ except ImportError:
 # Redis (Production)
 try:
     import redis
+    import redis.asyncio as redis_async
 
     redis_client = redis.Redis(
         host=os.getenv("REDIS_HOST", "localhost"),
@@ -27,9 +29,18 @@ try:
     )
     redis_client.ping()
     USE_REDIS = True
+
+    # Async client für den Hot Path (enforce) → blockiert den Event-Loop nicht
+    async_redis_client = redis_async.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        db=0,
+        decode_responses=True,
+    )
 except Exception:
     USE_REDIS = False
     redis_client = None
+    async_redis_client = None
 
 logger = logging.getLogger("usage_limiter")
 
@@ -88,6 +99,118 @@ TIER_LIMITS = {
     },
 }
 
+WINDOW_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+REQUEST_WINDOWS = ("minute", "hour", "day")
+
+# ============================================================================
+# SLIDING WINDOW COUNTER (O(1) Speicher pro User + Fenster)
+# ============================================================================
+
+
+class SlidingWindowCounter:
+    """
+    Sliding-Window-Counter mit zwei Buckets.
+
+    Statt jeden Request-Timestamp zu speichern, wird nur der Zähler des
+    aktuellen und des vorherigen Fensters gehalten. Die Schätzung
+    gewichtet den vorherigen Bucket mit dem noch überlappenden Anteil:
+
+        estimate = previous * (1 - elapsed / window) + current
+    """
+
+    __slots__ = ("window", "bucket", "current", "previous")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.bucket = 0
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float):
+        bucket = int(now // self.window)
+        if bucket != self.bucket:
+            self.previous = self.current if bucket == self.bucket + 1 else 0
+            self.current = 0
+            self.bucket = bucket
+
+    def estimate(self, now: float) -> float:
+        self._roll(now)
+        weight = 1.0 - (now % self.window) / self.window
+        return self.previous * weight + self.current
+
+    def hit(self, now: float):
+        self._roll(now)
+        self.current += 1
+
+
+# ============================================================================
+# REDIS LUA SCRIPT (alle Checks in einem atomaren Round Trip)
+# ============================================================================
+
+# KEYS: für jedes Fenster (cur, prev), danach tokens:day, tokens:month, cost:month
+# ARGV: n_windows, tokens, cost, token_day_limit, token_month_limit, cost_limit,
+#       danach für jedes Fenster (limit, prev_weight, ttl)
+# Return: {"ok"} oder {reason, limit[, current_cost]}
+LIMITS_LUA = """
+local nwin = tonumber(ARGV[1])
+local tokens = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local base = 2 * nwin
+
+for i = 0, nwin - 1 do
+    local cur = tonumber(redis.call('GET', KEYS[2 * i + 1]) or '0')
+    local prev = tonumber(redis.call('GET', KEYS[2 * i + 2]) or '0')
+    local limit = tonumber(ARGV[7 + 3 * i])
+    local weight = tonumber(ARGV[8 + 3 * i])
+    if prev * weight + cur + 1 > limit then
+        return {'rate:' .. i, limit}
+    end
+end
+
+if tokens > 0 then
+    local day = tonumber(redis.call('GET', KEYS[base + 1]) or '0') + tokens
+    if day > tonumber(ARGV[4]) then
+        return {'tokens_day', ARGV[4]}
+    end
+    local month = tonumber(redis.call('GET', KEYS[base + 2]) or '0') + tokens
+    if month > tonumber(ARGV[5]) then
+        return {'tokens_month', ARGV[5]}
+    end
+end
+
+local max_cost = tonumber(ARGV[6])
+if cost > 0 and max_cost > 0 then
+    local total = tonumber(redis.call('GET', KEYS[base + 3]) or '0') + cost
+    if total > max_cost then
+        return {'cost', ARGV[6], tostring(total)}
+    end
+end
+
+for i = 0, nwin - 1 do
+    local key = KEYS[2 * i + 1]
+    if redis.call('INCR', key) == 1 then
+        redis.call('EXPIRE', key, tonumber(ARGV[9 + 3 * i]))
+    end
+end
+
+if tokens > 0 then
+    if redis.call('INCRBY', KEYS[base + 1], tokens) == tokens then
+        redis.call('EXPIRE', KEYS[base + 1], 86400)
+    end
+    if redis.call('INCRBY', KEYS[base + 2], tokens) == tokens then
+        redis.call('EXPIRE', KEYS[base + 2], 2592000)
+    end
+end
+
+if cost > 0 then
+    if tonumber(redis.call('INCRBYFLOAT', KEYS[base + 3], cost)) == cost then
+        redis.call('EXPIRE', KEYS[base + 3], 2592000)
+    end
+end
+
+return {'ok'}
+"""
+
 # ============================================================================
 # RATE LIMITER CLASS
 # ============================================================================
@@ -104,13 +227,21 @@ class RateLimiter:
     """
 
     def __init__(self):
-        # In-memory fallback storage
-        self.requests: Dict[str, Dict[str, list]] = defaultdict(lambda: {"minute": [], "hour": [], "day": []})
+        # In-memory fallback storage (O(1) pro User + Fenster)
+        self.requests: Dict[str, Dict[str, SlidingWindowCounter]] = defaultdict(
+            lambda: {window: SlidingWindowCounter(seconds) for window, seconds in WINDOW_SECONDS.items()}
+        )
         self.tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: {"day": 0, "month": 0})
         self.costs: Dict[str, Dict[str, float]] = defaultdict(lambda: {"month": 0.0})
         self.builds: Dict[str, Dict[str, int]] = defaultdict(lambda: {"day": 0, "month": 0})
         self.sessions: Dict[str, int] = defaultdict(int)
 
+        # Lua Script einmal registrieren (EVALSHA, Fallback auf EVAL)
+        self._limits_script = redis_client.register_script(LIMITS_LUA) if USE_REDIS and redis_client else None
+        self._limits_script_async = (
+            async_redis_client.register_script(LIMITS_LUA) if USE_REDIS and async_redis_client else None
+        )
+
         logger.info(f"[LIMITER] Initialized (Redis: {USE_REDIS})")
 
     # ────────────────────────────────────────────────────────────────────────
@@ -144,47 +275,124 @@ class RateLimiter:
         Raises:
             HTTPException: If limit exceeded
         """
-        limits = self.get_limits(tier)
-        limit_key = f"requests_per_{window}"
-        max_requests = limits.get(limit_key, 10)
+        if USE_REDIS and self._limits_script:
+            keys, args = self._script_params(user_id, tier, (window,))
+            self._raise_for_result(self._limits_script(keys=keys, args=args), tier, (window,))
+        else:
+            self._check_windows_memory(user_id, tier, (window,))
 
+    def _check_windows_memory(self, user_id: str, tier: str, windows=REQUEST_WINDOWS):
+        """
+        In-memory sliding window check. Zählt nur, wenn ALLE Fenster frei sind.
+        """
+        limits = self.get_limits(tier)
         now = time.time()
-        window_seconds = {"minute": 60, "hour": 3600, "day": 86400}[window]
-
-        if USE_REDIS and redis_client:
-            # Redis-based rate limiting
-            key = f"rate:{user_id}:{window}"
-            count = redis_client.incr(key)
+        counters = self.requests[user_id]
 
-            if count == 1:
-                redis_client.expire(key, window_seconds)
-
-            if count > max_requests:
-                ttl = redis_client.ttl(key)
-                raise HTTPException(
-                    status_code=429,
-                    detail=f"Rate limit exceeded: {max_requests} requests per {window}. "
-                    f"Retry in {ttl}s. Upgrade to increase limits.",
-                )
-        else:
-            # In-memory fallback
-            self.requests[user_id][window] = [t for t in self.requests[user_id][window] if now - t < window_seconds]
-
-            if len(self.requests[user_id][window]) >= max_requests:
+        for window in windows:
+            max_requests = limits.get(f"requests_per_{window}", 10)
+            if counters[window].estimate(now) + 1 > max_requests:
                 raise HTTPException(
                     status_code=429,
                     detail=f"Rate limit exceeded: {max_requests} requests per {window}. "
                     f"Upgrade to increase limits.",
                 )
 
-            self.requests[user_id][window].append(now)
+        for window in windows:
+            counters[window].hit(now)
+
+    def _script_params(
+        self, user_id: str, tier: str, windows=REQUEST_WINDOWS, tokens: int = 0, cost: float = 0.0
+    ):
+        """
+        Baut KEYS/ARGV für LIMITS_LUA.
+        """
+        limits = self.get_limits(tier)
+        now = time.time()
+
+        keys: List[str] = []
+        window_args: List = []
+        for window in windows:
+            seconds = WINDOW_SECONDS[window]
+            bucket = int(now // seconds)
+            keys += [f"rate:{user_id}:{window}:{bucket}", f"rate:{user_id}:{window}:{bucket - 1}"]
+            window_args += [
+                limits.get(f"requests_per_{window}", 10),
+                1.0 - (now % seconds) / seconds,
+                seconds * 2,
+            ]
+
+        keys += [f"tokens:{user_id}:day", f"tokens:{user_id}:month", f"cost:{user_id}:month"]
+        args = [
+            len(windows),
+            int(tokens),
+            float(cost),
+            limits["tokens_per_day"],
+            limits["tokens_per_month"],
+            limits["cost_per_month"],
+        ] + window_args
+
+        return keys, args
+
+    def _raise_for_result(self, result, tier: str, windows=REQUEST_WINDOWS):
+        """
+        Übersetzt das Ergebnis von LIMITS_LUA in HTTPExceptions.
+        """
+        reason = result[0]
+        if reason == "ok":
+            return
+
+        limits = self.get_limits(tier)
+
+        if reason.startswith("rate:"):
+            window = windows[int(reason.split(":")[1])]
+            seconds = WINDOW_SECONDS[window]
+            retry_after = math.ceil(seconds - time.time() % seconds)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: {result[1]} requests per {window}. "
+                f"Retry in {retry_after}s. Upgrade to increase limits.",
+            )
+
+        if reason == "tokens_day":
+            raise HTTPException(
+                status_code=429,
+                detail=f"Daily token limit exceeded ({limits['tokens_per_day']:,} tokens). "
+                f"Upgrade for more capacity.",
+            )
+
+        if reason == "tokens_month":
+            raise HTTPException(
+                status_code=402,
+                detail=f"Monthly token quota exceeded ({limits['tokens_per_month']:,} tokens). "
+                f"Please upgrade your plan.",
+            )
+
+        if reason == "cost":
+            max_cost = limits["cost_per_month"]
+            raise HTTPException(
+                status_code=402,
+                detail=f"Monthly cost limit exceeded (${max_cost:.2f}). "
+                f"Current: ${float(result[2]):.2f}. Please upgrade.",
+            )
+
+    async def _check_redis_async(
+        self, user_id: str, tier: str, windows=REQUEST_WINDOWS, tokens: int = 0, cost: float = 0.0
+    ):
+        """
+        Minute/Hour/Day + Tokens + Kosten in EINEM async Round Trip.
+        """
+        keys, args = self._script_params(user_id, tier, windows, tokens, cost)
+        result = await self._limits_script_async(keys=keys, args=args)
+        self._raise_for_result(result, tier, windows)
 
     async def check_all_request_limits(self, user_id: str, tier: str):
         """Checks all request limits (minute/hour/day)"""
         try:
-            self.check_request_limit(user_id, tier, "minute")
-            self.check_request_limit(user_id, tier, "hour")
-            self.check_request_limit(user_id, tier, "day")
+            if USE_REDIS and self._limits_script_async:
+                await self._check_redis_async(user_id, tier)
+            else:
+                self._check_windows_memory(user_id, tier)
         except HTTPException as e:
             # Send WebSocket notification
             if WS_AVAILABLE:
@@ -337,7 +545,7 @@ class RateLimiter:
             self.builds[user_id]["month"] += 1
 
             if self.builds[user_id]["day"] > limits["builder_builds_per_day"]:
-                raise HTTPException(status_code=429, detail=f"Daily build limit exceeded")
+                raise HTTPException(status_code=429, detail="Daily build limit exceeded")
 
     # ────────────────────────────────────────────────────────────────────────
     # CONCURRENT SESSIONS
@@ -402,16 +610,20 @@ class RateLimiter:
             raise HTTPException(status_code=403, detail="Account suspended. Contact support.")
 
         try:
-            # 1. Request rate limits
-            await self.check_all_request_limits(user_id, tier)
+            if USE_REDIS and self._limits_script_async:
+                # 1-3. Requests + Tokens + Kosten: ein atomarer Lua-Call
+                await self._check_redis_async(user_id, tier, REQUEST_WINDOWS, tokens_expected, cost_estimate)
+            else:
+                # 1. Request rate limits
+                await self.check_all_request_limits(user_id, tier)
 
-            # 2. Token limits
-            if tokens_expected > 0:
-                self.add_token_usage(user_id, tier, tokens_expected)
+                # 2. Token limits
+                if tokens_expected > 0:
+                    self.add_token_usage(user_id, tier, tokens_expected)
 
-            # 3. Cost limits
-            if cost_estimate > 0:
-                self.add_cost(user_id, tier, cost_estimate)
+                # 3. Cost limits
+                if cost_estimate > 0:
+                    self.add_cost(user_id, tier, cost_estimate)
 
             # 4. Builder limits
             if check_builder:
@@ -465,13 +677,16 @@ class RateLimiter:
         limits = self.get_limits(tier)
 
         if USE_REDIS and redis_client:
+            keys, args = self._script_params(user_id, tier)
+            counts = redis_client.mget(keys[: 2 * len(REQUEST_WINDOWS)])
+            requests = {}
+            for i, window in enumerate(REQUEST_WINDOWS):
+                current, previous = int(counts[2 * i] or 0), int(counts[2 * i + 1] or 0)
+                requests[window] = math.ceil(previous * args[7 + 3 * i] + current)
+
             return {
                 "tier": tier,
-                "requests": {
-                    "minute": int(redis_client.get(f"rate:{user_id}:minute") or 0),
-                    "hour": int(redis_client.get(f"rate:{user_id}:hour") or 0),
-                    "day": int(redis_client.get(f"rate:{user_id}:day") or 0),
-                },
+                "requests": requests,
                 "tokens": {
                     "day": int(redis_client.get(f"tokens:{user_id}:day") or 0),
                     "month": int(redis_client.get(f"tokens:{user_id}:month") or 0),
@@ -486,12 +701,11 @@ class RateLimiter:
                 "limits": limits,
             }
         else:
+            now = time.time()
             return {
                 "tier": tier,
                 "requests": {
-                    "minute": len(self.requests[user_id]["minute"]),
-                    "hour": len(self.requests[user_id]["hour"]),
-                    "day": len(self.requests[user_id]["day"]),
+                    window: math.ceil(self.requests[user_id][window].estimate(now)) for window in REQUEST_WINDOWS
                 },
                 "tokens": self.tokens.get(user_id, {"day": 0, "month": 0}),
                 "costs": self.costs.get(user_id, {"month": 0.0}),
@@ -502,12 +716,11 @@ class RateLimiter:
     def reset_daily_limits(self, user_id: str):
         """Resets daily limits (called by cron job)"""
         if USE_REDIS and redis_client:
-            redis_client.delete(f"rate:{user_id}:day")
-            redis_client.delete(f"tokens:{user_id}:day")
-            redis_client.delete(f"builds:{user_id}:day")
+            keys, _ = self._script_params(user_id, "free", ("day",))
+            redis_client.delete(keys[0], keys[1], f"tokens:{user_id}:day", f"builds:{user_id}:day")
         else:
             if user_id in self.requests:
-                self.requests[user_id]["day"] = []
+                self.requests[user_id]["day"] = SlidingWindowCounter(WINDOW_SECONDS["day"])
             if user_id in self.tokens:
                 self.tokens[user_id]["day"] = 0
             if user_id in self.builds:
@@ -8,15 +8,17 @@ Project Download & Export:
 - Clone from GitHub
 """
 
+import asyncio
 import os
 import shutil
-import zipfile
 import subprocess
 from typing import Optional
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
+from builder import zip_stream
+
 router = APIRouter(prefix="/api/download", tags=["Download"])
 
 
@@ -42,42 +44,49 @@ def get_project_path(project_id: str) -> str:
 
 
 @router.get("/zip/{project_id}")
-async def download_project_zip(project_id: str):
-    """Download project as ZIP file."""
+async def download_project_zip(project_id: str, request: Request):
+    """
+    Download project as ZIP file.
+
+    Das Archiv wird gestreamt (Chunks im Threadpool erzeugt). Mit
+    ZIP_CACHE_DIR wird es zusätzlich gecacht: ETag/If-None-Match und
+    HTTP Range für wiederholte Downloads.
+    """
     project_path = get_project_path(project_id)
     
     if not os.path.exists(project_path):
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Create temporary ZIP file
-    zip_path = f"/tmp/{project_id}.zip"
-    
     try:
-        # Create ZIP file
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(project_path):
-                # Skip .git, node_modules, __pycache__, etc.
-                dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '__pycache__', '.venv', 'venv', 'build', 'dist', '.next', '.vscode']]
-                
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Skip hidden files and build artifacts
-                    if not file.startswith('.') and not file.endswith(('.pyc', '.pyo', '.log')):
-                        arcname = os.path.relpath(file_path, project_path)
-                        zipf.write(file_path, arcname)
-        
-        # Return ZIP file
-        return FileResponse(
-            zip_path,
-            media_type='application/zip',
-            filename=f"{project_id}.zip",
-            headers={"Content-Disposition": f"attachment; filename={project_id}.zip"}
-        )
+        manifest = await asyncio.to_thread(zip_stream.build_manifest, project_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating ZIP: {str(e)}")
-    finally:
-        # Clean up after download (optional - can keep for caching)
-        pass
+
+    etag = zip_stream.manifest_etag(manifest)
+    headers = {
+        "Content-Disposition": f"attachment; filename={project_id}.zip",
+        "ETag": f'"{etag}"',
+        "Cache-Control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if f'"{etag}"' in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": headers["ETag"]})
+
+    cache = zip_stream.zip_cache
+    if cache is None:
+        return StreamingResponse(zip_stream.iter_zip(manifest), media_type="application/zip", headers=headers)
+
+    cached_path = cache.lookup(project_id, etag)
+    if cached_path:
+        # FileResponse übernimmt Range / If-Range
+        return FileResponse(cached_path, media_type="application/zip", headers=headers)
+
+    return StreamingResponse(
+        cache.iter_and_store(project_id, etag, manifest),
+        media_type="application/zip",
+        headers=headers,
+    )
 
 
 @router.post("/clone-github")
@@ -0,0 +1,205 @@
+# -------------------------------------------------------------
+# VIBEAI – STREAMING ZIP (Projekt-Download ohne Temp-Datei)
+# -------------------------------------------------------------
+"""
+Streaming ZIP Writer + Archiv-Cache für den Projekt-Download.
+
+Vorher: download_project_zip baute das komplette Archiv synchron im
+Event-Loop nach /tmp/{project_id}.zip (ZIP_DEFLATED für alles) und gab
+es erst danach zurück – bei großen Projekten sekundenlang blockierter
+Loop, doppelter Plattenplatz, und zwei gleichzeitige Downloads desselben
+Projekts überschrieben sich gegenseitig die Datei.
+
+Jetzt:
+- iter_zip() ist ein Generator, der das Archiv in Chunks erzeugt
+  (zipfile auf einen nicht-seekbaren Sink, Data Descriptors) – Speicher
+  bleibt flach, das erste Byte ist sofort da. StreamingResponse holt die
+  Chunks im Threadpool, der Loop blockiert nie.
+- Bereits komprimierte Formate (png, jpg, zip, apk, woff2, ...) werden
+  ZIP_STORED statt erneut deflated.
+- Optionaler Cache (ZIP_CACHE_DIR): Schlüssel = Hash über das Manifest
+  (Pfad, Größe, mtime_ns jeder Datei). Der Stream schreibt parallel in
+  eine eigene .part-Datei, die erst nach vollständigem Archiv atomar
+  umbenannt wird. Wiederholte Downloads → FileResponse mit ETag und
+  HTTP Range.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+import zipfile
+from typing import Iterator, List, Optional, Tuple
+
+EXCLUDE_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", "build", "dist", ".next", ".vscode"}
+EXCLUDE_EXTENSIONS = (".pyc", ".pyo", ".log")
+
+# Formate, bei denen Deflate nur CPU kostet
+COMPRESSED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".mp3", ".mp4", ".mov", ".webm", ".ogg",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".jar", ".apk", ".aab", ".ipa",
+    ".woff", ".woff2", ".pdf",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# (arcname, absoluter Pfad, Größe, mtime_ns)
+Manifest = List[Tuple[str, str, int, int]]
+
+
+def build_manifest(project_path: str) -> Manifest:
+    """Alle zu packenden Dateien (gleiche Filter wie bisher), sortiert."""
+    manifest = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        for file in files:
+            if file.startswith(".") or file.endswith(EXCLUDE_EXTENSIONS):
+                continue
+            file_path = os.path.join(root, file)
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            manifest.append((os.path.relpath(file_path, project_path), file_path, st.st_size, st.st_mtime_ns))
+    manifest.sort()
+    return manifest
+
+
+def manifest_etag(manifest: Manifest) -> str:
+    """Stabiler Schlüssel für genau diesen Projektstand."""
+    digest = hashlib.sha256()
+    for arcname, _, size, mtime_ns in manifest:
+        digest.update(f"{arcname}\0{size}\0{mtime_ns}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def compress_type_for(arcname: str) -> int:
+    ext = os.path.splitext(arcname)[1].lower()
+    return zipfile.ZIP_STORED if ext in COMPRESSED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class _Sink:
+    """Nicht-seekbarer Schreib-Puffer für zipfile; wird chunkweise geleert."""
+
+    def __init__(self, tee=None):
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._position = 0
+        self._tee = tee
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if data:
+            self._chunks.append(data)
+            self._size += len(data)
+            self._position += len(data)
+            if self._tee is not None:
+                self._tee.write(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def ready(self) -> bool:
+        return self._size >= CHUNK_SIZE
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks, self._size = [], 0
+        return data
+
+
+def iter_zip(manifest: Manifest, tee=None) -> Iterator[bytes]:
+    """
+    Archiv als Folge von Chunks erzeugen (Sync-Generator).
+
+    Args:
+        manifest: Ergebnis von build_manifest()
+        tee: optionales File-Objekt, das dieselben Bytes erhält (Cache)
+    """
+    sink = _Sink(tee)
+    with zipfile.ZipFile(sink, "w") as zipf:
+        for arcname, file_path, size, _ in manifest:
+            try:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                zinfo.compress_type = compress_type_for(arcname)
+                with open(file_path, "rb") as src, zipf.open(zinfo, "w", force_zip64=size > zipfile.ZIP64_LIMIT) as dst:
+                    while True:
+                        chunk = src.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                        if sink.ready():
+                            yield sink.drain()
+            except FileNotFoundError:
+                # Datei zwischen Manifest und Packen gelöscht
+                continue
+            if sink.ready():
+                yield sink.drain()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+class ZipCache:
+    """
+    Fertige Archive pro (Projekt, Manifest-Hash) auf der Platte.
+    Pro Projekt bleibt nur der neueste Stand liegen.
+    """
+
+    def __init__(self, cache_dir: str, max_age_seconds: float = 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _project_key(project_id: str) -> str:
+        return hashlib.sha1(project_id.encode()).hexdigest()[:16]
+
+    def path_for(self, project_id: str, etag: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._project_key(project_id)}-{etag}.zip")
+
+    def lookup(self, project_id: str, etag: str) -> Optional[str]:
+        path = self.path_for(project_id, etag)
+        return path if os.path.exists(path) else None
+
+    def iter_and_store(self, project_id: str, etag: str, manifest: Manifest) -> Iterator[bytes]:
+        """Streamen und dabei in eine eigene .part-Datei schreiben."""
+        final_path = self.path_for(project_id, etag)
+        part_path = f"{final_path}.{uuid.uuid4().hex}.part"
+        completed = False
+        try:
+            with open(part_path, "wb") as part:
+                yield from iter_zip(manifest, tee=part)
+            completed = True
+        finally:
+            if completed:
+                os.replace(part_path, final_path)
+                self._evict(project_id, keep=final_path)
+            elif os.path.exists(part_path):
+                os.remove(part_path)
+
+    def _evict(self, project_id: str, keep: str):
+        prefix = self._project_key(project_id) + "-"
+        now = time.time()
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.path == keep:
+                    continue
+                try:
+                    expired = now - entry.stat().st_mtime > self.max_age_seconds
+                    # .part gehört evtl. zu einem laufenden Download
+                    superseded = entry.name.startswith(prefix) and not entry.name.endswith(".part")
+                    if expired or superseded:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+
+
+# Singleton Instance (nur wenn ZIP_CACHE_DIR gesetzt ist)
+zip_cache = ZipCache(os.environ["ZIP_CACHE_DIR"]) if os.getenv("ZIP_CACHE_DIR") else None
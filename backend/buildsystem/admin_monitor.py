@@ -20,7 +20,6 @@ Features:
 """
 
 import time
-from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 
 import psutil
@@ -33,7 +32,24 @@ from .build_cleanup import (
     get_all_builds_size,
     get_cleanup_stats,
 )
-from .build_manager import build_manager
+from .build_manager import BuildStatus, build_manager
+from .build_registry import ACTIVE_STATUSES, parse_timestamp, build_duration
+
+MAX_PAGE = 500
+
+
+def _summary(build: Dict) -> Dict[str, Any]:
+    """Build-Metadaten → Admin-Listeneintrag"""
+    return {
+        "build_id": build["id"],
+        "user": build.get("user"),
+        "project": build.get("project_id"),
+        "build_type": build.get("type"),
+        "status": build.get("status"),
+        "timestamp": parse_timestamp(build.get("created_at")),
+        "duration": build_duration(build),
+        "artifacts": build.get("artifacts", []),
+    }
 
 router = APIRouter(prefix="/api/admin/builds", tags=["admin-builds"])
 
@@ -41,61 +57,41 @@ router = APIRouter(prefix="/api/admin/builds", tags=["admin-builds"])
 @router.get("/")
 async def list_all_builds(
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     user: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Liste aller Builds mit Filterung.
+    Liste aller Builds mit Filterung (neueste zuerst).
 
     Query Params:
         limit: Max. Anzahl Builds
-        offset: Pagination offset
-        status: Filter nach Status (SUCCESS, FAILED, RUNNING)
-        user: Filter nach User-ID
+        cursor: next_cursor der vorherigen Seite (Keyset-Pagination)
+        status: Filter nach Status (success, failed, running, ...)
+        user: Filter nach User
 
     Returns:
         {
             "total": 125,
             "limit": 50,
-            "offset": 0,
+            "next_cursor": "...",
             "builds": [...]
         }
     """
-    all_builds = list(build_manager.builds.items())
-
-    # Filter nach Status
-    if status:
-        all_builds = [(bid, b) for bid, b in all_builds if b.get("status") == status]
-
-    # Filter nach User
-    if user:
-        all_builds = [(bid, b) for bid, b in all_builds if b.get("user") == user]
-
-    # Sortiere nach Timestamp (neueste zuerst)
-    all_builds.sort(key=lambda x: x[1].get("timestamp", 0), reverse=True)
+    status = status.lower() if status else None
+    limit = max(1, min(limit, MAX_PAGE))
 
-    total = len(all_builds)
+    try:
+        builds, next_cursor = build_manager.page_builds(user_email=user, status=status, limit=limit, before=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Pagination
-    paginated = all_builds[offset : offset + limit]
-
-    builds_data = []
-    for build_id, build_data in paginated:
-        builds_data.append(
-            {
-                "build_id": build_id,
-                "user": build_data.get("user"),
-                "project": build_data.get("project_path"),
-                "build_type": build_data.get("build_type"),
-                "status": build_data.get("status"),
-                "timestamp": build_data.get("timestamp"),
-                "duration": build_data.get("duration"),
-                "artifacts": build_data.get("artifacts", []),
-            }
-        )
-
-    return {"total": total, "limit": limit, "offset": offset, "builds": builds_data}
+    return {
+        "total": build_manager.registry.count(user=user, status=status),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "builds": [_summary(b) for b in builds],
+    }
 
 
 @router.get("/stats")
@@ -111,63 +107,13 @@ async def get_build_statistics() -> Dict[str, Any]:
             "builds_today": 12,
             "builds_this_week": 45,
             "builds_by_type": {...},
-            "builds_by_status": {...}
+            "builds_by_status": {...},
+            "duration_histogram": {...}
         }
-    """
-    all_builds = build_manager.builds.values()
-
-    total = len(all_builds)
-
-    if total == 0:
-        return {
-            "total_builds": 0,
-            "success_rate": 0,
-            "avg_duration_seconds": 0,
-            "builds_today": 0,
-            "builds_this_week": 0,
-            "builds_by_type": {},
-            "builds_by_status": {},
-        }
-
-    # Success Rate
-    success_count = sum(1 for b in all_builds if b.get("status") == "SUCCESS")
-    success_rate = success_count / total
 
-    # Durchschnittliche Dauer
-    durations = [b.get("duration", 0) for b in all_builds if b.get("duration")]
-    avg_duration = sum(durations) / len(durations) if durations else 0
-
-    # Builds heute
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-
-    builds_today = sum(1 for b in all_builds if b.get("timestamp", 0) >= today_start)
-
-    # Builds diese Woche
-    week_start = (datetime.now() - timedelta(days=7)).timestamp()
-
-    builds_this_week = sum(1 for b in all_builds if b.get("timestamp", 0) >= week_start)
-
-    # Builds nach Typ
-    builds_by_type = {}
-    for b in all_builds:
-        build_type = b.get("build_type", "unknown")
-        builds_by_type[build_type] = builds_by_type.get(build_type, 0) + 1
-
-    # Builds nach Status
-    builds_by_status = {}
-    for b in all_builds:
-        status = b.get("status", "UNKNOWN")
-        builds_by_status[status] = builds_by_status.get(status, 0) + 1
-
-    return {
-        "total_builds": total,
-        "success_rate": round(success_rate, 3),
-        "avg_duration_seconds": round(avg_duration, 2),
-        "builds_today": builds_today,
-        "builds_this_week": builds_this_week,
-        "builds_by_type": builds_by_type,
-        "builds_by_status": builds_by_status,
-    }
+    Laufende Aggregate der Registry (bei Status-Übergängen gepflegt).
+    """
+    return build_manager.registry.statistics()
 
 
 @router.get("/active")
@@ -182,19 +128,20 @@ async def get_active_builds() -> Dict[str, Any]:
         }
     """
     active_builds = []
+    now = time.time()
 
-    for build_id, build_data in build_manager.builds.items():
-        status = build_data.get("status")
-
-        if status in ["PENDING", "RUNNING"]:
+    for status in ACTIVE_STATUSES:
+        builds, _ = build_manager.page_builds(status=status, limit=MAX_PAGE)
+        for build_data in builds:
+            started_at = parse_timestamp(build_data.get("started_at") or build_data.get("created_at"))
             active_builds.append(
                 {
-                    "build_id": build_id,
+                    "build_id": build_data["id"],
                     "user": build_data.get("user"),
-                    "build_type": build_data.get("build_type"),
+                    "build_type": build_data.get("type"),
                     "status": status,
-                    "started_at": build_data.get("timestamp"),
-                    "elapsed_seconds": (time.time() - build_data.get("timestamp", 0)),
+                    "started_at": started_at,
+                    "elapsed_seconds": now - started_at,
                 }
             )
 
@@ -219,11 +166,11 @@ async def cancel_build(build_id: str) -> Dict[str, str]:
 
     status = build.get("status")
 
-    if status not in ["PENDING", "RUNNING"]:
+    if status not in ACTIVE_STATUSES:
         raise HTTPException(status_code=400, detail=f"Cannot cancel build with status: {status}")
 
     # Update Status
-    build_manager.update_status(build_id, "CANCELLED")
+    await build_manager.update_build_status(build_id, BuildStatus.CANCELLED)
 
     # TODO: Kill Build-Prozess wenn implementiert
 
@@ -332,24 +279,11 @@ async def get_user_builds(user_id: str, limit: int = 20) -> Dict[str, Any]:
             "builds": [...]
         }
     """
-    user_builds = [(bid, b) for bid, b in build_manager.builds.items() if b.get("user") == user_id]
-
-    # Sortiere nach Timestamp
-    user_builds.sort(key=lambda x: x[1].get("timestamp", 0), reverse=True)
-
-    total = len(user_builds)
-    limited = user_builds[:limit]
+    builds = build_manager.list_builds(user_id, limit=max(1, min(limit, MAX_PAGE)))
 
     builds_data = []
-    for build_id, build_data in limited:
-        builds_data.append(
-            {
-                "build_id": build_id,
-                "build_type": build_data.get("build_type"),
-                "status": build_data.get("status"),
-                "timestamp": build_data.get("timestamp"),
-                "duration": build_data.get("duration"),
-            }
-        )
-
-    return {"user_id": user_id, "total_builds": total, "builds": builds_data}
\ No newline at end of file
+    for build_data in builds:
+        summary = _summary(build_data)
+        builds_data.append({key: summary[key] for key in ("build_id", "build_type", "status", "timestamp", "duration")})
+
+    return {"user_id": user_id, "total_builds": build_manager.registry.count(user=user_id), "builds": builds_data}
\ No newline at end of file
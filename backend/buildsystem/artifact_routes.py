@@ -180,7 +180,8 @@ async def download_logs(build_id: str):
     if not build:
         raise HTTPException(status_code=404, detail="Build not found")
 
-    log_path = f"build_artifacts/{build_id}/build.log"
+    build_manager.log_store.flush(build_id)
+    log_path = build_manager.log_store.log_path(build_id)
 
     if not os.path.exists(log_path):
         # Fallback: Logs aus build_manager holen
@@ -4,10 +4,22 @@
 import asyncio
 import os
 import shutil
+import time
+from datetime import datetime, timezone
 
 from admin.notifications.ws_build_events import ws_build_events
 from buildsystem.build_manager import build_manager
 
+# Log-Frames: max. Zeilen bzw. Sekunden pro Frame (Disk + WebSocket)
+LOG_BATCH_LINES = 200
+LOG_BATCH_INTERVAL = 0.1
+
+# Max. gepufferte Zeilen zwischen Pipes und Log-Writer
+LOG_CHANNEL_SIZE = 10_000
+
+# Einzelne Zeilen länger als das gehen in Stücken in den Channel
+STREAM_LIMIT = 64 * 1024
+
 
 # -------------------------------------------------------------
 # UTILS: LOG WRITE + WS BROADCAST
@@ -19,10 +31,90 @@ async def _log(user, build_id, text):
     # Log in Datei speichern
     await build_manager.add_log(build_id, text)
 
-    # Live an WebSockets senden
+    # Live an WebSockets senden (blockiert nicht)
     await ws_build_events.broadcast(build_id, text)
 
 
+async def _emit(build_id, batch):
+    """Ein Frame: Disk (gepuffert) + WebSocket (Sende-Queues)"""
+    await build_manager.add_logs(
+        build_id, [(datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat(), text) for ts, text in batch]
+    )
+    ws_build_events.publish_logs(build_id, batch)
+
+
+# -------------------------------------------------------------
+# UTILS: STREAM DRAIN + LOG BATCHING
+# -------------------------------------------------------------
+async def _drain(stream, prefix, channel):
+    """
+    Liest eine Pipe zeilenweise in den gemeinsamen Channel.
+
+    Zeilen länger als STREAM_LIMIT gehen verlustfrei als mehrere
+    Einträge (je max. STREAM_LIMIT Bytes) in den Channel.
+    """
+    continued = False
+    while True:
+        try:
+            line = await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # EOF: Rest ohne abschließendes Newline
+            line = e.partial
+            if not line:
+                return
+        except asyncio.LimitOverrunError as e:
+            # Puffer bleibt erhalten → gelesenen Teil stückweise abholen
+            chunk = await stream.read(min(e.consumed, STREAM_LIMIT))
+            if not chunk:
+                return
+            await channel.put((time.time(), prefix + chunk.decode(errors="ignore")))
+            continued = True
+            continue
+
+        if continued and line == b"\n":
+            # Newline direkt nach einem Stück beendet nur die lange Zeile
+            continued = False
+            continue
+        continued = False
+        await channel.put((time.time(), prefix + line.decode(errors="ignore").rstrip()))
+
+
+async def _forward_logs(channel, build_id):
+    """
+    Sammelt Zeilen aus dem Channel zu Frames (max. LOG_BATCH_LINES Zeilen
+    oder LOG_BATCH_INTERVAL Sekunden) und schreibt sie raus. None = Ende.
+    """
+    loop = asyncio.get_running_loop()
+    done = False
+
+    while not done:
+        item = await channel.get()
+        if item is None:
+            return
+
+        batch = [item]
+        deadline = loop.time() + LOG_BATCH_INTERVAL
+
+        while len(batch) < LOG_BATCH_LINES:
+            try:
+                item = channel.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(channel.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            if item is None:
+                done = True
+                break
+            batch.append(item)
+
+        await _emit(build_id, batch)
+
+
 # -------------------------------------------------------------
 # UTILS: EXECUTE SECURE COMMAND
 # -------------------------------------------------------------
@@ -30,30 +122,33 @@ async def _run_cmd(cmd, cwd, user, build_id):
     """
     Führt einen Build-Schritt sicher aus:
     - async
-    - stdout live ins Log + WebSocket
-    - stderr live ins Log + WebSocket
+    - stdout + stderr werden GLEICHZEITIG gelesen (kein Deadlock bei
+      voller stderr-Pipe) und landen geordnet in einem Channel
+    - Log-Zeilen gehen gebündelt als Frames ins Log + WebSocket
     - kein shell=True (SICHER)
     """
 
     process = await asyncio.create_subprocess_exec(
-        *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LIMIT,
     )
 
-    # Live STDOUT
-    while True:
-        line = await process.stdout.readline()
-        if not line:
-            break
-        decoded = line.decode(errors="ignore").rstrip()
-        await _log(user, build_id, decoded)
-
-    # Live STDERR
-    stderr = await process.stderr.read()
-    if stderr:
-        for row in stderr.decode(errors="ignore").splitlines():
-            await _log(user, build_id, f"[ERROR] {row}")
-
-    await process.wait()
+    channel = asyncio.Queue(maxsize=LOG_CHANNEL_SIZE)
+    writer = asyncio.create_task(_forward_logs(channel, build_id))
+
+    try:
+        await asyncio.gather(
+            _drain(process.stdout, "", channel),
+            _drain(process.stderr, "[ERROR] ", channel),
+        )
+        await process.wait()
+    finally:
+        await channel.put(None)
+        await writer
+
     return process.returncode
 
 
@@ -0,0 +1,249 @@
+# -------------------------------------------------------------
+# VIBEAI – BUILD LOG STORE (Append-only, line-indexed)
+# -------------------------------------------------------------
+"""
+Append-only Log Storage für Builds.
+
+Vorher: Jede Log-Zeile landete in build["logs"] und build.json wurde
+komplett neu geschrieben → quadratische Disk-I/O bei großen Builds.
+
+Jetzt pro Build:
+- logs/build.log  → Log-Text, nur angehängt ("[timestamp] message\\n")
+- logs/build.idx  → Zeilen-Index: 8-Byte Start-Offset pro Zeile
+
+Features:
+- Gepufferte Writes, Flush nach Zeilen-Anzahl oder Zeitintervall
+  (kein Timer: das Intervall wird beim nächsten append() geprüft;
+  Lesen über den Store flusht vorher, close() flusht + fsynct)
+- Konfigurierbares fsync (nie / pro Flush)
+- Lesen nach Byte-Offset (Pagination) und tail(n) über den Index,
+  ohne die ganze Datei zu laden
+"""
+
+import os
+import struct
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+INDEX_ENTRY = struct.Struct("<Q")
+
+
+class _BuildLog:
+    """Offene Log-Dateien + Puffer eines einzelnen Builds"""
+
+    def __init__(self, log_path: str, index_path: str):
+        self.log_file = open(log_path, "ab")
+        self.index_file = open(index_path, "ab")
+        self.offset = self.log_file.tell()
+        self.lines = self.index_file.tell() // INDEX_ENTRY.size
+        self.buffer: List[bytes] = []
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.log_file.close()
+        self.index_file.close()
+
+
+class BuildLogStore:
+    """
+    Append-only, zeilen-indizierter Log Store für Builds.
+    """
+
+    def __init__(
+        self,
+        builds_dir: str,
+        batch_lines: int = 200,
+        flush_interval: float = 0.5,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            builds_dir: Basis-Verzeichnis der Builds
+            batch_lines: Flush nach so vielen gepufferten Zeilen
+            flush_interval: Flush beim nächsten append(), wenn der letzte
+                länger als so viele Sekunden her ist
+            fsync: os.fsync() nach jedem Flush (langsamer, crash-sicher)
+        """
+        self.builds_dir = builds_dir
+        self.batch_lines = batch_lines
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._open: Dict[str, _BuildLog] = {}
+
+    # ---------------------------------------------------------
+    # Paths
+    # ---------------------------------------------------------
+    def log_path(self, build_id: str) -> str:
+        return os.path.join(self.builds_dir, build_id, "logs", "build.log")
+
+    def index_path(self, build_id: str) -> str:
+        return os.path.join(self.builds_dir, build_id, "logs", "build.idx")
+
+    def _get(self, build_id: str) -> _BuildLog:
+        log = self._open.get(build_id)
+        if log is None:
+            os.makedirs(os.path.dirname(self.log_path(build_id)), exist_ok=True)
+            log = _BuildLog(self.log_path(build_id), self.index_path(build_id))
+            self._open[build_id] = log
+        return log
+
+    # ---------------------------------------------------------
+    # Write
+    # ---------------------------------------------------------
+    def append(self, build_id: str, message: str, timestamp: Optional[str] = None) -> int:
+        """
+        Hängt eine Log-Zeile an (gepuffert).
+
+        Returns:
+            Zeilennummer (0-basiert) der neuen Zeile
+        """
+        log = self._get(build_id)
+        timestamp = timestamp or datetime.utcnow().isoformat()
+
+        # Zeilenumbrüche in der Message escapen → 1 Eintrag = 1 Zeile
+        message = message.replace("\n", "\\n")
+        log.buffer.append(f"[{timestamp}] {message}\n".encode("utf-8"))
+        line_no = log.lines + len(log.buffer) - 1
+
+        if len(log.buffer) >= self.batch_lines or time.monotonic() - log.last_flush >= self.flush_interval:
+            self._flush(log)
+
+        return line_no
+
+    def _flush(self, log: _BuildLog, fsync: Optional[bool] = None):
+        if log.buffer:
+            index = bytearray()
+            offset = log.offset
+            for line in log.buffer:
+                index += INDEX_ENTRY.pack(offset)
+                offset += len(line)
+
+            log.log_file.write(b"".join(log.buffer))
+            log.index_file.write(index)
+            log.log_file.flush()
+            log.index_file.flush()
+
+            log.offset = offset
+            log.lines += len(log.buffer)
+            log.buffer.clear()
+
+            if self.fsync if fsync is None else fsync:
+                os.fsync(log.log_file.fileno())
+                os.fsync(log.index_file.fileno())
+
+        log.last_flush = time.monotonic()
+
+    def flush(self, build_id: str, fsync: Optional[bool] = None):
+        """Schreibt gepufferte Zeilen eines Builds auf Disk."""
+        log = self._open.get(build_id)
+        if log:
+            self._flush(log, fsync)
+
+    def close(self, build_id: str):
+        """Flush + fsync + Datei-Handles freigeben (Build beendet)."""
+        log = self._open.pop(build_id, None)
+        if log:
+            self._flush(log, fsync=True)
+            log.close()
+
+    def close_all(self):
+        for build_id in list(self._open):
+            self.close(build_id)
+
+    # ---------------------------------------------------------
+    # Read
+    # ---------------------------------------------------------
+    def line_count(self, build_id: str) -> int:
+        log = self._open.get(build_id)
+        if log:
+            return log.lines + len(log.buffer)
+
+        index_path = self.index_path(build_id)
+        if not os.path.exists(index_path):
+            return 0
+        return os.path.getsize(index_path) // INDEX_ENTRY.size
+
+    def size(self, build_id: str) -> int:
+        """Größe der Log-Datei in Bytes (nach Flush)."""
+        self.flush(build_id)
+        log_path = self.log_path(build_id)
+        return os.path.getsize(log_path) if os.path.exists(log_path) else 0
+
+    def read_range(self, build_id: str, offset: int = 0, limit: int = 64 * 1024) -> Dict:
+        """
+        Liest Log-Zeilen ab Byte-Offset (Pagination).
+
+        Es werden nur ganze Zeilen zurückgegeben; `next_offset` zeigt auf
+        den Anfang der nächsten ungelesenen Zeile.
+
+        Returns:
+            {"lines": [...], "offset": int, "next_offset": int, "size": int, "eof": bool}
+        """
+        if offset < 0:
+            raise ValueError(f"offset must be >= 0, got {offset}")
+        size = self.size(build_id)
+        if offset >= size:
+            return {"lines": [], "offset": offset, "next_offset": offset, "size": size, "eof": True}
+
+        with open(self.log_path(build_id), "rb") as f:
+            f.seek(offset)
+            data = f.read(max(limit, 1))
+
+        end = data.rfind(b"\n")
+        if end == -1:
+            # Einzelne Zeile länger als limit → bis zum Zeilenende lesen
+            with open(self.log_path(build_id), "rb") as f:
+                f.seek(offset)
+                data = f.readline()
+            end = len(data) - 1
+        chunk = data[: end + 1]
+        next_offset = offset + len(chunk)
+
+        return {
+            "lines": chunk.decode("utf-8", errors="replace").splitlines(),
+            "offset": offset,
+            "next_offset": next_offset,
+            "size": size,
+            "eof": next_offset >= size,
+        }
+
+    def read_lines(self, build_id: str, start: int = 0, count: int = 100) -> List[str]:
+        """
+        Liest `count` Zeilen ab Zeilennummer `start` über den Index.
+        """
+        self.flush(build_id)
+        total = self.line_count(build_id)
+        start = max(0, start)
+        if start >= total or count <= 0:
+            return []
+        end = min(start + count, total)
+
+        with open(self.index_path(build_id), "rb") as idx:
+            idx.seek(start * INDEX_ENTRY.size)
+            begin_offset = INDEX_ENTRY.unpack(idx.read(INDEX_ENTRY.size))[0]
+            if end < total:
+                idx.seek(end * INDEX_ENTRY.size)
+                end_offset = INDEX_ENTRY.unpack(idx.read(INDEX_ENTRY.size))[0]
+            else:
+                end_offset = None
+
+        with open(self.log_path(build_id), "rb") as f:
+            f.seek(begin_offset)
+            data = f.read() if end_offset is None else f.read(end_offset - begin_offset)
+
+        return data.decode("utf-8", errors="replace").splitlines()
+
+    def tail(self, build_id: str, lines: int = 100) -> Dict:
+        """
+        Letzte `lines` Zeilen + Offset zum Weiterlesen (Live-Follow).
+        """
+        total = self.line_count(build_id)
+        lines = max(0, lines)
+        start = max(0, total - lines)
+        return {
+            "lines": self.read_lines(build_id, start, lines),
+            "start_line": start,
+            "total_lines": total,
+            "next_offset": self.size(build_id),
+        }
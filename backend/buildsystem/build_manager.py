@@ -9,6 +9,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from buildsystem.build_log_store import BuildLogStore
+from buildsystem.build_registry import BuildRegistry
+
 logger = logging.getLogger("build_manager")
 
 
@@ -48,14 +51,20 @@ class BuildManager:
     - Parallel build support
     """
 
-    def __init__(self, builds_dir: str = "./build_artifacts"):
+    def __init__(self, builds_dir: str = "./build_artifacts", log_fsync: bool = False):
         self.builds_dir = builds_dir
         self.active_builds: Dict[str, Dict] = {}
         self.build_queue: List[str] = []
 
+        # Logs: append-only Datei pro Build (NICHT in build.json)
+        self.log_store = BuildLogStore(builds_dir, fsync=log_fsync)
+
         # Create builds directory
         os.makedirs(builds_dir, exist_ok=True)
 
+        # Historie + Indizes (user/status/Tag) + Aggregate, überlebt Neustarts
+        self.registry = BuildRegistry(os.path.join(builds_dir, "builds.sqlite3"), builds_dir=builds_dir)
+
     async def create_build(
         self,
         user_email: str,
@@ -88,7 +97,6 @@ class BuildManager:
             "created_at": datetime.utcnow().isoformat(),
             "started_at": None,
             "completed_at": None,
-            "logs": [],
             "artifacts": [],
             "error": None,
         }
@@ -103,6 +111,7 @@ class BuildManager:
 
         # Save metadata
         self._save_metadata(build_id, build_meta)
+        self.registry.record(build_meta)
 
         # Add to queue
         self.build_queue.append(build_id)
@@ -126,6 +135,7 @@ class BuildManager:
         build["started_at"] = datetime.utcnow().isoformat()
 
         self._save_metadata(build_id, build)
+        self.registry.record(build)
 
         logger.info("Started build %s", build_id)
 
@@ -147,7 +157,13 @@ class BuildManager:
         if error:
             build["error"] = error
 
+        if status in [BuildStatus.SUCCESS, BuildStatus.FAILED, BuildStatus.CANCELLED]:
+            # Build beendet → Logs final flushen + fsync
+            self.log_store.close(build_id)
+            build["log_lines"] = self.log_store.line_count(build_id)
+
         self._save_metadata(build_id, build)
+        self.registry.record(build)
 
         logger.info("Build %s status: %s", build_id, status.value)
 
@@ -155,24 +171,44 @@ class BuildManager:
         """
         Add log entry to build.
 
-        Logs werden sowohl in Metadata als auch in log-Datei gespeichert.
+        Logs werden append-only in logs/build.log geschrieben (gepuffert,
+        zeilen-indiziert). build.json wird dabei NICHT neu geschrieben.
         """
         if build_id not in self.active_builds:
             return
 
-        build = self.active_builds[build_id]
+        self.log_store.append(build_id, message)
 
-        log_entry = {"timestamp": datetime.utcnow().isoformat(), "message": message}
+    async def add_logs(self, build_id: str, entries: List[tuple]):
+        """
+        Add a batch of log lines (one call per frame from the executor).
 
-        build["logs"].append(log_entry)
-        self._save_metadata(build_id, build)
+        Args:
+            entries: [(iso_timestamp, message), ...] in output order
+        """
+        if build_id not in self.active_builds:
+            return
 
-        # Auch in log-Datei schreiben
-        build_path = self._get_build_path(build_id)
-        log_file = os.path.join(build_path, "logs", "build.log")
+        for timestamp, message in entries:
+            self.log_store.append(build_id, message, timestamp=timestamp)
 
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(f"[{log_entry['timestamp']}] {message}\n")
+    def get_logs(self, build_id: str, start: int = 0, limit: int = 1000) -> List[str]:
+        """
+        Get log lines by line number.
+        """
+        return self.log_store.read_lines(build_id, start, limit)
+
+    def read_logs(self, build_id: str, offset: int = 0, limit: int = 64 * 1024) -> Dict[str, Any]:
+        """
+        Read log lines starting at a byte offset (paginated).
+        """
+        return self.log_store.read_range(build_id, offset, limit)
+
+    def tail_logs(self, build_id: str, lines: int = 100) -> Dict[str, Any]:
+        """
+        Read the last N log lines.
+        """
+        return self.log_store.tail(build_id, lines)
 
     async def add_artifact(self, build_id: str, artifact_type: str, file_path: str, size: int):
         """
@@ -192,6 +228,7 @@ class BuildManager:
 
         build["artifacts"].append(artifact)
         self._save_metadata(build_id, build)
+        self.registry.record(build)
 
     def get_build(self, build_id: str) -> Optional[Dict]:
         """
@@ -200,19 +237,30 @@ class BuildManager:
         if build_id in self.active_builds:
             return self.active_builds[build_id]
 
-        # Try loading from disk
-        return self._load_metadata(build_id)
+        # Registry, then disk
+        return self.registry.get(build_id) or self._load_metadata(build_id)
 
     def list_builds(self, user_email: str, limit: int = 50) -> List[Dict]:
         """
-        List user builds.
+        List user builds (newest first).
         """
-        user_builds = [b for b in self.active_builds.values() if b["user"] == user_email]
+        builds, _ = self.registry.query(user=user_email, limit=limit)
+        return builds
 
-        # Sort by created_at descending
-        user_builds.sort(key=lambda x: x["created_at"], reverse=True)
+    def page_builds(
+        self,
+        user_email: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+    ):
+        """
+        Paginated build history (keyset cursor).
 
-        return user_builds[:limit]
+        Returns:
+            (builds, next_cursor)
+        """
+        return self.registry.query(user=user_email, status=status, limit=limit, before=before)
 
     def _get_build_path(self, build_id: str) -> str:
         """Get build directory path"""
@@ -0,0 +1,307 @@
+# -------------------------------------------------------------
+# VIBEAI – BUILD REGISTRY (SQLite-indiziert + laufende Aggregate)
+# -------------------------------------------------------------
+"""
+Indizierte Build-Historie.
+
+Vorher: Admin-Liste/Statistik und list_builds kopierten bei jedem Request
+alle Builds aus dem Speicher, filterten, sortierten und aggregierten in
+Python – und nach einem Neustart war die Historie weg (bzw. nur über
+jede einzelne build.json erreichbar).
+
+Jetzt:
+- SQLite (WAL) Tabelle builds mit Sekundär-Indizes
+  (user, created_ts, id), (status, created_ts, id), (day, ...)
+- Keyset-Pagination über (created_ts, id) statt offset
+- Laufende Aggregate (Status, Typ, Builds pro Tag, Dauer-Histogramm)
+  werden bei jedem Status-Übergang angepasst; beim Start EINE GROUP BY
+  Query statt alle build.json zu lesen
+- Einmaliger Import vorhandener build.json, wenn die DB noch leer ist
+"""
+
+import base64
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Obergrenzen der Dauer-Buckets in Sekunden (letzter Bucket = darüber)
+DURATION_BUCKETS = (10, 30, 60, 120, 300, 600, 1800)
+
+SUCCESS = "success"
+ACTIVE_STATUSES = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id TEXT PRIMARY KEY,
+    user TEXT,
+    project_id TEXT,
+    type TEXT,
+    status TEXT,
+    created_ts REAL NOT NULL,
+    day INTEGER NOT NULL,
+    duration REAL,
+    duration_bucket INTEGER,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_builds_created ON builds (created_ts, id);
+CREATE INDEX IF NOT EXISTS ix_builds_user_created ON builds (user, created_ts, id);
+CREATE INDEX IF NOT EXISTS ix_builds_status_created ON builds (status, created_ts, id);
+CREATE INDEX IF NOT EXISTS ix_builds_day ON builds (day);
+"""
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """ISO-String (UTC, naive) → Unix Timestamp"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def build_duration(build: Dict) -> Optional[float]:
+    """Dauer in Sekunden (started_at → completed_at), sonst None"""
+    started = parse_timestamp(build.get("started_at"))
+    completed = parse_timestamp(build.get("completed_at"))
+    if started is None or completed is None:
+        return None
+    return max(0.0, completed - started)
+
+
+def duration_bucket(duration: Optional[float]) -> Optional[int]:
+    if duration is None:
+        return None
+    return bisect.bisect_left(DURATION_BUCKETS, duration)
+
+
+def encode_cursor(created_ts: float, build_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_ts!r}|{build_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_ts, build_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(created_ts), build_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class _Aggregates:
+    """Laufende Zähler über alle Builds"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_status: Counter = Counter()
+        self.by_type: Counter = Counter()
+        self.by_day: Counter = Counter()
+        self.histogram = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.duration_count = 0
+
+    def apply(self, row: Optional[Tuple], sign: int, count: int = 1, duration_sum: Optional[float] = None):
+        """row = (status, type, day, duration, duration_bucket)"""
+        if row is None:
+            return
+        status, build_type, day, duration, bucket = row
+        n = sign * count
+        self.total += n
+        self.by_status[status] += n
+        self.by_type[build_type] += n
+        self.by_day[day] += n
+        if bucket is not None:
+            self.histogram[bucket] += n
+            self.duration_count += n
+            self.duration_sum += sign * (duration_sum if duration_sum is not None else duration)
+
+
+class BuildRegistry:
+    """
+    SQLite-persistierte Build-Registry mit Sekundär-Indizes.
+    """
+
+    def __init__(self, db_path: str, builds_dir: Optional[str] = None):
+        """
+        Args:
+            db_path: Pfad der SQLite-Datei
+            builds_dir: Build-Verzeichnis für den einmaligen build.json Import
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+        self.aggregates = _Aggregates()
+        if builds_dir and self._is_empty():
+            self.import_metadata(builds_dir)
+        self._load_aggregates()
+
+    # ---------------------------------------------------------
+    # STARTUP
+    # ---------------------------------------------------------
+    def _is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM builds LIMIT 1").fetchone() is None
+
+    def _load_aggregates(self):
+        """Aggregate aus EINER GROUP BY Query (kein build.json lesen)."""
+        aggregates = _Aggregates()
+        rows = self._conn.execute(
+            "SELECT status, type, day, duration_bucket, COUNT(*), SUM(duration) "
+            "FROM builds GROUP BY status, type, day, duration_bucket"
+        )
+        for status, build_type, day, bucket, count, duration_sum in rows:
+            aggregates.apply((status, build_type, day, None, bucket), 1, count, duration_sum or 0.0)
+        self.aggregates = aggregates
+
+    def import_metadata(self, builds_dir: str) -> int:
+        """Vorhandene build.json einmalig übernehmen (Migration)."""
+        if not os.path.isdir(builds_dir):
+            return 0
+        imported = 0
+        for entry in os.scandir(builds_dir):
+            metadata_path = os.path.join(entry.path, "build.json")
+            if not entry.is_dir() or not os.path.exists(metadata_path):
+                continue
+            try:
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    build = json.load(f)
+                self._write(build)
+                imported += 1
+            except (OSError, ValueError, KeyError):
+                continue
+        return imported
+
+    # ---------------------------------------------------------
+    # WRITE
+    # ---------------------------------------------------------
+    def _write(self, build: Dict) -> Tuple[Optional[Tuple], Tuple]:
+        created_ts = parse_timestamp(build["created_at"])
+        duration = build_duration(build)
+        bucket = duration_bucket(duration)
+        new = (build.get("status"), build.get("type"), int(created_ts // 86400), duration, bucket)
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT status, type, day, duration, duration_bucket FROM builds WHERE id = ?", (build["id"],)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO builds "
+                "(id, user, project_id, type, status, created_ts, day, duration, duration_bucket, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    build["id"],
+                    build.get("user"),
+                    build.get("project_id"),
+                    new[1],
+                    new[0],
+                    created_ts,
+                    new[2],
+                    duration,
+                    bucket,
+                    json.dumps(build),
+                ),
+            )
+        return old, new
+
+    def record(self, build: Dict):
+        """Build anlegen oder Übergang (Status, Artefakte, ...) speichern."""
+        with self._lock:
+            old, new = self._write(build)
+            if old != new:
+                self.aggregates.apply(old, -1)
+                self.aggregates.apply(new, 1)
+
+    def remove(self, build_id: str):
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT status, type, day, duration, duration_bucket FROM builds WHERE id = ?", (build_id,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM builds WHERE id = ?", (build_id,))
+            self.aggregates.apply(old, -1)
+
+    # ---------------------------------------------------------
+    # READ
+    # ---------------------------------------------------------
+    def get(self, build_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT meta FROM builds WHERE id = ?", (build_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(self, user: Optional[str], status: Optional[str]) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if user is not None:
+            clauses.append("user = ?")
+            params.append(user)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        return clauses, params
+
+    def query(
+        self,
+        user: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Neueste Builds zuerst (Keyset-Pagination).
+
+        Returns:
+            (builds, next_cursor) – next_cursor für die nächste (ältere) Seite
+        """
+        clauses, params = self._where(user, status)
+        if before:
+            created_ts, build_id = decode_cursor(before)
+            clauses.append("(created_ts < ? OR (created_ts = ? AND id < ?))")
+            params.extend([created_ts, created_ts, build_id])
+
+        sql = "SELECT created_ts, id, meta FROM builds"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_ts DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        page = rows[:limit]
+        next_cursor = encode_cursor(page[-1][0], page[-1][1]) if len(rows) > limit else None
+        return [json.loads(meta) for _, _, meta in page], next_cursor
+
+    def count(self, user: Optional[str] = None, status: Optional[str] = None) -> int:
+        if user is None:
+            return self.aggregates.by_status[status] if status is not None else self.aggregates.total
+        clauses, params = self._where(user, status)
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM builds WHERE " + " AND ".join(clauses), params).fetchone()[0]
+
+    def statistics(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Dashboard-Statistik aus den laufenden Aggregaten (O(1) bzw. O(7))."""
+        today = int((now or datetime.now(timezone.utc)).timestamp() // 86400)
+        agg = self.aggregates
+        with self._lock:
+            histogram_labels = [f"<={b}s" for b in DURATION_BUCKETS] + [f">{DURATION_BUCKETS[-1]}s"]
+            return {
+                "total_builds": agg.total,
+                "success_rate": round(agg.by_status[SUCCESS] / agg.total, 3) if agg.total else 0,
+                "avg_duration_seconds": round(agg.duration_sum / agg.duration_count, 2) if agg.duration_count else 0,
+                "builds_today": agg.by_day[today],
+                "builds_this_week": sum(agg.by_day[day] for day in range(today - 6, today + 1)),
+                "builds_by_type": {k: v for k, v in agg.by_type.items() if v},
+                "builds_by_status": {k: v for k, v in agg.by_status.items() if v},
+                "duration_histogram": dict(zip(histogram_labels, agg.histogram)),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,8 +4,9 @@
 import asyncio
 import os
 from shutil import which
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import FileResponse
 
 from auth import get_current_user
@@ -144,18 +145,29 @@ async def build_status(build_id: str, request: Request):
 # BUILD LOGS
 # -------------------------------------------------------------
 @router.get("/logs")
-async def build_logs(build_id: str, request: Request):
-    user = await get_current_user(request)
+async def build_logs(
+    build_id: str,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(65536, ge=1),
+    tail: Optional[int] = Query(None, ge=1),
+):
+    """
+    Build-Logs seitenweise lesen.
 
-    log_path = os.path.join("build_artifacts", user.email, build_id, "logs", "build.log")
+    - offset/limit: Byte-Range ab Offset (next_offset für die nächste Seite)
+    - tail: Nur die letzten N Zeilen
+    """
+    user = await get_current_user(request)
 
-    if not os.path.exists(log_path):
-        return {"logs": ""}
+    build = build_manager.get_build(build_id)
+    if not build or build.get("user") != user.email:
+        raise HTTPException(404, "Build not found")
 
-    with open(log_path, "r", encoding="utf-8") as f:
-        data = f.read()
+    if tail is not None:
+        return build_manager.tail_logs(build_id, lines=min(tail, 5000))
 
-    return {"logs": data}
+    return build_manager.read_logs(build_id, offset=offset, limit=min(limit, 1024 * 1024))
 
 
 # -------------------------------------------------------------
@@ -18,7 +18,7 @@ from codestudio.languages.react_executor import ReactExecutor
 from codestudio.languages.swift_executor import SwiftExecutor
 from codestudio.languages.typescript_executor import TypeScriptExecutor
 from codestudio.output_cleaner import clean_output
-from codestudio.sandbox import Sandbox
+from codestudio.worker_pool import worker_pool
 
 logger = logging.getLogger("executor")
 
@@ -99,12 +99,11 @@ class CodeExecutor:
         timeout = timeout or self.DEFAULT_TIMEOUT
         memory_limit = memory_limit or self.DEFAULT_MEMORY_LIMIT
 
-        # Create sandbox
-        sandbox = Sandbox(timeout=timeout, memory_limit=memory_limit)
-
         try:
-            # Execute in sandbox
-            result = await sandbox.execute(executor=executor, code=code, stdin=stdin)
+            # Execute: warmer Worker / Compile Cache / Sandbox
+            result = await worker_pool.execute(
+                language, executor, code, stdin=stdin, timeout=timeout, memory_limit=memory_limit
+            )
 
             # Clean output
             if result.get("stdout"):
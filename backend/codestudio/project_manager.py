@@ -8,6 +8,8 @@ import uuid
 from datetime import datetime
 from typing import Dict, List
 
+from project_generator.project_catalog import project_catalog
+
 logger = logging.getLogger("project_manager")
 
 # Basis-Verzeichnis für alle User-Projekte - use absolute path
@@ -123,6 +125,7 @@ class ProjectManager:
 
         if os.path.exists(project_path):
             shutil.rmtree(project_path)
+            project_catalog.remove(project_path)
             logger.info("Deleted project %s for %s", project_id, user_email)
         else:
             raise FileNotFoundError(f"Project {project_id} not found")
@@ -236,6 +239,7 @@ class ProjectManager:
         
         # Erstelle Projekt-Verzeichnis falls nicht vorhanden
         os.makedirs(project_path, exist_ok=True)
+        changes = []
         
         for file_info in files:
             file_path = file_info.get("path", "")
@@ -256,13 +260,17 @@ class ProjectManager:
             
             # Speichere Datei
             try:
+                old_size = os.path.getsize(full_path) if os.path.exists(full_path) else None
                 with open(full_path, "w", encoding="utf-8") as f:
                     f.write(content)
+                changes.append((file_path, old_size))
                 logger.info(f"Saved file: {full_path}")
             except Exception as e:
                 logger.error(f"Error saving file {full_path}: {e}")
+                project_catalog.files_written(project_path, changes)
                 return False
         
+        project_catalog.files_written(project_path, changes)
         return True
 
 
@@ -11,6 +11,7 @@ from billing.limiter import limiter
 from codestudio.executor import execute_code
 from codestudio.file_manager import file_manager
 from codestudio.project_manager import project_manager
+from codestudio.worker_pool import worker_pool
 from db import get_db
 
 logger = logging.getLogger("codestudio")
@@ -333,4 +334,15 @@ async def get_execution_stats(user=Depends(get_current_user_v2)):
         "total_projects": len(project_manager.list_projects(user.email)),
         "languages_used": [],
         "total_runtime_seconds": 0,
-    }
\ No newline at end of file
+    }
+
+
+# -------------------------------------------------------------
+# WORKER POOL STATS
+# -------------------------------------------------------------
+@router.get("/pool")
+async def get_worker_pool_stats(user=Depends(get_current_user_v2)):
+    """
+    Warm worker pool + compile cache stats (p50/p95 per language).
+    """
+    return worker_pool.get_stats()
@@ -1,16 +1,176 @@
 """
 Code Studio - Universal Language Executor
 Führt Code in 40+ Sprachen aus
+
+Alle Prozesse laufen über asyncio.create_subprocess_exec (wie
+Sandbox._run_process) → ein Kotlin/Java Compile blockiert nicht mehr
+den Worker. Ein ExecutionPool begrenzt parallele Ausführungen global
+und pro Sprache; bei Timeout wird die ganze Prozessgruppe gekillt.
 """
 
+import asyncio
 import os
-import subprocess
+import signal
 import tempfile
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
 
 from ALLE_SPRACHEN import get_executor, get_language_by_extension
 
+# on_output(stream, text) → "stdout"/"stderr" Chunk
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+RUN_TIMEOUT = 10
+COMPILE_TIMEOUT = 30
+CHUNK_SIZE = 4096
+
+
+class ExecutionPool:
+    """
+    Begrenzt parallele Ausführungen (global + pro Sprache).
+
+    Schwere Toolchains (JVM, GHC, rustc, dotnet) bekommen kleine Caps,
+    damit ein paar Compiles nicht alle CPU-Slots belegen.
+    """
+
+    DEFAULT_LANGUAGE_LIMIT = 4
+    LANGUAGE_LIMITS = {
+        "Kotlin": 1,
+        "Scala": 1,
+        "Haskell": 1,
+        "C#": 1,
+        "F#": 1,
+        "Java": 2,
+        "Rust": 2,
+        "Swift": 2,
+    }
+
+    def __init__(self, max_concurrent: int = None, language_limits: Dict[str, int] = None):
+        self.max_concurrent = max_concurrent or int(
+            os.getenv("VIBEAI_MAX_CONCURRENT_EXECUTIONS", max(4, (os.cpu_count() or 2) * 2))
+        )
+        self.language_limits = {**self.LANGUAGE_LIMITS, **(language_limits or {})}
+        self._global = asyncio.Semaphore(self.max_concurrent)
+        self._languages: Dict[str, asyncio.Semaphore] = {}
+        self.running: Dict[str, int] = {}
+        self.waiting = 0
+
+    def _semaphore(self, language: str) -> asyncio.Semaphore:
+        if language not in self._languages:
+            limit = self.language_limits.get(language, self.DEFAULT_LANGUAGE_LIMIT)
+            self._languages[language] = asyncio.Semaphore(limit)
+        return self._languages[language]
+
+    async def run(self, language: str, factory: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Führt factory() aus, sobald ein Slot (Sprache + global) frei ist."""
+        self.waiting += 1
+        try:
+            await self._semaphore(language).acquire()
+            try:
+                await self._global.acquire()
+            except BaseException:
+                self._semaphore(language).release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.running[language] = self.running.get(language, 0) + 1
+        try:
+            return await factory()
+        finally:
+            self.running[language] -= 1
+            self._global.release()
+            self._semaphore(language).release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": {lang: n for lang, n in self.running.items() if n},
+            "waiting": self.waiting,
+        }
+
+
+def _kill_process_group(process: asyncio.subprocess.Process):
+    """Killt den Prozess inkl. aller Kinder (eigene Session/Gruppe)."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+
+async def _read_stream(stream: asyncio.StreamReader, name: str, buffer: list, on_output: Optional[OutputCallback]):
+    while True:
+        chunk = await stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        text = chunk.decode("utf-8", errors="replace")
+        buffer.append(text)
+        if on_output:
+            await on_output(name, text)
+
+
+async def run_process(
+    command: list,
+    stdin: str = "",
+    timeout: float = RUN_TIMEOUT,
+    cwd: str = None,
+    on_output: Optional[OutputCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Startet einen Prozess in eigener Prozessgruppe, streamt stdout/stderr
+    und killt die ganze Gruppe bei Timeout.
+
+    Returns:
+        {"stdout": str, "stderr": str, "returncode": int, "timed_out": bool}
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=True,
+    )
+
+    stdout, stderr = [], []
+
+    async def communicate():
+        if stdin:
+            process.stdin.write(stdin.encode())
+            try:
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        process.stdin.close()
+        await asyncio.gather(
+            _read_stream(process.stdout, "stdout", stdout, on_output),
+            _read_stream(process.stderr, "stderr", stderr, on_output),
+        )
+        return await process.wait()
+
+    timed_out = False
+    try:
+        returncode = await asyncio.wait_for(communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_process_group(process)
+        returncode = await process.wait()
+    except asyncio.CancelledError:
+        _kill_process_group(process)
+        await process.wait()
+        raise
+
+    return {
+        "stdout": "".join(stdout),
+        "stderr": "".join(stderr),
+        "returncode": returncode,
+        "timed_out": timed_out,
+    }
+
 
 class UniversalExecutor:
     """Führt Code in allen unterstützten Sprachen aus"""
@@ -58,7 +218,12 @@ class UniversalExecutor:
         "Julia": {"cmd": "julia", "ext": ".jl"},
     }
     
-    async def execute(self, language: str, code: str, stdin: str = "") -> Dict[str, Any]:
+    def __init__(self, pool: ExecutionPool = None):
+        self.pool = pool or ExecutionPool()
+
+    async def execute(
+        self, language: str, code: str, stdin: str = "", on_output: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
         """
         Führt Code aus
         
@@ -66,6 +231,7 @@ class UniversalExecutor:
             language: Programmiersprache
             code: Source Code
             stdin: Standard Input
+            on_output: Optional async Callback(stream, text) für Live-Output
             
         Returns:
             {"success": bool, "output": str, "error": str, "execution_time": float}
@@ -79,16 +245,29 @@ class UniversalExecutor:
             }
         
         config = self.EXECUTORS[language]
+        start = time.perf_counter()
         
         try:
             # Compile & Run Languages
             if config.get("compile_run"):
-                return await self._compile_and_run(language, code, config, stdin)
+                def run():
+                    return self._compile_and_run(language, code, config, stdin, on_output)
             
             # Interpreted Languages
             else:
-                return await self._run_interpreted(language, code, config, stdin)
+                def run():
+                    return self._run_interpreted(language, code, config, stdin, on_output)
+
+            result = await self.pool.run(language, run)
+            result["execution_time"] = round(time.perf_counter() - start, 3)
+            return result
                 
+        except FileNotFoundError as e:
+            return {
+                "success": False,
+                "output": "",
+                "error": f"Runtime für {language} nicht installiert: {e.filename}"
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -96,7 +275,54 @@ class UniversalExecutor:
                 "error": f"Execution error: {str(e)}"
             }
     
-    async def _run_interpreted(self, language: str, code: str, config: Dict, stdin: str) -> Dict:
+    async def stream(self, language: str, code: str, stdin: str = "") -> AsyncGenerator[Dict, None]:
+        """
+        Führt Code aus und liefert Output-Chunks live.
+
+        Yields:
+            {"type": "output", "stream": "stdout"|"stderr", "text": str}
+            ... und zum Schluss {"type": "result", **execute()-Ergebnis}
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_output(stream: str, text: str):
+            await queue.put({"type": "output", "stream": stream, "text": text})
+
+        async def run():
+            try:
+                result = await self.execute(language, code, stdin, on_output)
+            finally:
+                await queue.put(None)
+            return result
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            yield {"type": "result", **(await task)}
+        finally:
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    def _result(language: str, process: Dict, timeout: float, error_prefix: str = "") -> Dict:
+        error = process["stderr"]
+        if process["timed_out"]:
+            error = f"{error}\nExecution timed out after {timeout}s".lstrip("\n")
+        return {
+            "success": process["returncode"] == 0 and not process["timed_out"],
+            "output": process["stdout"],
+            "error": f"{error_prefix}{error}" if error_prefix else error,
+            "language": language,
+            "timed_out": process["timed_out"],
+        }
+
+    async def _run_interpreted(
+        self, language: str, code: str, config: Dict, stdin: str, on_output: Optional[OutputCallback] = None
+    ) -> Dict:
         """Führt interpreted language aus"""
         
         with tempfile.NamedTemporaryFile(mode='w', suffix=config["ext"], delete=False) as f:
@@ -104,26 +330,18 @@ class UniversalExecutor:
             temp_file = f.name
         
         try:
-            cmd = [config["cmd"], temp_file]
+            # "go run" → ["go", "run"]
+            cmd = config["cmd"].split() + [temp_file]
             
-            result = subprocess.run(
-                cmd,
-                input=stdin,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = await run_process(cmd, stdin, timeout=RUN_TIMEOUT, on_output=on_output)
             
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "error": result.stderr,
-                "language": language
-            }
+            return self._result(language, result, RUN_TIMEOUT)
         finally:
             os.unlink(temp_file)
     
-    async def _compile_and_run(self, language: str, code: str, config: Dict, stdin: str) -> Dict:
+    async def _compile_and_run(
+        self, language: str, code: str, config: Dict, stdin: str, on_output: Optional[OutputCallback] = None
+    ) -> Dict:
         """Kompiliert und führt aus"""
         
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -148,20 +366,12 @@ class UniversalExecutor:
                 return {"success": False, "output": "", "error": f"Unknown compile config for {language}"}
             
             # Compile Step
-            compile_result = subprocess.run(
-                compile_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            compile_result = await run_process(compile_cmd, timeout=COMPILE_TIMEOUT, cwd=tmpdir)
             
-            if compile_result.returncode != 0:
-                return {
-                    "success": False,
-                    "output": "",
-                    "error": f"Compilation failed:\n{compile_result.stderr}",
-                    "language": language
-                }
+            if compile_result["returncode"] != 0 or compile_result["timed_out"]:
+                result = self._result(language, compile_result, COMPILE_TIMEOUT, "Compilation failed:\n")
+                result["output"] = ""
+                return result
             
             # Run
             if language == "Java":
@@ -171,20 +381,9 @@ class UniversalExecutor:
             else:
                 run_cmd = [str(output_file)]
             
-            run_result = subprocess.run(
-                run_cmd,
-                input=stdin,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            run_result = await run_process(run_cmd, stdin, timeout=RUN_TIMEOUT, cwd=tmpdir, on_output=on_output)
             
-            return {
-                "success": run_result.returncode == 0,
-                "output": run_result.stdout,
-                "error": run_result.stderr,
-                "language": language
-            }
+            return self._result(language, run_result, RUN_TIMEOUT)
 
 
 # Global instance
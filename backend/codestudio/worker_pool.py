@@ -0,0 +1,421 @@
+# -------------------------------------------------------------
+# VIBEAI – WARM WORKER POOL (Code Studio)
+# -------------------------------------------------------------
+"""
+Warme Runtime-Pools für Code Studio.
+
+Vorher: jeder Run = neues TemporaryDirectory + Cold Start von python,
+node, javac/kotlinc, ...
+
+Jetzt:
+- Python / JavaScript: vorgestartete Worker-Prozesse (codestudio/workers/),
+  Code kommt per Pipe, State wird zwischen Runs zurückgesetzt
+  (Python: fork pro Run, Node: frischer worker_thread pro Run, ohne
+  require/process im Context → Code mit Modulen läuft in der Sandbox)
+- Java / Kotlin / React: Compile Cache nach Source-Hash → der Compiler
+  läuft pro Source genau einmal
+- Idle Eviction: ungenutzte Worker werden nach idle_ttl beendet
+- p50/p95 Run-Latenz pro Sprache
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from codestudio.sandbox import Sandbox
+
+logger = logging.getLogger("worker_pool")
+
+WORKERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workers")
+
+# Sprache → Worker-Kommando
+WARM_WORKERS = {
+    "python": [sys.executable, "-u", os.path.join(WORKERS_DIR, "python_worker.py")],
+    "javascript": ["node", os.path.join(WORKERS_DIR, "node_worker.js")],
+}
+
+# Code, den der warme Worker nicht ausführen kann (kein require/import im Context)
+NEEDS_SANDBOX = {
+    "javascript": re.compile(r"\brequire\s*\(|^\s*import\b|\bimport\s*\(", re.MULTILINE),
+}
+
+# Sprachen, deren Executor in get_execution_command() kompiliert
+COMPILED_LANGUAGES = {"java", "kotlin", "react"}
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 1)
+
+
+class Worker:
+    """Ein vorgestarteter Runtime-Prozess (JSON-Zeilen über stdin/stdout)"""
+
+    def __init__(self, language: str, process: asyncio.subprocess.Process):
+        self.language = language
+        self.process = process
+        self.runs = 0
+        self.last_used = time.monotonic()
+        self.killed = False
+
+    @classmethod
+    async def spawn(cls, language: str) -> "Worker":
+        process = await asyncio.create_subprocess_exec(
+            *WARM_WORKERS[language],
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            limit=4 * 1024 * 1024,
+        )
+        worker = cls(language, process)
+        ready = await asyncio.wait_for(process.stdout.readline(), timeout=10)
+        if not ready:
+            raise RuntimeError(f"{language} worker failed to start")
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        # returncode wird erst nach wait() gesetzt → killed zählt sofort
+        return not self.killed and self.process.returncode is None
+
+    async def run(self, code: str, stdin: str, timeout: float, memory_limit: int) -> Dict[str, Any]:
+        request = {"code": code, "stdin": stdin, "timeout": timeout, "memory_limit": memory_limit}
+        self.process.stdin.write((json.dumps(request) + "\n").encode())
+        await self.process.stdin.drain()
+
+        # Worker setzt das Timeout selbst durch; +5s Puffer gegen hängende Worker
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout + 5)
+        if not line:
+            raise RuntimeError(f"{self.language} worker died")
+
+        self.runs += 1
+        self.last_used = time.monotonic()
+        return json.loads(line)
+
+    def kill(self):
+        if self.alive:
+            self.killed = True
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def close(self):
+        self.kill()
+        await self.process.wait()
+
+
+class CompileCache:
+    """
+    Kompilierte Artefakte nach Source-Hash.
+
+    Layout: <cache_dir>/<language>-<sha256>/ mit command.json als
+    Commit-Marker (wird erst nach erfolgreichem Compile geschrieben).
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 256):
+        # Ohne explizites Verzeichnis: eigenes privates Temp-Dir pro Cache
+        # (mkdtemp → 0700), kein geteiltes /tmp-Verzeichnis zwischen Pools/Usern
+        self.cache_dir = cache_dir or os.getenv("VIBEAI_COMPILE_CACHE") or tempfile.mkdtemp(
+            prefix="vibeai_compile_cache_"
+        )
+        self.max_entries = max_entries
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, language: str, code: str) -> str:
+        digest = hashlib.sha256(f"{language}\0{code}".encode("utf-8")).hexdigest()
+        return f"{language}-{digest}"
+
+    async def get_command(self, language: str, executor, code: str):
+        """
+        Liefert das Ausführungs-Kommando; kompiliert nur bei Cache-Miss.
+
+        Returns:
+            (command, cache_hit)
+
+        Raises:
+            RuntimeError: Compile-Fehler (wird nicht gecacht)
+        """
+        key = self.key(language, code)
+        entry_dir = os.path.join(self.cache_dir, key)
+        marker = os.path.join(entry_dir, "command.json")
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if os.path.exists(marker):
+                self.hits += 1
+                os.utime(marker)
+                with open(marker) as f:
+                    return json.load(f), True
+
+            self.misses += 1
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.makedirs(entry_dir, exist_ok=True)
+            try:
+                code_file = executor.prepare_code_file(entry_dir, code)
+                # Executors kompilieren blockierend → in Thread auslagern
+                command = await asyncio.to_thread(executor.get_execution_command, code_file)
+                with open(marker, "w") as f:
+                    json.dump(command, f)
+            except Exception:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                raise
+            finally:
+                self._locks.pop(key, None)
+
+        self._evict()
+        return command, False
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            marker = os.path.join(self.cache_dir, name, "command.json")
+            if os.path.exists(marker):
+                entries.append((os.path.getmtime(marker), name))
+        for _, name in sorted(entries)[: max(0, len(entries) - self.max_entries)]:
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+
+class WorkerPool:
+    """
+    Führt Code Studio Runs aus: warme Worker, Compile Cache oder Sandbox.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        idle_ttl: float = 300.0,
+        max_runs_per_worker: int = 500,
+        compile_cache: CompileCache = None,
+    ):
+        """
+        Args:
+            max_workers: Max. warme Worker pro Sprache
+            idle_ttl: Sekunden ohne Run, nach denen ein Worker beendet wird
+            max_runs_per_worker: Worker nach so vielen Runs recyceln
+            compile_cache: Cache für kompilierte Sprachen
+        """
+        self.max_workers = max_workers
+        self.idle_ttl = idle_ttl
+        self.max_runs_per_worker = max_runs_per_worker
+        self.compile_cache = compile_cache or CompileCache()
+
+        self._idle: Dict[str, List[Worker]] = {lang: [] for lang in WARM_WORKERS}
+        self._busy: Dict[str, int] = {lang: 0 for lang in WARM_WORKERS}
+        self._available: Dict[str, asyncio.Condition] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self._unavailable = set()  # Runtime nicht installiert → Sandbox
+
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    # ---------------------------------------------------------
+    # EXECUTE
+    # ---------------------------------------------------------
+    async def execute(
+        self, language: str, executor, code: str, stdin: str = "", timeout: int = 30, memory_limit: int = 512
+    ) -> Dict[str, Any]:
+        """
+        Führt Code aus und liefert ein Sandbox-kompatibles Ergebnis
+        ({"status", "stdout", "stderr", "returncode"}).
+        """
+        start = time.perf_counter()
+        try:
+            if language in WARM_WORKERS and language not in self._unavailable and not self._needs_sandbox(language, code):
+                result = await self._run_warm(language, code, stdin, timeout, memory_limit)
+                if result is not None:
+                    return result
+
+            if language in COMPILED_LANGUAGES:
+                return await self._run_compiled(language, executor, code, stdin, timeout)
+
+            self._count(language, "sandbox")
+            return await Sandbox(timeout=timeout, memory_limit=memory_limit).execute(executor, code, stdin)
+        finally:
+            self.latencies.setdefault(language, deque(maxlen=1000)).append(time.perf_counter() - start)
+
+    def _needs_sandbox(self, language: str, code: str) -> bool:
+        pattern = NEEDS_SANDBOX.get(language)
+        return bool(pattern and pattern.search(code))
+
+    async def _run_warm(self, language: str, code: str, stdin: str, timeout: int, memory_limit: int):
+        try:
+            worker = await self._acquire(language)
+        except (FileNotFoundError, RuntimeError, asyncio.TimeoutError) as e:
+            logger.warning(f"{language} worker unavailable, falling back to sandbox: {e}")
+            self._unavailable.add(language)
+            return None
+
+        # Jeder nicht-normale Ausstieg (auch CancelledError, ein BaseException)
+        # tötet den Worker: seine Antwortzeile ist evtl. noch ungelesen und
+        # würde sonst beim nächsten User landen.
+        try:
+            response = await worker.run(code, stdin, timeout, memory_limit)
+        except BaseException:
+            worker.kill()
+            raise
+        finally:
+            self._release(worker)
+
+        self._count(language, "warm")
+        if response["timed_out"]:
+            return {"status": "timeout", "stdout": "", "stderr": "Execution timed out.", "returncode": -1}
+
+        return {
+            "status": "success" if response["returncode"] == 0 else "error",
+            "stdout": response["stdout"],
+            "stderr": response["stderr"],
+            "returncode": response["returncode"],
+        }
+
+    async def _run_compiled(self, language: str, executor, code: str, stdin: str, timeout: int):
+        from codestudio.universal_executor import run_process
+
+        try:
+            command, cache_hit = await self.compile_cache.get_command(language, executor, code)
+        except Exception as e:
+            return {"status": "error", "stdout": "", "stderr": str(e), "returncode": -1}
+        self._count(language, "compile_cache_hit" if cache_hit else "compile")
+
+        result = await run_process(command, stdin, timeout=timeout)
+        if result["timed_out"]:
+            return {"status": "timeout", "stdout": "", "stderr": "Execution timed out.", "returncode": -1}
+
+        return {
+            "status": "success" if result["returncode"] == 0 else "error",
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"],
+        }
+
+    # ---------------------------------------------------------
+    # WORKER LIFECYCLE
+    # ---------------------------------------------------------
+    def _condition(self, language: str) -> asyncio.Condition:
+        if language not in self._available:
+            self._available[language] = asyncio.Condition()
+        return self._available[language]
+
+    async def _acquire(self, language: str) -> Worker:
+        self._ensure_reaper()
+        condition = self._condition(language)
+        async with condition:
+            while True:
+                idle = self._idle[language]
+                while idle:
+                    worker = idle.pop()
+                    if worker.alive:
+                        self._busy[language] += 1
+                        return worker
+                if self._busy[language] < self.max_workers:
+                    self._busy[language] += 1
+                    break
+                await condition.wait()
+
+        try:
+            self._count(language, "spawned")
+            return await Worker.spawn(language)
+        except BaseException:
+            async with condition:
+                self._busy[language] -= 1
+                condition.notify()
+            raise
+
+    def _release(self, worker: Worker):
+        language = worker.language
+        self._busy[language] -= 1
+        if worker.alive and worker.runs < self.max_runs_per_worker:
+            self._idle[language].append(worker)
+        else:
+            worker.kill()
+
+        async def notify():
+            async with self._condition(language):
+                self._condition(language).notify()
+
+        asyncio.ensure_future(notify())
+
+    async def warmup(self, languages: List[str] = None, count: int = 1):
+        """Startet Worker vorab (z.B. im App-Lifespan)."""
+        for language in languages or list(WARM_WORKERS):
+            for _ in range(count):
+                try:
+                    worker = await self._acquire(language)
+                except (FileNotFoundError, RuntimeError, asyncio.TimeoutError) as e:
+                    logger.warning(f"{language} worker warmup failed: {e}")
+                    self._unavailable.add(language)
+                    break
+                self._release(worker)
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _reap_idle(self):
+        """Idle Eviction: beendet Worker, die länger als idle_ttl ungenutzt sind."""
+        try:
+            while True:
+                await asyncio.sleep(min(self.idle_ttl, 30))
+                now = time.monotonic()
+                for language, idle in self._idle.items():
+                    expired = [w for w in idle if not w.alive or now - w.last_used >= self.idle_ttl]
+                    for worker in expired:
+                        idle.remove(worker)
+                    for worker in expired:
+                        await worker.close()
+                        self._count(language, "evicted")
+        except asyncio.CancelledError:
+            pass
+
+    async def shutdown(self):
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        for idle in self._idle.values():
+            for worker in idle:
+                await worker.close()
+            idle.clear()
+
+    # ---------------------------------------------------------
+    # STATS
+    # ---------------------------------------------------------
+    def _count(self, language: str, name: str):
+        counters = self.counters.setdefault(language, {})
+        counters[name] = counters.get(name, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        languages = {}
+        for language in set(self.latencies) | set(self.counters):
+            samples = list(self.latencies.get(language, ()))
+            languages[language] = {
+                "runs": len(samples),
+                "p50_ms": _percentile(samples, 50),
+                "p95_ms": _percentile(samples, 95),
+                **self.counters.get(language, {}),
+            }
+
+        return {
+            "languages": languages,
+            "idle_workers": {lang: len(idle) for lang, idle in self._idle.items()},
+            "busy_workers": dict(self._busy),
+            "compile_cache": {"hits": self.compile_cache.hits, "misses": self.compile_cache.misses},
+        }
+
+
+# Global instance
+worker_pool = WorkerPool()
@@ -0,0 +1,235 @@
+"use strict";
+// -------------------------------------------------------------
+// VIBEAI – WARM NODE WORKER
+// -------------------------------------------------------------
+//
+// Vorgestarteter Node-Prozess für Code Studio.
+//
+// Protokoll (eine JSON-Zeile pro Nachricht):
+//   stdin  ← {"code": str, "stdin": str, "timeout": float, "memory_limit": int}
+//   stdout → {"stdout": str, "stderr": str, "returncode": int, "timed_out": bool}
+//
+// Jeder Run läuft in einem FRISCHEN worker_threads Worker (eigener
+// Isolate-Heap, eigene Globals, eigene Timer) mit resourceLimits aus
+// memory_limit. Nach dem Run wird der Worker beendet → nichts, was ein
+// Run verändert (Module, Prototypen, process), überlebt bis zum nächsten.
+//
+// Im vm-Context des Users gibt es KEIN require, process oder Buffer des
+// Hosts: console/process/Timer werden im Context selbst definiert und
+// reden mit dem Host nur über eine Bridge-Funktion mit primitiven Werten.
+// Der Node-Prozess wird nur noch für den Start der Worker warmgehalten.
+
+const { Worker, isMainThread, parentPort, workerData } = require("worker_threads");
+
+const MAX_OUTPUT = 1024 * 1024;
+const YOUNG_GENERATION_MB = 16;
+const STACK_MB = 4;
+
+// -------------------------------------------------------------
+// WORKER THREAD: ein Run
+// -------------------------------------------------------------
+
+// Läuft IM Context: baut die Globals des Users, hält die Bridge nur als Closure
+const BOOTSTRAP = `(function (host, stdinText) {
+  "use strict";
+  const inspect = (value, depth) => {
+    if (typeof value === "string") return depth ? JSON.stringify(value) : value;
+    if (typeof value === "function") return "[Function: " + (value.name || "anonymous") + "]";
+    if (typeof value === "symbol" || typeof value === "bigint") return value.toString() + (typeof value === "bigint" ? "n" : "");
+    if (value === null || typeof value !== "object") return String(value);
+    if (value instanceof Error) return value.stack || String(value);
+    if (depth > 2) return Array.isArray(value) ? "[Array]" : "[Object]";
+    if (Array.isArray(value)) return "[ " + value.map((v) => inspect(v, depth + 1)).join(", ") + " ]";
+    if (value instanceof Map) return "Map(" + value.size + ") { " + [...value].map(([k, v]) => inspect(k, depth + 1) + " => " + inspect(v, depth + 1)).join(", ") + " }";
+    if (value instanceof Set) return "Set(" + value.size + ") { " + [...value].map((v) => inspect(v, depth + 1)).join(", ") + " }";
+    const keys = Object.keys(value);
+    if (!keys.length) return "{}";
+    return "{ " + keys.map((k) => k + ": " + inspect(value[k], depth + 1)).join(", ") + " }";
+  };
+  const format = (args) => args.map((v) => inspect(v, 0)).join(" ") + "\\n";
+  const write = (fd) => (...args) => host("write", fd, format(args));
+
+  const callbacks = new Map();
+  let nextTimer = 1;
+  const schedule = (repeat) => (fn, ms, ...args) => {
+    const id = nextTimer++;
+    callbacks.set(id, { fn, args, repeat });
+    host("setTimer", id, Number(ms) || 0, repeat);
+    return id;
+  };
+  const clear = (id) => {
+    if (callbacks.delete(id)) host("clearTimer", id);
+  };
+  const fire = (id) => {
+    const timer = callbacks.get(id);
+    if (!timer) return;
+    if (!timer.repeat) callbacks.delete(id);
+    timer.fn(...timer.args);
+  };
+
+  Object.assign(globalThis, {
+    console: { log: write(1), info: write(1), debug: write(1), warn: write(2), error: write(2) },
+    setTimeout: schedule(false),
+    setInterval: schedule(true),
+    clearTimeout: clear,
+    clearInterval: clear,
+    queueMicrotask: (fn) => Promise.resolve().then(fn),
+    process: {
+      argv: ["node", "main.js"],
+      env: {},
+      platform: host("platform"),
+      version: host("version"),
+      stdout: { write: (s) => { host("write", 1, String(s)); return true; } },
+      stderr: { write: (s) => { host("write", 2, String(s)); return true; } },
+      stdin: { read: () => stdinText },
+      exit: (code = 0) => host("exit", Number(code) || 0),
+    },
+  });
+  return fire;
+})`;
+
+function runInThread({ code, stdin }) {
+  const vm = require("vm");
+  let written = 0;
+  let returncode = 0;
+  const timers = new Map();
+  let fire = null;
+
+  const emit = (fd, text) => {
+    if (written >= MAX_OUTPUT) return;
+    written += text.length;
+    parentPort.postMessage({ type: "output", fd, text });
+  };
+  const fail = (e) => {
+    emit(2, (e && e.stack ? e.stack : String(e)) + "\n");
+    returncode = 1;
+  };
+
+  // Bridge: nur primitive Argumente und Rückgabewerte
+  const host = (op, a, b, c) => {
+    switch (op) {
+      case "write":
+        emit(a === 2 ? 2 : 1, String(b));
+        return undefined;
+      case "setTimer": {
+        const tick = () => fire(a);
+        timers.set(a, c ? setInterval(tick, b) : setTimeout(() => { timers.delete(a); tick(); }, b));
+        return undefined;
+      }
+      case "clearTimer":
+        clearTimeout(timers.get(a));
+        clearInterval(timers.get(a));
+        timers.delete(a);
+        return undefined;
+      case "exit":
+        parentPort.postMessage({ type: "exit", returncode: a });
+        process.exit(a);
+        return undefined;
+      case "platform":
+        return process.platform;
+      case "version":
+        return process.version;
+      default:
+        return undefined;
+    }
+  };
+
+  // Fehler aus Timern/Promises des User-Codes
+  process.on("uncaughtException", fail);
+  process.on("unhandledRejection", fail);
+  process.on("exit", () => parentPort.postMessage({ type: "exit", returncode }));
+
+  const context = vm.createContext({}, { codeGeneration: { strings: true, wasm: false } });
+  fire = vm.runInContext(BOOTSTRAP, context)(host, String(stdin || ""));
+
+  try {
+    const result = vm.runInContext(code, context, { filename: "main.js" });
+    if (result && typeof result.then === "function") result.then(undefined, fail);
+  } catch (e) {
+    fail(e);
+  }
+}
+
+// -------------------------------------------------------------
+// MAIN THREAD: Protokoll + ein Worker pro Run
+// -------------------------------------------------------------
+
+function run(request) {
+  return new Promise((resolve) => {
+    const out = [];
+    const err = [];
+    const timeoutMs = Math.max(1, (request.timeout || 30) * 1000);
+    const memoryMb = Math.max(YOUNG_GENERATION_MB * 2, request.memory_limit || 512);
+    let returncode = null;
+    let timedOut = false;
+
+    const worker = new Worker(__filename, {
+      workerData: { code: String(request.code || ""), stdin: request.stdin || "" },
+      resourceLimits: {
+        maxOldGenerationSizeMb: memoryMb - YOUNG_GENERATION_MB,
+        maxYoungGenerationSizeMb: YOUNG_GENERATION_MB,
+        stackSizeMb: STACK_MB,
+      },
+      env: {},
+      argv: [],
+      execArgv: [],
+      stdin: false,
+      stdout: true,
+      stderr: true,
+    });
+    // Eigene Streams des Threads nicht ins Protokoll auf stdout mischen
+    worker.stdout.resume();
+    worker.stderr.resume();
+
+    const timer = setTimeout(() => {
+      timedOut = true;
+      worker.terminate();
+    }, timeoutMs);
+
+    worker.on("message", (message) => {
+      if (message.type === "output") (message.fd === 2 ? err : out).push(message.text);
+      else if (message.type === "exit" && returncode === null) returncode = message.returncode;
+    });
+    worker.on("error", (e) => {
+      if (e && e.code === "ERR_WORKER_OUT_OF_MEMORY") {
+        err.push(`MemoryError: Execution exceeded ${memoryMb}MB memory limit\n`);
+      } else {
+        err.push((e && e.stack ? e.stack : String(e)) + "\n");
+      }
+      returncode = 1;
+    });
+    worker.on("exit", (exitCode) => {
+      clearTimeout(timer);
+      if (returncode === null) returncode = exitCode;
+      resolve({
+        stdout: out.join(""),
+        stderr: err.join(""),
+        returncode: timedOut ? -9 : returncode,
+        timed_out: timedOut,
+      });
+    });
+  });
+}
+
+if (isMainThread) {
+  const readline = require("readline");
+  const rl = readline.createInterface({ input: process.stdin });
+  let queue = Promise.resolve();
+
+  rl.on("line", (line) => {
+    if (!line.trim()) return;
+    queue = queue.then(async () => {
+      let response;
+      try {
+        response = await run(JSON.parse(line));
+      } catch (e) {
+        response = { stdout: "", stderr: `Worker error: ${e}`, returncode: -1, timed_out: false };
+      }
+      process.stdout.write(JSON.stringify(response) + "\n");
+    });
+  });
+
+  process.stdout.write(JSON.stringify({ ready: true }) + "\n");
+} else {
+  runInThread(workerData);
+}
@@ -0,0 +1,171 @@
+# -------------------------------------------------------------
+# VIBEAI – WARM PYTHON WORKER (Zygote)
+# -------------------------------------------------------------
+"""
+Vorgestarteter Python-Prozess für Code Studio.
+
+Protokoll (eine JSON-Zeile pro Nachricht):
+    stdin  ← {"code": str, "stdin": str, "timeout": float, "memory_limit": int}
+    stdout → {"stdout": str, "stderr": str, "returncode": int, "timed_out": bool}
+
+Jeder Run läuft in einem frisch geforkten Kind-Prozess (eigene Session,
+rlimits). Der Zustand des Users landet nie im Worker selbst → Reset
+zwischen Runs ist gratis, der Interpreter-Start entfällt.
+"""
+
+import json
+import os
+import select
+import signal
+import sys
+import time
+
+# Häufige Stdlib-Module vorwärmen (Kinder erben sie per fork)
+import collections  # noqa: F401
+import datetime  # noqa: F401
+import functools  # noqa: F401
+import itertools  # noqa: F401
+import math  # noqa: F401
+import random  # noqa: F401
+import re  # noqa: F401
+import traceback
+
+MAX_OUTPUT = 1024 * 1024
+
+# fd des Protokoll-Kanals (wird im Kind geschlossen)
+PROTO_FD = None
+
+
+def _child(code: str, memory_limit: int, timeout: float, in_r: int, out_w: int, err_w: int):
+    os.setsid()
+    os.dup2(in_r, 0)
+    os.dup2(out_w, 1)
+    os.dup2(err_w, 2)
+
+    try:
+        import resource
+
+        if memory_limit:
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        cpu = int(timeout) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    sys.stdin = os.fdopen(0, "r", closefd=False)
+    sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+    sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+    sys.argv = ["main.py"]
+
+    returncode = 0
+    try:
+        exec(compile(code, "main.py", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if e.code is not None and not isinstance(e.code, int):
+            print(e.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(returncode)
+
+
+def _run(request: dict) -> dict:
+    timeout = float(request.get("timeout", 30))
+    in_r, in_w = os.pipe()
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        for fd in (in_w, out_r, err_r, PROTO_FD):
+            os.close(fd)
+        _child(request["code"], request.get("memory_limit", 0), timeout, in_r, out_w, err_w)
+
+    for fd in (in_r, out_w, err_w):
+        os.close(fd)
+
+    pending_in = request.get("stdin", "").encode()
+    if not pending_in:
+        os.close(in_w)
+        in_w = None
+    else:
+        os.set_blocking(in_w, False)
+
+    buffers = {out_r: bytearray(), err_r: bytearray()}
+    open_fds = [out_r, err_r]
+    deadline = time.monotonic() + timeout
+    timed_out = False
+
+    while open_fds:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        writers = [in_w] if in_w is not None else []
+        readable, writable, _ = select.select(open_fds, writers, [], remaining)
+        if writable:
+            try:
+                sent = os.write(in_w, pending_in[:65536])
+                pending_in = pending_in[sent:]
+            except (BrokenPipeError, BlockingIOError):
+                pending_in = b""
+            if not pending_in:
+                os.close(in_w)
+                in_w = None
+        for fd in readable:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                open_fds.remove(fd)
+            elif len(buffers[fd]) < MAX_OUTPUT:
+                buffers[fd] += chunk
+
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    _, status = os.waitpid(pid, 0)
+    for fd in (out_r, err_r) + ((in_w,) if in_w is not None else ()):
+        os.close(fd)
+
+    if os.WIFEXITED(status):
+        returncode = os.WEXITSTATUS(status)
+    else:
+        returncode = -os.WTERMSIG(status)
+
+    return {
+        "stdout": buffers[out_r][:MAX_OUTPUT].decode("utf-8", errors="replace"),
+        "stderr": buffers[err_r][:MAX_OUTPUT].decode("utf-8", errors="replace"),
+        "returncode": returncode,
+        "timed_out": timed_out,
+    }
+
+
+def main():
+    global PROTO_FD
+
+    # Protokoll-Kanal auf eigenen fd legen; fd 1 gehört später dem User-Code
+    PROTO_FD = os.dup(1)
+    proto_out = os.fdopen(PROTO_FD, "w", buffering=1)
+    proto_out.write(json.dumps({"ready": True}) + "\n")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _run(json.loads(line))
+        except Exception as e:
+            response = {"stdout": "", "stderr": f"Worker error: {e}", "returncode": -1, "timed_out": False}
+        proto_out.write(json.dumps(response) + "\n")
+
+
+if __name__ == "__main__":
+    main()
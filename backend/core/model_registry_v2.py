@@ -1696,6 +1696,7 @@ def get_provider_stats() -> dict:
 # 👉 Das Dictionary ist perfekt, aber es braucht eine Runtime-Schicht
 
 from core.provider_clients.anthropic_client import AnthropicProvider
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 from core.provider_clients.local_client import LocalProvider
 from core.provider_clients.openai_client import OpenAIProvider
 
@@ -1710,11 +1711,14 @@ class ModelRegistryV2:
     Verbindet ALL_MODELS mit Provider-Clients.
     """
 
-    def __init__(self):
+    def __init__(self, pool: HTTPTransportPool = None):
+        # Ein geteilter HTTP Transport für alle Provider
+        self.http_pool = pool or http_pool
+
         # Provider Instanzen
         self.providers = {
-            "openai": OpenAIProvider(),
-            "anthropic": AnthropicProvider(),
+            "openai": OpenAIProvider(pool=self.http_pool),
+            "anthropic": AnthropicProvider(pool=self.http_pool),
             "google": LocalProvider(),  # Fallback bis Google-Client fertig
             "github": LocalProvider(),  # Fallback bis GitHub-Client fertig
             "github-azure": LocalProvider(),  # Fallback
@@ -1733,6 +1737,18 @@ class ModelRegistryV2:
 
         return ModelWrapper(model=model_name, provider=provider, info=model_info)
 
+    def get_pool_metrics(self) -> dict:
+        """
+        Auslastung des geteilten HTTP Pools (pro Provider).
+        """
+        return self.http_pool.get_metrics()
+
+    async def aclose(self):
+        """
+        Schließt alle Provider-Verbindungen (FastAPI Shutdown).
+        """
+        await self.http_pool.aclose()
+
 
 class ModelWrapper:
     """
@@ -69,7 +69,7 @@ class AnthropicClient:
 # -------------------------------------------------------------
 # VIBEAI – ANTHROPIC PROVIDER (ASYNC + MODEL REGISTRY COMPATIBLE)
 # -------------------------------------------------------------
-import httpx
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 
 
 class AnthropicProvider:
@@ -84,6 +84,10 @@ class AnthropicProvider:
 
     API_URL = "https://api.anthropic.com/v1/messages"
 
+    def __init__(self, pool: HTTPTransportPool = None):
+        # Geteilter Keep-Alive Transport statt Client pro Request
+        self.pool = pool or http_pool
+
     async def generate(self, model: str, messages: list, context: dict):
         """
         Einheitliche Schnittstelle für ModelWrapper.
@@ -132,10 +136,9 @@ class AnthropicProvider:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.post(self.API_URL, headers=headers, json=body)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await self.pool.post("anthropic", self.API_URL, headers=headers, json=body)
+            resp.raise_for_status()
+            data = resp.json()
 
             # Extract response
             output = data["content"][0]["text"] if data.get("content") else ""
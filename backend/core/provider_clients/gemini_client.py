@@ -26,7 +26,8 @@
 
 import os
 import base64
-import httpx
+
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
@@ -45,6 +46,10 @@ class GeminiProvider:
 
     API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
 
+    def __init__(self, pool: HTTPTransportPool = None):
+        # Geteilter Keep-Alive Transport statt Client pro Request
+        self.pool = pool or http_pool
+
     async def generate(self, model: str, messages: list, context: dict):
         """
         Einheitliche Schnittstelle für Gemini.
@@ -105,17 +110,16 @@ class GeminiProvider:
             },
         }
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            try:
-                resp = await client.post(url, json=body)
-                data = resp.json()
-
-                # Gemini Output extrahieren
-                output_text = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-            except Exception:
-                # Fallback wenn API nicht erreichbar
-                output_text = "Gemini response unavailable. Fallback executed."
-                data = {}
+        try:
+            resp = await self.pool.post("google", url, json=body)
+            data = resp.json()
+
+            # Gemini Output extrahieren
+            output_text = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
+        except Exception:
+            # Fallback wenn API nicht erreichbar
+            output_text = "Gemini response unavailable. Fallback executed."
+            data = {}
 
         # Token Usage auslesen (wichtig für Billing!)
         usage = data.get("usageMetadata", {})
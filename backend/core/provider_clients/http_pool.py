@@ -0,0 +1,226 @@
+# -------------------------------------------------------------
+# VIBEAI – SHARED POOLED HTTP TRANSPORT FÜR PROVIDER CLIENTS
+# -------------------------------------------------------------
+# Vorher: Jeder Provider-Call öffnete einen neuen httpx.AsyncClient
+#         → neuer TCP + TLS Handshake pro Completion.
+#
+# Jetzt: Ein prozessweiter Pool:
+# ✔ Ein langlebiger httpx.AsyncClient pro Provider (Keep-Alive)
+# ✔ HTTP/2 wenn das "h2" Paket installiert ist
+# ✔ Connection-Limits pro Provider
+# ✔ Konfigurierbare Timeouts (ENV, Read-Timeout auch pro Provider)
+# ✔ Pool-Auslastungsmetriken (in-flight, peak, Latenz)
+# ✔ Graceful Shutdown über den FastAPI Lifespan (aclose())
+# -------------------------------------------------------------
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Default Limits pro Provider (max_connections, max_keepalive)
+# Überschreibbar via VIBEAI_HTTP_<PROVIDER>_MAX_CONNECTIONS
+DEFAULT_PROVIDER_LIMITS = {
+    "openai": (100, 20),
+    "anthropic": (50, 10),
+    "google": (50, 10),
+    "ollama": (10, 5),
+    "default": (20, 5),
+}
+
+
+class HTTPTransportPool:
+    """
+    Prozessweiter HTTP Transport für alle Provider Clients.
+
+    Jeder Provider bekommt einen eigenen, lazy erzeugten httpx.AsyncClient
+    mit eigenen Limits, damit ein überlasteter Provider die anderen nicht
+    aushungert.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None):
+        self.limits = dict(DEFAULT_PROVIDER_LIMITS)
+        if limits:
+            self.limits.update(limits)
+
+        self.http2 = HTTP2_AVAILABLE and os.getenv("VIBEAI_HTTP2", "1") != "0"
+        self.keepalive_expiry = _env_float("VIBEAI_HTTP_KEEPALIVE_EXPIRY", 30.0)
+        self.connect_timeout = _env_float("VIBEAI_HTTP_CONNECT_TIMEOUT", 5.0)
+        self.read_timeout = _env_float("VIBEAI_HTTP_READ_TIMEOUT", 60.0)
+        self.write_timeout = _env_float("VIBEAI_HTTP_WRITE_TIMEOUT", 10.0)
+        self.pool_timeout = _env_float("VIBEAI_HTTP_POOL_TIMEOUT", 10.0)
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, dict] = {}
+
+    # ---------------------------------------------------------
+    # Clients
+    # ---------------------------------------------------------
+    def _provider_limits(self, provider: str) -> httpx.Limits:
+        max_conn, max_keepalive = self.limits.get(provider, self.limits["default"])
+        key = provider.upper().replace("-", "_")
+        max_conn = _env_int(f"VIBEAI_HTTP_{key}_MAX_CONNECTIONS", max_conn)
+        max_keepalive = _env_int(f"VIBEAI_HTTP_{key}_MAX_KEEPALIVE", max_keepalive)
+        return httpx.Limits(
+            max_connections=max_conn,
+            max_keepalive_connections=min(max_keepalive, max_conn),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _provider_read_timeout(self, provider: str) -> float:
+        key = provider.upper().replace("-", "_")
+        return _env_float(f"VIBEAI_HTTP_{key}_READ_TIMEOUT", self.read_timeout)
+
+    def _default_timeout(self, provider: str) -> httpx.Timeout:
+        # Read-Timeout überschreibbar via VIBEAI_HTTP_<PROVIDER>_READ_TIMEOUT
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self._provider_read_timeout(provider),
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """
+        Gibt den geteilten AsyncClient für einen Provider zurück.
+        Wird beim ersten Zugriff erzeugt.
+        """
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            limits = self._provider_limits(provider)
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=limits,
+                timeout=self._default_timeout(provider),
+            )
+            self._clients[provider] = client
+            self._metrics.setdefault(
+                provider, self._empty_metrics(limits.max_connections, client.timeout.read)
+            )
+        return client
+
+    # ---------------------------------------------------------
+    # Requests (mit Metriken)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _empty_metrics(max_connections: int, read_timeout: float) -> dict:
+        return {
+            "max_connections": max_connections,
+            "read_timeout": read_timeout,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "total_requests": 0,
+            "failed_requests": 0,
+            "total_latency": 0.0,
+        }
+
+    @asynccontextmanager
+    async def track(self, provider: str):
+        """
+        Zählt einen laufenden Request für die Auslastungsmetriken.
+        """
+        client = self.client(provider)
+        metrics = self._metrics[provider]
+        metrics["in_flight"] += 1
+        metrics["total_requests"] += 1
+        metrics["peak_in_flight"] = max(metrics["peak_in_flight"], metrics["in_flight"])
+        start = time.perf_counter()
+        try:
+            yield client
+        except BaseException:
+            metrics["failed_requests"] += 1
+            raise
+        finally:
+            metrics["in_flight"] -= 1
+            metrics["total_latency"] += time.perf_counter() - start
+
+    async def request(self, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Führt einen Request über den geteilten Client des Providers aus.
+        Timeouts kommen aus dem Pool (ENV); Provider Clients übergeben keine
+        eigenen, ein explizites `timeout` würde die ENV-Settings aushebeln.
+        """
+        async with self.track(provider) as client:
+            return await client.request(method, url, **kwargs)
+
+    async def post(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "POST", url, **kwargs)
+
+    async def get(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "GET", url, **kwargs)
+
+    # ---------------------------------------------------------
+    # Metriken
+    # ---------------------------------------------------------
+    def get_metrics(self) -> dict:
+        """
+        Pool-Auslastung pro Provider (zum Sizing der Limits).
+        """
+        providers = {}
+        for provider, m in self._metrics.items():
+            total = m["total_requests"]
+            providers[provider] = {
+                **m,
+                "utilization": round(m["in_flight"] / m["max_connections"], 3) if m["max_connections"] else 0.0,
+                "peak_utilization": (
+                    round(m["peak_in_flight"] / m["max_connections"], 3) if m["max_connections"] else 0.0
+                ),
+                "avg_latency": round(m["total_latency"] / total, 4) if total else 0.0,
+                "open": provider in self._clients and not self._clients[provider].is_closed,
+            }
+
+        return {
+            "http2": self.http2,
+            "keepalive_expiry": self.keepalive_expiry,
+            "timeouts": {
+                "connect": self.connect_timeout,
+                "read": self.read_timeout,
+                "write": self.write_timeout,
+                "pool": self.pool_timeout,
+            },
+            "providers": providers,
+        }
+
+    def reset_metrics(self):
+        for provider, m in self._metrics.items():
+            self._metrics[provider] = self._empty_metrics(m["max_connections"], m["read_timeout"])
+
+    # ---------------------------------------------------------
+    # Shutdown
+    # ---------------------------------------------------------
+    async def aclose(self):
+        """
+        Schließt alle Provider-Clients (FastAPI Lifespan Shutdown).
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
+# Globale Instanz
+http_pool = HTTPTransportPool()
@@ -1,5 +1,6 @@
 import base64
-import httpx
+
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 
 # -------------------------------------------------------------
 # VIBEAI – LOCAL PROVIDER (FALLBACK FOR UNIMPLEMENTED PROVIDERS)
@@ -101,8 +102,10 @@ class OllamaProvider:
     - model_registry_v2 kompatibel
     """
 
-    def __init__(self, host: str = "http://localhost:11434"):
+    def __init__(self, host: str = "http://localhost:11434", pool: HTTPTransportPool = None):
         self.host = host
+        # Geteilter Keep-Alive Transport statt Client pro Request
+        self.pool = pool or http_pool
         self.chat_url = f"{host}/api/chat"
         self.generate_url = f"{host}/api/generate"
         self.embeddings_url = f"{host}/api/embeddings"
@@ -178,9 +181,8 @@ class OllamaProvider:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(self.chat_url, json=body)
-                data = resp.json()
+            resp = await self.pool.post("ollama", self.chat_url, json=body)
+            data = resp.json()
 
             # Output extrahieren
             output_text = data.get("message", {}).get("content", "")
@@ -243,9 +245,8 @@ class OllamaProvider:
                 "stream": False,
             }
 
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(self.chat_url, json=body)
-                data = resp.json()
+            resp = await self.pool.post("ollama", self.chat_url, json=body)
+            data = resp.json()
 
             return data.get("message", {}).get("content", "")
 
@@ -271,9 +272,8 @@ class OllamaProvider:
         try:
             body = {"model": model, "prompt": text}
 
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.post(self.embeddings_url, json=body)
-                data = resp.json()
+            resp = await self.pool.post("ollama", self.embeddings_url, json=body)
+            data = resp.json()
 
             return data.get("embedding", [])
 
@@ -294,9 +294,8 @@ class OllamaProvider:
         try:
             body = {"model": model, "prompt": prompt, "stream": False}
 
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(self.generate_url, json=body)
-                data = resp.json()
+            resp = await self.pool.post("ollama", self.generate_url, json=body)
+            data = resp.json()
 
             return data.get("response", "")
 
@@ -1,4 +1,4 @@
-import httpx
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 
 
 class OllamaProvider:
@@ -17,6 +17,10 @@ class OllamaProvider:
 
     BASE_URL = "http://localhost:11434"
 
+    def __init__(self, pool: HTTPTransportPool = None):
+        # Geteilter Keep-Alive Transport statt Client pro Request
+        self.pool = pool or http_pool
+
     async def generate(self, model: str, messages: list, context: dict):
         """
         Einheitliche Schnittstelle für Ollama.
@@ -77,27 +81,24 @@ class OllamaProvider:
             },
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            try:
-                resp = await client.post(url, json=body)
-                data = resp.json()
+        try:
+            resp = await self.pool.post("ollama", url, json=body)
+            data = resp.json()
 
-                # Ollama Output extrahieren
-                output_text = data.get("message", {}).get("content", "")
+            # Ollama Output extrahieren
+            output_text = data.get("message", {}).get("content", "")
 
-                # Token Schätzung (Ollama liefert keine echten Tokens)
-                # Wir schätzen: ~4 chars = 1 token (Standard-Regel)
-                input_text = " ".join([str(m.get("content", "")) for m in ollama_messages])
-                input_tokens = len(input_text) // 4
-                output_tokens = len(output_text) // 4
+            # Token Schätzung (Ollama liefert keine echten Tokens)
+            # Wir schätzen: ~4 chars = 1 token (Standard-Regel)
+            input_text = " ".join([str(m.get("content", "")) for m in ollama_messages])
+            input_tokens = len(input_text) // 4
+            output_tokens = len(output_text) // 4
 
-            except Exception as e:
-                # Fallback wenn Ollama nicht läuft
-                output_text = (
-                    f"Ollama unavailable. Please ensure Ollama is running on {self.BASE_URL}. Error: {str(e)}"
-                )
-                input_tokens = 0
-                output_tokens = 0
+        except Exception as e:
+            # Fallback wenn Ollama nicht läuft
+            output_text = f"Ollama unavailable. Please ensure Ollama is running on {self.BASE_URL}. Error: {str(e)}"
+            input_tokens = 0
+            output_tokens = 0
 
         return {
             "provider": "ollama",
@@ -122,10 +123,9 @@ class OllamaProvider:
 
         body = {"model": model, "prompt": text}
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            try:
-                resp = await client.post(url, json=body)
-                data = resp.json()
-                return data.get("embedding", [])
-            except Exception:
-                return []
\ No newline at end of file
+        try:
+            resp = await self.pool.post("ollama", url, json=body)
+            data = resp.json()
+            return data.get("embedding", [])
+        except Exception:
+            return []
\ No newline at end of file
@@ -1,7 +1,7 @@
 import base64
 import os
 
-import httpx
+from core.provider_clients.http_pool import HTTPTransportPool, http_pool
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -24,6 +24,10 @@ class OpenAIProvider:
 
     API_URL = "https://api.openai.com/v1/chat/completions"
 
+    def __init__(self, pool: HTTPTransportPool = None):
+        # Geteilter Keep-Alive Transport statt Client pro Request
+        self.pool = pool or http_pool
+
     async def generate(self, model: str, messages: list, context: dict):
         """
         Einheitliche Schnittstelle für VibeAI.
@@ -103,9 +107,8 @@ class OpenAIProvider:
             body["stream"] = False
 
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                resp = await client.post(self.API_URL, headers=headers, json=body)
-                data = resp.json()
+            resp = await self.pool.post("openai", self.API_URL, headers=headers, json=body)
+            data = resp.json()
 
             output = data.get("choices", [{}])[0].get("message", {}).get("content", "")
 
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends
 
 from core.auth import require_admin  # Corrected import path
 from core.provider_health import provider_health_monitor, ProviderHealthMonitor  # Ensure correct imports
+from core.provider_clients.http_pool import http_pool
 
 router = APIRouter(prefix="/api/providers", tags=["Provider Health"])
 
@@ -48,6 +49,19 @@ async def get_best_provider(priority: str = "balanced", admin=Depends(require_ad
     }
 
 
+@router.get("/pool")
+async def get_provider_pool_metrics(admin=Depends(require_admin)):
+    """
+    Auslastung des geteilten HTTP Connection Pools.
+    Zeigt pro Provider:
+    - Max Connections
+    - Laufende / Peak Requests
+    - Auslastung (utilization)
+    - Durchschnittliche Latenz
+    """
+    return http_pool.get_metrics()
+
+
 @router.post("/reset-metrics")
 async def reset_provider_metrics(admin=Depends(require_admin)):
     """
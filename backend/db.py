@@ -1,6 +1,6 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
@@ -26,6 +26,69 @@ def get_db():
     finally:
         db.close()
 
+# Spalten, die nach dem ersten create_all() dazukamen.
+# create_all() legt nur fehlende Tabellen an, ändert bestehende nicht.
+# (Tabelle, Spalte, DDL, Backfill-SQL oder None)
+ADDED_COLUMNS = [
+    (
+        "users",
+        "is_suspended",
+        "BOOLEAN NOT NULL DEFAULT FALSE",
+        "UPDATE users SET is_suspended = TRUE WHERE role = 'SUSPENDED'",
+    ),
+]
+
+# Indizes, die nach dem ersten create_all() dazukamen (Tabelle, Index, Spalten)
+ADDED_INDEXES = [
+    ("messages", "ix_messages_session_created", "session_id, created_at, id"),
+]
+
+# Foreign Keys, die aus dem Modell entfernt wurden (Tabelle, Spalte).
+# SQLite erzwingt FKs ohne PRAGMA nicht und kann Constraints nicht droppen.
+DROPPED_FOREIGN_KEYS = [
+    ("messages", "session_id"),
+]
+
+
+def migrate_db(bind=None):
+    """
+    Zieht fehlende Spalten per ALTER TABLE ADD COLUMN und fehlende Indizes
+    per CREATE INDEX IF NOT EXISTS nach und entfernt nicht mehr gewollte
+    Foreign Keys (idempotent).
+    Gibt die geänderten Spalten/Indizes/FKs als "tabelle.name" zurück.
+    """
+    added = []
+    with (bind or engine).begin() as conn:
+        inspector = inspect(conn)
+        tables = set(inspector.get_table_names())
+        for table, column, ddl, backfill in ADDED_COLUMNS:
+            if table not in tables:
+                continue  # create_all() legt die Tabelle komplett an
+            if column in {c["name"] for c in inspector.get_columns(table)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            if backfill:
+                conn.execute(text(backfill))
+            added.append(f"{table}.{column}")
+        for table, index, columns in ADDED_INDEXES:
+            if table not in tables:
+                continue
+            if index in {ix["name"] for ix in inspector.get_indexes(table)}:
+                continue
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns})"))
+            added.append(f"{table}.{index}")
+        if conn.dialect.name != "sqlite":
+            for table, column in DROPPED_FOREIGN_KEYS:
+                if table not in tables:
+                    continue
+                for fk in inspector.get_foreign_keys(table):
+                    if fk["constrained_columns"] == [column] and fk.get("name"):
+                        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {fk['name']}"))
+                        added.append(f"{table}.{fk['name']}")
+    return added
+
+
 # Init
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    migrate_db()
\ No newline at end of file
@@ -1,6 +1,12 @@
 # backend/llm/openai_client.py
 # ---------------------------
 # OpenAI Client-Wrapper für LLM-Router
+#
+# Streaming läuft komplett async über openai.AsyncOpenAI:
+# - kein blockierendes `for chunk in response` auf dem Event-Loop
+# - Backpressure: der nächste Chunk wird erst gelesen, wenn der
+#   Consumer (SSE-Stream) ihn abholt
+# - Cancellation: bricht der Client ab, wird der HTTP-Stream geschlossen
 
 import os
 import openai
@@ -9,51 +15,54 @@ from llm.base import BaseLLM
 
 class OpenAIClient(BaseLLM):
     """
-    OpenAI GPT Client mit Streaming-Support.
+    OpenAI GPT Client mit async Streaming-Support.
     """
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None):
+    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None, client=None):
         """
         Args:
             model: OpenAI Modell-ID (z.B. "gpt-4o", "gpt-4o-mini")
             api_key: Optional API Key (nutzt ENV wenn nicht gegeben)
+            client: Optional vorhandener AsyncOpenAI Client (geteilt / Tests)
         """
         self.model = model
-        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = client or openai.AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
 
     async def stream(self, prompt: str, system_prompt: str = None):
         """
         Streamt Antwort von OpenAI.
-        
+
         Args:
             prompt: User-Nachricht
             system_prompt: Optionaler System-Prompt
-            
+
         Yields:
             str: Text-Chunks
         """
-        import asyncio
-        
         messages = []
-        
+
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
-            
+
         messages.append({"role": "user", "content": prompt})
 
+        response = None
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 stream=True,
                 temperature=0.7,
             )
 
-            # OpenAI stream ist synchron, also in executor laufen lassen
-            for chunk in response:
-                if chunk.choices[0].delta.content:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
-                    await asyncio.sleep(0)  # Yield control
 
         except Exception as e:
             yield f"❌ OpenAI Error: {str(e)}"
+
+        finally:
+            # Client-Disconnect / Abbruch: HTTP-Stream sofort freigeben
+            if response is not None and hasattr(response, "close"):
+                await response.close()
@@ -5,6 +5,8 @@ Full-featured API with Authentication, Sessions, Chat, Models, and more
 import os
 import time
 import asyncio
+import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +25,10 @@ from kernel.control.human_control import ControlMode
 from kernel.streamer import SSEStreamer
 from llm.router import LLMRouter
 from llm.openai_client import OpenAIClient
+from kernel.kernel_session import KernelSession
+from core.provider_clients.http_pool import http_pool
+from password_hasher import BCRYPT_ROUNDS, password_hasher
+from message_store import message_store
 
 try:
     import google.generativeai as genai
@@ -37,7 +43,9 @@ from fastapi import (
     FastAPI,
     File,
     HTTPException,
+    Query,
     Request,
+    Response,
     UploadFile,
     status,
 )
@@ -158,7 +166,7 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -333,12 +341,33 @@ MODELS = {
 # -------------------------------------------------------------
 # FASTAPI APP SETUP
 # -------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/Shutdown: Schema-Migration, LLMRouter für den Chat-Stream bauen, Provider-Verbindungen sauber schließen"""
+    try:
+        from db import migrate_db
+
+        added = await asyncio.to_thread(migrate_db)
+        if added:
+            print(f"🛠️  DB migration: added {', '.join(added)}")
+    except Exception as e:
+        print(f"⚠️  DB migration failed: {e}")
+    try:
+        _chat_llm_router()
+    except Exception as e:
+        print(f"⚠️  LLM router setup failed: {e}")
+    yield
+    await http_pool.aclose()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title="VibeAI Backend API",
     description="Complete AI-Powered Development Platform with Authentication, Chat, Models, and more",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -352,9 +381,7 @@ app.add_middleware(
 # In-memory stores (for development - use Redis/DB in production)
 users_db = {}
 sessions_db = {}
-messages_db = {}
 session_counter = 0
-message_counter = 0
 user_counter = 0
 
 # -------------------------------------------------------------
@@ -372,7 +399,7 @@ async def register(user_data: UserCreate):
     
     # Create user
     user_id = user_counter
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.run(get_password_hash, user_data.password)
     
     user = {
         "id": user_id,
@@ -418,11 +445,20 @@ async def login(user_data: UserLogin):
             user = u
             break
     
-    if not user or not verify_password(user_data.password, user["hashed_password"]):
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await password_hasher.verify_and_rehash(
+            verify_password, get_password_hash, user_data.password, user["hashed_password"]
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
+
+    if new_hash:
+        user["hashed_password"] = new_hash
     
     # Create access token
     access_token_expires = timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
@@ -459,13 +495,10 @@ async def get_me(current_user = Depends(get_current_user)):
 @app.get("/api/sessions", response_model=List[SessionResponse])
 async def get_sessions(current_user = Depends(get_current_user)):
     """Get user sessions"""
-    user_sessions = []
-    for session in sessions_db.values():
-        if session["user_id"] == current_user["id"]:
-            # Count messages
-            message_count = sum(1 for msg in messages_db.values() if msg["session_id"] == session["id"])
-            session_response = SessionResponse(**session, message_count=message_count)
-            user_sessions.append(session_response)
+    owned = [session for session in sessions_db.values() if session["user_id"] == current_user["id"]]
+    # Message counts for all sessions in one lookup
+    counts = await asyncio.to_thread(message_store.counts, [session["id"] for session in owned])
+    user_sessions = [SessionResponse(**session, message_count=counts[session["id"]]) for session in owned]
     
     return sorted(user_sessions, key=lambda x: x.updated_at, reverse=True)
 
@@ -473,6 +506,11 @@ async def get_sessions(current_user = Depends(get_current_user)):
 async def create_session(session_data: SessionCreate, current_user = Depends(get_current_user)):
     """Create new chat session"""
     global session_counter
+    if session_counter == 0:
+        # Messages are persisted → never reuse a session id after restart
+        # max(): parallele erste Requests dürfen den Zähler nicht zurücksetzen
+        persisted = await asyncio.to_thread(message_store.max_session_id)
+        session_counter = max(session_counter, persisted)
     session_counter += 1
     
     session = {
@@ -488,18 +526,29 @@ async def create_session(session_data: SessionCreate, current_user = Depends(get
     return SessionResponse(**session, message_count=0)
 
 @app.get("/api/sessions/{session_id}/messages", response_model=List[MessageResponse])
-async def get_messages(session_id: int, current_user = Depends(get_current_user)):
-    """Get messages from session"""
+async def get_messages(
+    session_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    """Get messages from session (newest `limit`, older pages via `before` cursor)"""
     # Check session belongs to user
     if session_id not in sessions_db or sessions_db[session_id]["user_id"] != current_user["id"]:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session_messages = []
-    for message in messages_db.values():
-        if message["session_id"] == session_id:
-            session_messages.append(MessageResponse(**message))
+    try:
+        session_messages, next_cursor = await asyncio.to_thread(
+            message_store.get_messages, session_id, limit=limit, before=before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return sorted(session_messages, key=lambda x: x.created_at)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return [MessageResponse(**message) for message in session_messages]
 
 @app.post("/api/sessions/{session_id}/messages", response_model=MessageResponse)
 async def send_message(
@@ -512,40 +561,31 @@ async def send_message(
     if session_id not in sessions_db or sessions_db[session_id]["user_id"] != current_user["id"]:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    global message_counter
-    message_counter += 1
-    
-    # Save user message
+    # User message
     user_message = {
-        "id": message_counter,
         "session_id": session_id,
         "role": message_data.role,
         "content": message_data.content,
         "model_used": None,
         "tokens_used": 0,
-        "created_at": datetime.utcnow()
     }
     
-    messages_db[message_counter] = user_message
-    
-    # Update session timestamp
-    sessions_db[session_id]["updated_at"] = datetime.utcnow()
-    
     # Generate AI response (simplified for demo)
-    message_counter += 1
     ai_message = {
-        "id": message_counter, 
         "session_id": session_id,
         "role": "assistant",
         "content": f"This is an AI response to: '{message_data.content}'. Full chat integration coming next!",
         "model_used": "gpt-4o",
         "tokens_used": 50,
-        "created_at": datetime.utcnow()
     }
     
-    messages_db[message_counter] = ai_message
+    # Save both in one transaction
+    saved_user_message, _ = await asyncio.to_thread(message_store.add_many, [user_message, ai_message])
     
-    return MessageResponse(**user_message)
+    # Update session timestamp
+    sessions_db[session_id]["updated_at"] = datetime.utcnow()
+    
+    return MessageResponse(**saved_user_message)
 
 # -------------------------------------------------------------
 # MODELS ENDPOINTS
@@ -854,21 +894,15 @@ CRITICAL: When you mention executing a command, you MUST output it in TERMINAL:
             
         # Save to session if provided
         if request.session_id and request.session_id in sessions_db:
-            global message_counter
-            message_counter += 1
-            
             # Save AI response to session
-            ai_message = {
-                "id": message_counter,
-                "session_id": request.session_id,
-                "role": "assistant", 
-                "content": response_content,
-                "model_used": request.model,
-                "tokens_used": len(response_content.split()) * 1.3,  # Rough estimate
-                "created_at": datetime.utcnow()
-            }
-            
-            messages_db[message_counter] = ai_message
+            await asyncio.to_thread(
+                message_store.add,
+                request.session_id,
+                "assistant",
+                response_content,
+                model_used=request.model,
+                tokens_used=int(len(response_content.split()) * 1.3),  # Rough estimate
+            )
             sessions_db[request.session_id]["updated_at"] = datetime.utcnow()
         
         return {
@@ -1470,7 +1504,7 @@ async def root():
         "models_available": len(MODELS),
         "total_users": len(users_db),
         "total_sessions": len(sessions_db),
-        "total_messages": len(messages_db)
+        "total_messages": await asyncio.to_thread(message_store.total)
     }
 
 @app.get("/health")
@@ -1485,91 +1519,65 @@ async def health_check():
             "openai": bool(os.getenv("OPENAI_API_KEY")),
             "anthropic": bool(os.getenv("ANTHROPIC_API_KEY")),
             "google": bool(os.getenv("GOOGLE_API_KEY"))
-        }
+        },
+        "password_hashing": password_hasher.get_stats()
     }
 
 # -------------------------------------------------------------
 # KERNEL SSE ENDPOINT
 # -------------------------------------------------------------
+# Geteilt über alle Requests; Runtime + Kernel sind pro Request
+_chat_router: Optional[LLMRouter] = None
+
+
+def _chat_llm_router() -> LLMRouter:
+    """
+    Holt den LLMRouter für /api/chat/stream.
+    LLMRouter + Clients werden nur beim ersten Aufruf gebaut.
+    """
+    global _chat_router
+    if _chat_router is None:
+        _chat_router = LLMRouter({
+            "openai": OpenAIClient(model="gpt-4o"),
+            "openai-mini": OpenAIClient(model="gpt-4o-mini"),
+        })
+    return _chat_router
+
+
 @app.get("/api/chat/stream")
 async def chat_stream(request: Request, task: str):
     """
     SSE-Chat-Endpoint:
-    - startet den AgentKernel
+    - frische Kernel-Session pro Request, geteilter LLMRouter
     - streamt Events live an den Client
     """
-    
+    session = KernelSession(_chat_llm_router())
+
     async def event_generator():
         """Generator für SSE Events"""
-        queue = asyncio.Queue()
-        
-        class QueueResponse:
-            """Response-Wrapper für Queue-basiertes Streaming"""
-            async def write(self, data: str):
-                await queue.put(data)
-            
-            async def flush(self):
-                pass
-        
-        # Streamer und Kernel initialisieren
-        streamer = SSEStreamer(response=QueueResponse())
-        
-        # LLM-Router mit verfügbaren Clients
-        llm_router = LLMRouter({
-            "openai": OpenAIClient(model="gpt-4o"),
-            "openai-mini": OpenAIClient(model="gpt-4o-mini"),
-        })
-        
-        # v1.1: Runtime mit allen Komponenten
-        runtime = init_runtime(
-            security_level=SecurityLevel.NORMAL,
-            control_mode=ControlMode.ASSISTED,
-            kernel=None  # Wird von KernelV1 gesetzt
-        )
-        
-        # v1.1: Kernel mit Runtime
-        kernel = KernelV1(
-            streamer=streamer,
-            runtime=runtime,
-            llm_router=llm_router
-        )
-        
         # Kernel-Task im Hintergrund starten
-        async def run_kernel():
+        kernel_task = asyncio.create_task(session.run(task))
+
+        try:
+            # Events bis zum Sentinel streamen (kein Polling)
+            async for data in session.events():
+                yield data
+
             try:
-                await kernel.run(task)
+                await kernel_task
             except Exception as e:
                 import traceback
-                error_msg = f"Kernel Error: {str(e)}\n{traceback.format_exc()}"
-                await queue.put(f'data: {{"type": "error", "message": "{error_msg}", "data": null}}\n\n')
-        
-        kernel_task = asyncio.create_task(run_kernel())
-        
-        # Events aus der Queue streamen
-        try:
-            while True:
-                # Timeout, um auf neue Events zu warten
-                try:
-                    data = await asyncio.wait_for(queue.get(), timeout=0.1)
-                    yield data
-                    
-                    # Bei "done" Event beenden
-                    if '"type": "done"' in data or '"type":"done"' in data:
-                        break
-                except asyncio.TimeoutError:
-                    # Prüfen, ob Kernel-Task fertig ist
-                    if kernel_task.done():
-                        # Hole exception falls vorhanden
-                        if kernel_task.exception():
-                            error = kernel_task.exception()
-                            yield f'data: {{"type": "error", "message": "Kernel failed: {str(error)}", "data": null}}\n\n'
-                        break
-                    continue
+                error_msg = json.dumps(f"Kernel Error: {str(e)}\n{traceback.format_exc()}")
+                yield f'data: {{"type": "error", "message": {error_msg}, "data": null}}\n\n'
         finally:
-            # Aufräumen
+            # Aufräumen: Kernel stoppen, wenn der Client abbricht
             if not kernel_task.done():
                 kernel_task.cancel()
-    
+                try:
+                    await kernel_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -0,0 +1,320 @@
+"""
+VIBEAI MESSAGE STORE
+
+Chat-Nachrichten pro Session, gespeichert über models.Message.
+
+Vorher: messages_db Dict in main.py → jeder GET /messages und jede
+Session-Liste lief über ALLE Nachrichten aller User (O(gesamt)) und
+sortierte danach.
+
+Jetzt:
+- SQL (models.Message) mit Composite-Index (session_id, created_at, id)
+- Cursor-Pagination (ältere Seiten über "before" Cursor)
+- Ring-Buffer pro Session für die letzten N Nachrichten (Chat-Fenster
+  kommt ohne Query aus)
+- Nachrichten-Zähler pro Session (kein COUNT pro Request)
+- add_many: User-Nachricht + Assistant-Antwort(en) in EINEM Insert
+"""
+
+import base64
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import sessionmaker
+
+from models import Message
+
+MESSAGE_FIELDS = ("id", "session_id", "role", "content", "model_used", "tokens_used", "created_at")
+
+
+def encode_cursor(message: Dict) -> str:
+    raw = f"{message['created_at'].isoformat()}|{message['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class _SessionWindow:
+    """Neueste Nachrichten + Anzahl einer Session"""
+
+    __slots__ = ("recent", "count")
+
+    def __init__(self, recent: Iterable[Dict], count: int, ring_size: int):
+        self.recent = deque(recent, maxlen=ring_size)
+        self.count = count
+
+
+class MessageStore:
+    """
+    Session-partitionierter Nachrichten-Store.
+    """
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None, ring_size: int = 50, max_sessions: int = 10_000):
+        """
+        Args:
+            session_factory: SQLAlchemy sessionmaker (default: db.SessionLocal)
+            ring_size: Nachrichten pro Session im Ring-Buffer
+            max_sessions: Max. Sessions mit Ring-Buffer im Speicher (LRU)
+        """
+        if session_factory is None:
+            from db import SessionLocal
+
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+        self.ring_size = ring_size
+        self.max_sessions = max_sessions
+
+        self._windows: "OrderedDict[int, _SessionWindow]" = OrderedDict()
+        # Laufende Writes bzw. Fenster-Loads pro Session (unter _lock)
+        self._writing: Dict[int, int] = {}
+        self._loading: Dict[int, List[Dict]] = {}
+        self._lock = threading.RLock()
+        self._schema_ready = False
+        self.stats = {"ring_hits": 0, "db_reads": 0, "inserts": 0, "insert_batches": 0}
+
+    # ---------------------------------------------------------
+    # SCHEMA
+    # ---------------------------------------------------------
+    def _ensure_schema(self):
+        if self._schema_ready:
+            return
+        from db import migrate_db
+
+        with self.session_factory() as db:
+            bind = db.get_bind()
+            Message.metadata.create_all(bind=bind)
+            # Bestehende messages-Tabelle ohne Composite-Index nachziehen
+            migrate_db(bind)
+        self._schema_ready = True
+
+    @staticmethod
+    def _to_dict(message: Message) -> Dict:
+        return {field: getattr(message, field) for field in MESSAGE_FIELDS}
+
+    # ---------------------------------------------------------
+    # RING BUFFER
+    # ---------------------------------------------------------
+    def _window(self, session_id: int) -> _SessionWindow:
+        """
+        Ring-Buffer der Session (beim ersten Zugriff aus der DB geladen).
+
+        Die Query läuft ohne Lock. Überlappt sie mit einem add_many() derselben
+        Session, ist unklar, ob der Snapshot dessen Nachrichten enthält → das
+        Fenster wird dann nur für diesen Aufruf benutzt, nicht gecacht.
+        """
+        with self._lock:
+            window = self._windows.get(session_id)
+            if window is not None:
+                self._windows.move_to_end(session_id)
+                return window
+            load = {"stale": session_id in self._writing}
+            self._loading.setdefault(session_id, []).append(load)
+
+        try:
+            self._ensure_schema()
+            with self.session_factory() as db:
+                rows = (
+                    db.query(Message)
+                    .filter(Message.session_id == session_id)
+                    .order_by(Message.created_at.desc(), Message.id.desc())
+                    .limit(self.ring_size)
+                    .all()
+                )
+                count = db.query(func.count(Message.id)).filter(Message.session_id == session_id).scalar()
+            self.stats["db_reads"] += 1
+            window = _SessionWindow(reversed([self._to_dict(r) for r in rows]), count, self.ring_size)
+        finally:
+            with self._lock:
+                loads = self._loading[session_id]
+                loads.remove(load)
+                if not loads:
+                    del self._loading[session_id]
+
+        with self._lock:
+            cached = self._windows.get(session_id)
+            if cached is not None:
+                return cached
+            if not load["stale"]:
+                self._windows[session_id] = window
+                while len(self._windows) > self.max_sessions:
+                    self._windows.popitem(last=False)
+            return window
+
+    # ---------------------------------------------------------
+    # WRITE
+    # ---------------------------------------------------------
+    def add(self, session_id: int, role: str, content: str, model_used: Optional[str] = None, tokens_used: int = 0) -> Dict:
+        """Eine Nachricht speichern."""
+        return self.add_many(
+            [
+                {
+                    "session_id": session_id,
+                    "role": role,
+                    "content": content,
+                    "model_used": model_used,
+                    "tokens_used": tokens_used,
+                }
+            ]
+        )[0]
+
+    def add_many(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Mehrere Nachrichten in einer Transaktion speichern
+        (z.B. User-Prompt + Assistant-Antwort, oder fertige Stream-Chunks).
+        """
+        if not messages:
+            return []
+
+        self._ensure_schema()
+        now = datetime.utcnow()
+        rows = [
+            Message(
+                session_id=m["session_id"],
+                role=m["role"],
+                content=m["content"],
+                model_used=m.get("model_used"),
+                tokens_used=int(m.get("tokens_used") or 0),
+                created_at=m.get("created_at") or now,
+            )
+            for m in messages
+        ]
+
+        session_ids = {m["session_id"] for m in messages}
+        with self._lock:
+            # Parallel laufende Fenster-Loads sehen diesen Write evtl. nicht
+            for session_id in session_ids:
+                self._writing[session_id] = self._writing.get(session_id, 0) + 1
+                for load in self._loading.get(session_id, ()):
+                    load["stale"] = True
+
+        saved = None
+        try:
+            with self.session_factory() as db:
+                db.add_all(rows)
+                db.commit()
+                saved = [self._to_dict(r) for r in rows]
+        finally:
+            with self._lock:
+                for session_id in session_ids:
+                    self._writing[session_id] -= 1
+                    if not self._writing[session_id]:
+                        del self._writing[session_id]
+                for message in saved or ():
+                    window = self._windows.get(message["session_id"])
+                    # Nicht geladene Sessions werden beim ersten Lesen aus der DB geholt
+                    if window is not None:
+                        window.recent.append(message)
+                        window.count += 1
+
+        self.stats["inserts"] += len(saved)
+        self.stats["insert_batches"] += 1
+        return saved
+
+    # ---------------------------------------------------------
+    # READ
+    # ---------------------------------------------------------
+    def get_messages(self, session_id: int, limit: Optional[int] = None, before: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Nachrichten einer Session (chronologisch).
+
+        Args:
+            session_id: Session ID
+            limit: Max. Anzahl (None = alle)
+            before: Cursor – nur Nachrichten älter als dieser
+
+        Returns:
+            (messages, next_cursor) – next_cursor zeigt auf ältere Seiten
+        """
+        if before is None and limit is not None:
+            window = self._window(session_id)
+            with self._lock:
+                recent = list(window.recent)
+                count = window.count
+            # Fenster liegt komplett im Ring-Buffer
+            if limit <= len(recent) or len(recent) == count:
+                page = recent[-limit:] if limit else []
+                self.stats["ring_hits"] += 1
+                has_more = count > len(page)
+                return page, (encode_cursor(page[0]) if page and has_more else None)
+
+        self._ensure_schema()
+        query_limit = limit + 1 if limit is not None else None
+        with self.session_factory() as db:
+            query = db.query(Message).filter(Message.session_id == session_id)
+            if before:
+                created_at, message_id = decode_cursor(before)
+                query = query.filter(
+                    or_(
+                        Message.created_at < created_at,
+                        and_(Message.created_at == created_at, Message.id < message_id),
+                    )
+                )
+            query = query.order_by(Message.created_at.desc(), Message.id.desc())
+            if query_limit is not None:
+                query = query.limit(query_limit)
+            rows = [self._to_dict(r) for r in query.all()]
+        self.stats["db_reads"] += 1
+
+        has_more = limit is not None and len(rows) > limit
+        page = list(reversed(rows[:limit] if limit is not None else rows))
+        return page, (encode_cursor(page[0]) if page and has_more else None)
+
+    def count(self, session_id: int) -> int:
+        window = self._window(session_id)
+        return window.count
+
+    def counts(self, session_ids: Iterable[int]) -> Dict[int, int]:
+        """Nachrichten-Anzahl für mehrere Sessions (fehlende in EINER Query)."""
+        session_ids = list(session_ids)
+        result = {}
+        missing = []
+        with self._lock:
+            for session_id in session_ids:
+                window = self._windows.get(session_id)
+                if window is not None:
+                    result[session_id] = window.count
+                else:
+                    missing.append(session_id)
+
+        if missing:
+            self._ensure_schema()
+            with self.session_factory() as db:
+                rows = (
+                    db.query(Message.session_id, func.count(Message.id))
+                    .filter(Message.session_id.in_(missing))
+                    .group_by(Message.session_id)
+                    .all()
+                )
+            self.stats["db_reads"] += 1
+            found = dict(rows)
+            for session_id in missing:
+                result[session_id] = found.get(session_id, 0)
+        return result
+
+    def max_session_id(self) -> int:
+        """Höchste Session-ID mit Nachrichten (Session-Zähler nach Neustart)."""
+        self._ensure_schema()
+        with self.session_factory() as db:
+            return db.query(func.max(Message.session_id)).scalar() or 0
+
+    def total(self) -> int:
+        self._ensure_schema()
+        with self.session_factory() as db:
+            return db.query(func.count(Message.id)).scalar()
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "cached_sessions": len(self._windows)}
+
+
+# Singleton Instance
+message_store = MessageStore()
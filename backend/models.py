@@ -8,6 +8,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -40,6 +41,7 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.USER)
     plan = Column(Enum(PlanType), default=PlanType.FREE)
     is_active = Column(Boolean, default=True)
+    is_suspended = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Billing
@@ -65,21 +67,35 @@ class ChatSession(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="sessions")
-    messages = relationship("Message", back_populates="session")
+    messages = relationship(
+        "Message",
+        primaryjoin="ChatSession.id == foreign(Message.session_id)",
+        back_populates="session",
+    )
 
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Session-Verlauf: WHERE session_id = ? ORDER BY created_at, id (+ Cursor)
+        Index("ix_messages_session_created", "session_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
+    # Kein FK auf chat_sessions: /api/sessions hält Sessions (noch) nur im
+    # Speicher, Nachrichten werden aber persistiert (MessageStore)
+    session_id = Column(Integer, nullable=False)
     role = Column(String, nullable=False)  # user, assistant, system
     content = Column(Text, nullable=False)
     model_used = Column(String, nullable=True)
     tokens_used = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    session = relationship("ChatSession", back_populates="messages")
+    session = relationship(
+        "ChatSession",
+        primaryjoin="ChatSession.id == foreign(Message.session_id)",
+        back_populates="messages",
+    )
 
 
 class Ticket(Base):
@@ -120,4 +136,23 @@ class Notification(Base):
     message = Column(Text, nullable=False)
     type = Column(String, default="info")  # info, warning, error, success
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# -------------------------------------------------------------
+# ADMIN STATS (materialisiert, inkrementell gepflegt – admin/stats.py)
+# -------------------------------------------------------------
+class AdminCounter(Base):
+    __tablename__ = "admin_counters"
+
+    name = Column(String, primary_key=True)  # users, suspended_users, sessions, messages, projects
+    value = Column(Integer, nullable=False, default=0)
+
+
+class UserActivity(Base):
+    __tablename__ = "user_activity"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_count = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    last_active = Column(DateTime, nullable=True)
@@ -0,0 +1,164 @@
+# -------------------------------------------------------------
+# VIBEAI – PASSWORD HASHING POOL (OFF-LOOP BCRYPT)
+# -------------------------------------------------------------
+# Vorher: bcrypt lief direkt im async Route-Handler
+#         → 100–300 ms blockierter Event-Loop pro Login/Register,
+#           ein Login-Burst friert alle SSE-Streams des Workers ein.
+#
+# Jetzt: Eigener, begrenzter Thread-Pool nur für Passwort-Hashing:
+# ✔ bcrypt gibt den GIL frei → echte Parallelität in Threads
+# ✔ Queue-Limit: bei Überlast sofort 429 statt endloser Warteschlange
+# ✔ Metriken: Wartezeit in der Queue + Hash-Dauer (p50/p95)
+# ✔ Rehash beim Login, wenn sich BCRYPT_ROUNDS geändert hat
+# -------------------------------------------------------------
+
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+_BCRYPT_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """
+    True, wenn der Hash mit anderen Cost-Parametern erzeugt wurde
+    (oder noch der SHA-256 Fallback ist und bcrypt jetzt verfügbar ist).
+    """
+    rounds = rounds or BCRYPT_ROUNDS
+    match = _BCRYPT_COST.match(hashed_password or "")
+    if match is None:
+        try:
+            import bcrypt  # noqa: F401
+
+            return True
+        except ImportError:
+            return False
+    return int(match.group(1)) != rounds
+
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class PasswordHasher:
+    """
+    Begrenzter Thread-Pool für CPU-teure Passwort-Operationen.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Args:
+            max_workers: Threads für Hashing (ENV VIBEAI_HASH_WORKERS, default CPU-Anzahl)
+            max_pending: Max. laufende + wartende Jobs, danach 429
+                         (ENV VIBEAI_HASH_MAX_PENDING, default workers * 8)
+        """
+        self.max_workers = max_workers or int(os.getenv("VIBEAI_HASH_WORKERS", os.cpu_count() or 2))
+        self.max_pending = max_pending or int(
+            os.getenv("VIBEAI_HASH_MAX_PENDING", self.max_workers * 8)
+        )
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+
+        self._wait_times = deque(maxlen=1000)
+        self._hash_times = deque(maxlen=1000)
+        self.stats = {"completed": 0, "rejected": 0, "rehashed": 0, "peak_pending": 0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args):
+        """
+        Führt fn(*args) im Hash-Pool aus.
+
+        Raises:
+            HTTPException 429: Queue voll (Login-/Register-Burst)
+        """
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        self.stats["peak_pending"] = max(self.stats["peak_pending"], self.pending)
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            self._wait_times.append(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self._hash_times.append(time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), job)
+        finally:
+            self.pending -= 1
+            self.stats["completed"] += 1
+
+    async def verify_and_rehash(
+        self,
+        verify_fn: Callable,
+        hash_fn: Callable,
+        password: str,
+        hashed_password: str,
+        rehash_check: Callable[[str], bool] = needs_rehash,
+    ):
+        """
+        Passwort prüfen und bei veralteten Cost-Parametern neu hashen.
+
+        Returns:
+            (valid, new_hash) – new_hash ist None, wenn kein Rehash nötig war
+        """
+        if not await self.run(verify_fn, password, hashed_password):
+            return False, None
+        if not rehash_check(hashed_password):
+            return True, None
+
+        try:
+            new_hash = await self.run(hash_fn, password)
+        except HTTPException:
+            # Rehash ist optional – Login nicht an Überlast scheitern lassen
+            return True, None
+        self.stats["rehashed"] += 1
+        return True, new_hash
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            **self.stats,
+            "wait_ms_p50": round(_percentile(self._wait_times, 0.50) * 1000, 2),
+            "wait_ms_p95": round(_percentile(self._wait_times, 0.95) * 1000, 2),
+            "hash_ms_p50": round(_percentile(self._hash_times, 0.50) * 1000, 2),
+            "hash_ms_p95": round(_percentile(self._hash_times, 0.95) * 1000, 2),
+        }
+
+
+# Singleton Instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,305 @@
+# -------------------------------------------------------------
+# VIBEAI – PREVIEW FILE WATCHER SERVICE
+# -------------------------------------------------------------
+"""
+Shared File Watcher für alle Live Previews.
+
+Vorher: pro User ein Task, der alle 2 Sekunden os.walk über das ganze
+Projekt lief und jede Datei komplett per MD5 gehasht hat.
+
+Jetzt: EIN Watcher-Service für alle User.
+- Event-basiert über watchdog (inotify / FSEvents), falls installiert
+- Fallback: ein gemeinsamer Stat-Polling Loop (nur os.stat, kein Lesen)
+- Rehash nur wenn sich mtime oder Größe geändert haben
+- Debounce: Änderungen werden gesammelt und als ein Event gemeldet
+
+Verwendung:
+    file_watcher.watch(user, project_path, extensions, on_change)
+    file_watcher.unwatch(user)
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+IGNORED_DIRS = {"node_modules", ".git", "build", "dist", ".next"}
+
+# on_change(key, changed_files)
+ChangeCallback = Callable[[str, List[str]], Awaitable[None]]
+
+
+def _file_hash(file_path: str) -> Optional[str]:
+    """MD5 in Blöcken (große Dateien nicht komplett in den Speicher)."""
+    try:
+        digest = hashlib.md5()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class _ProjectWatch:
+    """Zustand eines überwachten Projekts"""
+
+    def __init__(self, key: str, project_path: str, extensions: Set[str], callback: ChangeCallback):
+        self.key = key
+        self.project_path = os.path.abspath(project_path)
+        self.extensions = extensions
+        self.callback = callback
+
+        # file_path → (mtime_ns, size, hash)
+        self.files: Dict[str, Tuple[int, int, Optional[str]]] = {}
+
+        self.pending: Set[str] = set()
+        # Serialisiert _flush (files wird nur auf dem Loop verändert)
+        self.flush_lock = asyncio.Lock()
+        self.debounce_handle: Optional[asyncio.TimerHandle] = None
+        self.observer_watch = None
+
+    def matches(self, file_path: str) -> bool:
+        if os.path.splitext(file_path)[1] not in self.extensions:
+            return False
+        rel_parts = os.path.relpath(file_path, self.project_path).split(os.sep)
+        return not any(part in IGNORED_DIRS for part in rel_parts[:-1])
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat-Scan aller relevanten Dateien (ohne sie zu lesen)."""
+        stats = {}
+        for root, dirs, files in os.walk(self.project_path):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            for file in files:
+                if os.path.splitext(file)[1] not in self.extensions:
+                    continue
+                file_path = os.path.join(root, file)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                stats[file_path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+
+class _EventHandler(FileSystemEventHandler):
+    """watchdog Handler → leitet Pfade threadsafe in den Event-Loop"""
+
+    def __init__(self, service: "FileWatcherService", key: str):
+        self.service = service
+        self.key = key
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        for path in paths:
+            if path:
+                self.service._loop.call_soon_threadsafe(self.service._mark_dirty, self.key, path)
+
+
+class FileWatcherService:
+    """
+    Gemeinsamer File Watcher für alle Previews.
+    """
+
+    def __init__(self, debounce: float = 0.15, poll_interval: float = 1.0, use_events: bool = True):
+        """
+        Args:
+            debounce: Sekunden Ruhe, bevor gesammelte Änderungen gemeldet werden
+            poll_interval: Intervall des Stat-Polling Fallbacks
+            use_events: watchdog (inotify/FSEvents) nutzen, falls installiert
+        """
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_events = use_events and WATCHDOG_AVAILABLE
+
+        self.watches: Dict[str, _ProjectWatch] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._observer = None
+        self._poll_task: Optional[asyncio.Task] = None
+
+        self.stats = {"events": 0, "rehashes": 0, "reloads": 0}
+
+    @property
+    def mode(self) -> str:
+        return "events" if self.use_events else "polling"
+
+    # ---------------------------------------------------------
+    # WATCH / UNWATCH
+    # ---------------------------------------------------------
+    async def watch(self, key: str, project_path: str, extensions: Set[str], callback: ChangeCallback):
+        """
+        Startet Überwachung eines Projekts (ersetzt bestehende für `key`).
+        """
+        self.unwatch(key)
+        self._loop = asyncio.get_running_loop()
+
+        watch = _ProjectWatch(key, project_path, extensions, callback)
+        watch.files = await asyncio.to_thread(self._initial_state, watch)
+        self.watches[key] = watch
+
+        if self.use_events:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            watch.observer_watch = self._observer.schedule(
+                _EventHandler(self, key), watch.project_path, recursive=True
+            )
+        elif self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    def _initial_state(self, watch: _ProjectWatch) -> Dict[str, Tuple[int, int, Optional[str]]]:
+        """Einmaliger Scan + Hash als Baseline (danach nur noch stat)."""
+        return {
+            path: (mtime, size, _file_hash(path)) for path, (mtime, size) in watch.scan().items()
+        }
+
+    def unwatch(self, key: str) -> bool:
+        watch = self.watches.pop(key, None)
+        if watch is None:
+            return False
+
+        if watch.debounce_handle:
+            watch.debounce_handle.cancel()
+        if self._observer is not None and watch.observer_watch is not None:
+            self._observer.unschedule(watch.observer_watch)
+
+        if not self.watches and self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        return True
+
+    def stop(self):
+        """Stoppt alle Watches und den Observer-Thread."""
+        for key in list(self.watches):
+            self.unwatch(key)
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+    # ---------------------------------------------------------
+    # CHANGE DETECTION
+    # ---------------------------------------------------------
+    def _mark_dirty(self, key: str, file_path: str):
+        """Merkt Pfad vor und (re)startet den Debounce-Timer."""
+        watch = self.watches.get(key)
+        if watch is None or not watch.matches(file_path):
+            return
+
+        self.stats["events"] += 1
+        watch.pending.add(file_path)
+
+        if watch.debounce_handle:
+            watch.debounce_handle.cancel()
+        watch.debounce_handle = self._loop.call_later(
+            self.debounce, lambda: asyncio.ensure_future(self._flush(watch))
+        )
+
+    @staticmethod
+    def _check(
+        known: Dict[str, Optional[Tuple[int, int, Optional[str]]]]
+    ) -> Tuple[List[str], Dict[str, Optional[Tuple[int, int, Optional[str]]]], int]:
+        """
+        Prüft vorgemerkte Pfade: stat → bei Abweichung rehash.
+
+        Läuft im Thread und arbeitet nur auf der übergebenen Kopie;
+        die Änderungen werden auf dem Loop in watch.files übernommen.
+
+        Returns:
+            (geänderte Pfade, Updates {Pfad: Eintrag oder None = gelöscht}, Rehashes)
+        """
+        changed = []
+        updates = {}
+        rehashes = 0
+        for file_path, entry in known.items():
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                if entry is not None:
+                    updates[file_path] = None
+                    changed.append(file_path)
+                continue
+
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                continue
+
+            rehashes += 1
+            new_hash = _file_hash(file_path)
+            updates[file_path] = (st.st_mtime_ns, st.st_size, new_hash)
+            if entry is None or entry[2] != new_hash:
+                changed.append(file_path)
+
+        return sorted(changed), updates, rehashes
+
+    async def _flush(self, watch: _ProjectWatch):
+        watch.debounce_handle = None
+        async with watch.flush_lock:
+            if self.watches.get(watch.key) is not watch or not watch.pending:
+                return
+
+            paths, watch.pending = watch.pending, set()
+            known = {file_path: watch.files.get(file_path) for file_path in paths}
+            changed, updates, rehashes = await asyncio.to_thread(self._check, known)
+
+            if self.watches.get(watch.key) is not watch:
+                return
+            self.stats["rehashes"] += rehashes
+            for file_path, entry in updates.items():
+                if entry is None:
+                    watch.files.pop(file_path, None)
+                else:
+                    watch.files[file_path] = entry
+
+        if changed:
+            self.stats["reloads"] += 1
+            try:
+                await watch.callback(watch.key, changed)
+            except Exception as e:
+                print(f"Watcher callback error for {watch.key}: {e}")
+
+    async def _poll_loop(self):
+        """
+        Fallback ohne watchdog: ein Loop für ALLE Projekte, nur os.stat.
+        """
+        try:
+            while self.watches:
+                await asyncio.sleep(self.poll_interval)
+                for watch in list(self.watches.values()):
+                    stats = await asyncio.to_thread(watch.scan)
+                    for file_path, (mtime, size) in stats.items():
+                        known = watch.files.get(file_path)
+                        if known is None or known[0] != mtime or known[1] != size:
+                            self._mark_dirty(watch.key, file_path)
+                    for file_path in watch.files.keys() - stats.keys():
+                        self._mark_dirty(watch.key, file_path)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"Watcher poll error: {e}")
+
+    # ---------------------------------------------------------
+    # STATS
+    # ---------------------------------------------------------
+    def get_stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "watched_projects": len(self.watches),
+            "watched_files": sum(len(w.files) for w in self.watches.values()),
+            **self.stats,
+        }
+
+
+# Singleton Instance
+file_watcher = FileWatcherService()
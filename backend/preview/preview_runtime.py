@@ -6,7 +6,7 @@ Preview Runtime System
 
 Features:
 - Live Compilation Engine
-- File Watcher für Auto-Reload
+- File Watcher für Auto-Reload (gemeinsamer, event-basierter Watcher)
 - Hot Module Replacement (HMR)
 - Error Detection & Reporting
 - Compilation Cache
@@ -21,11 +21,12 @@ Verwendung:
 """
 
 import asyncio
-import hashlib
 import os
 import time
 from typing import Dict, Optional, Set
 
+from preview.file_watcher import file_watcher
+
 
 class PreviewRuntime:
     """
@@ -36,7 +37,7 @@ class PreviewRuntime:
     """
 
     def __init__(self):
-        # user → {project_id, watcher_task, file_hashes}
+        # user → {project_id, project_path}
         self.active_watchers: Dict[str, Dict] = {}
 
         # Cache für Compilation Results
@@ -71,101 +72,14 @@ class PreviewRuntime:
         # Alten Watcher stoppen
         self.stop_watcher(user)
 
-        # File Hashes initialisieren
-        file_hashes = self._scan_files(project_path, extensions)
-
-        # Watcher Task erstellen
-        watcher_task = asyncio.create_task(self._watch_loop(user, project_path, file_hashes, extensions))
+        # Beim gemeinsamen Watcher-Service registrieren (kein Task pro User)
+        await file_watcher.watch(user, project_path, extensions, self.trigger_reload)
 
         self.active_watchers[user] = {
             "project_id": project_id,
-            "watcher_task": watcher_task,
-            "file_hashes": file_hashes,
+            "project_path": project_path,
         }
 
-    async def _watch_loop(
-        self,
-        user: str,
-        project_path: str,
-        file_hashes: Dict[str, str],
-        extensions: Set[str],
-    ):
-        """
-        Watch Loop - prüft alle 2 Sekunden auf Änderungen.
-
-        Args:
-            user: User-Email/ID
-            project_path: Projekt-Pfad
-            file_hashes: Dictionary mit File-Hashes
-            extensions: Dateitypen
-        """
-        try:
-            while True:
-                await asyncio.sleep(2)  # Check alle 2 Sekunden
-
-                # Files scannen
-                current_hashes = self._scan_files(project_path, extensions)
-
-                # Änderungen finden
-                changed_files = []
-
-                for file_path, current_hash in current_hashes.items():
-                    old_hash = file_hashes.get(file_path)
-
-                    if old_hash != current_hash:
-                        changed_files.append(file_path)
-                        file_hashes[file_path] = current_hash
-
-                # Neue Dateien
-                new_files = set(current_hashes.keys()) - set(file_hashes.keys())
-                changed_files.extend(new_files)
-
-                # Gelöschte Dateien
-                deleted_files = set(file_hashes.keys()) - set(current_hashes.keys())
-                for file_path in deleted_files:
-                    del file_hashes[file_path]
-                    changed_files.append(file_path)
-
-                # Reload triggern wenn Änderungen
-                if changed_files:
-                    await self.trigger_reload(user, changed_files)
-
-        except asyncio.CancelledError:
-            print(f"Watcher stopped for {user}")
-        except Exception as e:
-            print(f"Watcher error for {user}: {e}")
-
-    def _scan_files(self, project_path: str, extensions: Set[str]) -> Dict[str, str]:
-        """
-        Scannt alle Dateien und berechnet Hashes.
-
-        Args:
-            project_path: Projekt-Pfad
-            extensions: Dateitypen
-
-        Returns:
-            {file_path: hash}
-        """
-        file_hashes = {}
-
-        for root, dirs, files in os.walk(project_path):
-            # Ignore node_modules, .git, build, etc.
-            dirs[:] = [d for d in dirs if d not in ["node_modules", ".git", "build", "dist", ".next"]]
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1]
-
-                if ext in extensions:
-                    try:
-                        with open(file_path, "rb") as f:
-                            file_hash = hashlib.md5(f.read()).hexdigest()
-                            file_hashes[file_path] = file_hash
-                    except Exception:
-                        pass
-
-        return file_hashes
-
     # ---------------------------------------------------------
     # RELOAD TRIGGER
     # ---------------------------------------------------------
@@ -177,11 +91,12 @@ class PreviewRuntime:
             user: User-Email/ID
             changed_files: Liste geänderter Dateien
         """
-        # TODO: WebSocket Event senden wenn preview_ws verfügbar
-        # from preview.preview_ws import preview_ws
-        # await preview_ws.send_event(user, "reload", {
-        #     "files": changed_files
-        # })
+        try:
+            from preview.preview_ws import preview_ws
+
+            await preview_ws.send_event(user, "reload", {"files": changed_files})
+        except ImportError as e:
+            print(f"⚠️  Preview reload not available: {e}")
 
         print(f"[RELOAD] {user}: {len(changed_files)} files changed")
         for file in changed_files[:5]:  # Nur erste 5 anzeigen
@@ -203,11 +118,7 @@ class PreviewRuntime:
         if user not in self.active_watchers:
             return False
 
-        watcher = self.active_watchers[user]
-        task = watcher["watcher_task"]
-
-        # Task canceln
-        task.cancel()
+        file_watcher.unwatch(user)
 
         del self.active_watchers[user]
 
@@ -313,13 +224,15 @@ class PreviewRuntime:
             {
                 "active_watchers": 3,
                 "cache_size": 15,
-                "users": [...]
+                "users": [...],
+                "watcher": {"mode": "events", ...}
             }
         """
         return {
             "active_watchers": len(self.active_watchers),
             "cache_size": len(self.compilation_cache),
             "users": list(self.active_watchers.keys()),
+            "watcher": file_watcher.get_stats(),
         }
 
 
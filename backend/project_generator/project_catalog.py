@@ -0,0 +1,401 @@
+"""
+Project Catalog – persistenter Index für list_projects
+
+Vorher: list_projects lief bei jedem Aufruf mit os.walk über jede Datei
+jedes Projekts (Anzahl + neueste mtime), öffnete README.md/package.json
+pro Projekt und calculate_directory_size lief den Baum noch einmal ab.
+
+Jetzt (SQLite, eine Zeile pro Projekt):
+- file_count, size_bytes, platform, framework, name, description,
+  last_modified
+- create_project / write_files / save_files_to_project / delete_project
+  aktualisieren den Katalog direkt (inkrementell)
+- Abgleich mit der Platte nur über Verzeichnis-mtimes (gedrosselt):
+  neue/gelöschte Projekte über die mtime des Basis-Verzeichnisses,
+  Änderungen im Projekt über die mtimes der bekannten Unterordner
+- Listing = eine indizierte Query mit Keyset-Pagination
+"""
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXCLUDE_DIRS = {".git", "node_modules", "__pycache__", ".next", "build", "dist", ".vscode", ".idea", "venv", ".metadata", ".dart_tool"}
+EXCLUDE_EXTENSIONS = {".pyc", ".log", ".DS_Store"}
+SKIP_PROJECT_DIRS = {"__pycache__", "node_modules"}
+
+# Dateien, aus denen der Anzeigename kommt → bei Änderung komplett neu scannen
+NAME_FILES = {"README.md", "package.json"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    base TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    name TEXT,
+    platform TEXT,
+    framework TEXT,
+    description TEXT,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    last_modified REAL NOT NULL DEFAULT 0,
+    dirs TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS ix_projects_modified ON projects (last_modified, path);
+CREATE INDEX IF NOT EXISTS ix_projects_base ON projects (base);
+CREATE TABLE IF NOT EXISTS bases (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+def is_counted(rel_path: str) -> bool:
+    """Gleiche Regeln wie der alte os.walk in list_projects."""
+    parts = rel_path.replace("\\", "/").split("/")
+    filename = parts[-1]
+    if any(part in EXCLUDE_DIRS for part in parts[:-1]):
+        return False
+    return not (filename.startswith(".") or any(filename.endswith(ext) for ext in EXCLUDE_EXTENSIONS))
+
+
+def detect_platform(rel_path: str) -> Optional[str]:
+    """Plattform anhand der Dateiendung (wie bisher)."""
+    filename = os.path.basename(rel_path)
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".dart":
+        return "flutter"
+    if ext in [".js", ".jsx", ".ts", ".tsx"]:
+        return "nextjs" if "next.config" in filename or "next" in rel_path else "react"
+    return {".py": "python", ".swift": "ios-swift", ".kt": "android-kotlin", ".vue": "vue"}.get(ext)
+
+
+def read_project_info(project_dir: str) -> Tuple[str, Optional[str]]:
+    """Name aus README.md (# Titel) bzw. package.json, Beschreibung aus package.json."""
+    name = os.path.basename(project_dir)
+    description = None
+    try:
+        readme_path = os.path.join(project_dir, "README.md")
+        if os.path.exists(readme_path):
+            with open(readme_path, "r", encoding="utf-8") as f:
+                first_line = f.readline().strip()
+                if first_line.startswith("#"):
+                    name = first_line[1:].strip()
+
+        package_json = os.path.join(project_dir, "package.json")
+        if os.path.exists(package_json):
+            with open(package_json, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            name = data.get("name", name)
+            description = data.get("description")
+    except (OSError, ValueError):
+        pass
+    return name, description
+
+
+def encode_cursor(last_modified: float, path: str) -> str:
+    return base64.urlsafe_b64encode(f"{last_modified!r}|{path}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        last_modified, path = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(last_modified), path
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class ProjectCatalog:
+    """
+    SQLite-Katalog aller generierten Projekte.
+    """
+
+    def __init__(self, db_path: str, reconcile_interval: float = 30.0):
+        """
+        Args:
+            db_path: Pfad der SQLite-Datei
+            reconcile_interval: Sekunden zwischen zwei Abgleichen mit der Platte
+        """
+        self.db_path = db_path
+        self.reconcile_interval = reconcile_interval
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._last_reconcile: Dict[Tuple[str, ...], float] = {}
+        self.stats = {"project_scans": 0, "incremental_updates": 0, "reconciles": 0}
+
+    # ---------------------------------------------------------
+    # SCAN (ein Projekt)
+    # ---------------------------------------------------------
+    def refresh(self, project_dir, framework: Optional[str] = None, description: Optional[str] = None) -> Optional[Dict]:
+        """Ein Projekt komplett neu scannen und speichern."""
+        path = os.path.abspath(project_dir)
+        if not os.path.isdir(path):
+            self.remove(path)
+            return None
+
+        file_count = 0
+        size_bytes = 0
+        last_modified = 0.0
+        platform = None
+        dirs = {}
+
+        for root, subdirs, filenames in os.walk(path):
+            subdirs[:] = [d for d in subdirs if d not in EXCLUDE_DIRS]
+            rel_root = os.path.relpath(root, path)
+            try:
+                dirs[rel_root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+
+            for filename in filenames:
+                if filename.startswith(".") or any(filename.endswith(ext) for ext in EXCLUDE_EXTENSIONS):
+                    continue
+                file_path = os.path.join(root, filename)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                file_count += 1
+                size_bytes += st.st_size
+                last_modified = max(last_modified, st.st_mtime)
+                if not platform:
+                    platform = detect_platform(os.path.relpath(file_path, path))
+
+        name, package_description = read_project_info(path)
+        self.stats["project_scans"] += 1
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO projects "
+                "(path, base, project_id, name, platform, framework, description, file_count, size_bytes, last_modified, dirs) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET "
+                "name = excluded.name, platform = excluded.platform, "
+                "framework = COALESCE(excluded.framework, projects.framework), "
+                "description = COALESCE(excluded.description, projects.description), "
+                "file_count = excluded.file_count, size_bytes = excluded.size_bytes, "
+                "last_modified = excluded.last_modified, dirs = excluded.dirs",
+                (
+                    path,
+                    os.path.dirname(path),
+                    os.path.basename(path),
+                    name,
+                    platform,
+                    framework,
+                    description or package_description,
+                    file_count,
+                    size_bytes,
+                    last_modified,
+                    json.dumps(dirs),
+                ),
+            )
+        return self.get(path)
+
+    # ---------------------------------------------------------
+    # INKREMENTELL (Write-Pfade)
+    # ---------------------------------------------------------
+    def files_written(self, project_dir, changes: Iterable[Tuple[str, Optional[int]]]):
+        """
+        Nach dem Schreiben von Dateien aufrufen.
+
+        Args:
+            project_dir: Projekt-Verzeichnis
+            changes: [(rel_path, alte Größe oder None wenn neu), ...]
+        """
+        path = os.path.abspath(project_dir)
+        changes = list(changes)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_count, size_bytes, last_modified, platform, dirs FROM projects WHERE path = ?", (path,)
+            ).fetchone()
+
+            if row is None or any(os.path.basename(rel) in NAME_FILES and rel.count("/") == 0 for rel, _ in changes):
+                self.refresh(path)
+                return
+
+            file_count, size_bytes, last_modified, platform, dirs_json = row
+            dirs = json.loads(dirs_json)
+
+            for rel_path, old_size in changes:
+                rel_path = rel_path.replace("\\", "/").lstrip("/")
+                full_path = os.path.join(path, rel_path)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+
+                # Ordner-mtimes mitziehen, sonst würde der Abgleich neu scannen
+                parent = os.path.dirname(rel_path)
+                while True:
+                    key = parent or "."
+                    if not any(part in EXCLUDE_DIRS for part in key.split("/")):
+                        try:
+                            dirs[key] = os.stat(os.path.join(path, parent)).st_mtime_ns
+                        except OSError:
+                            pass
+                    if not parent:
+                        break
+                    parent = os.path.dirname(parent)
+
+                if not is_counted(rel_path):
+                    continue
+                file_count += 1 if old_size is None else 0
+                size_bytes += st.st_size - (old_size or 0)
+                last_modified = max(last_modified, st.st_mtime)
+                platform = platform or detect_platform(rel_path)
+
+            self._conn.execute(
+                "UPDATE projects SET file_count = ?, size_bytes = ?, last_modified = ?, platform = ?, dirs = ? "
+                "WHERE path = ?",
+                (file_count, size_bytes, last_modified, platform, json.dumps(dirs), path),
+            )
+        self.stats["incremental_updates"] += 1
+
+    def remove(self, project_dir):
+        with self._lock:
+            self._conn.execute("DELETE FROM projects WHERE path = ?", (os.path.abspath(project_dir),))
+
+    # ---------------------------------------------------------
+    # ABGLEICH (Verzeichnis-mtimes)
+    # ---------------------------------------------------------
+    def reconcile(self, base_dirs: List, force: bool = False):
+        """
+        Katalog mit der Platte abgleichen, ohne Dateien zu lesen:
+        nur geänderte Projekte (Ordner-mtime) werden neu gescannt.
+        """
+        key = tuple(str(b) for b in base_dirs)
+        now = time.monotonic()
+        if not force and now - self._last_reconcile.get(key, float("-inf")) < self.reconcile_interval:
+            return
+        self._last_reconcile[key] = now
+        self.stats["reconciles"] += 1
+
+        for base_dir in base_dirs:
+            base = os.path.abspath(base_dir)
+            with self._lock:
+                known = dict(self._conn.execute("SELECT path, dirs FROM projects WHERE base = ?", (base,)).fetchall())
+                stored_mtime = self._conn.execute("SELECT mtime_ns FROM bases WHERE path = ?", (base,)).fetchone()
+
+            try:
+                base_mtime = os.stat(base).st_mtime_ns
+            except OSError:
+                for path in known:
+                    self.remove(path)
+                continue
+
+            # Projekte hinzugekommen/gelöscht?
+            if stored_mtime is None or stored_mtime[0] != base_mtime:
+                current = set()
+                for entry in os.scandir(base):
+                    if entry.is_dir() and not entry.name.startswith(".") and entry.name not in SKIP_PROJECT_DIRS:
+                        current.add(os.path.abspath(entry.path))
+                for path in set(known) - current:
+                    self.remove(path)
+                    del known[path]
+                for path in current - set(known):
+                    self.refresh(path)
+                with self._lock:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO bases (path, mtime_ns) VALUES (?, ?)", (base, base_mtime)
+                    )
+
+            # Geänderte Projekte (nur Ordner stat'en)
+            for path, dirs_json in known.items():
+                if self._dirs_changed(path, json.loads(dirs_json)):
+                    self.refresh(path)
+
+    @staticmethod
+    def _dirs_changed(path: str, dirs: Dict[str, int]) -> bool:
+        for rel, mtime_ns in dirs.items():
+            try:
+                if os.stat(os.path.join(path, rel)).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    # ---------------------------------------------------------
+    # READ
+    # ---------------------------------------------------------
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        path, project_id, name, platform, framework, description, file_count, size_bytes, last_modified = row
+        return {
+            "id": project_id,
+            "name": name or project_id,
+            "platform": platform or "unknown",
+            "framework": framework,
+            "description": description,
+            "file_count": file_count,
+            "size_bytes": size_bytes,
+            "last_modified": int(last_modified) if last_modified > 0 else None,
+            "path": os.path.relpath(path),
+        }
+
+    _COLUMNS = "path, project_id, name, platform, framework, description, file_count, size_bytes, last_modified"
+
+    def get(self, project_dir) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM projects WHERE path = ?", (os.path.abspath(project_dir),)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list(
+        self,
+        base_dirs: List,
+        limit: Optional[int] = None,
+        before: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        """
+        Projekte, zuletzt geänderte zuerst (Keyset-Pagination).
+
+        Returns:
+            (projects, next_cursor, total)
+        """
+        bases = [os.path.abspath(b) for b in base_dirs]
+        placeholders = ",".join("?" * len(bases))
+        where = f"base IN ({placeholders})"
+        params: List = list(bases)
+
+        if before:
+            last_modified, path = decode_cursor(before)
+            where += " AND (last_modified < ? OR (last_modified = ? AND path < ?))"
+            params.extend([last_modified, last_modified, path])
+
+        sql = f"SELECT {self._COLUMNS} FROM projects WHERE {where} ORDER BY last_modified DESC, path DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM projects WHERE base IN ({placeholders})", bases).fetchone()[0]
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][8], rows[-1][0])
+        return [self._row_to_dict(r) for r in rows], next_cursor, total
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton Instance
+project_catalog = ProjectCatalog(
+    os.getenv("PROJECT_CATALOG_DB", "./data/project_catalog.sqlite3"),
+    reconcile_interval=float(os.getenv("PROJECT_CATALOG_RECONCILE_INTERVAL", 30)),
+)
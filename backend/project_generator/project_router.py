@@ -2,6 +2,7 @@
 Clean Project Router without lint errors
 """
 from typing import Dict, List, Optional
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -9,6 +10,8 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
+from project_generator.project_catalog import project_catalog
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -41,115 +44,34 @@ def get_project_path_from_id(project_id: str) -> Path:
     return Path("projects") / project_id
 
 
+# Alle Basis-Verzeichnisse, in denen Projekte liegen können
+PROJECT_BASE_DIRS = [
+    Path("user_projects/default_user"),
+    Path("backend/user_projects/default_user"),
+    Path("projects")
+]
+
+
 @router.get("/list")
-async def list_projects():
+async def list_projects(limit: Optional[int] = None, cursor: Optional[str] = None):
     """
     List all available projects with metadata.
     Returns projects with name, platform, file count, and last modified date.
+
+    Liest aus dem Projekt-Katalog (eine indizierte Query) statt jeden
+    Projektbaum zu durchlaufen; optional mit limit/cursor paginiert.
     """
     try:
-        projects = []
-        
-        # Check all possible project directories
-        project_dirs = [
-            Path("user_projects/default_user"),
-            Path("backend/user_projects/default_user"),
-            Path("projects")
-        ]
-        
-        for base_dir in project_dirs:
-            if not base_dir.exists():
-                continue
-            
-            for project_dir in base_dir.iterdir():
-                if not project_dir.is_dir():
-                    continue
-                
-                # Skip system directories
-                if project_dir.name.startswith('.') or project_dir.name in ['__pycache__', 'node_modules']:
-                    continue
-                
-                project_id = project_dir.name
-                
-                # Count files
-                file_count = 0
-                exclude_dirs = {".git", "node_modules", "__pycache__", ".next", "build", "dist", ".vscode", ".idea", "venv", ".metadata", ".dart_tool"}
-                exclude_extensions = {".pyc", ".log", ".DS_Store"}
-                
-                last_modified = 0
-                platform = None
-                
-                for root, dirs, filenames in os.walk(project_dir):
-                    dirs[:] = [d for d in dirs if d not in exclude_dirs]
-                    for filename in filenames:
-                        if filename.startswith(".") or any(filename.endswith(ext) for ext in exclude_extensions):
-                            continue
-                        
-                        file_path = Path(root) / filename
-                        file_count += 1
-                        
-                        # Get last modified time
-                        try:
-                            mtime = os.path.getmtime(file_path)
-                            if mtime > last_modified:
-                                last_modified = mtime
-                        except:
-                            pass
-                        
-                        # Detect platform from file extensions
-                        if not platform:
-                            ext = file_path.suffix.lower()
-                            if ext == '.dart':
-                                platform = 'flutter'
-                            elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-                                if 'next.config' in filename or 'next' in str(file_path):
-                                    platform = 'nextjs'
-                                else:
-                                    platform = 'react'
-                            elif ext == '.py':
-                                platform = 'python'
-                            elif ext == '.swift':
-                                platform = 'ios-swift'
-                            elif ext == '.kt':
-                                platform = 'android-kotlin'
-                            elif ext == '.vue':
-                                platform = 'vue'
-                
-                # Try to get project name from README or package.json
-                project_name = project_id
-                try:
-                    readme_path = project_dir / "README.md"
-                    if readme_path.exists():
-                        with open(readme_path, "r", encoding="utf-8") as f:
-                            first_line = f.readline().strip()
-                            if first_line.startswith("#"):
-                                project_name = first_line[1:].strip()
-                    
-                    # Also check package.json
-                    package_json = project_dir / "package.json"
-                    if package_json.exists():
-                        import json
-                        with open(package_json, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                            if "name" in data:
-                                project_name = data["name"]
-                except:
-                    pass
-                
-                projects.append({
-                    "id": project_id,
-                    "name": project_name,
-                    "platform": platform or "unknown",
-                    "file_count": file_count,
-                    "last_modified": int(last_modified) if last_modified > 0 else None,
-                    "path": str(project_dir)
-                })
-        
-        # Sort by last modified (newest first)
-        projects.sort(key=lambda x: x.get("last_modified") or 0, reverse=True)
-        
-        return {"projects": projects, "total": len(projects)}
-        
+        def _load():
+            project_catalog.reconcile(PROJECT_BASE_DIRS)
+            return project_catalog.list(PROJECT_BASE_DIRS, limit=limit, before=cursor)
+
+        projects, next_cursor, total = await asyncio.to_thread(_load)
+
+        return {"projects": projects, "total": total, "next_cursor": next_cursor}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing projects: {e}")
         raise HTTPException(
@@ -175,6 +97,7 @@ async def delete_project(project_id: str):
         # Delete project directory
         import shutil
         shutil.rmtree(project_path)
+        project_catalog.remove(project_path)
         
         return {
             "success": True,
@@ -329,6 +252,7 @@ async def create_project(request: ProjectRequest):
         # Create project directory
         project_path = Path(f"projects/{request.project_name}")
         project_path.mkdir(parents=True, exist_ok=True)
+        project_catalog.refresh(project_path, framework=request.framework, description=request.description)
         
         # Generate based on framework
         if request.framework in ["react", "react-native"]:
@@ -353,8 +277,9 @@ async def create_project(request: ProjectRequest):
             # Fallback: universal project structure
             files_created = create_universal_project(project_path, request)
         
-        # Calculate size
-        total_size = calculate_directory_size(str(project_path))
+        # Größe kommt aus dem Katalog (von write_files inkrementell gepflegt)
+        entry = project_catalog.get(project_path)
+        total_size = entry["size_bytes"] if entry else calculate_directory_size(str(project_path))
         
         return ProjectResponse(
             success=True,
@@ -591,16 +516,20 @@ app.listen(port, () => {{
 def write_files(project_path: Path, files: Dict[str, str]) -> int:
     """Write files to project directory"""
     files_created = 0
+    changes = []
     
     for file_path, content in files.items():
         full_path = project_path / file_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
+        old_size = full_path.stat().st_size if full_path.exists() else None
         
         with open(full_path, 'w', encoding='utf-8') as f:
             f.write(content)
         
+        changes.append((file_path, old_size))
         files_created += 1
     
+    project_catalog.files_written(project_path, changes)
     return files_created
 
 
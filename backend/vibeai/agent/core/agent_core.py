@@ -360,18 +360,14 @@ class SuperAgentCore:
         # STEP 3: Generate code content
         code_content = await self._generate_code_content(file_info)
         
-        # STEP 4: Stream code CHARACTER BY CHARACTER with live editor updates
+        # STEP 4: Stream code as typed deltas with live editor updates
         async for chunk in self.code_streamer.stream_code(file_path, code_content, typing_speed=1.0):
             # Update editor content in real-time
-            if chunk["event"] == "code_character_written":
-                await self.editor_controller.update_file_content(
-                    file_path,
-                    chunk["data"]["content"],
-                    chunk["data"]["line"],
-                    chunk["data"]["column"]
-                )
-                await self.editor_controller.set_cursor_position(
+            if chunk["event"] == "code_delta":
+                await self.editor_controller.append_file_content(
                     file_path,
+                    chunk["data"]["offset"],
+                    chunk["data"]["text"],
                     chunk["data"]["line"],
                     chunk["data"]["column"]
                 )
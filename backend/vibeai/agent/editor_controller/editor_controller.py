@@ -64,6 +64,7 @@ class EditorController:
             await self.open_file(file_path, line or 1, column or 1)
         
         self.open_files[file_path]["content"] = content
+        self.open_files[file_path]["chunks"] = []
         
         await self.event_emitter.emit("editor_content_updated", {
             "path": file_path,
@@ -73,6 +74,50 @@ class EditorController:
             "length": len(content)
         })
     
+    async def append_file_content(
+        self,
+        file_path: str,
+        offset: int,
+        text: str,
+        line: int = None,
+        column: int = None
+    ) -> None:
+        """
+        Append typed text to the editor content (delta update).
+
+        Only the appended text is sent, with its offset and the cursor
+        position after it, instead of the full content.
+        """
+        if file_path not in self.open_files:
+            await self.open_file(file_path, line or 1, column or 1)
+
+        entry = self.open_files[file_path]
+        entry.setdefault("chunks", [])
+        entry["chunks"].append(text)
+        entry["length"] = offset + len(text)
+        if line:
+            entry["line"] = line
+        if column:
+            entry["column"] = column
+
+        await self.event_emitter.emit("editor_content_appended", {
+            "path": file_path,
+            "offset": offset,
+            "text": text,
+            "line": entry["line"],
+            "column": entry["column"],
+            "length": entry["length"]
+        })
+
+    def get_file_content(self, file_path: str) -> str:
+        """
+        Current editor content of a file.
+        """
+        entry = self.open_files.get(file_path)
+        if not entry:
+            return ""
+        return entry["content"] + "".join(entry.get("chunks", []))
+
     async def set_cursor_position(self, file_path: str, line: int, column: int) -> None:
         """
         Set cursor position in editor.
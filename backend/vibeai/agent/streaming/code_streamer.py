@@ -4,30 +4,60 @@
 """
 Live code streaming engine with character-by-character typing effect.
 
-Streams code character by character like a human typing.
+Streams code like a human typing, using a delta protocol:
+
+- code_streaming_started: file announced (total chars/lines)
+- code_delta: only the newly typed text, with its offset and the
+  cursor line/column after applying it. All characters typed within
+  one frame are coalesced into a single delta.
+- code_snapshot: periodic full content + checksum, so a client that
+  missed a delta can resync
+- code_streaming_complete: final content + checksum + bytes sent
 """
 
 import asyncio
+import json
 import random
+import zlib
 from typing import AsyncGenerator, Dict
 from vibeai.agent.event_stream.event_emitter import EventEmitter
 
 
+def content_checksum(content: str) -> str:
+    """CRC32 of the UTF-8 content (hex), used to verify client state."""
+    return format(zlib.crc32(content.encode("utf-8")) & 0xFFFFFFFF, "08x")
+
+
 class CodeStreamer:
     """
     Streams code character by character with realistic typing effect.
-    
-    Shows code as it's being written, character by character,
-    like a real human typing in the editor.
+
+    Shows code as it's being written, like a real human typing in the
+    editor, but only sends what changed (deltas) instead of the full
+    content on every character.
     """
-    
-    def __init__(self, event_emitter: EventEmitter):
+
+    def __init__(
+        self,
+        event_emitter: EventEmitter,
+        frame_interval: float = 0.05,
+        snapshot_interval: int = 4096
+    ):
+        """
+        Args:
+            event_emitter: Event emitter for live events
+            frame_interval: Seconds per frame; chars typed within one frame
+                are coalesced into one code_delta event
+            snapshot_interval: Emit a checksummed code_snapshot every N chars
+        """
         self.event_emitter = event_emitter
-    
+        self.frame_interval = frame_interval
+        self.snapshot_interval = snapshot_interval
+
     def _get_typing_delay(self, char: str) -> float:
         """
         Get realistic typing delay for a character.
-        
+
         ⚡ LERN-GESCHWINDIGKEIT: Langsam genug zum Lernen und Verstehen
         - Normal chars: 150-250ms (langsam genug zum Mitlesen und Lernen)
         - Spaces: 80-120ms
@@ -51,7 +81,13 @@ class CodeStreamer:
         else:
             # Normale Zeichen = langsam genug zum Lernen und Verstehen
             return random.uniform(0.15, 0.25)  # 150-250ms für normale Zeichen (LERN-GESCHWINDIGKEIT)
-    
+
+    async def _emit(self, event_type: str, data: Dict, stats: Dict) -> Dict:
+        """Emit an event and count its payload size."""
+        stats["events"] += 1
+        stats["bytes"] += len(json.dumps(data))
+        return await self.event_emitter.emit(event_type, data)
+
     async def stream_code(
         self,
         file_path: str,
@@ -59,68 +95,83 @@ class CodeStreamer:
         typing_speed: float = 1.0  # Multiplier for typing speed (1.0 = normal, 2.0 = 2x faster)
     ) -> AsyncGenerator[Dict, None]:
         """
-        Stream code character by character with realistic typing effect.
-        
-        Yields events for each character written, making it look
-        like a human is typing in the editor.
+        Stream code with realistic typing effect as deltas.
+
+        Yields one code_delta per frame (the text typed during that
+        frame), a code_snapshot every `snapshot_interval` chars and a
+        final code_streaming_complete event.
         """
         total_chars = len(code_content)
-        current_content = ""
         current_line = 1
         current_column = 1
-        
+        stats = {"events": 0, "bytes": 0}
+        seq = 0
+
         # Announce streaming start
-        yield await self.event_emitter.emit("code_streaming_started", {
+        yield await self._emit("code_streaming_started", {
             "path": file_path,
+            "protocol": "delta",
             "total_chars": total_chars,
             "total_lines": code_content.count("\n") + 1
-        })
-        
-        # Stream character by character
+        }, stats)
+
+        frame_start = 0  # Offset of the first char not yet sent
+        frame_delay = 0.0
+        next_snapshot = self.snapshot_interval
+
         for char_index, char in enumerate(code_content):
-            # Add character to current content
-            current_content += char
-            
             # Update line/column tracking
             if char == '\n':
                 current_line += 1
                 current_column = 1
             else:
                 current_column += 1
-            
-            # Emit character written event
-            yield await self.event_emitter.emit("code_character_written", {
+
+            frame_delay += self._get_typing_delay(char) / typing_speed
+            end = char_index + 1
+
+            # Frame voll (oder letztes Zeichen) → Delta senden
+            if frame_delay < self.frame_interval and end < total_chars:
+                continue
+
+            # Realistic typing delay (one sleep per frame)
+            await asyncio.sleep(frame_delay)
+            frame_delay = 0.0
+
+            seq += 1
+            yield await self._emit("code_delta", {
                 "path": file_path,
-                "content": current_content,  # Full content so far
-                "character": char,
-                "char_index": char_index + 1,
-                "total_chars": total_chars,
+                "seq": seq,
+                "offset": frame_start,
+                "text": code_content[frame_start:end],
                 "line": current_line,
                 "column": current_column,
-                "progress": ((char_index + 1) / total_chars) * 100
-            })
-            
-            # Realistic typing delay
-            delay = self._get_typing_delay(char) / typing_speed
-            await asyncio.sleep(delay)
-            
-            # Every 10 characters, also emit a "chunk" event for smoother updates
-            if (char_index + 1) % 10 == 0:
-                yield await self.event_emitter.emit("code_chunk_written", {
+                "progress": round((end / total_chars) * 100, 1)
+            }, stats)
+            frame_start = end
+
+            # Periodic snapshot for resync
+            if end >= next_snapshot and end < total_chars:
+                next_snapshot = end + self.snapshot_interval
+                snapshot = code_content[:end]
+                yield await self._emit("code_snapshot", {
                     "path": file_path,
-                    "content": current_content,
-                    "char_index": char_index + 1,
-                    "total_chars": total_chars,
+                    "seq": seq,
+                    "content": snapshot,
+                    "length": end,
+                    "checksum": content_checksum(snapshot),
                     "line": current_line,
-                    "column": current_column,
-                    "progress": ((char_index + 1) / total_chars) * 100
-                })
-        
+                    "column": current_column
+                }, stats)
+
         # Streaming complete
-        yield await self.event_emitter.emit("code_streaming_complete", {
+        yield await self._emit("code_streaming_complete", {
             "path": file_path,
+            "seq": seq,
             "total_lines": current_line,
             "total_chars": total_chars,
-            "final_content": current_content
-        })
-
+            "final_content": code_content,
+            "checksum": content_checksum(code_content),
+            "events_sent": stats["events"],
+            "bytes_sent": stats["bytes"]
+        }, stats)
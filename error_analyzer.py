@@ -5,10 +5,12 @@ Error Analyzer - Listet alle Fehler, Warnungen und Code-Probleme auf
 
 import os
 import ast
+import hashlib
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set
-from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import asdict, dataclass, field
 import json
 
 
@@ -53,17 +55,286 @@ class AnalysisReport:
         print("="*70)
 
 
+# Bei Änderungen an den Checks erhöhen → alte Cache-Einträge werden ignoriert
+ANALYZER_VERSION = 2
+
+CACHE_FILENAME = ".error_analyzer_cache.json"
+
+
+@dataclass
+class ParsedFile:
+    """Einmal gelesene + geparste Datei (geteilt von allen Checks)"""
+    rel_path: str
+    content: str
+    lines: List[str]
+    tree: Optional[ast.AST] = None
+    error: Optional[Exception] = None
+
+
+def parse_source(rel_path: str, raw: bytes) -> ParsedFile:
+    """Dekodiert und parst eine Datei genau einmal."""
+    try:
+        content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    except UnicodeDecodeError as e:
+        return ParsedFile(rel_path, "", [], error=e)
+
+    lines = content.split('\n')
+    lines = [line + '\n' for line in lines[:-1]] + ([lines[-1]] if lines[-1] else [])
+
+    parsed = ParsedFile(rel_path, content, lines)
+    try:
+        parsed.tree = ast.parse(content)
+    except Exception as e:
+        parsed.error = e
+    return parsed
+
+
+def check_syntax(parsed: ParsedFile) -> List[Issue]:
+    """Prüfe Syntax-Fehler"""
+    e = parsed.error
+    if e is None:
+        return []
+    if isinstance(e, SyntaxError):
+        return [Issue(
+            file=parsed.rel_path,
+            line=e.lineno or 0,
+            column=e.offset or 0,
+            severity='error',
+            code='E001',
+            message=e.msg or "Syntax error",
+            rule='syntax'
+        )]
+    return [Issue(
+        file=parsed.rel_path,
+        line=0,
+        column=0,
+        severity='error',
+        code='E002',
+        message=f"Parse error: {str(e)}",
+        rule='parse'
+    )]
+
+
+def check_imports(parsed: ParsedFile) -> List[Issue]:
+    """Prüfe Import-Probleme"""
+    if parsed.tree is None:
+        return []
+
+    imports = set()
+    used_names = set()
+
+    for node in ast.walk(parsed.tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                imports.add(alias.asname if alias.asname else alias.name)
+        elif isinstance(node, ast.Name):
+            used_names.add(node.id)
+
+    # Finde ungenutzte Imports
+    return [
+        Issue(
+            file=parsed.rel_path,
+            line=0,
+            column=0,
+            severity='warning',
+            code='W001',
+            message=f"Unused import: {name}",
+            rule='unused-import'
+        )
+        for name in sorted(imports - used_names)
+    ]
+
+
+def check_style(parsed: ParsedFile) -> List[Issue]:
+    """Prüfe Code-Style Probleme"""
+    issues = []
+    for i, line in enumerate(parsed.lines, 1):
+        stripped = line.rstrip()
+
+        # Trailing whitespace
+        if stripped != line.rstrip('\n'):
+            issues.append(Issue(
+                file=parsed.rel_path,
+                line=i,
+                column=len(stripped),
+                severity='info',
+                code='S001',
+                message="Trailing whitespace",
+                rule='trailing-whitespace'
+            ))
+
+        # Tabs statt Spaces
+        if '\t' in line:
+            issues.append(Issue(
+                file=parsed.rel_path,
+                line=i,
+                column=line.index('\t'),
+                severity='warning',
+                code='S002',
+                message="Tab character found (use spaces)",
+                rule='no-tabs'
+            ))
+
+        # Zeile zu lang
+        if len(stripped) > 88:
+            issues.append(Issue(
+                file=parsed.rel_path,
+                line=i,
+                column=88,
+                severity='info',
+                code='S003',
+                message=f"Line too long ({len(stripped)} > 88)",
+                rule='line-too-long'
+            ))
+    return issues
+
+
+def check_code_smells(parsed: ParsedFile) -> List[Issue]:
+    """Prüfe Code-Smells"""
+    if parsed.tree is None:
+        return []
+
+    issues = []
+    for node in ast.walk(parsed.tree):
+        # Zu generelle Exception
+        if isinstance(node, ast.ExceptHandler):
+            if node.type and isinstance(node.type, ast.Name) and node.type.id == 'Exception':
+                issues.append(Issue(
+                    file=parsed.rel_path,
+                    line=node.lineno,
+                    column=node.col_offset,
+                    severity='info',
+                    code='C001',
+                    message="Catching too general exception 'Exception'",
+                    rule='broad-exception'
+                ))
+
+        # Fehlende Docstrings
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            has_docstring = (
+                node.body and
+                isinstance(node.body[0], ast.Expr) and
+                isinstance(node.body[0].value, ast.Constant) and
+                isinstance(node.body[0].value.value, str)
+            )
+            if not has_docstring and not node.name.startswith('_'):
+                issues.append(Issue(
+                    file=parsed.rel_path,
+                    line=node.lineno,
+                    column=node.col_offset,
+                    severity='info',
+                    code='C002',
+                    message=f"Missing docstring for {node.__class__.__name__} '{node.name}'",
+                    rule='missing-docstring'
+                ))
+    return issues
+
+
+# Report-Kategorie → Check
+CHECKS = {
+    'syntax_errors': check_syntax,
+    'import_errors': check_imports,
+    'style_warnings': check_style,
+    'code_smells': check_code_smells,
+}
+
+
+def analyze_source(rel_path: str, raw: bytes) -> Dict[str, List[dict]]:
+    """
+    Alle Checks für eine Datei (ein Parse, läuft im Worker-Prozess).
+    Ergebnis ohne Dateiname → unabhängig vom Pfad cachebar.
+    """
+    parsed = parse_source(rel_path, raw)
+    result = {}
+    for category, check in CHECKS.items():
+        issues = [asdict(issue) for issue in check(parsed)]
+        for issue in issues:
+            del issue['file']
+        result[category] = issues
+    return result
+
+
+def _analyze_job(job: Tuple[str, bytes]) -> Dict[str, List[dict]]:
+    return analyze_source(*job)
+
+
+class ResultCache:
+    """
+    Persistenter Ergebnis-Cache: Content-Hash → Issues.
+    Unveränderte Dateien werden nicht erneut geparst.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.used: Set[str] = set()
+        self.dirty = False
+
+        if path and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == ANALYZER_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @staticmethod
+    def key(raw: bytes) -> str:
+        return hashlib.sha1(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        result = self.entries.get(key)
+        if result is not None:
+            self.used.add(key)
+        return result
+
+    def put(self, key: str, result: dict):
+        self.entries[key] = result
+        self.used.add(key)
+        self.dirty = True
+
+    def save(self, prune: bool = False):
+        """Speichern; prune=True entfernt Einträge, die im Lauf nicht vorkamen."""
+        if not self.path:
+            return
+        if prune and self.used != self.entries.keys():
+            self.entries = {k: v for k, v in self.entries.items() if k in self.used}
+            self.dirty = True
+        if not self.dirty:
+            return
+
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ANALYZER_VERSION, 'files': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
 class ErrorAnalyzer:
     """Analysiert alle Fehler im Projekt"""
-    
-    def __init__(self, project_root: str = "."):
+
+    # Unter dieser Anzahl ungecachter Dateien lohnt sich kein Prozess-Pool
+    MIN_FILES_FOR_POOL = 32
+
+    def __init__(self, project_root: str = ".", jobs: Optional[int] = None,
+                 cache_path: Optional[str] = CACHE_FILENAME):
+        """
+        Args:
+            project_root: Projekt-Pfad
+            jobs: Worker-Prozesse (None = CPU-Anzahl, 1 = seriell)
+            cache_path: Ergebnis-Cache (relativ zu project_root), None = kein Cache
+        """
         self.project_root = Path(project_root).resolve()
         self.report = AnalysisReport()
         self.ignore_dirs = {
             'node_modules', '__pycache__', '.git', 'venv',
             '.venv', 'build', 'dist', '.next', 'build_artifacts'
         }
-    
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = ResultCache(self.project_root / cache_path if cache_path else None)
+        self.stats = {'files': 0, 'cached': 0, 'analyzed': 0}
+
     def scan_files(self) -> List[Path]:
         """Scanne alle Python-Dateien"""
         files = []
@@ -73,179 +344,131 @@ class ErrorAnalyzer:
                 if filename.endswith('.py'):
                     files.append(Path(root) / filename)
         return files
-    
-    def check_syntax(self, file_path: Path):
-        """Prüfe Syntax-Fehler"""
+
+    def changed_files(self, since: str) -> List[Path]:
+        """
+        Python-Dateien, die sich seit `since` (Git-Ref) geändert haben,
+        inklusive neuer, noch nicht getrackter Dateien.
+        """
+        commands = [
+            ['git', 'diff', '--name-only', '--relative', '--diff-filter=ACMR', since, '--'],
+            ['git', 'ls-files', '--others', '--exclude-standard'],
+        ]
+        names: Set[str] = set()
+        for command in commands:
+            result = subprocess.run(
+                command, cwd=self.project_root, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"git failed: {result.stderr.strip()}")
+            names.update(line for line in result.stdout.splitlines() if line)
+
+        files = []
+        for name in sorted(names):
+            path = self.project_root / name
+            if (name.endswith('.py') and path.is_file()
+                    and not any(part in self.ignore_dirs for part in Path(name).parts[:-1])):
+                files.append(path)
+        return files
+
+    def _add_issues(self, rel_path: str, result: Dict[str, List[dict]]):
+        for category in CHECKS:
+            target = getattr(self.report, category)
+            for issue in result.get(category, []):
+                target.append(Issue(file=rel_path, **issue))
+
+    def _run_checks(self, file_path: Path, category: str):
+        rel_path = str(file_path.relative_to(self.project_root))
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            ast.parse(content)
-        except SyntaxError as e:
-            self.report.syntax_errors.append(Issue(
-                file=str(file_path.relative_to(self.project_root)),
-                line=e.lineno or 0,
-                column=e.offset or 0,
-                severity='error',
-                code='E001',
-                message=e.msg or "Syntax error",
-                rule='syntax'
-            ))
-        except Exception as e:
-            self.report.syntax_errors.append(Issue(
-                file=str(file_path.relative_to(self.project_root)),
-                line=0,
-                column=0,
-                severity='error',
-                code='E002',
-                message=f"Parse error: {str(e)}",
-                rule='parse'
-            ))
-    
+            raw = file_path.read_bytes()
+        except OSError:
+            return
+        getattr(self.report, category).extend(CHECKS[category](parse_source(rel_path, raw)))
+
+    def check_syntax(self, file_path: Path):
+        """Prüfe Syntax-Fehler (einzelne Datei)"""
+        self._run_checks(file_path, 'syntax_errors')
+
     def check_imports(self, file_path: Path):
-        """Prüfe Import-Probleme"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                tree = ast.parse(f.read())
-            
-            imports = set()
-            used_names = set()
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        name = alias.asname if alias.asname else alias.name
-                        imports.add(name)
-                elif isinstance(node, ast.ImportFrom):
-                    for alias in node.names:
-                        name = alias.asname if alias.asname else alias.name
-                        imports.add(name)
-                elif isinstance(node, ast.Name):
-                    used_names.add(node.id)
-            
-            # Finde ungenutzte Imports
-            unused = imports - used_names
-            for name in unused:
-                self.report.import_errors.append(Issue(
-                    file=str(file_path.relative_to(self.project_root)),
-                    line=0,
-                    column=0,
-                    severity='warning',
-                    code='W001',
-                    message=f"Unused import: {name}",
-                    rule='unused-import'
-                ))
-        except Exception:
-            pass
-    
+        """Prüfe Import-Probleme (einzelne Datei)"""
+        self._run_checks(file_path, 'import_errors')
+
     def check_style(self, file_path: Path):
-        """Prüfe Code-Style Probleme"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for i, line in enumerate(lines, 1):
-                # Trailing whitespace
-                if line.rstrip() != line.rstrip('\n'):
-                    self.report.style_warnings.append(Issue(
-                        file=str(file_path.relative_to(self.project_root)),
-                        line=i,
-                        column=len(line.rstrip()),
-                        severity='info',
-                        code='S001',
-                        message="Trailing whitespace",
-                        rule='trailing-whitespace'
-                    ))
-                
-                # Tabs statt Spaces
-                if '\t' in line:
-                    self.report.style_warnings.append(Issue(
-                        file=str(file_path.relative_to(self.project_root)),
-                        line=i,
-                        column=line.index('\t'),
-                        severity='warning',
-                        code='S002',
-                        message="Tab character found (use spaces)",
-                        rule='no-tabs'
-                    ))
-                
-                # Zeile zu lang
-                if len(line.rstrip()) > 88:
-                    self.report.style_warnings.append(Issue(
-                        file=str(file_path.relative_to(self.project_root)),
-                        line=i,
-                        column=88,
-                        severity='info',
-                        code='S003',
-                        message=f"Line too long ({len(line.rstrip())} > 88)",
-                        rule='line-too-long'
-                    ))
-        except Exception:
-            pass
-    
+        """Prüfe Code-Style Probleme (einzelne Datei)"""
+        self._run_checks(file_path, 'style_warnings')
+
     def check_code_smells(self, file_path: Path):
-        """Prüfe Code-Smells"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                tree = ast.parse(content)
-                lines = content.split('\n')
-            
-            for node in ast.walk(tree):
-                # Zu generelle Exception
-                if isinstance(node, ast.ExceptHandler):
-                    if node.type and isinstance(node.type, ast.Name):
-                        if node.type.id == 'Exception':
-                            self.report.code_smells.append(Issue(
-                                file=str(file_path.relative_to(self.project_root)),
-                                line=node.lineno,
-                                column=node.col_offset,
-                                severity='info',
-                                code='C001',
-                                message="Catching too general exception 'Exception'",
-                                rule='broad-exception'
-                            ))
-                
-                # Fehlende Docstrings
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    has_docstring = (
-                        node.body and 
-                        isinstance(node.body[0], ast.Expr) and 
-                        isinstance(node.body[0].value, ast.Constant) and
-                        isinstance(node.body[0].value.value, str)
-                    )
-                    if not has_docstring and not node.name.startswith('_'):
-                        self.report.code_smells.append(Issue(
-                            file=str(file_path.relative_to(self.project_root)),
-                            line=node.lineno,
-                            column=node.col_offset,
-                            severity='info',
-                            code='C002',
-                            message=f"Missing docstring for {node.__class__.__name__} '{node.name}'",
-                            rule='missing-docstring'
-                        ))
-        except Exception:
-            pass
-    
-    def analyze(self):
-        """Führe vollständige Analyse durch"""
+        """Prüfe Code-Smells (einzelne Datei)"""
+        self._run_checks(file_path, 'code_smells')
+
+    def analyze(self, changed_since: Optional[str] = None):
+        """
+        Führe Analyse durch.
+
+        - Jede Datei wird einmal gelesen und einmal geparst
+        - Unveränderte Dateien (gleicher Content-Hash) kommen aus dem Cache
+        - Der Rest läuft parallel in einem ProcessPoolExecutor
+
+        Args:
+            changed_since: Nur Dateien analysieren, die sich seit diesem
+                           Git-Ref geändert haben
+        """
         print("🔍 Starte Fehler-Analyse...")
-        files = self.scan_files()
-        print(f"📁 {len(files)} Python-Dateien gefunden\n")
-        
-        for i, file_path in enumerate(files, 1):
-            rel_path = file_path.relative_to(self.project_root)
-            print(f"[{i}/{len(files)}] {rel_path}", end='\r')
-            
-            self.check_syntax(file_path)
-            self.check_imports(file_path)
-            self.check_style(file_path)
-            self.check_code_smells(file_path)
-        
-        print("\n")
+        if changed_since:
+            files = self.changed_files(changed_since)
+            print(f"📁 {len(files)} geänderte Python-Dateien seit {changed_since}\n")
+        else:
+            files = self.scan_files()
+            print(f"📁 {len(files)} Python-Dateien gefunden\n")
+
+        results: List[Optional[dict]] = [None] * len(files)
+        rel_paths = []
+        pending = []
+
+        for i, file_path in enumerate(files):
+            rel_path = str(file_path.relative_to(self.project_root))
+            rel_paths.append(rel_path)
+            try:
+                raw = file_path.read_bytes()
+            except OSError:
+                results[i] = {}
+                continue
+
+            key = ResultCache.key(raw)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, key, rel_path, raw))
+
+        jobs = [(rel_path, raw) for _, _, rel_path, raw in pending]
+        if self.jobs > 1 and len(jobs) >= self.MIN_FILES_FOR_POOL:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                chunksize = max(1, len(jobs) // (self.jobs * 4))
+                fresh = pool.map(_analyze_job, jobs, chunksize=chunksize)
+                fresh = list(fresh)
+        else:
+            fresh = [_analyze_job(job) for job in jobs]
+
+        for (i, key, _, _), result in zip(pending, fresh):
+            results[i] = result
+            self.cache.put(key, result)
+
+        for rel_path, result in zip(rel_paths, results):
+            self._add_issues(rel_path, result)
+
+        self.stats = {
+            'files': len(files),
+            'cached': len(files) - len(pending),
+            'analyzed': len(pending),
+        }
+        self.cache.save(prune=not changed_since)
+
+        print(f"⚡ {self.stats['analyzed']} analysiert, {self.stats['cached']} aus Cache\n")
         self.report.print_summary()
-        
+
         return self.report
-    
+
     def save_report(self, filename: str = "error_report.json"):
         """Speichere Bericht als JSON"""
         data = {
@@ -325,11 +548,20 @@ def main():
     parser.add_argument('path', nargs='?', default='.', help='Projekt-Pfad')
     parser.add_argument('--save', action='store_true', help='Speichere Report als JSON')
     parser.add_argument('--details', action='store_true', help='Zeige Details')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='Nur Dateien prüfen, die sich seit REF (git diff) geändert haben')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Anzahl Worker-Prozesse (Default: CPU-Anzahl)')
+    parser.add_argument('--no-cache', action='store_true', help='Ergebnis-Cache nicht verwenden')
     
     args = parser.parse_args()
     
-    analyzer = ErrorAnalyzer(args.path)
-    report = analyzer.analyze()
+    analyzer = ErrorAnalyzer(
+        args.path,
+        jobs=args.jobs,
+        cache_path=None if args.no_cache else CACHE_FILENAME,
+    )
+    report = analyzer.analyze(changed_since=args.changed_since)
     
     if args.details:
         analyzer.print_details()
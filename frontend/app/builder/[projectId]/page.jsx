@@ -151,6 +151,7 @@ export default function BuilderPage({ params, searchParams }) {
   const editorUpdateQueueRef = useRef(null);
   const chatUpdateTimeoutRef = useRef(null);
   const editorUpdateTimeoutRef = useRef(null);
+  const codeStreamBuffersRef = useRef({}); // path → content (Delta-Protokoll)
 
   // Resize handlers
   const startResize = (e, type) => {
@@ -936,6 +937,52 @@ Bitte versuche es erneut.`);
         }
         break;
       
+      case 'code_streaming_started': {
+        // ⚡ Delta-Protokoll: Puffer für die Datei zurücksetzen
+        const payload = data.data || data;
+        codeStreamBuffersRef.current[payload.path] = '';
+        break;
+      }
+      
+      case 'code_delta':
+      case 'code_snapshot': {
+        // ⚡ Delta-Protokoll: nur neuer Text + Offset, Snapshots zum Resync
+        const payload = data.data || data;
+        const buffers = codeStreamBuffersRef.current;
+        const current = buffers[payload.path] || '';
+        let content;
+        
+        if (event === 'code_snapshot') {
+          content = payload.content;
+        } else if (payload.offset === current.length) {
+          content = current + payload.text;
+        } else {
+          // Delta verpasst → auf nächsten Snapshot warten
+          break;
+        }
+        
+        buffers[payload.path] = content;
+        handleWebSocketMessage({
+          event: 'code_character_written',
+          path: payload.path,
+          content,
+          line: payload.line,
+        });
+        break;
+      }
+      
+      case 'code_streaming_complete': {
+        const payload = data.data || data;
+        delete codeStreamBuffersRef.current[payload.path];
+        handleWebSocketMessage({
+          event: 'code_character_written',
+          path: payload.path,
+          content: payload.final_content,
+          line: payload.total_lines,
+        });
+        break;
+      }
+      
       case 'code.character_written':
       case 'code_character_written':
       case 'code_written':
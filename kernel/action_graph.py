@@ -8,7 +8,18 @@
 # - Simulation ohne Ausführung
 # - Parallele Agenten
 # - Erweiterbar ohne Umbau
+#
+# SCHEDULER (Kahn):
+# - Vorher: Wellen – pro Runde alle Nodes neu scannen, Welle per gather,
+#   ein langsamer Node hielt die Dependents schnellerer Geschwister auf
+# - Jetzt: In-Degree-Zähler + Ready-Queue; ein Node startet, sobald seine
+#   letzte Dependency fertig ist (O(V+E) gesamt)
+# - Concurrency-Limit global + pro Resource-Typ (ActionNode.resource)
+# - ErrorPolicy: FAIL_FAST (nichts Neues starten, Fehler werfen) oder
+#   CONTINUE (abhängige Nodes SKIPPED, unabhängige laufen weiter)
+# - Validierung iterativ O(V+E), Stats als laufende Zähler
 
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Callable
 from enum import Enum
@@ -24,6 +35,12 @@ class ActionStatus(Enum):
     SKIPPED = "skipped"
 
 
+class ErrorPolicy(Enum):
+    """Verhalten von execute_all bei einem fehlgeschlagenen Node."""
+    FAIL_FAST = "fail_fast"  # Nichts Neues starten, laufende abwarten, Fehler werfen
+    CONTINUE = "continue"    # Dependents überspringen, Rest weiter ausführen
+
+
 @dataclass
 class ActionNode:
     """
@@ -37,6 +54,7 @@ class ActionNode:
     - undo_action: Funktion zum Rückgängigmachen (optional)
     - status: Aktueller Status
     - result: Ergebnis der Ausführung
+    - resource: Resource-Typ für Concurrency-Limits (z.B. "llm", "io")
     """
     id: str
     action: Callable
@@ -46,6 +64,16 @@ class ActionNode:
     status: ActionStatus = ActionStatus.PENDING
     result: Optional[Any] = None
     error: Optional[str] = None
+    resource: Optional[str] = None
+    
+    def __setattr__(self, name, value):
+        # Status-Wechsel an den Graph melden (laufende Stats)
+        if name == "status":
+            graph = self.__dict__.get("_graph")
+            old = self.__dict__.get("status")
+            if graph is not None and old is not value:
+                graph._status_changed(old, value)
+        object.__setattr__(self, name, value)
     
     def can_execute(self, completed_ids: set) -> bool:
         """Prüft ob alle Dependencies erfüllt sind."""
@@ -89,15 +117,37 @@ class ActionGraph:
     - Simulation Mode
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        resource_limits: Optional[Dict[str, int]] = None,
+        error_policy: ErrorPolicy = ErrorPolicy.FAIL_FAST,
+    ):
+        """
+        Args:
+            max_concurrency: Max. gleichzeitig laufende Nodes (None = unbegrenzt)
+            resource_limits: Max. gleichzeitig pro Resource-Typ, z.B. {"llm": 2}
+            error_policy: Default-Verhalten bei Fehlern
+        """
         self.nodes: Dict[str, ActionNode] = {}
         self.execution_order: List[str] = []
+        self.max_concurrency = max_concurrency
+        self.resource_limits = resource_limits or {}
+        self.error_policy = error_policy
+        self._status_counts: Counter = Counter()
     
     def add_node(self, node: ActionNode):
         """Fügt einen Node zum Graph hinzu."""
         if node.id in self.nodes:
             raise ValueError(f"Node {node.id} already exists")
         self.nodes[node.id] = node
+        object.__setattr__(node, "_graph", self)
+        self._status_counts[node.status] += 1
+    
+    def _status_changed(self, old: Optional[ActionStatus], new: ActionStatus):
+        if old is not None:
+            self._status_counts[old] -= 1
+        self._status_counts[new] += 1
     
     def get_node(self, node_id: str) -> Optional[ActionNode]:
         """Holt einen Node by ID."""
@@ -115,34 +165,127 @@ class ActionGraph:
             if node.status == ActionStatus.PENDING and node.can_execute(completed_ids)
         ]
     
-    async def execute_all(self, simulate: bool = False):
+    async def execute_all(
+        self,
+        simulate: bool = False,
+        max_concurrency: Optional[int] = None,
+        resource_limits: Optional[Dict[str, int]] = None,
+        error_policy: Optional[ErrorPolicy] = None,
+    ) -> Any:
         """
         Führt alle Nodes im Graph aus (mit Dependency-Auflösung).
         
         Args:
             simulate: Wenn True → nur Validierung, keine Ausführung
+            max_concurrency: Überschreibt das globale Limit
+            resource_limits: Überschreibt die Limits pro Resource-Typ
+            error_policy: Überschreibt die Fehler-Policy
+        
+        Returns:
+            Stats nach der Ausführung (bzw. True bei simulate)
         """
         if simulate:
             # Validiere DAG ohne Ausführung
             return self._validate_dag()
         
-        while True:
-            executable = self.get_executable_nodes()
-            
-            if not executable:
-                # Prüfe ob fertig oder Deadlock
-                pending = [n for n in self.nodes.values() if n.status == ActionStatus.PENDING]
-                if not pending:
-                    break  # Alle fertig
-                else:
-                    raise RuntimeError("Deadlock detected in ActionGraph")
-            
-            # Führe alle executable Nodes parallel aus
-            tasks = [node.execute() for node in executable]
-            await asyncio.gather(*tasks)
+        max_concurrency = max_concurrency if max_concurrency is not None else self.max_concurrency
+        limits = resource_limits if resource_limits is not None else self.resource_limits
+        policy = error_policy or self.error_policy
+        
+        # In-Degree = offene (nicht COMPLETED) Dependencies
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        indegree: Dict[str, int] = {}
+        ready: Dict[Optional[str], deque] = {}
+        for node in self.nodes.values():
+            if node.status != ActionStatus.PENDING:
+                continue
+            open_deps = 0
+            for dep_id in node.requires:
+                dep = self.nodes.get(dep_id)
+                if dep is None or dep.status != ActionStatus.COMPLETED:
+                    open_deps += 1
+                    if dep is not None:
+                        dependents[dep_id].append(node.id)
+            indegree[node.id] = open_deps
+            if open_deps == 0:
+                ready.setdefault(node.resource, deque()).append(node)
+        
+        running: Dict[asyncio.Task, ActionNode] = {}
+        in_use: Counter = Counter()
+        first_error: Optional[BaseException] = None
+        
+        def launch():
+            for resource, queue in ready.items():
+                limit = limits.get(resource) if resource is not None else None
+                while queue:
+                    if max_concurrency is not None and len(running) >= max_concurrency:
+                        return
+                    if limit is not None and in_use[resource] >= limit:
+                        break
+                    node = queue.popleft()
+                    in_use[resource] += 1
+                    running[asyncio.ensure_future(node.execute())] = node
+        
+        def skip_dependents(node_id: str):
+            stack = [node_id]
+            while stack:
+                for dep_id in dependents[stack.pop()]:
+                    dependent = self.nodes[dep_id]
+                    if dependent.status == ActionStatus.PENDING:
+                        dependent.status = ActionStatus.SKIPPED
+                        dependent.error = f"Dependency {node_id} failed"
+                        stack.append(dep_id)
+        
+        try:
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = running.pop(task)
+                    in_use[node.resource] -= 1
+                    error = task.exception()
+                    if error is not None:
+                        if first_error is None:
+                            first_error = error
+                        if policy == ErrorPolicy.CONTINUE:
+                            skip_dependents(node.id)
+                        continue
+                
+                    # Merke Ausführungsreihenfolge
+                    self.execution_order.append(node.id)
+                    for dep_id in dependents[node.id]:
+                        indegree[dep_id] -= 1
+                        if indegree[dep_id] == 0 and self.nodes[dep_id].status == ActionStatus.PENDING:
+                            dependent = self.nodes[dep_id]
+                            ready.setdefault(dependent.resource, deque()).append(dependent)
             
-            # Merke Ausführungsreihenfolge
-            self.execution_order.extend([n.id for n in executable])
+                if first_error is not None and policy == ErrorPolicy.FAIL_FAST:
+                    # Nichts Neues starten, laufende Nodes noch abwarten
+                    if running:
+                        await asyncio.wait(running)
+                        for task, node in running.items():
+                            if task.exception() is None:
+                                self.execution_order.append(node.id)
+                    raise first_error
+                launch()
+        
+        finally:
+            # execute_all abgebrochen (oder Fehler) → keine verwaisten Node-Tasks
+            pending = [task for task in running if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    node = running[task]
+                    if task.cancelled() and node.status == ActionStatus.RUNNING:
+                        node.status = ActionStatus.PENDING  # beim Resume erneut ausführen
+        
+        # Übrig gebliebene PENDING Nodes: Zyklus, unbekannte oder fehlgeschlagene Dependency
+        if self._status_counts[ActionStatus.PENDING]:
+            raise RuntimeError("Deadlock detected in ActionGraph")
+        
+        return self.get_stats()
     
     async def undo_last(self):
         """Macht die letzte Action rückgängig."""
@@ -162,38 +305,46 @@ class ActionGraph:
         self.execution_order = []
     
     def _validate_dag(self) -> bool:
-        """Validiert dass der Graph ein DAG ist (keine Zyklen)."""
-        visited = set()
-        rec_stack = set()
-        
-        def has_cycle(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            node = self.nodes[node_id]
+        """Validiert dass der Graph ein DAG ist (keine Zyklen), iterativ O(V+E)."""
+        indegree = {node_id: 0 for node_id in self.nodes}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        for node in self.nodes.values():
             for dep_id in node.requires:
-                if dep_id not in visited:
-                    if has_cycle(dep_id):
-                        return True
-                elif dep_id in rec_stack:
-                    return True
-            
-            rec_stack.remove(node_id)
-            return False
+                if dep_id not in self.nodes:
+                    raise ValueError(f"Node {node.id} requires unknown node {dep_id}")
+                indegree[node.id] += 1
+                dependents[dep_id].append(node.id)
+        
+        queue = deque(node_id for node_id, degree in indegree.items() if degree == 0)
+        processed = 0
+        while queue:
+            node_id = queue.popleft()
+            processed += 1
+            for dep_id in dependents[node_id]:
+                indegree[dep_id] -= 1
+                if indegree[dep_id] == 0:
+                    queue.append(dep_id)
         
-        for node_id in self.nodes:
-            if node_id not in visited:
-                if has_cycle(node_id):
-                    raise ValueError(f"Cycle detected in ActionGraph involving {node_id}")
+        if processed < len(self.nodes):
+            # Übrige Nodes haben alle einen übrigen Vorgänger → rückwärts
+            # laufen, bis sich ein Node wiederholt (liegt auf dem Zyklus)
+            node_id = next(n for n, degree in indegree.items() if degree > 0)
+            seen = set()
+            while node_id not in seen:
+                seen.add(node_id)
+                node_id = next(d for d in self.nodes[node_id].requires if indegree[d] > 0)
+            raise ValueError(f"Cycle detected in ActionGraph involving {node_id}")
         
         return True
     
     def get_stats(self) -> Dict[str, int]:
-        """Gibt Statistiken über den Graph zurück."""
+        """Gibt Statistiken über den Graph zurück (laufende Zähler, O(1))."""
+        counts = self._status_counts
         return {
             "total": len(self.nodes),
-            "pending": sum(1 for n in self.nodes.values() if n.status == ActionStatus.PENDING),
-            "running": sum(1 for n in self.nodes.values() if n.status == ActionStatus.RUNNING),
-            "completed": sum(1 for n in self.nodes.values() if n.status == ActionStatus.COMPLETED),
-            "failed": sum(1 for n in self.nodes.values() if n.status == ActionStatus.FAILED),
+            "pending": counts[ActionStatus.PENDING],
+            "running": counts[ActionStatus.RUNNING],
+            "completed": counts[ActionStatus.COMPLETED],
+            "failed": counts[ActionStatus.FAILED],
+            "skipped": counts[ActionStatus.SKIPPED],
         }
@@ -0,0 +1,96 @@
+# kernel/kernel_session.py
+# ------------------------
+# Kernel-Session pro Request für den SSE-Endpoint.
+#
+# Vorher pro Request (/api/chat/stream):
+# - neuer LLMRouter + zwei neue OpenAIClients
+# - init_runtime(...) (ModelRouter, Telemetry, Security, Recovery, ...)
+# - neuer KernelV1
+# - Queue mit 100ms-Timeout gepollt, um das Stream-Ende zu erkennen
+#
+# Jetzt:
+# - LLMRouter + Clients werden EINMAL beim Startup gebaut (geteilt)
+# - Jeder Request bekommt eine eigene KernelSession: frische Runtime
+#   (session_id, Telemetry, Recovery, HumanControl, ...), frischer
+#   Kernel + Streamer → kein Zustand wandert zwischen Usern
+# - Kein Pool und keine Obergrenze: Runtime/Kernel sind billig, teuer
+#   waren nur Router + Clients
+# - Events laufen über eine asyncio.Queue, das Ende wird über ein
+#   Sentinel signalisiert (kein Polling)
+
+import asyncio
+from typing import Optional
+
+from kernel.control.human_control import ControlMode
+from kernel.control.security_policy import SecurityLevel
+from kernel.kernel_runtime import KernelRuntime
+from kernel.kernel_v1 import KernelV1
+from kernel.streamer import SSEStreamer
+
+# Markiert das Ende eines Streams in der Queue
+STREAM_END = None
+
+
+class QueueResponse:
+    """
+    Response-Wrapper für Queue-basiertes Streaming.
+    Der SSEStreamer schreibt hinein, der SSE-Endpoint liest heraus.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def write(self, data: str):
+        await self.queue.put(data)
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        """Signalisiert dem Leser das Stream-Ende."""
+        await self.queue.put(STREAM_END)
+
+
+class KernelSession:
+    """
+    Kernel-Instanz für genau einen Request (Runtime + Kernel + Streamer).
+    Nur der LLMRouter wird zwischen Sessions geteilt.
+    """
+
+    def __init__(
+        self,
+        llm_router,
+        security_level: SecurityLevel = SecurityLevel.NORMAL,
+        control_mode: ControlMode = ControlMode.ASSISTED,
+    ):
+        self.response = QueueResponse()
+        self.streamer = SSEStreamer(response=self.response)
+        self.runtime = KernelRuntime(
+            security_level=security_level,
+            control_mode=control_mode,
+        )
+        self.kernel = KernelV1(
+            streamer=self.streamer,
+            runtime=self.runtime,
+            llm_router=llm_router,
+        )
+
+    async def run(self, task: str, model_hint: Optional[str] = None):
+        """
+        Führt den Kernel aus und schließt den Stream danach immer
+        (auch bei Fehlern), damit der Leser nicht hängen bleibt.
+        """
+        try:
+            await self.kernel.run(task, model_hint)
+        finally:
+            await self.response.close()
+
+    async def events(self):
+        """
+        Liefert SSE-Nachrichten bis zum Sentinel.
+        """
+        while True:
+            data = await self.response.queue.get()
+            if data is STREAM_END:
+                return
+            yield data
@@ -12,61 +12,228 @@
 # - ActionGraph speichern/laden
 # - Events speichern (letzte N)
 # - Runtime-State speichern
-# - Mehrere Backends: JSON, SQLite, Redis
+# - Mehrere Backends: JSON, SQLite, Redis (async KV)
+#
+# DELTA-PERSISTENZ:
+# - Vorher: jedes save() schrieb alle drei State-Zeilen neu und fügte die
+#   letzten 1000 Events ERNEUT ein (SQLite, neue Connection pro Aufruf)
+#   bzw. dumpte den ganzen State mit indent=2 + Backup-Rotation (JSON)
+# - Jetzt: Snapshots (flow_state, action_graph, runtime_config) nur bei
+#   geändertem Hash; Events einmalig mit fortlaufender Sequenznummer
+#   anhängen (Überlappung mit dem zuletzt gespeicherten Fenster wird
+#   erkannt); Compaction alle compact_every Events
+# - SQLite: WAL + EINE langlebige Connection
+# - JSON: Snapshot-Datei + kernel_events.jsonl (append-only)
 
+import asyncio
+import hashlib
 import json
 import os
 import sqlite3
-from typing import Optional, Dict, Any
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from kernel.flow_state import FlowState
 from kernel.action_graph import ActionGraph, ActionNode
 
+SECTIONS = ("flow_state", "action_graph", "runtime_config")
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha1(data.encode()).hexdigest()
+
 
 class KernelStateStore:
     """
     Kernel State Persistence (v1.1).
-    
+
     VERANTWORTLICHKEITEN:
     - Speichert vollständigen Kernel-Zustand
     - Ermöglicht Wiederherstellung nach Restart
     - Bietet mehrere Storage-Backends
-    
+
     GESPEICHERT WIRD:
     - FlowState (active, mode, project, step, todos)
     - ActionGraph (nodes, edges, executed)
     - Runtime Config (security, control mode)
     - Events (letzte 1000)
     - Project Context
-    
+
     BACKENDS:
     - JSON: Einfach, readable, für Dev
     - SQLite: Robust, queryable, für Prod
-    - Redis: Schnell, distributed, für Scale
+    - Redis: Schnell, distributed, für Scale (nur asave/aload)
     """
-    
-    def __init__(self, backend: str = "json", base_path: str = "./kernel_state"):
+
+    def __init__(
+        self,
+        backend: str = "json",
+        base_path: str = "./kernel_state",
+        kv=None,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "vibeai:kernel",
+        max_events: int = 1000,
+        compact_every: int = 500,
+    ):
         """
         Args:
             backend: "json", "sqlite", oder "redis"
             base_path: Basis-Pfad für State-Files
+            kv: Async KV-Client für "redis" (z.B. InMemoryKV), sonst redis.asyncio
+            redis_url: Redis URL (Default: REDIS_URL / REDIS_HOST)
+            key_prefix: Key-Prefix im KV-Store
+            max_events: So viele Events bleiben nach einer Compaction erhalten
+            compact_every: Compaction nach so vielen neuen Events
         """
+        if backend not in ("json", "sqlite", "redis"):
+            raise ValueError(f"Backend '{backend}' not supported")
+
         self.backend = backend
         self.base_path = Path(base_path)
-        self.base_path.mkdir(parents=True, exist_ok=True)
-        
+        self.key_prefix = key_prefix
+        self.max_events = max_events
+        self.compact_every = compact_every
+
+        self._lock = threading.RLock()
+        # "redis": _prepare → await _save_kv → _commit darf sich nicht überlappen
+        self._alock = asyncio.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._kv = None
+        self._kv_ready = False
+        self.stats = {"saves": 0, "snapshot_writes": 0, "events_appended": 0, "bytes_written": 0, "compactions": 0}
+        self._reset_tracking()
+
         # Backend-spezifische Initialisierung
-        if backend == "sqlite":
-            self._init_sqlite()
-    
+        if backend == "redis":
+            if kv is None:
+                from kernel.kv_backend import connect_redis
+                kv = connect_redis(redis_url)
+            self._kv = kv
+        else:
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            if backend == "sqlite":
+                self._init_sqlite()
+            else:
+                self._init_json()
+
+    def _reset_tracking(self):
+        self._hashes: Dict[str, str] = {}
+        self._json_state: Optional[Dict] = None
+        self._seq = 0
+        self._window: deque = deque(maxlen=self.max_events)
+        self._since_compact = 0
+
+    def _track_stored_events(self, seq: int, stored: List[str]):
+        """Zustand nach Start: letzte Sequenz + Fenster der gespeicherten Events."""
+        self._seq = seq
+        self._window.extend(_digest(data) for data in stored)
+
+    # ---------------------------------------------------------
+    # DELTA
+    # ---------------------------------------------------------
+    @staticmethod
+    def _sections(
+        flow_state: FlowState,
+        action_graph: ActionGraph,
+        runtime_config: Optional[Dict],
+    ) -> Dict[str, Any]:
+        sections = {
+            "flow_state": {
+                "active": flow_state.active,
+                "mode": flow_state.mode,
+                "project": flow_state.project,
+                "step": flow_state.step,
+                "todo": flow_state.todo.copy()
+            },
+            "action_graph": {
+                "nodes": [
+                    {
+                        "id": node.id,
+                        "status": node.status.value,
+                        "requires": node.requires,
+                        "reversible": node.reversible
+                    }
+                    for node in action_graph.nodes.values()
+                ]
+            },
+        }
+        # None = Runtime-Config unverändert lassen
+        if runtime_config is not None:
+            sections["runtime_config"] = runtime_config
+        return sections
+
+    def _new_events(self, events: Optional[list]) -> Tuple[list, List[str], List[str]]:
+        """
+        Nur die Events, die noch nicht gespeichert sind.
+
+        Aufrufer übergeben meist ein gleitendes Fenster (letzte N Events):
+        gesucht wird die Position j, an der die Eingabe das zuletzt
+        gespeicherte Event enthält und davor mit dem gespeicherten Fenster
+        übereinstimmt (längste Übereinstimmung gewinnt); alles nach j ist neu.
+        """
+        if not events:
+            return [], [], []
+        data = [json.dumps(event, default=str) for event in events]
+        digests = [_digest(d) for d in data]
+
+        window = list(self._window)
+        overlap, best = 0, 0
+        if window:
+            last = window[-1]
+            for j, digest in enumerate(digests):
+                if digest != last:
+                    continue
+                length = min(len(window), j + 1)
+                if length > best and digests[j + 1 - length:j + 1] == window[-length:]:
+                    overlap, best = j + 1, length
+                    if length == len(window):
+                        break
+        return events[overlap:], data[overlap:], digests[overlap:]
+
+    def _prepare(self, flow_state, action_graph, runtime_config, events):
+        changed = {}
+        for name, payload in self._sections(flow_state, action_graph, runtime_config).items():
+            data = json.dumps(payload, default=str)
+            digest = _digest(data)
+            if self._hashes.get(name) != digest:
+                changed[name] = (payload, data, digest)
+        fresh, new_data, new_digests = self._new_events(events)
+        new_events = [
+            (self._seq + i, event.get("type", "unknown") if isinstance(event, dict) else "unknown", data)
+            for i, (event, data) in enumerate(zip(fresh, new_data), start=1)
+        ]
+        return changed, new_events, new_digests
+
+    def _commit(self, changed, new_events, new_digests):
+        for name, (_, data, digest) in changed.items():
+            self._hashes[name] = digest
+            self.stats["bytes_written"] += len(data)
+        if new_events:
+            self._seq = new_events[-1][0]
+            self._window.extend(new_digests)
+            self._since_compact += len(new_events)
+            self.stats["bytes_written"] += sum(len(data) for _, _, data in new_events)
+        self.stats["saves"] += 1
+        self.stats["snapshot_writes"] += len(changed)
+        self.stats["events_appended"] += len(new_events)
+
+    def _compaction_due(self) -> bool:
+        return self._since_compact >= self.compact_every
+
+    # ---------------------------------------------------------
+    # SQLITE
+    # ---------------------------------------------------------
     def _init_sqlite(self):
-        """Initialisiert SQLite-Datenbank."""
+        """Initialisiert SQLite-Datenbank (WAL, eine Connection)."""
         db_path = self.base_path / "kernel_state.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
-        
+
         # Flow State Table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS flow_state (
@@ -80,7 +247,7 @@ class KernelStateStore:
                 metadata TEXT
             )
         """)
-        
+
         # Action Graph Table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS action_graph (
@@ -91,8 +258,8 @@ class KernelStateStore:
                 metadata TEXT
             )
         """)
-        
-        # Events Table
+
+        # Events Table (id = Sequenznummer)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -101,7 +268,7 @@ class KernelStateStore:
                 data TEXT
             )
         """)
-        
+
         # Runtime Config Table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS runtime_config (
@@ -110,10 +277,242 @@ class KernelStateStore:
                 config TEXT
             )
         """)
-        
+
         conn.commit()
-        conn.close()
-    
+        self._conn = conn
+
+        seq = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        stored = [row[0] for row in conn.execute(
+            "SELECT data FROM (SELECT id, data FROM events ORDER BY id DESC LIMIT ?) ORDER BY id",
+            (self.max_events,)
+        )]
+        self._track_stored_events(seq, stored)
+        total = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        self._since_compact = max(0, total - self.max_events)
+
+    def _save_sqlite(self, changed, new_events) -> None:
+        """Schreibt nur geänderte Snapshots + neue Events (eine Transaktion)."""
+        timestamp = datetime.now().timestamp()
+        conn = self._conn
+        with conn:
+            if "flow_state" in changed:
+                flow = changed["flow_state"][0]
+                conn.execute("""
+                    INSERT OR REPLACE INTO flow_state (id, timestamp, active, mode, project, step, todos, metadata)
+                    VALUES (1, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    timestamp,
+                    flow["active"],
+                    flow["mode"],
+                    flow["project"],
+                    flow["step"],
+                    json.dumps(flow["todo"]),
+                    json.dumps({})
+                ))
+
+            if "action_graph" in changed:
+                conn.execute("""
+                    INSERT OR REPLACE INTO action_graph (id, timestamp, nodes, executed_nodes, metadata)
+                    VALUES (1, ?, ?, ?, ?)
+                """, (
+                    timestamp,
+                    json.dumps(changed["action_graph"][0]["nodes"]),
+                    json.dumps([]),  # Legacy field, nicht mehr verwendet
+                    json.dumps({})
+                ))
+
+            if "runtime_config" in changed:
+                conn.execute("""
+                    INSERT OR REPLACE INTO runtime_config (id, timestamp, config)
+                    VALUES (1, ?, ?)
+                """, (timestamp, changed["runtime_config"][1]))
+
+            if new_events:
+                conn.executemany(
+                    "INSERT INTO events (id, timestamp, event_type, data) VALUES (?, ?, ?, ?)",
+                    [(seq, timestamp, event_type, data) for seq, event_type, data in new_events]
+                )
+
+    def _compact_sqlite(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM events WHERE id <= ?", (self._seq - self.max_events,))
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _load_sqlite(self) -> Optional[Dict]:
+        """Lädt aus SQLite."""
+        conn = self._conn
+
+        # Load Flow State
+        flow_row = conn.execute("SELECT * FROM flow_state WHERE id = 1").fetchone()
+
+        if not flow_row:
+            return None
+
+        flow_state = FlowState()
+        flow_state.active = bool(flow_row[2])
+        flow_state.mode = flow_row[3]
+        flow_state.project = flow_row[4]
+        flow_state.step = flow_row[5]
+        flow_state.todo = json.loads(flow_row[6])
+
+        # Load Action Graph
+        graph_row = conn.execute("SELECT * FROM action_graph WHERE id = 1").fetchone()
+
+        action_graph = ActionGraph()
+        if graph_row:
+            # Speichere nur Metadaten (Callables nicht serialisierbar)
+            action_graph._saved_state = json.loads(graph_row[2])
+
+        # Load Runtime Config
+        config_row = conn.execute("SELECT config FROM runtime_config WHERE id = 1").fetchone()
+        runtime_config = json.loads(config_row[0]) if config_row else {}
+
+        # Load Events (letzte max_events, chronologisch)
+        events = [json.loads(row[0]) for row in conn.execute(
+            "SELECT data FROM (SELECT id, data FROM events ORDER BY id DESC LIMIT ?) ORDER BY id",
+            (self.max_events,)
+        )]
+
+        return {
+            "flow_state": flow_state,
+            "action_graph": action_graph,
+            "runtime_config": runtime_config,
+            "events": events,
+            "timestamp": flow_row[1]
+        }
+
+    # ---------------------------------------------------------
+    # JSON
+    # ---------------------------------------------------------
+    @property
+    def _state_file(self) -> Path:
+        return self.base_path / "kernel_state.json"
+
+    @property
+    def _events_file(self) -> Path:
+        return self.base_path / "kernel_events.jsonl"
+
+    def _read_event_lines(self) -> List[Tuple[int, str]]:
+        if not self._events_file.exists():
+            return []
+        lines = []
+        with open(self._events_file, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # abgeschnittene letzte Zeile nach Absturz
+                lines.append((record["seq"], json.dumps(record["event"], default=str)))
+        return lines
+
+    def _init_json(self):
+        lines = self._read_event_lines()
+        seq = lines[-1][0] if lines else 0
+        self._track_stored_events(seq, [data for _, data in lines[-self.max_events:]])
+        self._since_compact = max(0, len(lines) - self.max_events)
+
+    def _save_json(self, changed, new_events) -> None:
+        """Snapshot-Datei nur bei Änderung, Events append-only."""
+        if changed:
+            if self._json_state is None:
+                # Einmalig nach Start: nicht geänderte Abschnitte übernehmen
+                self._json_state = {}
+                if self._state_file.exists():
+                    with open(self._state_file, "r") as f:
+                        previous = json.load(f)
+                    self._json_state = {name: previous[name] for name in SECTIONS if name in previous}
+            state = dict(self._json_state)
+            for name, (payload, _, _) in changed.items():
+                state[name] = payload
+            self._json_state = state
+            state = {"timestamp": datetime.now().isoformat(), **state}
+
+            tmp_file = self._state_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self._state_file)
+
+        if new_events:
+            with open(self._events_file, "a") as f:
+                f.write("".join(f'{{"seq": {seq}, "event": {data}}}\n' for seq, _, data in new_events))
+
+    def _compact_json(self):
+        lines = self._read_event_lines()[-self.max_events:]
+        tmp_file = self._events_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "w") as f:
+            f.write("".join(f'{{"seq": {seq}, "event": {data}}}\n' for seq, data in lines))
+        os.replace(tmp_file, self._events_file)
+
+        # Backup (letzte 5) – bei Compaction statt bei jedem save()
+        self._rotate_backups()
+
+    def _load_json(self) -> Optional[Dict]:
+        """Lädt aus JSON."""
+        state_file = self._state_file
+
+        if not state_file.exists():
+            return None
+
+        with open(state_file, "r") as f:
+            state = json.load(f)
+
+        if self._events_file.exists():
+            events = [json.loads(data) for _, data in self._read_event_lines()[-self.max_events:]]
+        else:
+            events = state.get("events", [])
+
+        return self._build_result(state, events, state["timestamp"])
+
+    # ---------------------------------------------------------
+    # REDIS / ASYNC KV
+    # ---------------------------------------------------------
+    def _key(self, name: str) -> str:
+        return f"{self.key_prefix}:{name}"
+
+    async def _init_kv(self):
+        if self._kv_ready:
+            return
+        seq = await self._kv.get(self._key("seq"))
+        stored = [json.loads(line) for line in await self._kv.lrange(self._key("events"), -self.max_events, -1)]
+        # seq nie hinter dem letzten gespeicherten Event (Stand vor atomarem Save)
+        last_seq = max(int(seq or 0), stored[-1]["seq"] if stored else 0)
+        self._track_stored_events(last_seq, [json.dumps(entry["event"], default=str) for entry in stored])
+        self._since_compact = max(0, await self._kv.llen(self._key("events")) - self.max_events)
+        self._kv_ready = True
+
+    async def _save_kv(self, changed, new_events) -> None:
+        # Ein MULTI/EXEC: Snapshots, Events und seq landen ganz oder gar nicht
+        async with self._kv.pipeline(transaction=True) as pipe:
+            if changed:
+                pipe.set(self._key("timestamp"), datetime.now().isoformat())
+            for name, (_, data, _) in changed.items():
+                pipe.set(self._key(f"snapshot:{name}"), data)
+            if new_events:
+                pipe.rpush(
+                    self._key("events"),
+                    *[f'{{"seq": {seq}, "event": {data}}}' for seq, _, data in new_events]
+                )
+                pipe.set(self._key("seq"), new_events[-1][0])
+            await pipe.execute()
+
+    async def _compact_kv(self):
+        await self._kv.ltrim(self._key("events"), -self.max_events, -1)
+
+    async def _load_kv(self) -> Optional[Dict]:
+        state = {}
+        for name in SECTIONS:
+            data = await self._kv.get(self._key(f"snapshot:{name}"))
+            if data is not None:
+                state[name] = json.loads(data)
+        if "flow_state" not in state:
+            return None
+        lines = await self._kv.lrange(self._key("events"), -self.max_events, -1)
+        events = [json.loads(line)["event"] for line in lines]
+        return self._build_result(state, events, await self._kv.get(self._key("timestamp")))
+
+    # ---------------------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------------------
     def save(
         self,
         flow_state: FlowState,
@@ -122,294 +521,191 @@ class KernelStateStore:
         events: Optional[list] = None
     ) -> bool:
         """
-        Speichert vollständigen Kernel-Zustand.
-        
+        Speichert Kernel-Zustand (nur Änderungen seit dem letzten save()).
+
         Args:
             flow_state: FlowState-Instanz
             action_graph: ActionGraph-Instanz
-            runtime_config: Runtime-Konfiguration
-            events: Liste der letzten Events
-            
+            runtime_config: Runtime-Konfiguration (None = unverändert)
+            events: Liste der letzten Events (bereits gespeicherte werden erkannt)
+
         Returns:
             True wenn erfolgreich
         """
-        if self.backend == "json":
-            return self._save_json(flow_state, action_graph, runtime_config, events)
-        elif self.backend == "sqlite":
-            return self._save_sqlite(flow_state, action_graph, runtime_config, events)
-        else:
-            raise ValueError(f"Backend '{self.backend}' not supported")
-    
-    def _save_json(
-        self,
-        flow_state: FlowState,
-        action_graph: ActionGraph,
-        runtime_config: Optional[Dict],
-        events: Optional[list]
-    ) -> bool:
-        """Speichert als JSON."""
-        try:
-            state = {
-                "timestamp": datetime.now().isoformat(),
-                "flow_state": {
-                    "active": flow_state.active,
-                    "mode": flow_state.mode,
-                    "project": flow_state.project,
-                    "step": flow_state.step,
-                    "todo": flow_state.todo.copy()
-                },
-                "action_graph": {
-                    "nodes": [
-                        {
-                            "id": node.id,
-                            "status": node.status.value,
-                            "requires": node.requires,
-                            "reversible": node.reversible
-                        }
-                        for node in action_graph.nodes.values()
-                    ]
-                },
-                "runtime_config": runtime_config or {},
-                "events": events or []
-            }
-            
-            # Speichere State
-            state_file = self.base_path / "kernel_state.json"
-            with open(state_file, "w") as f:
-                json.dump(state, f, indent=2)
-            
-            # Backup (letzte 5)
-            self._rotate_backups()
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to save state: {e}")
-            return False
-    
-    def _save_sqlite(
+        if self.backend == "redis":
+            raise RuntimeError("Backend 'redis' ist async: asave() verwenden")
+
+        with self._lock:
+            try:
+                changed, new_events, new_digests = self._prepare(flow_state, action_graph, runtime_config, events)
+                if self.backend == "sqlite":
+                    self._save_sqlite(changed, new_events)
+                else:
+                    self._save_json(changed, new_events)
+                self._commit(changed, new_events, new_digests)
+
+                if self._compaction_due():
+                    self.compact()
+                return True
+
+            except Exception as e:
+                print(f"❌ Failed to save state ({self.backend}): {e}")
+                return False
+
+    async def asave(
         self,
         flow_state: FlowState,
         action_graph: ActionGraph,
-        runtime_config: Optional[Dict],
-        events: Optional[list]
+        runtime_config: Optional[Dict] = None,
+        events: Optional[list] = None
     ) -> bool:
-        """Speichert in SQLite."""
+        """Async save() – Redis direkt, JSON/SQLite im Threadpool."""
+        if self.backend != "redis":
+            return await asyncio.to_thread(self.save, flow_state, action_graph, runtime_config, events)
+
         try:
-            db_path = self.base_path / "kernel_state.db"
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            timestamp = datetime.now().timestamp()
-            
-            # Flow State
-            cursor.execute("""
-                INSERT OR REPLACE INTO flow_state (id, timestamp, active, mode, project, step, todos, metadata)
-                VALUES (1, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                timestamp,
-                flow_state.active,
-                flow_state.mode,
-                flow_state.project,
-                flow_state.step,
-                json.dumps(flow_state.todo),
-                json.dumps({})
-            ))
-            
-            # Action Graph
-            cursor.execute("""
-                INSERT OR REPLACE INTO action_graph (id, timestamp, nodes, executed_nodes, metadata)
-                VALUES (1, ?, ?, ?, ?)
-            """, (
-                timestamp,
-                json.dumps([
-                    {
-                        "id": n.id,
-                        "status": n.status.value,
-                        "requires": n.requires,
-                        "reversible": n.reversible
-                    }
-                    for n in action_graph.nodes.values()
-                ]),
-                json.dumps([]),  # Legacy field, nicht mehr verwendet
-                json.dumps({})
-            ))
-            
-            # Runtime Config
-            if runtime_config:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO runtime_config (id, timestamp, config)
-                    VALUES (1, ?, ?)
-                """, (timestamp, json.dumps(runtime_config)))
-            
-            # Events (nur letzte 1000)
-            if events:
-                for event in events[-1000:]:
-                    cursor.execute("""
-                        INSERT INTO events (timestamp, event_type, data)
-                        VALUES (?, ?, ?)
-                    """, (
-                        timestamp,
-                        event.get("type", "unknown"),
-                        json.dumps(event)
-                    ))
-            
-            conn.commit()
-            conn.close()
+            async with self._alock:
+                await self._init_kv()
+                changed, new_events, new_digests = self._prepare(flow_state, action_graph, runtime_config, events)
+                await self._save_kv(changed, new_events)
+                self._commit(changed, new_events, new_digests)
+
+                if self._compaction_due():
+                    await self._compact_kv()
+                    self._since_compact = 0
+                    self.stats["compactions"] += 1
             return True
-            
+
         except Exception as e:
-            print(f"❌ Failed to save to SQLite: {e}")
+            print(f"❌ Failed to save state (redis): {e}")
             return False
-    
+
+    def compact(self):
+        """Alte Events entfernen (nur die letzten max_events bleiben)."""
+        with self._lock:
+            if self.backend == "sqlite":
+                self._compact_sqlite()
+            elif self.backend == "json":
+                self._compact_json()
+            else:
+                raise RuntimeError("Backend 'redis' ist async: Compaction läuft in asave()")
+            self._since_compact = 0
+            self.stats["compactions"] += 1
+
     def load(self) -> Optional[Dict[str, Any]]:
         """
         Lädt gespeicherten Kernel-Zustand.
-        
+
         Returns:
             Dict mit flow_state, action_graph, runtime_config, events
             oder None wenn kein State vorhanden
         """
-        if self.backend == "json":
-            return self._load_json()
-        elif self.backend == "sqlite":
-            return self._load_sqlite()
-        else:
-            raise ValueError(f"Backend '{self.backend}' not supported")
-    
-    def _load_json(self) -> Optional[Dict]:
-        """Lädt aus JSON."""
-        state_file = self.base_path / "kernel_state.json"
-        
-        if not state_file.exists():
-            return None
-        
-        try:
-            with open(state_file, "r") as f:
-                state = json.load(f)
-            
-            # Reconstruct FlowState
-            flow_data = state["flow_state"]
-            flow_state = FlowState()
-            flow_state.active = flow_data["active"]
-            flow_state.mode = flow_data["mode"]
-            flow_state.project = flow_data["project"]
-            flow_state.step = flow_data["step"]
-            flow_state.todo = flow_data["todo"]
-            
-            # Reconstruct ActionGraph (nur Metadaten, keine Callables)
-            graph_data = state["action_graph"]
-            action_graph = ActionGraph()
-            
-            # Note: Actions können nicht wiederhergestellt werden (Callables nicht serialisierbar)
-            # Nur Status-Info wird gespeichert
-            # In Produktion müsste hier Action-Registry verwendet werden
-            
-            # Simplified: Speichere nur Node-IDs und Stati
-            action_graph._saved_state = graph_data["nodes"]
-            
-            return {
-                "flow_state": flow_state,
-                "action_graph": action_graph,
-                "runtime_config": state.get("runtime_config", {}),
-                "events": state.get("events", []),
-                "timestamp": state["timestamp"]
-            }
-            
-        except Exception as e:
-            print(f"❌ Failed to load state: {e}")
-            return None
-    
-    def _load_sqlite(self) -> Optional[Dict]:
-        """Lädt aus SQLite."""
-        db_path = self.base_path / "kernel_state.db"
-        
-        if not db_path.exists():
-            return None
-        
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Load Flow State
-            cursor.execute("SELECT * FROM flow_state WHERE id = 1")
-            flow_row = cursor.fetchone()
-            
-            if not flow_row:
-                conn.close()
+        if self.backend == "redis":
+            raise RuntimeError("Backend 'redis' ist async: aload() verwenden")
+
+        with self._lock:
+            try:
+                if self.backend == "sqlite":
+                    return self._load_sqlite()
+                return self._load_json()
+            except Exception as e:
+                print(f"❌ Failed to load state ({self.backend}): {e}")
                 return None
-            
-            flow_state = FlowState()
-            flow_state.active = bool(flow_row[2])
-            flow_state.mode = flow_row[3]
-            flow_state.project = flow_row[4]
-            flow_state.step = flow_row[5]
-            flow_state.todo = json.loads(flow_row[6])
-            
-            # Load Action Graph
-            cursor.execute("SELECT * FROM action_graph WHERE id = 1")
-            graph_row = cursor.fetchone()
-            
-            action_graph = ActionGraph()
-            if graph_row:
-                nodes_data = json.loads(graph_row[2])
-                # Speichere nur Metadaten (Callables nicht serialisierbar)
-                action_graph._saved_state = nodes_data
-            
-            # Load Runtime Config
-            cursor.execute("SELECT config FROM runtime_config WHERE id = 1")
-            config_row = cursor.fetchone()
-            runtime_config = json.loads(config_row[0]) if config_row else {}
-            
-            # Load Events (letzte 100)
-            cursor.execute("SELECT data FROM events ORDER BY id DESC LIMIT 100")
-            events = [json.loads(row[0]) for row in cursor.fetchall()]
-            
-            conn.close()
-            
-            return {
-                "flow_state": flow_state,
-                "action_graph": action_graph,
-                "runtime_config": runtime_config,
-                "events": events,
-                "timestamp": flow_row[1]
-            }
-            
+
+    async def aload(self) -> Optional[Dict[str, Any]]:
+        """Async load() – Redis direkt, JSON/SQLite im Threadpool."""
+        if self.backend != "redis":
+            return await asyncio.to_thread(self.load)
+        try:
+            async with self._alock:
+                await self._init_kv()
+                return await self._load_kv()
         except Exception as e:
-            print(f"❌ Failed to load from SQLite: {e}")
+            print(f"❌ Failed to load state (redis): {e}")
             return None
-    
+
+    @staticmethod
+    def _build_result(state: Dict, events: list, timestamp) -> Dict[str, Any]:
+        # Reconstruct FlowState
+        flow_data = state["flow_state"]
+        flow_state = FlowState()
+        flow_state.active = flow_data["active"]
+        flow_state.mode = flow_data["mode"]
+        flow_state.project = flow_data["project"]
+        flow_state.step = flow_data["step"]
+        flow_state.todo = flow_data["todo"]
+
+        # Reconstruct ActionGraph (nur Metadaten, keine Callables)
+        # Note: Actions können nicht wiederhergestellt werden (Callables nicht serialisierbar)
+        # In Produktion müsste hier Action-Registry verwendet werden
+        action_graph = ActionGraph()
+        action_graph._saved_state = state.get("action_graph", {}).get("nodes", [])
+
+        return {
+            "flow_state": flow_state,
+            "action_graph": action_graph,
+            "runtime_config": state.get("runtime_config", {}),
+            "events": events,
+            "timestamp": timestamp
+        }
+
     def _rotate_backups(self, max_backups: int = 5):
         """Rotiert JSON-Backups."""
-        state_file = self.base_path / "kernel_state.json"
-        
+        state_file = self._state_file
+
         if not state_file.exists():
             return
-        
+
         # Backup erstellen
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = self.base_path / f"kernel_state_{timestamp}.json"
-        
+
         try:
             import shutil
             shutil.copy(state_file, backup_file)
-            
+
             # Alte Backups löschen
             backups = sorted(self.base_path.glob("kernel_state_*.json"))
             if len(backups) > max_backups:
                 for old_backup in backups[:-max_backups]:
                     old_backup.unlink()
-                    
+
         except Exception as e:
             print(f"⚠️ Backup rotation failed: {e}")
-    
+
     def clear(self):
         """Löscht gespeicherten State."""
-        if self.backend == "json":
-            state_file = self.base_path / "kernel_state.json"
-            if state_file.exists():
-                state_file.unlink()
-        elif self.backend == "sqlite":
-            db_path = self.base_path / "kernel_state.db"
-            if db_path.exists():
-                db_path.unlink()
+        if self.backend == "redis":
+            raise RuntimeError("Backend 'redis' ist async: aclear() verwenden")
+
+        with self._lock:
+            if self.backend == "json":
+                for path in (self._state_file, self._events_file):
+                    if path.exists():
+                        path.unlink()
+                self._reset_tracking()
+            elif self.backend == "sqlite":
+                self.close()
+                db_path = self.base_path / "kernel_state.db"
+                for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+                    if path.exists():
+                        path.unlink()
+                self._reset_tracking()
+                self._init_sqlite()
+
+    async def aclear(self):
+        """Async clear()."""
+        if self.backend != "redis":
+            return await asyncio.to_thread(self.clear)
+        async with self._alock:
+            await self._kv.delete(*[self._key(name) for name in ("seq", "events", "timestamp")],
+                                  *[self._key(f"snapshot:{name}") for name in SECTIONS])
+            self._reset_tracking()
+            self._kv_ready = True
+
+    def close(self):
+        """Schließt die SQLite-Connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
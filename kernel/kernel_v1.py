@@ -168,7 +168,7 @@ class KernelV1:
         
         # v1.1: Telemetry tracken
         if self.runtime:
-            self.runtime.telemetry.track_agent_action("dialog", task, True, 0.0)
+            self.runtime.telemetry.track_agent_action("dialog", True, 0.0)
         
         # Wrapper für emit
         async def emit_event(event: KernelEvent):
@@ -207,7 +207,7 @@ class KernelV1:
             
             # v1.1: Telemetry
             if self.runtime:
-                self.runtime.telemetry.track_agent_action("flutter", project, True, 0.0)
+                self.runtime.telemetry.track_agent_action("flutter", True, 0.0)
         
         except Exception as e:
             # v1.1: Recovery
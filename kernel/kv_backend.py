@@ -0,0 +1,128 @@
+# kernel/kv_backend.py
+# ---------------------
+# Async Key-Value Backends für den KernelStateStore ("redis" Backend)
+#
+# SCHNITTSTELLE (Teilmenge von redis.asyncio.Redis):
+# - get(key) / set(key, value) / delete(*keys)
+# - rpush(key, *values) / lrange(key, start, end) / ltrim(key, start, end) / llen(key)
+# - pipeline(transaction=True) → MULTI/EXEC (set/rpush/delete/ltrim + execute)
+#
+# Ein redis.asyncio.Redis Client erfüllt sie direkt; InMemoryKV ist der
+# In-Process-Fake für Tests und Single-Node-Betrieb.
+
+import os
+from typing import Dict, List, Optional
+
+
+class InMemoryPipeline:
+    """
+    MULTI/EXEC-Fake: sammelt Befehle, execute() wendet alle ohne
+    Unterbrechung an (wie redis.asyncio Pipeline mit transaction=True).
+    """
+
+    def __init__(self, kv: "InMemoryKV"):
+        self._kv = kv
+        self._commands: List[tuple] = []
+
+    def _queue(self, name: str, *args) -> "InMemoryPipeline":
+        self._commands.append((name, args))
+        return self
+
+    def set(self, key: str, value) -> "InMemoryPipeline":
+        return self._queue("set", key, value)
+
+    def delete(self, *keys: str) -> "InMemoryPipeline":
+        return self._queue("delete", *keys)
+
+    def rpush(self, key: str, *values) -> "InMemoryPipeline":
+        return self._queue("rpush", key, *values)
+
+    def ltrim(self, key: str, start: int, end: int) -> "InMemoryPipeline":
+        return self._queue("ltrim", key, start, end)
+
+    async def execute(self) -> List:
+        commands, self._commands = self._commands, []
+        # InMemoryKV-Methoden direkt (ohne Overrides) → kein await-Punkt dazwischen
+        return [await getattr(InMemoryKV, name)(self._kv, *args) for name, args in commands]
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._commands = []
+
+
+class InMemoryKV:
+    """
+    In-Process Key-Value Store mit Redis-Semantik (Strings + Listen).
+    """
+
+    def __init__(self):
+        self._values: Dict[str, str] = {}
+        self._lists: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def _slice(items: List[str], start: int, end: int) -> slice:
+        # Redis: end ist inklusiv, -1 = letztes Element
+        n = len(items)
+        start = max(n + start, 0) if start < 0 else start
+        end = n + end if end < 0 else end
+        return slice(start, end + 1)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value) -> bool:
+        self._values[key] = str(value)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            removed += int(self._values.pop(key, None) is not None)
+            removed += int(self._lists.pop(key, None) is not None)
+        return removed
+
+    async def rpush(self, key: str, *values) -> int:
+        items = self._lists.setdefault(key, [])
+        items.extend(str(v) for v in values)
+        return len(items)
+
+    async def lrange(self, key: str, start: int, end: int) -> List[str]:
+        items = self._lists.get(key, [])
+        return items[self._slice(items, start, end)]
+
+    async def ltrim(self, key: str, start: int, end: int) -> bool:
+        items = self._lists.get(key)
+        if items is not None:
+            self._lists[key] = items[self._slice(items, start, end)]
+        return True
+
+    async def llen(self, key: str) -> int:
+        return len(self._lists.get(key, []))
+
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+
+def connect_redis(url: Optional[str] = None):
+    """
+    redis.asyncio Client (decode_responses=True).
+
+    Args:
+        url: redis:// URL, sonst REDIS_URL bzw. REDIS_HOST/REDIS_PORT
+    """
+    try:
+        import redis.asyncio as redis_async
+    except ImportError as e:
+        raise RuntimeError("Backend 'redis' benötigt das Paket 'redis'") from e
+
+    url = url or os.getenv("REDIS_URL")
+    if url:
+        return redis_async.from_url(url, decode_responses=True)
+    return redis_async.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        db=0,
+        decode_responses=True,
+    )
@@ -16,16 +16,109 @@
 # PERSISTENZ:
 # - SQLite + JSON (hybrid)
 # - Schneller Zugriff (in-memory cache)
-# - Langzeit-Speicher (SQLite)
+# - Langzeit-Speicher (SQLite, WAL)
+# - Writes über MemoryDB (Writer-Thread, Group Commit) → blockieren nie
+# - AsyncKernelMemory: async Fassade für Kernel-Code im Event-Loop
 
+import asyncio
 import json
-import sqlite3
 import time
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import os
 
+from kernel.memory.memory_db import MemoryDB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    path TEXT,
+    created_at TEXT,
+    last_active TEXT,
+    tech_stack TEXT,
+    agents_used TEXT,
+    completion_status TEXT,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS agent_memory (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id TEXT,
+    action TEXT,
+    timestamp TEXT,
+    project_id TEXT,
+    success INTEGER,
+    context TEXT
+);
+CREATE TABLE IF NOT EXISTS user_preferences (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS abandoned_tasks (
+    id TEXT PRIMARY KEY,
+    description TEXT,
+    context TEXT,
+    abandoned_at TEXT,
+    project_id TEXT,
+    resume_hint TEXT
+);
+-- Indizes für die Query-Formen von get_agent_history / get_abandoned_tasks / get_recent_projects
+CREATE INDEX IF NOT EXISTS ix_agent_memory_agent_ts ON agent_memory (agent_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_abandoned_project_ts ON abandoned_tasks (project_id, abandoned_at);
+CREATE INDEX IF NOT EXISTS ix_abandoned_ts ON abandoned_tasks (abandoned_at);
+CREATE INDEX IF NOT EXISTS ix_projects_last_active ON projects (last_active);
+CREATE INDEX IF NOT EXISTS ix_projects_status ON projects (completion_status);
+"""
+
+# Feste SQL-Strings → einmal vorbereitet (Statement-Cache pro Connection)
+SQL_UPSERT_PROJECT = """
+    INSERT OR REPLACE INTO projects
+    (id, name, path, created_at, last_active, tech_stack, agents_used, completion_status, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_INSERT_AGENT_ACTION = """
+    INSERT INTO agent_memory (agent_id, action, timestamp, project_id, success, context)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_AGENT_HISTORY = """
+    SELECT agent_id, action, timestamp, project_id, success, context
+    FROM agent_memory
+    WHERE agent_id = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+SQL_UPSERT_PREFERENCE = """
+    INSERT OR REPLACE INTO user_preferences (key, value, updated_at)
+    VALUES (?, ?, ?)
+"""
+SQL_UPSERT_ABANDONED = """
+    INSERT OR REPLACE INTO abandoned_tasks
+    (id, description, context, abandoned_at, project_id, resume_hint)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_ABANDONED_BY_PROJECT = """
+    SELECT id, description, context, abandoned_at, project_id, resume_hint
+    FROM abandoned_tasks
+    WHERE project_id = ?
+    ORDER BY abandoned_at DESC
+    LIMIT ?
+"""
+SQL_ABANDONED_ALL = """
+    SELECT id, description, context, abandoned_at, project_id, resume_hint
+    FROM abandoned_tasks
+    ORDER BY abandoned_at DESC
+    LIMIT ?
+"""
+SQL_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM projects),
+        (SELECT COUNT(*) FROM projects WHERE completion_status = 'active'),
+        (SELECT COUNT(*) FROM agent_memory),
+        (SELECT COUNT(*) FROM abandoned_tasks)
+"""
+
 
 @dataclass
 class ProjectRecord:
@@ -147,7 +240,7 @@ class KernelMemory:
         tasks = memory.get_abandoned_tasks()
     """
     
-    def __init__(self, db_path: str = "./kernel_state/memory/kernel_memory.db"):
+    def __init__(self, db_path: str = "./kernel_state/memory/kernel_memory.db", readers: int = 4):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
@@ -155,69 +248,12 @@ class KernelMemory:
         self.projects: Dict[str, ProjectRecord] = {}
         self.user_prefs: Dict[str, UserPreference] = {}
         
-        # DB initialisieren
-        self._init_db()
+        # DB initialisieren (Schema + Writer-Thread + Reader-Pool)
+        self._db = MemoryDB(db_path, schema=SCHEMA, readers=readers)
         
         # Cache laden
         self._load_cache()
     
-    def _init_db(self):
-        """Erstellt DB-Schema."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Projects
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id TEXT PRIMARY KEY,
-                name TEXT,
-                path TEXT,
-                created_at TEXT,
-                last_active TEXT,
-                tech_stack TEXT,
-                agents_used TEXT,
-                completion_status TEXT,
-                notes TEXT
-            )
-        """)
-        
-        # Agent Memory
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS agent_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                agent_id TEXT,
-                action TEXT,
-                timestamp TEXT,
-                project_id TEXT,
-                success INTEGER,
-                context TEXT
-            )
-        """)
-        
-        # User Preferences
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS user_preferences (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                updated_at TEXT
-            )
-        """)
-        
-        # Abandoned Tasks
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS abandoned_tasks (
-                id TEXT PRIMARY KEY,
-                description TEXT,
-                context TEXT,
-                abandoned_at TEXT,
-                project_id TEXT,
-                resume_hint TEXT
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
     def _load_cache(self):
         """Lädt oft verwendete Daten in Memory."""
         # Projects (letzte 20)
@@ -236,14 +272,7 @@ class KernelMemory:
     
     def add_project(self, project: ProjectRecord):
         """Fügt Projekt zum Gedächtnis hinzu."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute("""
-            INSERT OR REPLACE INTO projects
-            (id, name, path, created_at, last_active, tech_stack, agents_used, completion_status, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        self._db.execute(SQL_UPSERT_PROJECT, (
             project.id,
             project.name,
             project.path,
@@ -255,9 +284,6 @@ class KernelMemory:
             project.notes
         ))
         
-        conn.commit()
-        conn.close()
-        
         # Cache update
         self.projects[project.id] = project
     
@@ -268,11 +294,7 @@ class KernelMemory:
             return self.projects[project_id]
         
         # DB lookup
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-        row = c.fetchone()
-        conn.close()
+        row = self._db.query("SELECT * FROM projects WHERE id = ?", (project_id,), one=True)
         
         if row:
             return self._row_to_project(row)
@@ -280,11 +302,7 @@ class KernelMemory:
     
     def get_recent_projects(self, limit: int = 10) -> List[ProjectRecord]:
         """Holt zuletzt aktive Projekte."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT * FROM projects ORDER BY last_active DESC LIMIT ?", (limit,))
-        rows = c.fetchall()
-        conn.close()
+        rows = self._db.query("SELECT * FROM projects ORDER BY last_active DESC LIMIT ?", (limit,))
         
         return [self._row_to_project(row) for row in rows]
     
@@ -292,11 +310,7 @@ class KernelMemory:
         """Aktualisiert letzte Aktivität."""
         now = datetime.now().isoformat()
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("UPDATE projects SET last_active = ? WHERE id = ?", (now, project_id))
-        conn.commit()
-        conn.close()
+        self._db.execute("UPDATE projects SET last_active = ? WHERE id = ?", (now, project_id))
         
         # Cache update
         if project_id in self.projects:
@@ -307,14 +321,8 @@ class KernelMemory:
     # --------------------------------------------------
     
     def track_agent_action(self, agent_id: str, action: str, project_id: str, success: bool, context: Dict = None):
-        """Trackt Agent-Aktion."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute("""
-            INSERT INTO agent_memory (agent_id, action, timestamp, project_id, success, context)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        """Trackt Agent-Aktion (eingereiht, blockiert nicht)."""
+        self._db.execute(SQL_INSERT_AGENT_ACTION, (
             agent_id,
             action,
             datetime.now().isoformat(),
@@ -322,23 +330,10 @@ class KernelMemory:
             1 if success else 0,
             json.dumps(context or {})
         ))
-        
-        conn.commit()
-        conn.close()
     
     def get_agent_history(self, agent_id: str, limit: int = 50) -> List[AgentMemoryEntry]:
         """Holt Agent-Historie."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
-            SELECT agent_id, action, timestamp, project_id, success, context
-            FROM agent_memory
-            WHERE agent_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (agent_id, limit))
-        rows = c.fetchall()
-        conn.close()
+        rows = self._db.query(SQL_AGENT_HISTORY, (agent_id, limit))
         
         return [
             AgentMemoryEntry(
@@ -364,14 +359,7 @@ class KernelMemory:
             updated_at=datetime.now().isoformat()
         )
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
-            INSERT OR REPLACE INTO user_preferences (key, value, updated_at)
-            VALUES (?, ?, ?)
-        """, (key, json.dumps(value), pref.updated_at))
-        conn.commit()
-        conn.close()
+        self._db.execute(SQL_UPSERT_PREFERENCE, (key, json.dumps(value), pref.updated_at))
         
         # Cache
         self.user_prefs[key] = pref
@@ -383,11 +371,7 @@ class KernelMemory:
             return self.user_prefs[key].value
         
         # DB
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT value FROM user_preferences WHERE key = ?", (key,))
-        row = c.fetchone()
-        conn.close()
+        row = self._db.query("SELECT value FROM user_preferences WHERE key = ?", (key,), one=True)
         
         if row:
             return json.loads(row[0])
@@ -395,11 +379,7 @@ class KernelMemory:
     
     def _get_all_preferences(self) -> List[UserPreference]:
         """Holt alle Präferenzen."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT key, value, updated_at FROM user_preferences")
-        rows = c.fetchall()
-        conn.close()
+        rows = self._db.query("SELECT key, value, updated_at FROM user_preferences")
         
         return [
             UserPreference(key=row[0], value=json.loads(row[1]), updated_at=row[2])
@@ -421,13 +401,7 @@ class KernelMemory:
             resume_hint=resume_hint
         )
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
-            INSERT OR REPLACE INTO abandoned_tasks
-            (id, description, context, abandoned_at, project_id, resume_hint)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        self._db.execute(SQL_UPSERT_ABANDONED, (
             task.id,
             task.description,
             json.dumps(task.context),
@@ -435,32 +409,13 @@ class KernelMemory:
             task.project_id,
             task.resume_hint
         ))
-        conn.commit()
-        conn.close()
     
     def get_abandoned_tasks(self, project_id: Optional[str] = None, limit: int = 20) -> List[AbandonedTask]:
         """Holt abgebrochene Tasks."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
         if project_id:
-            c.execute("""
-                SELECT id, description, context, abandoned_at, project_id, resume_hint
-                FROM abandoned_tasks
-                WHERE project_id = ?
-                ORDER BY abandoned_at DESC
-                LIMIT ?
-            """, (project_id, limit))
+            rows = self._db.query(SQL_ABANDONED_BY_PROJECT, (project_id, limit))
         else:
-            c.execute("""
-                SELECT id, description, context, abandoned_at, project_id, resume_hint
-                FROM abandoned_tasks
-                ORDER BY abandoned_at DESC
-                LIMIT ?
-            """, (limit,))
-        
-        rows = c.fetchall()
-        conn.close()
+            rows = self._db.query(SQL_ABANDONED_ALL, (limit,))
         
         return [
             AbandonedTask(
@@ -476,11 +431,7 @@ class KernelMemory:
     
     def resolve_abandoned_task(self, task_id: str):
         """Markiert abgebrochenen Task als erledigt (löscht ihn)."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("DELETE FROM abandoned_tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        conn.close()
+        self._db.execute("DELETE FROM abandoned_tasks WHERE id = ?", (task_id,))
     
     # --------------------------------------------------
     # STATS & INSIGHTS
@@ -488,25 +439,7 @@ class KernelMemory:
     
     def get_stats(self) -> Dict[str, Any]:
         """Gibt Memory-Statistiken zurück."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Projekt-Counts
-        c.execute("SELECT COUNT(*) FROM projects")
-        total_projects = c.fetchone()[0]
-        
-        c.execute("SELECT COUNT(*) FROM projects WHERE completion_status = 'active'")
-        active_projects = c.fetchone()[0]
-        
-        # Agent Actions
-        c.execute("SELECT COUNT(*) FROM agent_memory")
-        total_actions = c.fetchone()[0]
-        
-        # Abandoned Tasks
-        c.execute("SELECT COUNT(*) FROM abandoned_tasks")
-        abandoned_count = c.fetchone()[0]
-        
-        conn.close()
+        total_projects, active_projects, total_actions, abandoned_count = self._db.query(SQL_STATS, one=True)
         
         return {
             "total_projects": total_projects,
@@ -516,6 +449,18 @@ class KernelMemory:
             "user_preferences": len(self.user_prefs)
         }
     
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    
+    def flush(self):
+        """Wartet, bis alle eingereihten Writes committed sind."""
+        self._db.flush()
+    
+    def close(self):
+        """Restliche Writes committen und Connections schließen."""
+        self._db.close()
+    
     # --------------------------------------------------
     # HELPERS
     # --------------------------------------------------
@@ -535,6 +480,68 @@ class KernelMemory:
         )
 
 
+class AsyncKernelMemory:
+    """
+    Async Fassade für KernelMemory (Kernel-Code im Event-Loop).
+    
+    - Writes: nur einreihen (Writer-Thread committed gruppiert) → kein await nötig
+    - Reads: Reader-Pool im Threadpool → Loop blockiert nie
+    
+    USAGE:
+        memory = get_async_kernel_memory()
+        memory.track_agent_action("code_dev_1", "created_file", project_id, True)
+        history = await memory.get_agent_history("code_dev_1")
+    """
+    
+    def __init__(self, memory: KernelMemory):
+        self.memory = memory
+    
+    # Writes (nicht blockierend)
+    def add_project(self, project: ProjectRecord):
+        self.memory.add_project(project)
+    
+    def update_project_activity(self, project_id: str):
+        self.memory.update_project_activity(project_id)
+    
+    def track_agent_action(self, agent_id: str, action: str, project_id: str, success: bool, context: Dict = None):
+        self.memory.track_agent_action(agent_id, action, project_id, success, context)
+    
+    def set_preference(self, key: str, value: Any):
+        self.memory.set_preference(key, value)
+    
+    def mark_abandoned(self, task_id: str, description: str, context: Dict, project_id: str, resume_hint: str = ""):
+        self.memory.mark_abandoned(task_id, description, context, project_id, resume_hint)
+    
+    def resolve_abandoned_task(self, task_id: str):
+        self.memory.resolve_abandoned_task(task_id)
+    
+    # Reads
+    async def get_project(self, project_id: str) -> Optional[ProjectRecord]:
+        if project_id in self.memory.projects:
+            return self.memory.projects[project_id]
+        return await asyncio.to_thread(self.memory.get_project, project_id)
+    
+    async def get_recent_projects(self, limit: int = 10) -> List[ProjectRecord]:
+        return await asyncio.to_thread(self.memory.get_recent_projects, limit)
+    
+    async def get_agent_history(self, agent_id: str, limit: int = 50) -> List[AgentMemoryEntry]:
+        return await asyncio.to_thread(self.memory.get_agent_history, agent_id, limit)
+    
+    async def get_preference(self, key: str, default: Any = None) -> Any:
+        if key in self.memory.user_prefs:
+            return self.memory.user_prefs[key].value
+        return await asyncio.to_thread(self.memory.get_preference, key, default)
+    
+    async def get_abandoned_tasks(self, project_id: Optional[str] = None, limit: int = 20) -> List[AbandonedTask]:
+        return await asyncio.to_thread(self.memory.get_abandoned_tasks, project_id, limit)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.memory.get_stats)
+    
+    async def flush(self):
+        await asyncio.to_thread(self.memory.flush)
+
+
 # Singleton
 _kernel_memory = None
 
@@ -544,3 +551,8 @@ def get_kernel_memory():
     if _kernel_memory is None:
         _kernel_memory = KernelMemory()
     return _kernel_memory
+
+
+def get_async_kernel_memory() -> AsyncKernelMemory:
+    """Async Fassade über der KernelMemory-Singleton."""
+    return AsyncKernelMemory(get_kernel_memory())
@@ -0,0 +1,273 @@
+# kernel/memory/memory_db.py
+# ---------------------------
+# MemoryDB - Connection-Layer für KernelMemory
+#
+# VORHER:
+# - Jede KernelMemory-Methode: sqlite3.connect() → Query → commit → close
+# - Rollback-Journal → fsync pro track_agent_action (jeder Agent-Schritt)
+# - Läuft synchron im Event-Loop
+#
+# JETZT:
+# - EIN Writer-Thread besitzt die WAL-Connection; Writes werden in eine
+#   Queue gestellt und gruppiert in EINER Transaktion committed
+#   (was während eines Commits ankommt, landet im nächsten Batch)
+# - Kleiner Pool read-only Connections für Lesezugriffe
+# - Statement-Cache pro Connection (cached_statements) → feste SQL-Strings
+#   werden nur einmal vorbereitet
+# - Reads sehen alle vorher eingereihten Writes (warten ggf. auf den Commit)
+# - atexit: ausstehende Writes werden beim Prozessende committed
+# - Stirbt der Writer trotzdem, schlagen flush()/query()/execute() mit
+#   MemoryDBError fehl statt ewig zu warten
+
+import atexit
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_STOP = object()
+
+
+class MemoryDBError(RuntimeError):
+    """Writer-Thread läuft nicht (mehr) oder Warten auf Writes überschritt das Timeout."""
+
+
+class MemoryDB:
+    """
+    SQLite mit einem Writer-Thread (Group Commit) und Reader-Pool.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        schema: str = "",
+        readers: int = 4,
+        max_batch: int = 512,
+        cached_statements: int = 128,
+        wait_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            db_path: Pfad der SQLite-Datei
+            schema: DDL (CREATE TABLE/INDEX IF NOT EXISTS), wird vor dem Start ausgeführt
+            readers: Anzahl read-only Connections
+            max_batch: Max. Writes pro Transaktion
+            cached_statements: Prepared-Statement-Cache pro Connection
+            wait_timeout: Max. Sekunden, die query() auf ausstehende Writes wartet
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.cached_statements = cached_statements
+        self.wait_timeout = wait_timeout
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._submitted = 0
+        self._committed = 0
+        self._progress = threading.Condition()
+        self._writer_error: Optional[BaseException] = None
+        self._stopped = False
+        self.stats = {"writes": 0, "transactions": 0, "failed_writes": 0}
+
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        if schema:
+            self._writer.executescript(schema)
+
+        # Nach dem Schema anlegen (mode=ro braucht die Datei)
+        self._readers: "queue.LifoQueue" = queue.LifoQueue()
+        for _ in range(readers):
+            self._readers.put(self._connect(read_only=True))
+
+        self._thread = threading.Thread(target=self._run_writer, name="kernel-memory-writer", daemon=True)
+        self._thread.start()
+        # Daemon-Thread → beim Prozessende sonst verlorene Writes
+        atexit.register(self.close)
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=self.cached_statements,
+            )
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # ---------------------------------------------------------
+    # WRITES
+    # ---------------------------------------------------------
+    def _enqueue(self, item) -> None:
+        with self._progress:
+            self._check_writer()
+            self._submitted += 1
+        self._queue.put(item)
+
+    def _check_writer(self):
+        """Muss mit self._progress aufgerufen werden."""
+        if self._writer_error is not None:
+            raise MemoryDBError(f"MemoryDB writer died: {self._writer_error!r}")
+        if self._stopped:
+            raise MemoryDBError("MemoryDB is closed")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> Future:
+        """
+        Write einreihen (blockiert nicht).
+
+        Returns:
+            Future – erfüllt nach dem Commit (rowcount)
+
+        Raises:
+            MemoryDBError: Writer läuft nicht mehr
+        """
+        future: Future = Future()
+        self._enqueue((sql, tuple(params), future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet, bis alle bisher eingereihten Writes committed sind.
+
+        Returns:
+            False bei Timeout
+
+        Raises:
+            MemoryDBError: Writer ist gestorben, Writes bleiben ausstehend
+        """
+        with self._progress:
+            target = self._submitted
+            done = self._progress.wait_for(
+                lambda: self._committed >= target or self._writer_error is not None, timeout=timeout
+            )
+            if self._committed < target and self._writer_error is not None:
+                self._check_writer()
+            return done
+
+    def _run_writer(self):
+        conn = self._writer
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        next_item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_item is _STOP:
+                        stop = True
+                        break
+                    batch.append(next_item)
+
+                try:
+                    self._write_batch(conn, batch)
+                except BaseException as e:
+                    # z.B. ROLLBACK/Connection kaputt: Batch scheitert, Writer läuft weiter
+                    print(f"❌ KernelMemory batch failed: {e!r}")
+                    for _, _, future in batch:
+                        if not future.done():
+                            self.stats["failed_writes"] += 1
+                            future.set_exception(e)
+                    if not isinstance(e, Exception):
+                        raise
+                finally:
+                    with self._progress:
+                        self._committed += len(batch)
+                        self._progress.notify_all()
+                if stop:
+                    break
+        except BaseException as e:
+            with self._progress:
+                self._writer_error = e
+                self._progress.notify_all()
+            raise
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple]):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params, _ in batch:
+                results.append(conn.execute(sql, params).rowcount)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Einzeln wiederholen, damit ein fehlerhafter Write nicht den Batch mitnimmt
+            for sql, params, future in batch:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    result = conn.execute(sql, params).rowcount
+                    conn.execute("COMMIT")
+                    future.set_result(result)
+                    self.stats["writes"] += 1
+                    self.stats["transactions"] += 1
+                except Exception as e:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    self.stats["failed_writes"] += 1
+                    print(f"❌ KernelMemory write failed: {e}")
+                    future.set_exception(e)
+            return
+
+        self.stats["writes"] += len(batch)
+        self.stats["transactions"] += 1
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    # ---------------------------------------------------------
+    # READS
+    # ---------------------------------------------------------
+    def query(self, sql: str, params: Sequence[Any] = (), one: bool = False):
+        """
+        Lese-Query über den Reader-Pool.
+
+        Sieht alle Writes, die vor dem Aufruf eingereiht wurden.
+
+        Raises:
+            MemoryDBError: Writer gestorben oder ausstehende Writes nach
+                wait_timeout nicht committed
+        """
+        with self._progress:
+            pending = self._committed < self._submitted
+        if pending and not self.flush(timeout=self.wait_timeout):
+            raise MemoryDBError(f"Pending writes not committed after {self.wait_timeout}s")
+
+        conn = self._readers.get()
+        try:
+            cursor = conn.execute(sql, tuple(params))
+            return cursor.fetchone() if one else cursor.fetchall()
+        finally:
+            self._readers.put(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._progress:
+            pending = self._submitted - self._committed
+        return {**self.stats, "pending_writes": pending}
+
+    def close(self):
+        """Restliche Writes committen, Connections schließen."""
+        with self._progress:
+            if self._stopped:
+                return
+            self._stopped = True
+        atexit.unregister(self.close)
+
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
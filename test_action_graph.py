@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+ActionGraph - Kahn-Scheduler mit Ready-Queue und Concurrency-Limits
+Benchmark auf synthetischen 10k-Node Graphen (Makespan + Scheduling-
+Overhead) gegen den alten Wellen-Scheduler, dazu Limits pro Resource,
+Fehler-Policies, iterative Validierung und laufende Stats.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from kernel.action_graph import ActionGraph, ActionNode, ActionStatus, ErrorPolicy
+
+NODES = 10_000
+LAYERS = 50
+
+
+def sleeper(seconds):
+    async def action():
+        if seconds:
+            await asyncio.sleep(seconds)
+        return seconds
+    return action
+
+
+def make_graph(durations=None, seed=7, resources=None):
+    """Geschichteter Zufalls-DAG: jeder Node hängt von 1–3 Nodes der Vorgänger-Schicht ab"""
+    rng = random.Random(seed)
+    graph = ActionGraph()
+    per_layer = NODES // LAYERS
+    layers = []
+    for layer in range(LAYERS):
+        ids = []
+        for i in range(per_layer):
+            node_id = f"n{layer}_{i}"
+            requires = rng.sample(layers[-1], rng.randint(1, 3)) if layers else []
+            duration = durations(rng) if durations else 0
+            resource = rng.choice(resources) if resources else None
+            graph.add_node(ActionNode(id=node_id, action=sleeper(duration), requires=requires, resource=resource))
+            ids.append(node_id)
+        layers.append(ids)
+    return graph
+
+
+async def legacy_execute_all(graph):
+    """Alter execute_all: Wellen, Rescan aller Nodes pro Runde"""
+    while True:
+        executable = graph.get_executable_nodes()
+        if not executable:
+            if any(n.status == ActionStatus.PENDING for n in graph.nodes.values()):
+                raise RuntimeError("Deadlock detected in ActionGraph")
+            break
+        await asyncio.gather(*[node.execute() for node in executable])
+        graph.execution_order.extend(n.id for n in executable)
+
+
+def critical_path(graph):
+    finish = {}
+    for node_id in graph.execution_order:
+        node = graph.nodes[node_id]
+        finish[node_id] = node.result + max((finish[d] for d in node.requires), default=0)
+    return max(finish.values())
+
+
+def assert_topological(graph):
+    position = {node_id: i for i, node_id in enumerate(graph.execution_order)}
+    assert len(position) == len(graph.nodes)
+    for node in graph.nodes.values():
+        assert all(position[d] < position[node.id] for d in node.requires)
+
+
+async def test_overhead():
+    """Benchmark: reiner Scheduling-Overhead (Actions ohne Wartezeit)"""
+    legacy = make_graph()
+    start = time.perf_counter()
+    await legacy_execute_all(legacy)
+    legacy_time = time.perf_counter() - start
+
+    graph = make_graph()
+    start = time.perf_counter()
+    stats = await graph.execute_all()
+    kahn_time = time.perf_counter() - start
+
+    print(f"   {NODES} Nodes, {LAYERS} Schichten, Actions ohne Wartezeit:")
+    print(f"      Vorher (Wellen + Rescan): {legacy_time * 1000:.0f} ms ({legacy_time / NODES * 1e6:.1f} µs/Node)")
+    print(f"      Nachher (Kahn):           {kahn_time * 1000:.0f} ms ({kahn_time / NODES * 1e6:.1f} µs/Node)")
+
+    assert stats["completed"] == NODES and stats["pending"] == 0
+    assert_topological(graph)
+    assert kahn_time < legacy_time
+    print("✅ Scheduling-Overhead OK")
+
+
+async def test_makespan():
+    """Benchmark: Makespan bei gemischten Laufzeiten (0–20 ms)"""
+    def durations(rng):
+        return rng.choice([0.0, 0.001, 0.002, 0.02])
+
+    legacy = make_graph(durations)
+    start = time.perf_counter()
+    await legacy_execute_all(legacy)
+    legacy_time = time.perf_counter() - start
+
+    graph = make_graph(durations)
+    start = time.perf_counter()
+    await graph.execute_all()
+    kahn_time = time.perf_counter() - start
+    bound = critical_path(graph)
+
+    print(f"   {NODES} Nodes mit 0/1/2/20 ms Laufzeit:")
+    print(f"      Kritischer Pfad (Untergrenze): {bound * 1000:.0f} ms")
+    print(f"      Vorher (Wellen):               {legacy_time * 1000:.0f} ms")
+    print(f"      Nachher (Kahn):                {kahn_time * 1000:.0f} ms")
+
+    assert_topological(graph)
+    assert kahn_time < legacy_time
+    print("✅ Makespan OK")
+
+
+async def test_concurrency_limits():
+    """Test: globales Limit + Limit pro Resource-Typ werden eingehalten"""
+    graph = ActionGraph(max_concurrency=6, resource_limits={"llm": 2, "io": 3})
+    active = {"llm": 0, "io": 0, None: 0}
+    peak = {"llm": 0, "io": 0, None: 0, "total": 0}
+
+    def tracked(resource):
+        async def action():
+            active[resource] += 1
+            peak[resource] = max(peak[resource], active[resource])
+            peak["total"] = max(peak["total"], sum(active.values()))
+            await asyncio.sleep(0.002)
+            active[resource] -= 1
+        return action
+
+    for i in range(120):
+        resource = ["llm", "io", None][i % 3]
+        graph.add_node(ActionNode(id=f"a{i}", action=tracked(resource), resource=resource,
+                                  requires=[f"a{i - 30}"] if i >= 30 else []))
+    await graph.execute_all()
+    assert peak["llm"] == 2 and peak["io"] == 3 and peak["total"] == 6
+    assert graph.get_stats()["completed"] == 120
+    print("✅ Concurrency-Limits OK")
+
+
+async def test_no_wave_blocking():
+    """Test: Dependent eines schnellen Nodes wartet nicht auf langsames Geschwister"""
+    graph = ActionGraph()
+    started = {}
+
+    def action(node_id, seconds):
+        async def run():
+            started[node_id] = time.perf_counter()
+            await asyncio.sleep(seconds)
+        return run
+
+    graph.add_node(ActionNode(id="slow", action=action("slow", 0.2)))
+    graph.add_node(ActionNode(id="fast", action=action("fast", 0.01)))
+    graph.add_node(ActionNode(id="after_fast", action=action("after_fast", 0), requires=["fast"]))
+    await graph.execute_all()
+    assert started["after_fast"] - started["slow"] < 0.1
+    assert graph.execution_order.index("after_fast") < graph.execution_order.index("slow")
+    print("✅ Keine Wellen-Blockade OK")
+
+
+async def test_error_policies():
+    """Test: FAIL_FAST wirft und startet nichts Neues, CONTINUE überspringt nur Dependents"""
+    async def boom():
+        raise RuntimeError("build failed")
+
+    def make():
+        graph = ActionGraph()
+        graph.add_node(ActionNode(id="a", action=boom))
+        graph.add_node(ActionNode(id="b", action=sleeper(0.01)))
+        graph.add_node(ActionNode(id="a_child", action=sleeper(0), requires=["a"]))
+        graph.add_node(ActionNode(id="a_grandchild", action=sleeper(0), requires=["a_child"]))
+        graph.add_node(ActionNode(id="b_child", action=sleeper(0), requires=["b"]))
+        return graph
+
+    graph = make()
+    try:
+        await graph.execute_all()
+        assert False, "FAIL_FAST muss den Fehler werfen"
+    except RuntimeError as e:
+        assert str(e) == "build failed"
+    assert graph.nodes["b"].status == ActionStatus.COMPLETED  # lief schon, wurde abgewartet
+    assert graph.nodes["b_child"].status == ActionStatus.PENDING
+    assert graph.get_stats() == {"total": 5, "pending": 3, "running": 0, "completed": 1, "failed": 1, "skipped": 0}
+
+    graph = make()
+    stats = await graph.execute_all(error_policy=ErrorPolicy.CONTINUE)
+    assert stats == {"total": 5, "pending": 0, "running": 0, "completed": 2, "failed": 1, "skipped": 2}
+    assert graph.nodes["a_grandchild"].error == "Dependency a failed"
+    assert graph.execution_order == ["b", "b_child"]
+    print("✅ Fehler-Policies OK")
+
+
+async def test_validation_and_stats():
+    """Test: iterative Validierung (tiefe Ketten, Zyklen), Deadlock, laufende Stats"""
+    deep = ActionGraph()
+    for i in range(20_000):
+        deep.add_node(ActionNode(id=f"c{i}", action=sleeper(0), requires=[f"c{i - 1}"] if i else []))
+    start = time.perf_counter()
+    assert await deep.execute_all(simulate=True) is True
+    print(f"      Validierung 20k-Kette: {(time.perf_counter() - start) * 1000:.1f} ms (vorher: RecursionError)")
+
+    cyclic = ActionGraph()
+    cyclic.add_node(ActionNode(id="root", action=sleeper(0)))
+    cyclic.add_node(ActionNode(id="x", action=sleeper(0), requires=["root", "z"]))
+    cyclic.add_node(ActionNode(id="y", action=sleeper(0), requires=["x"]))
+    cyclic.add_node(ActionNode(id="z", action=sleeper(0), requires=["y"]))
+    cyclic.add_node(ActionNode(id="tail", action=sleeper(0), requires=["z"]))
+    try:
+        cyclic._validate_dag()
+        assert False, "Zyklus muss erkannt werden"
+    except ValueError as e:
+        assert any(f"involving {n}" in str(e) for n in ("x", "y", "z")), str(e)
+    try:
+        await cyclic.execute_all()
+        assert False, "Zyklus muss als Deadlock enden"
+    except RuntimeError as e:
+        assert "Deadlock" in str(e)
+
+    # Laufende Stats folgen auch direkten Status-Zuweisungen (Resume)
+    graph = make_graph()
+    graph.nodes["n0_0"].status = ActionStatus.COMPLETED
+    graph.nodes["n0_1"].status = ActionStatus.FAILED
+    stats = graph.get_stats()
+    assert stats["completed"] == 1 and stats["failed"] == 1 and stats["pending"] == NODES - 2
+    print("✅ Validierung + Stats OK")
+
+
+async def test_cancel_stops_running_nodes():
+    """Test: Abbruch von execute_all bricht laufende Node-Tasks mit ab"""
+    graph = ActionGraph()
+    finished = []
+
+    def slow(node_id):
+        async def action():
+            await asyncio.sleep(0.5)
+            finished.append(node_id)
+        return action
+
+    graph.add_node(ActionNode(id="fast", action=sleeper(0)))
+    for i in range(3):
+        graph.add_node(ActionNode(id=f"slow{i}", action=slow(f"slow{i}"), requires=["fast"]))
+
+    task = asyncio.ensure_future(graph.execute_all())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        await task
+        assert False, "execute_all muss abgebrochen sein"
+    except asyncio.CancelledError:
+        pass
+
+    await asyncio.sleep(0.6)
+    assert finished == []
+    assert graph.get_stats() == {"total": 4, "pending": 3, "running": 0, "completed": 1, "failed": 0, "skipped": 0}
+    print("✅ Abbruch stoppt laufende Nodes OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_overhead())
+    asyncio.run(test_makespan())
+    asyncio.run(test_concurrency_limits())
+    asyncio.run(test_no_wave_blocking())
+    asyncio.run(test_error_policies())
+    asyncio.run(test_validation_and_stats())
+    asyncio.run(test_cancel_stops_running_nodes())
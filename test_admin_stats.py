@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+AdminStats - Materialisierte Admin-Zähler statt N+1
+Seedet 100k User und vergleicht Query-Anzahl und Latenz der alten
+User-Übersicht (3 Queries pro User) und des alten Dashboards (6 count())
+mit admin_counters / user_activity, plus inkrementelle Updates und Cache.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from admin.stats import AdminStats
+from db import Base
+from models import ChatSession, Message, User
+
+USERS = 100_000
+SESSIONS = 60_000
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def setup_db(tmp: str):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'admin.db')}")
+    Base.metadata.create_all(engine)
+    base = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "email": f"user{i}@vibeai.dev",
+                    "username": f"user{i}",
+                    "hashed_password": "x",
+                    "is_suspended": i % 10 == 0,
+                    "created_at": base,
+                }
+                for i in range(1, USERS + 1)
+            ],
+        )
+        conn.execute(
+            insert(ChatSession),
+            [
+                {"user_id": i % 1000 + 1, "created_at": base, "updated_at": base + timedelta(minutes=i)}
+                for i in range(SESSIONS)
+            ],
+        )
+        conn.execute(insert(Message), [{"session_id": i % 100 + 1, "role": "user", "content": "hi"} for i in range(5000)])
+    return engine
+
+
+def legacy_overview(db, limit=200):
+    """Alte get_users_overview Schleife (ohne Projekte – Model existiert nicht)"""
+    result = []
+    for user in db.query(User).offset(0).limit(limit).all():
+        session_count = db.query(ChatSession).filter(ChatSession.user_id == user.id).count()
+        last = db.query(ChatSession).filter(ChatSession.user_id == user.id).order_by(ChatSession.updated_at.desc()).first()
+        result.append((user.id, session_count, last.updated_at.isoformat() if last else None))
+    return result
+
+
+def legacy_dashboard(db):
+    """Alte get_dashboard_stats Zähler"""
+    return (
+        db.query(User).count(),
+        db.query(User).filter(User.is_suspended == False).count(),  # noqa: E712
+        db.query(User).filter(User.is_suspended == True).count(),  # noqa: E712
+        db.query(ChatSession).count(),
+        db.query(Message).count(),
+    )
+
+
+def test_overview_and_dashboard():
+    """Test: Query-Anzahl + Latenz vorher/nachher bei 100k Usern"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = setup_db(tmp)
+        queries = QueryCounter(engine)
+        SessionLocal = sessionmaker(bind=engine)
+        stats = AdminStats(cache_ttl=60)
+        stats.install(User, ChatSession, Message)
+
+        with SessionLocal() as db:
+            queries.count = 0
+            start = time.perf_counter()
+            old_overview = legacy_overview(db)
+            old_overview_time, old_overview_queries = time.perf_counter() - start, queries.count
+
+            queries.count = 0
+            start = time.perf_counter()
+            old_dashboard = legacy_dashboard(db)
+            old_dashboard_time, old_dashboard_queries = time.perf_counter() - start, queries.count
+
+            start = time.perf_counter()
+            stats.ensure_ready(db)
+            rebuild_time = time.perf_counter() - start
+
+            queries.count = 0
+            start = time.perf_counter()
+            overview = stats.users_overview(db, limit=200)
+            overview_time, overview_queries = time.perf_counter() - start, queries.count
+
+            queries.count = 0
+            start = time.perf_counter()
+            counters = stats.dashboard_counts(db)
+            dashboard_time, dashboard_queries = time.perf_counter() - start, queries.count
+
+            queries.count = 0
+            start = time.perf_counter()
+            for _ in range(100):
+                stats.dashboard_counts(db)
+            polled_time, polled_queries = (time.perf_counter() - start) / 100, queries.count
+
+        print(f"   {USERS} User, {SESSIONS} Sessions:")
+        print(f"      Übersicht (200 User) vorher: {old_overview_queries} Queries, {old_overview_time * 1000:.0f} ms")
+        print(f"      Übersicht (200 User) jetzt:  {overview_queries} Query, {overview_time * 1000:.1f} ms")
+        print(f"      Dashboard vorher:            {old_dashboard_queries} Queries, {old_dashboard_time * 1000:.1f} ms")
+        print(f"      Dashboard jetzt:             {dashboard_queries} Query, {dashboard_time * 1000:.2f} ms")
+        print(f"      Dashboard Polling (Cache):   {polled_queries} Queries, {polled_time * 1e6:.1f} µs")
+        print(f"      Einmaliger Rebuild:          {rebuild_time * 1000:.0f} ms")
+
+        assert [(r["id"], r["session_count"], r["last_active"]) for r in overview] == old_overview
+        assert (counters["users"], counters["users"] - counters["suspended_users"], counters["suspended_users"],
+                counters["sessions"], counters["messages"]) == old_dashboard
+        assert old_overview_queries > 400 and overview_queries == 1
+        assert dashboard_queries == 1 and polled_queries == 0
+        assert overview_time < old_overview_time
+    print("✅ Übersicht + Dashboard OK")
+
+
+def test_incremental_updates():
+    """Test: Inserts/Suspend/Delete halten Zähler ohne Rebuild aktuell"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'admin.db')}")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(bind=engine)
+        stats = AdminStats(cache_ttl=0)
+        stats.install(User, ChatSession, Message)
+
+        with SessionLocal() as db:
+            stats.ensure_ready(db)
+            user = User(email="a@vibeai.dev", username="a", hashed_password="x")
+            db.add(user)
+            db.commit()
+
+            late = datetime(2026, 5, 1)
+            chat = ChatSession(user_id=user.id, created_at=late, updated_at=late)
+            old_chat = ChatSession(user_id=user.id, updated_at=datetime(2026, 1, 1))
+            db.add_all([chat, old_chat])
+            db.flush()
+            db.add(Message(session_id=chat.id, role="user", content="hi"))
+            user.is_suspended = True
+            db.commit()
+
+            counters = stats.dashboard_counts(db)
+            assert counters == {"users": 1, "suspended_users": 1, "sessions": 2, "messages": 1, "projects": 0}
+            row = stats.users_overview(db)[0]
+            assert row["session_count"] == 2 and row["last_active"] == late.isoformat()
+            assert stats.users_overview(db, suspended_only=True)[0]["id"] == user.id
+
+            user.is_suspended = False
+            db.delete(old_chat)
+            db.commit()
+            assert stats.dashboard_counts(db)["suspended_users"] == 0
+            assert stats.users_overview(db)[0]["session_count"] == 1
+            assert stats.stats["rebuilds"] == 1
+
+            # Vergleich mit komplettem Rebuild
+            incremental = stats.dashboard_counts(db)
+            stats.rebuild(db)
+            assert stats.dashboard_counts(db) == incremental
+    print("✅ Inkrementelle Updates OK")
+
+
+def test_migration_adds_is_suspended():
+    """Test: bestehende users-Tabelle ohne is_suspended wird nachgezogen (idempotent)"""
+    from sqlalchemy import text
+
+    from db import migrate_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'old.db')}")
+        # Schema wie vor user-018 (ohne is_suspended)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, username VARCHAR NOT NULL, "
+                "full_name VARCHAR, hashed_password VARCHAR NOT NULL, role VARCHAR(9), plan VARCHAR(10), "
+                "is_active BOOLEAN, created_at DATETIME, stripe_customer_id VARCHAR, stripe_subscription_id VARCHAR, "
+                "referral_code VARCHAR, referred_by INTEGER, credits FLOAT)"
+            ))
+            conn.execute(text(
+                "INSERT INTO users (email, username, hashed_password, role) VALUES "
+                "('a@x', 'a', 'h', 'USER'), ('b@x', 'b', 'h', 'SUSPENDED')"
+            ))
+
+        assert migrate_db(engine) == ["users.is_suspended"]
+        assert migrate_db(engine) == []
+
+        db = sessionmaker(bind=engine)()
+        users = {u.username: u.is_suspended for u in db.query(User).all()}
+        assert users == {"a": False, "b": True}
+        db.add(User(email="c@x", username="c", hashed_password="h"))
+        db.commit()
+        assert db.query(User).filter(User.username == "c").one().is_suspended is False
+        db.close()
+    print("✅ Migration is_suspended OK")
+
+
+if __name__ == "__main__":
+    test_overview_and_dashboard()
+    test_incremental_updates()
+    test_migration_adds_is_suspended()
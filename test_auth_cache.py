@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+AuthCache - Authenticated Requests/s Benchmark
+Vergleicht den alten get_current_user Pfad (jwt.decode + Blacklist +
+SELECT pro Request) mit Token-/User-Cache und prüft Invalidierung bei
+Suspend (UPDATE auf User) und Logout (Blacklist über Bloom-Filter).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import jwt
+from sqlalchemy import Boolean, Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from auth_cache import AuthCache, BloomFilter
+
+SECRET = "bench-secret-for-auth-cache-benchmark-0001"
+REQUESTS = 3_000
+
+Base = declarative_base()
+
+
+class BenchUser(Base):
+    __tablename__ = "bench_users"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String, nullable=False)
+    is_admin = Column(Boolean, default=False)
+    is_suspended = Column(Boolean, default=False)
+
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine)
+SessionLocal = sessionmaker(bind=engine)
+
+with SessionLocal() as setup:
+    setup.add_all([BenchUser(id=i, email=f"user{i}@vibeai.dev") for i in range(1, 51)])
+    setup.commit()
+
+
+def make_token(user_id: int) -> str:
+    payload = {"user_id": user_id, "type": "access", "exp": int(time.time()) + 900}
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+def legacy_current_user(token: str, db, blacklist: set):
+    """Alter Pfad aus auth_production.get_current_user"""
+    if token in blacklist:
+        raise PermissionError("revoked")
+    payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+    user = db.query(BenchUser).filter(BenchUser.id == payload["user_id"]).first()
+    if user.is_suspended:
+        raise PermissionError("suspended")
+    return user
+
+
+def cached_current_user(cache: AuthCache, token: str, db):
+    """Neuer Pfad (wie auth_production.get_current_user)"""
+    payload = cache.get_token(token)
+    if payload is None:
+        if cache.is_blacklisted(token):
+            raise PermissionError("revoked")
+        payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+        cache.put_token(token, payload)
+    user = cache.load_user(db, BenchUser, payload["user_id"])
+    if user.is_suspended:
+        raise PermissionError("suspended")
+    return user
+
+
+def test_bloom_filter():
+    """Test: keine False Negatives, wenige False Positives"""
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    for i in range(1_000):
+        bloom.add(f"revoked-{i}")
+    assert all(f"revoked-{i}" in bloom for i in range(1_000))
+
+    false_positives = sum(f"valid-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    print(f"✅ BloomFilter OK ({false_positives / 100:.2f}% False Positives)")
+
+
+def test_invalidation():
+    """Test: Suspend (UPDATE) und Logout greifen sofort trotz Cache"""
+    cache = AuthCache(token_ttl=60, user_ttl=60)
+    cache.install_model_hooks(BenchUser)
+    token = make_token(7)
+
+    with SessionLocal() as db:
+        assert cached_current_user(cache, token, db).email == "user7@vibeai.dev"
+    with SessionLocal() as db:
+        cached_current_user(cache, token, db)
+    assert cache.stats["user_hits"] == 1
+
+    # Suspend über eine andere Session → after_update/after_commit Hook
+    with SessionLocal() as admin_db:
+        admin_db.query(BenchUser).filter(BenchUser.id == 7).first().is_suspended = True
+        admin_db.commit()
+
+    with SessionLocal() as db:
+        try:
+            cached_current_user(cache, token, db)
+            raise AssertionError("suspended user accepted")
+        except PermissionError as e:
+            assert str(e) == "suspended"
+
+    with SessionLocal() as admin_db:
+        admin_db.query(BenchUser).filter(BenchUser.id == 7).first().is_suspended = False
+        admin_db.commit()
+
+    # Logout → Token aus dem Cache, Blacklist über Bloom-Filter
+    cache.blacklist(token)
+    with SessionLocal() as db:
+        try:
+            cached_current_user(cache, token, db)
+            raise AssertionError("revoked token accepted")
+        except PermissionError as e:
+            assert str(e) == "revoked"
+        cached_current_user(cache, make_token(8), db)
+    assert cache.stats["blacklist_lookups"] == 1
+    print("✅ Invalidierung OK")
+
+
+def test_cached_user_is_attached():
+    """Test: gecachter User hängt an der Request-Session und ist änderbar"""
+    cache = AuthCache()
+    with SessionLocal() as db:
+        cache.load_user(db, BenchUser, 3)
+    with SessionLocal() as db:
+        user = cache.load_user(db, BenchUser, 3)
+        assert user in db
+        user.email = "renamed@vibeai.dev"
+        db.commit()
+    with SessionLocal() as db:
+        assert db.get(BenchUser, 3).email == "renamed@vibeai.dev"
+    print("✅ Session-Merge OK")
+
+
+def test_benchmark():
+    """Test: Authenticated Requests/s mit und ohne Cache"""
+    tokens = [make_token(i % 50 + 1) for i in range(100)]
+    blacklist = {f"revoked-{i}" for i in range(1_000)}
+    cache = AuthCache()
+    for token in blacklist:
+        cache.bloom.add(token)
+
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        with SessionLocal() as db:
+            legacy_current_user(tokens[i % len(tokens)], db, blacklist)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        with SessionLocal() as db:
+            cached_current_user(cache, tokens[i % len(tokens)], db)
+    cached_time = time.perf_counter() - start
+
+    print(f"   {REQUESTS} Requests ({len(tokens)} Tokens, 50 User):")
+    print(f"      Vorher (decode + SELECT): {REQUESTS / legacy_time:,.0f} req/s")
+    print(f"      Nachher (AuthCache):      {REQUESTS / cached_time:,.0f} req/s")
+    print(f"      Cache: {cache.get_stats()}")
+    assert cached_time < legacy_time
+    print("✅ Benchmark OK")
+
+
+if __name__ == "__main__":
+    test_bloom_filter()
+    test_invalidation()
+    test_cached_user_is_attached()
+    test_benchmark()
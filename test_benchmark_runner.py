@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+BenchmarkRunner - Concurrent, deterministischer Benchmark-Harness
+Prüft Concurrency-Speedup gegenüber seriellen Calls, Determinismus des
+Mock-Providers, Perzentile/TTFT/Tokens pro Sekunde, Warmup, den
+JSONL-Store und die Regressionserkennung.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from ai.benchmark.benchmark_engine import BenchmarkEngine
+from ai.benchmark.benchmark_runner import (
+    BenchmarkRunner,
+    BenchmarkStore,
+    MockProvider,
+    percentile,
+)
+
+MODELS = ["openai:gpt-4o", "anthropic:claude-3.5-sonnet", "google:gemini-2.0-flash"]
+PROMPTS = [f"prompt {i}" for i in range(8)]
+
+
+def test_percentile():
+    """Test: lineare Interpolation"""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50.5
+    assert round(percentile(values, 99), 2) == 99.01
+    assert percentile([7], 90) == 7
+    assert percentile([], 50) == 0.0
+    print("✅ Perzentile OK")
+
+
+async def test_mock_is_deterministic():
+    """Test: gleicher Seed → gleiche Latenzprofile und Token-Anzahl"""
+    a = MockProvider(seed=7).stream("openai:gpt-4o", "hello")
+    b = MockProvider(seed=7).stream("openai:gpt-4o", "hello")
+    c = MockProvider(seed=8).stream("openai:gpt-4o", "hello")
+    assert a.expected_ns == b.expected_ns and len(a.tokens) == len(b.tokens)
+    assert a.expected_ns != c.expected_ns
+    print("✅ Mock-Determinismus OK")
+
+
+async def test_concurrency_and_metrics():
+    """Test: Concurrency-Speedup, Metriken, Harness-Overhead"""
+    mock = MockProvider(seed=1, time_scale=0.05)
+
+    serial = BenchmarkRunner(concurrency=1, warmup=0, mock=mock)
+    start = time.perf_counter()
+    await serial.run_many(MODELS, PROMPTS)
+    serial_time = time.perf_counter() - start
+
+    concurrent = BenchmarkRunner(concurrency=8, warmup=1, mock=mock)
+    start = time.perf_counter()
+    results = await concurrent.run_many(MODELS, PROMPTS)
+    concurrent_time = time.perf_counter() - start
+
+    print(f"   {len(MODELS)} Modelle x {len(PROMPTS)} Prompts (Mock, time_scale 0.05):")
+    print(f"      Seriell:          {serial_time * 1000:.0f} ms")
+    print(f"      Concurrency 8:    {concurrent_time * 1000:.0f} ms")
+    for model_id, (samples, summary) in results.items():
+        assert len(samples) == len(PROMPTS)  # Warmup nicht gezählt
+        assert summary.success_rate == 100
+        assert summary.p50_latency_ms <= summary.p90_latency_ms <= summary.p99_latency_ms
+        assert 0 < summary.ttft_p50_ms < summary.p50_latency_ms
+        assert summary.tokens_per_sec > 0
+        print(
+            f"      {model_id}: p50 {summary.p50_latency_ms:.1f} ms, p99 {summary.p99_latency_ms:.1f} ms, "
+            f"TTFT {summary.ttft_p50_ms:.1f} ms, {summary.tokens_per_sec:.0f} tok/s, "
+            f"Overhead {summary.overhead_p50_ms:.2f} ms"
+        )
+    assert concurrent_time < serial_time / 3
+    print("✅ Concurrency + Metriken OK")
+
+
+async def test_call_fn_variants():
+    """Test: sync call_fn und fehlerhafte Calls"""
+
+    def sync_call(model_id, prompt):
+        time.sleep(0.01)
+        if prompt.endswith("3"):
+            raise RuntimeError("provider down")
+        return "x" * 120
+
+    runner = BenchmarkRunner(call_fn=sync_call, concurrency=4, warmup=0)
+    samples, summary = (await runner.run_many(["openai:gpt-4o"], PROMPTS))["openai:gpt-4o"]
+    assert summary.mode == "live"
+    assert summary.success_rate == 7 / 8 * 100
+    assert samples[0].output_tokens == 30 and summary.overhead_p50_ms is None
+    print("✅ call_fn Varianten OK")
+
+
+async def test_store_and_regressions():
+    """Test: Ergebnisse werden gespeichert (Mock nur explizit), Verlangsamung wird erkannt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BenchmarkStore(os.path.join(tmp, "results.jsonl"))
+        engine = BenchmarkEngine()
+        engine.store = store
+        engine.mock = MockProvider(time_scale=0.05)
+
+        # Mock-Läufe landen nur auf ausdrücklichen Wunsch (CI) im Store
+        await engine.run_models_async(MODELS, num_iterations=2, warmup=0)
+        assert store.load() == []
+        results = await engine.run_models_async(MODELS, num_iterations=6, warmup=0, persist=True)
+        assert len(store.load()) == len(MODELS)
+        assert results["openai:gpt-4o"].mode == "mock"
+        assert results["openai:gpt-4o"].p99_latency_ms > 0
+
+        # Gleicher Lauf → keine Regression
+        mock = MockProvider(time_scale=0.05)
+        await BenchmarkRunner(concurrency=8, warmup=0, store=store, mock=mock).run_many(MODELS, PROMPTS)
+        again = await BenchmarkRunner(concurrency=8, warmup=0, mock=mock).run_many(MODELS, PROMPTS)
+        assert store.detect_regressions([s for _, s in again.values()]) == []
+
+        # Zusätzlicher Harness-Overhead (50 ms) → Regression
+        class SlowHarness(BenchmarkRunner):
+            async def _call(self, model_id, prompt, iteration):
+                sample = await super()._call(model_id, prompt, iteration)
+                sample.latency_ns += 50_000_000
+                sample.overhead_ns += 50_000_000
+                return sample
+
+        slow = await SlowHarness(concurrency=8, warmup=0, mock=mock).run_many(MODELS, PROMPTS)
+        regressions = store.detect_regressions([s for _, s in slow.values()])
+        assert {r["metric"] for r in regressions} >= {"p50_latency_ms", "overhead_p50_ms"}
+    print("✅ Store + Regressionen OK")
+
+
+if __name__ == "__main__":
+    test_percentile()
+    asyncio.run(test_mock_is_deterministic())
+    asyncio.run(test_concurrency_and_metrics())
+    asyncio.run(test_call_fn_variants())
+    asyncio.run(test_store_and_regressions())
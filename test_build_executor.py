@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Build Executor - Paralleles stdout/stderr Draining + Log-Frames
+Prüft, dass eine volle stderr-Pipe den Build nicht mehr blockiert, dass
+Zeilen gebündelt (statt einzeln) geschrieben werden und dass ein
+langsamer WebSocket-Client den Build nicht ausbremst und überlange
+Zeilen nicht verloren gehen.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from admin.notifications import ws_build_events as ws_module
+from buildsystem import build_executor
+from buildsystem.build_manager import BuildManager, BuildType
+
+# 1 MB auf stderr, bevor stdout geschrieben wird → füllt den Pipe-Puffer
+CHATTY_STDERR = [
+    sys.executable,
+    "-c",
+    "import sys\n"
+    "for i in range(20000): sys.stderr.write(f'warn {i} ' + 'x' * 40 + '\\n')\n"
+    "sys.stderr.flush()\n"
+    "for i in range(2000): print(f'out {i}')\n",
+]
+
+MANY_LINES = [sys.executable, "-c", "for i in range(5000): print(f'line {i}')"]
+
+
+class SlowWebSocket:
+    """Client, der pro Nachricht 50 ms braucht"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(0.05)
+        self.messages.append(text)
+
+
+async def legacy_run_cmd(cmd):
+    """Alter _run_cmd: erst stdout komplett, dann stderr"""
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            break
+    await process.stderr.read()
+    await process.wait()
+    return process.returncode
+
+
+async def make_build(tmp):
+    manager = BuildManager(builds_dir=tmp)
+    build_executor.build_manager = manager
+    build = await manager.create_build("a@vibeai.dev", "p1", BuildType.FLUTTER_ANDROID)
+    return manager, build["id"]
+
+
+async def test_no_stderr_deadlock():
+    """Test: volle stderr-Pipe blockiert nicht mehr"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager, build_id = await make_build(tmp)
+
+        try:
+            await asyncio.wait_for(legacy_run_cmd(CHATTY_STDERR), timeout=3)
+            legacy = "fertig"
+        except asyncio.TimeoutError:
+            legacy = "Deadlock (Timeout 3 s)"
+
+        start = time.perf_counter()
+        rc = await asyncio.wait_for(build_executor._run_cmd(CHATTY_STDERR, tmp, "a@vibeai.dev", build_id), timeout=30)
+        elapsed = time.perf_counter() - start
+
+        print("   20k stderr-Zeilen vor stdout:")
+        print(f"      Vorher:  {legacy}")
+        print(f"      Nachher: rc={rc} in {elapsed * 1000:.0f} ms")
+
+        manager.log_store.flush(build_id)
+        lines = manager.log_store.read_lines(build_id, 0, 30000)
+        assert rc == 0 and len(lines) == 22000
+        errors = [line for line in lines if "[ERROR] warn" in line]
+        outputs = [line for line in lines if "] out " in line]
+        assert errors[-1].endswith("warn 19999 " + "x" * 40) and outputs[-1].endswith("out 1999")
+        # Reihenfolge pro Stream bleibt erhalten
+        assert [int(line.split("out ")[1]) for line in outputs] == list(range(2000))
+        manager.registry.close()
+    print("✅ Kein stderr-Deadlock OK")
+
+
+async def test_batching_and_slow_subscriber():
+    """Test: Frames statt Einzelzeilen, langsamer Client bremst nicht"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager, build_id = await make_build(tmp)
+        events = ws_module.BuildEventManager(max_frames=8)
+        build_executor.ws_build_events = events
+
+        calls = []
+        original = manager.add_logs
+
+        async def counting_add_logs(bid, entries):
+            calls.append(len(entries))
+            await original(bid, entries)
+
+        manager.add_logs = counting_add_logs
+
+        slow = SlowWebSocket()
+        await events.connect(slow, build_id)
+
+        start = time.perf_counter()
+        rc = await build_executor._run_cmd(MANY_LINES, tmp, "a@vibeai.dev", build_id)
+        elapsed = time.perf_counter() - start
+
+        print("   5000 Zeilen, Client mit 50 ms pro Nachricht:")
+        print(f"      Vorher (1 await pro Zeile): ~{5000 * 0.05:.0f} s (geschätzt)")
+        print(f"      Nachher: {elapsed * 1000:.0f} ms, {len(calls)} Frames")
+
+        assert rc == 0 and sum(calls) == 5000
+        assert len(calls) < 100 and max(calls) <= build_executor.LOG_BATCH_LINES
+        assert elapsed < 3
+
+        # Ende-Event geht nie verloren, auch wenn Log-Frames verworfen wurden
+        await events.broadcast_complete(build_id, success=True)
+        for _ in range(100):
+            if slow.messages and '"complete"' in slow.messages[-1]:
+                break
+            await asyncio.sleep(0.05)
+        assert '"complete"' in slow.messages[-1]
+        assert any("dropped_frames" in m for m in slow.messages)
+
+        await events.disconnect(slow, build_id)
+        manager.registry.close()
+    print("✅ Batching + langsamer Client OK")
+
+
+async def test_long_lines_not_lost():
+    """Test: Zeilen länger als STREAM_LIMIT kommen vollständig im Channel an"""
+    limit = build_executor.STREAM_LIMIT
+    script = (
+        "import sys\n"
+        "sys.stdout.write('a' * 200000 + '\\n')\n"
+        "sys.stdout.write('kurz\\n')\n"
+        f"sys.stdout.write('b' * {limit} + '\\n')\n"
+        "sys.stdout.write('c' * 100000)\n"
+    )
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", script, stdout=asyncio.subprocess.PIPE, limit=limit
+    )
+    channel = asyncio.Queue()
+    await build_executor._drain(process.stdout, "", channel)
+    await process.wait()
+
+    entries = []
+    while not channel.empty():
+        entries.append(channel.get_nowait()[1])
+
+    text = "".join(entries)
+    assert text.count("a") == 200000 and text.count("b") == limit and text.count("c") == 100000
+    assert "kurz" in entries and "" not in entries
+    assert all(len(e) <= limit for e in entries)
+    # Stücke einer langen Zeile stehen direkt hintereinander
+    assert "".join(e for e in entries if e.startswith("a")) == "a" * 200000
+    print(f"   200000 Zeichen in einer Zeile → {sum(e.startswith('a') for e in entries)} Einträge, nichts verloren")
+    print("✅ Lange Zeilen OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_no_stderr_deadlock())
+    asyncio.run(test_batching_and_slow_subscriber())
+    asyncio.run(test_long_lines_not_lost())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+BuildLogStore - Append-only Build-Logs mit Zeilen-Index
+Prüft Append + Index, Flush-Policy (Zeilen, Intervall, fsync),
+read_range Pagination, tail() und die Validierung der Query-Parameter
+von GET /build/logs.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from buildsystem import build_log_store
+from buildsystem.build_log_store import INDEX_ENTRY, BuildLogStore
+
+TS = "2026-01-01T00:00:00"
+
+
+def test_append_and_index():
+    """Test: Zeilennummern, Index-Offsets, escapte Zeilenumbrüche, Neustart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BuildLogStore(tmp, batch_lines=1000)
+        assert [store.append("b1", f"zeile {i}", timestamp=TS) for i in range(3)] == [0, 1, 2]
+        assert store.append("b1", "mehr\nzeilen", timestamp=TS) == 3
+        assert store.line_count("b1") == 4
+
+        assert store.read_lines("b1", 1, 2) == [f"[{TS}] zeile 1", f"[{TS}] zeile 2"]
+        assert store.read_lines("b1", 3, 10) == [f"[{TS}] mehr\\nzeilen"]
+        assert store.read_lines("b1", 4, 10) == [] and store.read_lines("b1", 0, 0) == []
+
+        # Index: 8-Byte Start-Offset pro Zeile
+        with open(store.index_path("b1"), "rb") as f:
+            offsets = [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))[0] for _ in range(4)]
+        line_size = len(f"[{TS}] zeile 0\n")
+        assert offsets == [0, line_size, 2 * line_size, 3 * line_size]
+
+        # Neuer Store auf gleichem Verzeichnis hängt hinten an
+        store.close("b1")
+        reopened = BuildLogStore(tmp)
+        assert reopened.line_count("b1") == 4
+        assert reopened.append("b1", "nach neustart", timestamp=TS) == 4
+        assert reopened.read_lines("b1", 4, 1) == [f"[{TS}] nach neustart"]
+        reopened.close_all()
+    print("✅ Append + Index OK")
+
+
+def test_flush_policy():
+    """Test: Flush nach batch_lines bzw. beim nächsten append() nach flush_interval, fsync nur wenn konfiguriert"""
+    fsyncs = []
+    original_fsync = build_log_store.os.fsync
+    build_log_store.os.fsync = fsyncs.append
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BuildLogStore(tmp, batch_lines=3, flush_interval=60)
+            store.append("b1", "a")
+            store.append("b1", "b")
+            assert os.path.getsize(store.log_path("b1")) == 0  # noch gepuffert
+            store.append("b1", "c")
+            assert os.path.getsize(store.index_path("b1")) == 3 * INDEX_ENTRY.size
+            assert fsyncs == []
+
+            # Intervall wird erst beim nächsten append() geprüft (kein Timer)
+            store = BuildLogStore(tmp, batch_lines=1000, flush_interval=0.05)
+            store.append("b2", "a")
+            time.sleep(0.1)
+            assert os.path.getsize(store.log_path("b2")) == 0
+            store.append("b2", "b")
+            assert os.path.getsize(store.index_path("b2")) == 2 * INDEX_ENTRY.size
+
+            # fsync=True: pro Flush Log + Index; close() fsynct immer
+            store = BuildLogStore(tmp, batch_lines=2, fsync=True)
+            store.append("b3", "a")
+            store.append("b3", "b")
+            assert len(fsyncs) == 2
+            store.close("b3")  # nichts gepuffert → kein weiterer fsync
+            assert len(fsyncs) == 2
+            store = BuildLogStore(tmp, batch_lines=1000)
+            store.append("b4", "a")
+            store.close("b4")
+            assert len(fsyncs) == 4
+    finally:
+        build_log_store.os.fsync = original_fsync
+    print("✅ Flush + fsync Policy OK")
+
+
+def test_read_range_and_tail():
+    """Test: seitenweises Lesen nach Byte-Offset nur in ganzen Zeilen, tail() mit Randfällen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BuildLogStore(tmp, batch_lines=1000)
+        for i in range(100):
+            store.append("b1", f"zeile {i:03d}", timestamp=TS)
+
+        # Gepufferte Zeilen sind beim Lesen sichtbar (Lesen flusht)
+        lines, offset, pages = [], 0, 0
+        while True:
+            page = store.read_range("b1", offset, limit=500)
+            lines += page["lines"]
+            pages += 1
+            assert page["next_offset"] > offset or page["eof"]
+            offset = page["next_offset"]
+            if page["eof"]:
+                break
+        assert lines == [f"[{TS}] zeile {i:03d}" for i in range(100)] and pages > 1
+        assert store.read_range("b1", offset) == {
+            "lines": [], "offset": offset, "next_offset": offset, "size": offset, "eof": True,
+        }
+
+        # Zeile länger als limit → trotzdem ganze Zeile
+        store.append("b2", "x" * 1000, timestamp=TS)
+        page = store.read_range("b2", 0, limit=10)
+        assert page["lines"] == [f"[{TS}] " + "x" * 1000] and page["eof"]
+
+        try:
+            store.read_range("b1", -1)
+            assert False, "negativer Offset muss abgelehnt werden"
+        except ValueError:
+            pass
+
+        tail = store.tail("b1", 5)
+        assert tail["lines"] == [f"[{TS}] zeile {i:03d}" for i in range(95, 100)]
+        assert tail["start_line"] == 95 and tail["total_lines"] == 100 and tail["next_offset"] == offset
+        assert store.tail("b1", 500)["start_line"] == 0 and len(store.tail("b1", 500)["lines"]) == 100
+        for n in (0, -5):
+            tail = store.tail("b1", n)
+            assert tail["lines"] == [] and tail["start_line"] == 100
+        assert store.tail("unbekannt", 10) == {"lines": [], "start_line": 0, "total_lines": 0, "next_offset": 0}
+        store.close_all()
+    print("✅ read_range + tail OK")
+
+
+def test_route_validation():
+    """Test: GET /build/logs lehnt negative offset/limit/tail mit 422 ab (statt 500)"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from buildsystem.build_routes import router
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    for query in ("offset=-1", "limit=0", "tail=0", "tail=-3"):
+        response = client.get(f"/build/logs?build_id=b1&{query}")
+        assert response.status_code == 422, (query, response.status_code)
+    print("✅ Query-Validierung OK")
+
+
+if __name__ == "__main__":
+    test_append_and_index()
+    test_flush_policy()
+    test_read_range_and_tail()
+    test_route_validation()
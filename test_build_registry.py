@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+BuildRegistry - Indizierte Build-Historie für admin_monitor
+Vergleicht den alten Copy/Filter/Sort über alle Builds mit Index-Queries
+und laufenden Aggregaten, prüft Keyset-Pagination, Status-Übergänge und
+dass Historie + Aggregate einen Neustart überleben.
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from buildsystem.build_manager import BuildManager, BuildStatus, BuildType
+from buildsystem.build_registry import BuildRegistry, build_duration, parse_timestamp
+
+BUILDS = 20_000
+USERS = [f"user{i}@vibeai.dev" for i in range(200)]
+NOW = datetime(2026, 3, 15, 12, 0)
+
+
+def make_builds():
+    rng = random.Random(3)
+    builds = []
+    for i in range(BUILDS):
+        created = NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        status = rng.choice(["success", "success", "success", "failed", "running", "queued"])
+        started = created + timedelta(seconds=5) if status != "queued" else None
+        completed = started + timedelta(seconds=rng.randint(3, 2400)) if status in ("success", "failed") else None
+        builds.append(
+            {
+                "id": f"build-{i:05d}",
+                "user": rng.choice(USERS),
+                "project_id": f"p{i % 50}",
+                "type": rng.choice([t.value for t in BuildType]),
+                "status": status,
+                "created_at": created.isoformat(),
+                "started_at": started.isoformat() if started else None,
+                "completed_at": completed.isoformat() if completed else None,
+                "artifacts": [],
+            }
+        )
+    return builds
+
+
+def legacy_list(builds, status=None, user=None, limit=50):
+    """Alter list_all_builds Pfad"""
+    all_builds = list(builds.items())
+    if status:
+        all_builds = [(bid, b) for bid, b in all_builds if b.get("status") == status]
+    if user:
+        all_builds = [(bid, b) for bid, b in all_builds if b.get("user") == user]
+    all_builds.sort(key=lambda x: (x[1]["created_at"], x[0]), reverse=True)
+    return len(all_builds), [bid for bid, _ in all_builds[:limit]]
+
+
+def legacy_stats(builds):
+    """Alter get_build_statistics Pfad"""
+    values = builds.values()
+    durations = [d for d in (build_duration(b) for b in values) if d is not None]
+    today = int(NOW.timestamp() // 86400)
+    days = Counter(int(parse_timestamp(b["created_at"]) // 86400) for b in values)
+    return {
+        "total_builds": len(values),
+        "success_rate": round(sum(1 for b in values if b["status"] == "success") / len(values), 3),
+        "avg_duration_seconds": round(sum(durations) / len(durations), 2),
+        "builds_today": days[today],
+        "builds_this_week": sum(days[d] for d in range(today - 6, today + 1)),
+        "builds_by_type": dict(Counter(b["type"] for b in values)),
+        "builds_by_status": dict(Counter(b["status"] for b in values)),
+    }
+
+
+def test_queries_and_stats():
+    """Test: Index-Queries + Aggregate vs. alter Scan, Neustart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "builds.sqlite3")
+        registry = BuildRegistry(db_path)
+        builds = make_builds()
+        for build in builds:
+            registry.record(build)
+        by_id = {b["id"]: b for b in builds}
+        now = datetime.fromisoformat(NOW.isoformat() + "+00:00")
+
+        start = time.perf_counter()
+        for _ in range(20):
+            old_total, old_ids = legacy_list(by_id, status="failed")
+            old_user_total, old_user_ids = legacy_list(by_id, user=USERS[7])
+            old_stats = legacy_stats(by_id)
+        legacy_time = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for _ in range(20):
+            page, _ = registry.query(status="failed", limit=50)
+            total = registry.count(status="failed")
+            user_page, _ = registry.query(user=USERS[7], limit=50)
+            user_total = registry.count(user=USERS[7])
+            stats = registry.statistics(now)
+        registry_time = (time.perf_counter() - start) / 20
+
+        print(f"   {BUILDS} Builds – Liste (Status + User) + Statistik pro Request:")
+        print(f"      Vorher (Copy/Filter/Sort): {legacy_time * 1000:.1f} ms")
+        print(f"      Nachher (Registry):        {registry_time * 1000:.2f} ms")
+
+        assert (total, [b["id"] for b in page]) == (old_total, old_ids)
+        assert (user_total, [b["id"] for b in user_page]) == (old_user_total, old_user_ids)
+        assert {k: v for k, v in stats.items() if k != "duration_histogram"} == old_stats
+        assert sum(stats["duration_histogram"].values()) == old_stats["builds_by_status"]["success"] + old_stats["builds_by_status"]["failed"]
+        assert registry_time < legacy_time
+
+        # Neustart: Aggregate aus der DB, ohne build.json
+        registry.close()
+        start = time.perf_counter()
+        reopened = BuildRegistry(db_path)
+        reopen_time = time.perf_counter() - start
+        print(f"      Neustart (Aggregate laden): {reopen_time * 1000:.1f} ms")
+        assert reopened.statistics(now) == stats
+        reopened.close()
+    print("✅ Queries + Statistik OK")
+
+
+def test_pagination_and_transitions():
+    """Test: Keyset-Seiten lückenlos, Status-Übergänge passen Aggregate an"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = BuildRegistry(os.path.join(tmp, "builds.sqlite3"))
+        builds = make_builds()[:500]
+        for build in builds:
+            registry.record(build)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = registry.query(limit=64, before=cursor)
+            seen.extend(b["id"] for b in page)
+            if not cursor:
+                break
+        expected = [b["id"] for b in sorted(builds, key=lambda b: (b["created_at"], b["id"]), reverse=True)]
+        assert seen == expected
+
+        queued = next(b for b in builds if b["status"] == "queued")
+        before = registry.statistics()
+        queued.update(status="success", started_at=queued["created_at"],
+                      completed_at=(datetime.fromisoformat(queued["created_at"]) + timedelta(seconds=42)).isoformat())
+        registry.record(queued)
+        after = registry.statistics()
+        assert after["builds_by_status"]["queued"] == before["builds_by_status"]["queued"] - 1
+        assert after["builds_by_status"]["success"] == before["builds_by_status"]["success"] + 1
+        assert after["duration_histogram"]["<=60s"] == before["duration_histogram"]["<=60s"] + 1
+        assert after["total_builds"] == before["total_builds"]
+
+        try:
+            registry.query(before="kaputt")
+            assert False, "ungültiger Cursor muss ValueError werfen"
+        except ValueError:
+            pass
+        registry.close()
+    print("✅ Pagination + Übergänge OK")
+
+
+async def test_build_manager_integration():
+    """Test: BuildManager schreibt in die Registry, Historie nach Neustart, build.json Import"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = BuildManager(builds_dir=tmp)
+        first = await manager.create_build("a@vibeai.dev", "p1", BuildType.REACT_WEB)
+        second = await manager.create_build("a@vibeai.dev", "p2", BuildType.FLUTTER_WEB)
+        await manager.start_build(first["id"])
+        await manager.update_build_status(first["id"], BuildStatus.SUCCESS)
+
+        assert [b["id"] for b in manager.list_builds("a@vibeai.dev")] == [second["id"], first["id"]]
+        assert manager.registry.statistics()["builds_by_status"] == {"success": 1, "queued": 1}
+
+        manager.registry.close()
+        restarted = BuildManager(builds_dir=tmp)
+        assert restarted.get_build(first["id"])["status"] == "success"
+        assert len(restarted.list_builds("a@vibeai.dev")) == 2
+        restarted.registry.close()
+
+        # Ohne Registry-DB: vorhandene build.json einmalig importieren
+        os.remove(os.path.join(tmp, "builds.sqlite3"))
+        for leftover in ("builds.sqlite3-wal", "builds.sqlite3-shm"):
+            if os.path.exists(os.path.join(tmp, leftover)):
+                os.remove(os.path.join(tmp, leftover))
+        migrated = BuildManager(builds_dir=tmp)
+        assert migrated.registry.statistics()["total_builds"] == 2
+        migrated.registry.close()
+    print("✅ BuildManager Integration OK")
+
+
+if __name__ == "__main__":
+    test_queries_and_stats()
+    test_pagination_and_transitions()
+    asyncio.run(test_build_manager_integration())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+CodeStreamer - Delta Protocol Test
+Misst die gesendeten Bytes pro Datei vorher (volle Content-Kopie pro Zeichen)
+und nachher (Deltas + Snapshots) und prüft, dass ein Client den Inhalt
+aus den Deltas exakt rekonstruiert.
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import vibeai.agent.streaming.code_streamer as code_streamer_module
+from vibeai.agent.event_stream.event_emitter import EventEmitter
+from vibeai.agent.streaming.code_streamer import CodeStreamer, content_checksum
+
+FILE_SIZE = 30 * 1024
+
+
+async def _no_sleep(delay):
+    """Typing-Delays überspringen (nur Payload-Größe ist relevant)"""
+    return None
+
+
+def make_source(size: int) -> str:
+    line = "    final result = computeValue(input, options: {'mode': 1});\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def legacy_bytes(path: str, content: str) -> int:
+    """Payload-Größe des alten Protokolls (voller Content pro Zeichen)"""
+    total = 0
+    current = ""
+    line, column = 1, 1
+    for i, char in enumerate(content):
+        current += char
+        if char == "\n":
+            line, column = line + 1, 1
+        else:
+            column += 1
+        payload = {
+            "path": path, "content": current, "character": char, "char_index": i + 1,
+            "total_chars": len(content), "line": line, "column": column,
+            "progress": ((i + 1) / len(content)) * 100,
+        }
+        total += len(json.dumps(payload))
+        if (i + 1) % 10 == 0:
+            del payload["character"]
+            total += len(json.dumps(payload))
+    return total
+
+
+async def test_delta_protocol():
+    """Test: Deltas rekonstruieren den Inhalt, Bytes wachsen linear"""
+    source = make_source(FILE_SIZE)
+    streamer = CodeStreamer(EventEmitter())
+
+    rebuilt = ""
+    complete = None
+    deltas = snapshots = 0
+    # Nur sleep patchen und danach wiederherstellen
+    original_sleep = code_streamer_module.asyncio.sleep
+    code_streamer_module.asyncio.sleep = _no_sleep
+    try:
+        async for event in streamer.stream_code("lib/main.dart", source):
+            data = event["data"]
+            if event["event"] == "code_delta":
+                assert data["offset"] == len(rebuilt)
+                rebuilt += data["text"]
+                deltas += 1
+            elif event["event"] == "code_snapshot":
+                assert data["checksum"] == content_checksum(rebuilt)
+                snapshots += 1
+            elif event["event"] == "code_streaming_complete":
+                complete = data
+    finally:
+        code_streamer_module.asyncio.sleep = original_sleep
+    assert asyncio.sleep is original_sleep
+
+    assert rebuilt == source
+    assert complete["checksum"] == content_checksum(source)
+
+    before = legacy_bytes("lib/main.dart", source)
+    after = complete["bytes_sent"]
+    print(f"   Datei: {FILE_SIZE // 1024} KB, {deltas} Deltas, {snapshots} Snapshots")
+    print(f"   Vorher:  {before / 1024 / 1024:.1f} MB")
+    print(f"   Nachher: {after / 1024:.1f} KB ({before / after:.0f}x weniger)")
+
+    assert after < before / 100
+    print("✅ Delta Protocol OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_delta_protocol())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+ErrorAnalyzer - Single-Parse, Cache und --changed-since
+Prüft an einem Temp-Projekt, dass alle Checks weiterhin greifen, dass der
+Content-Hash Cache unveränderte Dateien überspringt, dass Pool und
+serieller Lauf identische Ergebnisse liefern und dass --changed-since nur
+Git-Änderungen analysiert.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from error_analyzer import ErrorAnalyzer
+
+CLEAN = '''"""Modul"""
+
+
+def helper():
+    """Hilfsfunktion"""
+    return 1
+'''
+
+SMELLY = '''import os
+import json
+
+
+def run():
+    try:
+        return json.dumps({})
+    except Exception:
+        pass\t
+'''
+
+BROKEN = "def broken(:\n    pass\n"
+
+
+def make_project(root: Path, copies: int = 1):
+    for i in range(copies):
+        package = root / f"pkg{i}"
+        package.mkdir()
+        (package / "clean.py").write_text(CLEAN)
+        (package / "smelly.py").write_text(SMELLY)
+        (package / "broken.py").write_text(BROKEN)
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "ignored.py").write_text(BROKEN)
+
+
+def issues(report):
+    return sorted(
+        (category, i.file, i.line, i.code, i.message)
+        for category in ("syntax_errors", "import_errors", "style_warnings", "code_smells")
+        for i in getattr(report, category)
+    )
+
+
+def test_checks_and_cache():
+    """Test: Checks greifen, zweiter Lauf kommt komplett aus dem Cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+
+        first = ErrorAnalyzer(tmp, jobs=1)
+        report = first.analyze()
+        codes = {code for _, _, _, code, _ in issues(report)}
+        assert {"E001", "W001", "S001", "S002", "C001", "C002"} <= codes
+        assert all("node_modules" not in i.file for i in report.syntax_errors)
+        assert first.stats == {"files": 3, "cached": 0, "analyzed": 3}
+
+        second = ErrorAnalyzer(tmp, jobs=1)
+        assert issues(second.analyze()) == issues(report)
+        assert second.stats == {"files": 3, "cached": 3, "analyzed": 0}
+
+        # Nur die geänderte Datei wird neu analysiert
+        (root / "pkg0" / "broken.py").write_text(CLEAN + "\nVALUE = 1\n")
+        third = ErrorAnalyzer(tmp, jobs=1)
+        assert not third.analyze().syntax_errors
+        assert third.stats == {"files": 3, "cached": 2, "analyzed": 1}
+    print("✅ Checks + Cache OK")
+
+
+def test_pool_matches_serial():
+    """Test: ProcessPool liefert dieselben Issues wie der serielle Lauf"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_project(Path(tmp), copies=20)
+
+        start = time.perf_counter()
+        serial = issues(ErrorAnalyzer(tmp, jobs=1, cache_path=None).analyze())
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = issues(ErrorAnalyzer(tmp, jobs=4, cache_path=None).analyze())
+        pooled_time = time.perf_counter() - start
+
+        print(f"   60 Dateien: seriell {serial_time * 1000:.0f} ms, Pool {pooled_time * 1000:.0f} ms")
+        assert serial == pooled
+    print("✅ Pool OK")
+
+
+def test_changed_since():
+    """Test: --changed-since analysiert nur geänderte/neue Dateien"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+
+        def git(*args):
+            return subprocess.run(["git", *args], cwd=tmp, check=True, capture_output=True)
+        git("init", "-q")
+        git("add", ".")
+        git("-c", "user.name=test", "-c", "user.email=test@vibeai.dev", "commit", "-qm", "init")
+
+        (root / "pkg0" / "clean.py").write_text(SMELLY)
+        (root / "new.py").write_text(BROKEN)
+
+        analyzer = ErrorAnalyzer(tmp, jobs=1, cache_path=None)
+        report = analyzer.analyze(changed_since="HEAD")
+        files = {i.file for i in report.syntax_errors + report.code_smells}
+        assert analyzer.stats["files"] == 2
+        assert files == {"new.py", os.path.join("pkg0", "clean.py")}
+    print("✅ --changed-since OK")
+
+
+if __name__ == "__main__":
+    test_checks_and_cache()
+    test_pool_matches_serial()
+    test_changed_since()
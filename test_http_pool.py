@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+HTTPTransportPool - Geteilter Keep-Alive Transport für Provider Clients
+Prüft gegen einen lokalen HTTP-Server: Connection-Reuse über alle
+Provider Clients, Connection-Limits und Read-Timeouts pro Provider aus
+ENV (keine hartcodierten Timeouts in den Clients) und aclose() im
+FastAPI Lifespan.
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from core.provider_clients.http_pool import HTTPTransportPool
+from core.provider_clients.local_client import OllamaProvider
+
+MESSAGES = [{"role": "user", "content": "hallo"}]
+
+
+class FakeOllama:
+    """Minimaler HTTP/1.1 Keep-Alive Server im Ollama-Format"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.peak_active = 0
+        self.requests = 0
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+
+                self.requests += 1
+                self.active += 1
+                self.peak_active = max(self.peak_active, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+
+                body = json.dumps({"message": {"content": "hi"}}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def test_shared_keepalive_pool():
+    """Test: mehrere Provider-Instanzen teilen einen Client, eine TCP-Verbindung für alle Calls"""
+    pool = HTTPTransportPool()
+    pool.http2 = False
+    async with FakeOllama() as server:
+        clients = [OllamaProvider(host=server.url, pool=pool) for _ in range(3)]
+        for _ in range(5):
+            for client in clients:
+                result = await client.generate("llama3.1", MESSAGES, {})
+                assert result["message"] == "hi", result
+
+        assert server.requests == 15 and server.connections == 1
+        metrics = pool.get_metrics()["providers"]["ollama"]
+        assert metrics["total_requests"] == 15 and metrics["failed_requests"] == 0 and metrics["open"]
+        await pool.aclose()
+    print("✅ Geteilter Keep-Alive Pool OK")
+
+
+async def test_provider_limits_and_timeouts():
+    """Test: max_connections und Read-Timeout pro Provider aus ENV, Clients überschreiben nichts"""
+    env = {"VIBEAI_HTTP_OLLAMA_MAX_CONNECTIONS": "2", "VIBEAI_HTTP_OLLAMA_READ_TIMEOUT": "0.3"}
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        pool = HTTPTransportPool()
+        pool.http2 = False
+        assert pool.client("ollama").timeout.read == 0.3
+        assert pool.client("openai").timeout.read == pool.read_timeout
+
+        async with FakeOllama(delay=0.1) as server:
+            client = OllamaProvider(host=server.url, pool=pool)
+            results = await asyncio.gather(*[client.generate("llama3.1", MESSAGES, {}) for _ in range(8)])
+            assert all(r["message"] == "hi" for r in results)
+            assert server.peak_active == 2 and server.connections == 2
+            metrics = pool.get_metrics()["providers"]["ollama"]
+            assert metrics["max_connections"] == 2 and metrics["read_timeout"] == 0.3
+
+            # Langsamer als der Provider-Timeout → Fehler nach ~0.3 s statt eines festen 60 s Literals
+            server.delay = 1.0
+            start = time.perf_counter()
+            await client.generate("llama3.1", MESSAGES, {})
+            assert time.perf_counter() - start < 0.8
+            assert pool.get_metrics()["providers"]["ollama"]["failed_requests"] == 1
+            await pool.aclose()
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    print("✅ Limits + Timeouts pro Provider OK")
+
+
+async def test_lifespan_closes_pool():
+    """Test: FastAPI Lifespan schließt den globalen Pool beim Shutdown"""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'vibeai.db')}")
+        import main
+
+        async with main.lifespan(main.app):
+            client = main.http_pool.client("openai")
+            assert not client.is_closed
+        assert client.is_closed
+        assert main.http_pool.get_metrics()["providers"]["openai"]["open"] is False
+    print("✅ aclose() im Lifespan OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_shared_keepalive_pool())
+    asyncio.run(test_provider_limits_and_timeouts())
+    asyncio.run(test_lifespan_closes_pool())
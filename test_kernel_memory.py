@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+KernelMemory - Writer-Thread (Group Commit) + Reader-Pool + async Fassade
+Vergleicht connect/commit/close pro Aufruf mit eingereihten Writes,
+prüft Read-your-writes, Index-Nutzung, dass ein kaputter Write den Batch
+nicht mitnimmt und dass der Event-Loop nicht blockiert.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from kernel.memory.memory_db import MemoryDB, MemoryDBError
+from kernel.memory.kernel_memory import (
+    SQL_ABANDONED_BY_PROJECT,
+    SQL_AGENT_HISTORY,
+    AsyncKernelMemory,
+    KernelMemory,
+    ProjectRecord,
+)
+
+ACTIONS = 2000
+
+
+def legacy_track(db_path, agent_id, action, project_id, success, context):
+    """Alter track_agent_action: eigene Connection + Commit pro Aufruf"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO agent_memory (agent_id, action, timestamp, project_id, success, context) VALUES (?, ?, ?, ?, ?, ?)",
+        (agent_id, action, datetime.now().isoformat(), project_id, 1 if success else 0, json.dumps(context or {})),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_write_throughput():
+    """Test: Agent-Schritte pro Sekunde, vorher vs. nachher"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("CREATE TABLE agent_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, agent_id TEXT, action TEXT, "
+                     "timestamp TEXT, project_id TEXT, success INTEGER, context TEXT)")
+        conn.close()
+
+        start = time.perf_counter()
+        for i in range(ACTIONS):
+            legacy_track(legacy_db, f"agent_{i % 8}", "created_file", "p1", True, {"file": f"lib/f{i}.dart"})
+        legacy_time = time.perf_counter() - start
+
+        memory = KernelMemory(db_path=os.path.join(tmp, "memory", "kernel_memory.db"))
+        start = time.perf_counter()
+        for i in range(ACTIONS):
+            memory.track_agent_action(f"agent_{i % 8}", "created_file", "p1", True, {"file": f"lib/f{i}.dart"})
+        enqueue_time = time.perf_counter() - start
+        memory.flush()
+        total_time = time.perf_counter() - start
+        stats = memory._db.get_stats()
+
+        print(f"   {ACTIONS} track_agent_action Aufrufe:")
+        print(f"      Vorher (connect/commit/close): {legacy_time * 1000:.0f} ms ({ACTIONS / legacy_time:.0f}/s)")
+        print(f"      Nachher, Aufrufer blockiert:   {enqueue_time * 1000:.0f} ms")
+        print(f"      Nachher, bis committed:        {total_time * 1000:.0f} ms ({ACTIONS / total_time:.0f}/s), "
+              f"{stats['transactions']} Transaktionen")
+
+        assert memory.get_stats()["total_agent_actions"] == ACTIONS
+        assert stats["transactions"] < ACTIONS
+        assert total_time < legacy_time
+        memory.close()
+    print("✅ Write-Durchsatz OK")
+
+
+def test_reads_indexes_and_failures():
+    """Test: Read-your-writes, Index-Nutzung, fehlerhafter Write isoliert, Neustart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "memory", "kernel_memory.db")
+        memory = KernelMemory(db_path=db_path)
+
+        now = datetime.now().isoformat()
+        memory.add_project(ProjectRecord(id="p1", name="Shop", path="/tmp/shop", created_at=now, last_active=now,
+                                         tech_stack=["flutter"], agents_used=["code_dev_1"], completion_status="active"))
+        for i in range(50):
+            memory.track_agent_action("code_dev_1", f"step {i}", "p1", i % 5 != 0)
+        memory.mark_abandoned("t1", "Login bauen", {"file": "login.dart"}, "p1", resume_hint="Zeile 42")
+        memory.set_preference("code_style", "functional")
+
+        # Direkt danach lesen (ohne flush): alle Writes sichtbar
+        history = memory.get_agent_history("code_dev_1", limit=10)
+        assert len(history) == 10 and history[0].agent_id == "code_dev_1"
+        assert [t.id for t in memory.get_abandoned_tasks("p1")] == ["t1"]
+        stats = memory.get_stats()
+        assert stats == {"total_projects": 1, "active_projects": 1, "total_agent_actions": 50,
+                         "abandoned_tasks": 1, "user_preferences": 1}
+
+        # Query-Pläne nutzen die Indizes
+        conn = sqlite3.connect(db_path)
+        plan = " ".join(str(row) for row in conn.execute("EXPLAIN QUERY PLAN " + SQL_AGENT_HISTORY, ("a", 1)))
+        assert "ix_agent_memory_agent_ts" in plan, plan
+        plan = " ".join(str(row) for row in conn.execute("EXPLAIN QUERY PLAN " + SQL_ABANDONED_BY_PROJECT, ("p", 1)))
+        assert "ix_abandoned_project_ts" in plan, plan
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+        # Ein kaputter Write im Batch nimmt die anderen nicht mit
+        futures = [memory._db.execute("INSERT INTO agent_memory (agent_id) VALUES (?)", (f"ok{i}",)) for i in range(5)]
+        broken = memory._db.execute("INSERT INTO does_not_exist VALUES (?)", (1,))
+        futures += [memory._db.execute("INSERT INTO agent_memory (agent_id) VALUES (?)", (f"ok{i}",)) for i in range(5, 10)]
+        memory.flush()
+        assert all(f.result() == 1 for f in futures)
+        assert isinstance(broken.exception(), sqlite3.OperationalError)
+        assert memory.get_stats()["total_agent_actions"] == 60
+
+        # Neustart: alles persistiert
+        memory.resolve_abandoned_task("t1")
+        memory.close()
+        reopened = KernelMemory(db_path=db_path)
+        assert reopened.get_preference("code_style") == "functional"
+        assert reopened.get_project("p1").tech_stack == ["flutter"]
+        assert reopened.get_abandoned_tasks() == []
+        reopened.close()
+    print("✅ Reads + Indizes + Fehler-Isolation OK")
+
+
+def test_shutdown_and_writer_failures():
+    """Test: atexit committed ausstehende Writes, Writer-Fehler blockieren nicht"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "memory", "kernel_memory.db")
+
+        # Prozess endet ohne close()/flush() → Writes trotzdem auf Disk
+        script = (
+            "import sys\n"
+            f"sys.path[:0] = [{os.path.dirname(os.path.abspath(__file__))!r}]\n"
+            "from kernel.memory.kernel_memory import KernelMemory\n"
+            f"memory = KernelMemory(db_path={db_path!r})\n"
+            "for i in range(500): memory.track_agent_action('a', f'step {i}', 'p1', True)\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM agent_memory").fetchone()[0] == 500
+        conn.close()
+
+        schema = "CREATE TABLE IF NOT EXISTS t (v TEXT);"
+        db = MemoryDB(os.path.join(tmp, "fail.db"), schema=schema)
+        original = db._write_batch
+
+        # Fehler außerhalb der Einzel-Wiederholung → Batch scheitert, Writer lebt weiter
+        def broken_batch(conn, batch):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        db._write_batch = broken_batch
+        failed = db.execute("INSERT INTO t VALUES (?)", ("x",))
+        assert db.flush(timeout=5) and isinstance(failed.exception(timeout=5), sqlite3.OperationalError)
+        db._write_batch = original
+        assert db.execute("INSERT INTO t VALUES (?)", ("y",)).result(timeout=5) == 1
+        assert db.query("SELECT v FROM t") == [("y",)]
+
+        # Writer stirbt → flush/query/execute werfen statt ewig zu warten
+        class WriterCrash(BaseException):
+            pass
+
+        release = threading.Event()
+
+        def crash(conn, batch):
+            release.wait(5)
+            raise WriterCrash()
+
+        db._write_batch = crash
+        lost = db.execute("INSERT INTO t VALUES (?)", ("z",))
+        time.sleep(0.1)  # Writer hängt im ersten Batch
+        queued = db.execute("INSERT INTO t VALUES (?)", ("q",))
+        release.set()
+        db._thread.join(timeout=5)
+        assert isinstance(lost.exception(timeout=5), WriterCrash) and not queued.done()
+        for call in (db.flush, lambda: db.query("SELECT v FROM t"), lambda: db.execute("INSERT INTO t VALUES (?)", ("w",))):
+            try:
+                call()
+                assert False, "MemoryDBError erwartet"
+            except MemoryDBError:
+                pass
+        db.close()
+
+        slow = MemoryDB(os.path.join(tmp, "slow.db"), schema=schema, wait_timeout=0.2)
+        slow._write_batch = lambda conn, batch: time.sleep(1) or original(conn, batch)
+        slow.execute("INSERT INTO t VALUES (?)", ("s",))
+        start = time.perf_counter()
+        try:
+            slow.query("SELECT v FROM t")
+            assert False, "MemoryDBError erwartet"
+        except MemoryDBError:
+            assert time.perf_counter() - start < 0.5
+        slow.close()
+    print("✅ Shutdown + Writer-Fehler OK")
+
+
+async def test_async_facade_keeps_loop_free():
+    """Test: async Fassade – Event-Loop bleibt frei"""
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = AsyncKernelMemory(KernelMemory(db_path=os.path.join(tmp, "memory", "kernel_memory.db")))
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.002)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        for step in range(ACTIONS):
+            memory.track_agent_action(f"agent_{step % 4}", "step", "p1", True, {"n": step})
+            if step % 100 == 0:
+                await memory.get_agent_history("agent_0", limit=20)
+                await asyncio.sleep(0)
+        await memory.flush()
+        history = await memory.get_agent_history("agent_1", limit=5)
+        stats = await memory.get_stats()
+        tick.cancel()
+
+        print(f"      Längste Loop-Pause: {max(gaps) * 1000:.1f} ms")
+        assert stats["total_agent_actions"] == ACTIONS and len(history) == 5
+        assert max(gaps) < 0.1
+        memory.memory.close()
+    print("✅ Async Fassade OK")
+
+
+if __name__ == "__main__":
+    test_write_throughput()
+    test_reads_indexes_and_failures()
+    test_shutdown_and_writer_failures()
+    asyncio.run(test_async_facade_keeps_loop_free())
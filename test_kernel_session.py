@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Kernel Session - SSE Stream Benchmark
+Vergleicht den alten /api/chat/stream Ablauf (alles pro Request neu bauen,
+Queue mit 100ms-Timeout pollen) mit KernelSession (geteilter LLMRouter,
+frische Runtime pro Request, Sentinel-basiertes Stream-Ende).
+
+Gemessen pro Request:
+- Time-to-first-event
+- Gesamtdauer
+- Allokationen (tracemalloc)
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from kernel.kernel_session import KernelSession
+from kernel.kernel_runtime import init_runtime
+from kernel.kernel_v1 import KernelV1
+from kernel.streamer import SSEStreamer
+from kernel.control.security_policy import SecurityLevel
+from kernel.control.human_control import ControlMode
+from llm.base import BaseLLM
+from llm.router import LLMRouter
+
+REQUESTS = 50
+
+
+class FakeLLM(BaseLLM):
+    """Deterministischer LLM-Client ohne Netzwerk"""
+
+    async def stream(self, prompt: str, system_prompt: str = None):
+        for word in ["Hallo", " wie", " kann", " ich", " helfen?"]:
+            yield word
+
+
+def make_router():
+    return LLMRouter({"openai": FakeLLM(), "openai-mini": FakeLLM()})
+
+
+async def legacy_request(task: str):
+    """Alter Ablauf: alles neu bauen + Polling"""
+    queue = asyncio.Queue()
+
+    class QueueResponse:
+        async def write(self, data: str):
+            await queue.put(data)
+
+        async def flush(self):
+            pass
+
+    streamer = SSEStreamer(response=QueueResponse())
+    llm_router = make_router()
+    runtime = init_runtime(
+        security_level=SecurityLevel.NORMAL,
+        control_mode=ControlMode.ASSISTED,
+        kernel=None
+    )
+    kernel = KernelV1(streamer=streamer, runtime=runtime, llm_router=llm_router)
+    kernel_task = asyncio.create_task(kernel.run(task))
+
+    first_event = None
+    while True:
+        try:
+            data = await asyncio.wait_for(queue.get(), timeout=0.1)
+            first_event = first_event or time.perf_counter()
+            if '"type": "done"' in data:
+                break
+        except asyncio.TimeoutError:
+            if kernel_task.done():
+                break
+    return first_event
+
+
+async def session_request(llm_router: LLMRouter, task: str):
+    """Neuer Ablauf: frische Session mit geteiltem Router + Sentinel"""
+    first_event = None
+    session = KernelSession(llm_router)
+    kernel_task = asyncio.create_task(session.run(task))
+    async for _ in session.events():
+        first_event = first_event or time.perf_counter()
+    await kernel_task
+    return first_event
+
+
+async def measure(name: str, make_request):
+    ttfe = []
+    tracemalloc.start()
+    start_total = time.perf_counter()
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        first = await make_request()
+        ttfe.append((first - start) * 1000)
+    total = time.perf_counter() - start_total
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size for stat in snapshot.statistics("filename"))
+    ttfe.sort()
+    print(f"   {name}:")
+    print(f"      TTFE p50: {ttfe[len(ttfe) // 2]:.2f} ms")
+    print(f"      Dauer/Request: {total / REQUESTS * 1000:.2f} ms")
+    print(f"      Peak-Speicher: {peak / 1024:.1f} KB, gehalten: {allocated / 1024:.1f} KB")
+    return total
+
+
+async def test_kernel_session_benchmark():
+    """Test: geteilter Router + Sentinel ist schneller als Neubau + Polling"""
+    print("=" * 60)
+    print(f"KERNEL SESSION BENCHMARK ({REQUESTS} Requests)")
+    print("=" * 60)
+
+    legacy = await measure("Vorher (Neubau + Polling)", lambda: legacy_request("hallo"))
+
+    llm_router = make_router()
+    shared = await measure("Nachher (geteilter Router + Sentinel)", lambda: session_request(llm_router, "hallo"))
+
+    assert shared < legacy
+    print("✅ Kernel Session OK")
+
+
+async def test_isolation_and_no_cap():
+    """Test: kein Request-Zustand zwischen Requests, keine Obergrenze für gleichzeitige Streams"""
+    llm_router = make_router()
+
+    first = KernelSession(llm_router)
+    first.runtime.human_control.set_mode(ControlMode.OBSERVE)
+    first.kernel._agents["leak"] = object()
+    kernel_task = asyncio.create_task(first.run("hallo"))
+    async for _ in first.events():
+        pass
+    await kernel_task
+
+    second = KernelSession(llm_router)
+    assert second.runtime is not first.runtime and second.kernel is not first.kernel
+    assert second.runtime.session_id != first.runtime.session_id
+    assert second.runtime.human_control.mode == ControlMode.ASSISTED
+    assert "leak" not in second.kernel._agents
+    assert second.kernel.llm_router is first.kernel.llm_router  # geteilt
+
+    # 32 gleichzeitige Streams laufen alle parallel, keiner wartet
+    active = 0
+    peak = 0
+
+    async def request():
+        nonlocal active, peak
+        session = KernelSession(llm_router)
+        active += 1
+        peak = max(peak, active)
+        kernel_task = asyncio.create_task(session.run("hallo"))
+        async for _ in session.events():
+            await asyncio.sleep(0.001)
+        await kernel_task
+        active -= 1
+
+    await asyncio.wait_for(asyncio.gather(*[request() for _ in range(32)]), timeout=10)
+    assert peak == 32 and active == 0
+    print("✅ Isolation ohne Obergrenze OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_kernel_session_benchmark())
+    asyncio.run(test_isolation_and_no_cap())
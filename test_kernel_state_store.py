@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+KernelStateStore - Delta-Persistenz + async KV Backend
+Benchmark (saves/s, Bytes pro save) alter Vollschreib-Pfad vs. Delta,
+prüft dass Events genau einmal mit fortlaufender Sequenz gespeichert
+werden, Compaction, Neustart und das "redis" Backend gegen InMemoryKV.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from kernel.action_graph import ActionGraph, ActionNode, ActionStatus
+from kernel.flow_state import FlowState
+from kernel.kernel_state_store import KernelStateStore
+from kernel.kv_backend import InMemoryKV
+
+STEPS = 400
+
+
+def make_state():
+    flow = FlowState()
+    flow.start(mode="flutter", project="shop_app")
+    for i in range(30):
+        flow.add_todo(f"Create screen {i}")
+    graph = ActionGraph()
+
+    async def noop():
+        return None
+
+    for i in range(60):
+        graph.add_node(ActionNode(id=f"step_{i}", action=noop, requires=[f"step_{i - 1}"] if i else [], reversible=True))
+    runtime_config = {"version": "1.2", "session_id": "abc", "security_level": "normal", "control_mode": "assisted"}
+    return flow, graph, runtime_config
+
+
+def kernel_loop(save, flow, graph, runtime_config):
+    """Typischer Ablauf: pro Schritt ein Event, selten Statuswechsel"""
+    events = []
+    for step in range(STEPS):
+        events.append({"type": "thought", "message": f"Schritt {step}: analysiere Datei lib/screen_{step}.dart", "step": step})
+        events = events[-1000:]
+        if step % 20 == 0:
+            graph.nodes[f"step_{step // 20}"].status = ActionStatus.COMPLETED
+            flow.step = step // 20
+        save(flow, graph, runtime_config, list(events))
+    return events
+
+
+def legacy_save_sqlite(db_path, flow_state, action_graph, runtime_config, events):
+    """Alter _save_sqlite: neue Connection, alle Zeilen neu, letzte 1000 Events erneut"""
+    conn = sqlite3.connect(db_path)
+    timestamp = datetime.now().timestamp()
+    todos = json.dumps(flow_state.todo)
+    nodes = json.dumps([{"id": n.id, "status": n.status.value, "requires": n.requires, "reversible": n.reversible}
+                        for n in action_graph.nodes.values()])
+    config = json.dumps(runtime_config)
+    conn.execute("INSERT OR REPLACE INTO flow_state VALUES (1, ?, ?, ?, ?, ?, ?, ?)",
+                 (timestamp, flow_state.active, flow_state.mode, flow_state.project, flow_state.step, todos, "{}"))
+    conn.execute("INSERT OR REPLACE INTO action_graph VALUES (1, ?, ?, ?, ?)", (timestamp, nodes, "[]", "{}"))
+    conn.execute("INSERT OR REPLACE INTO runtime_config VALUES (1, ?, ?)", (timestamp, config))
+    written = len(todos) + len(nodes) + len(config)
+    for event in events[-1000:]:
+        data = json.dumps(event)
+        conn.execute("INSERT INTO events (timestamp, event_type, data) VALUES (?, ?, ?)", (timestamp, event["type"], data))
+        written += len(data)
+    conn.commit()
+    conn.close()
+    return written
+
+
+def test_benchmark_sqlite():
+    """Benchmark: saves/s + Bytes pro save (SQLite)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_store = KernelStateStore(backend="sqlite", base_path=os.path.join(tmp, "legacy"))
+        legacy_store.close()
+        legacy_db = os.path.join(tmp, "legacy", "kernel_state.db")
+        written = []
+
+        flow, graph, config = make_state()
+        start = time.perf_counter()
+        kernel_loop(lambda f, g, c, e: written.append(legacy_save_sqlite(legacy_db, f, g, c, e)), flow, graph, config)
+        legacy_time = time.perf_counter() - start
+        legacy_rows = sqlite3.connect(legacy_db).execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+        store = KernelStateStore(backend="sqlite", base_path=os.path.join(tmp, "delta"))
+        flow, graph, config = make_state()
+        start = time.perf_counter()
+        kernel_loop(store.save, flow, graph, config)
+        delta_time = time.perf_counter() - start
+
+        print(f"   SQLite, {STEPS} saves (1 neues Event pro save):")
+        print(f"      Vorher: {STEPS / legacy_time:8.0f} saves/s, {sum(written) / STEPS:8.0f} Bytes/save, {legacy_rows} Event-Zeilen")
+        print(f"      Nachher:{STEPS / delta_time:8.0f} saves/s, {store.stats['bytes_written'] / STEPS:8.0f} Bytes/save, "
+              f"{store.stats['events_appended']} Event-Zeilen")
+
+        assert store.stats["events_appended"] == STEPS
+        assert legacy_rows > STEPS * 10
+        assert store.stats["bytes_written"] * 10 < sum(written)
+        assert delta_time < legacy_time
+        store.close()
+    print("✅ Benchmark SQLite OK")
+
+
+def test_benchmark_json():
+    """Benchmark: saves/s + Bytes pro save (JSON)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "legacy")
+        os.makedirs(base)
+        written = []
+
+        def legacy_save_json(flow_state, action_graph, runtime_config, events):
+            state = {
+                "timestamp": datetime.now().isoformat(),
+                "flow_state": {"active": flow_state.active, "mode": flow_state.mode, "project": flow_state.project,
+                               "step": flow_state.step, "todo": flow_state.todo.copy()},
+                "action_graph": {"nodes": [{"id": n.id, "status": n.status.value, "requires": n.requires,
+                                            "reversible": n.reversible} for n in action_graph.nodes.values()]},
+                "runtime_config": runtime_config,
+                "events": events,
+            }
+            data = json.dumps(state, indent=2)
+            with open(os.path.join(base, "kernel_state.json"), "w") as f:
+                f.write(data)
+            # Backup-Rotation bei jedem save
+            with open(os.path.join(base, f"kernel_state_{len(written) % 5}.json"), "w") as f:
+                f.write(data)
+            written.append(2 * len(data))
+
+        flow, graph, config = make_state()
+        start = time.perf_counter()
+        kernel_loop(legacy_save_json, flow, graph, config)
+        legacy_time = time.perf_counter() - start
+
+        store = KernelStateStore(backend="json", base_path=os.path.join(tmp, "delta"))
+        flow, graph, config = make_state()
+        start = time.perf_counter()
+        kernel_loop(store.save, flow, graph, config)
+        delta_time = time.perf_counter() - start
+
+        print(f"   JSON, {STEPS} saves:")
+        print(f"      Vorher: {STEPS / legacy_time:8.0f} saves/s, {sum(written) / STEPS:8.0f} Bytes/save")
+        print(f"      Nachher:{STEPS / delta_time:8.0f} saves/s, {store.stats['bytes_written'] / STEPS:8.0f} Bytes/save")
+
+        assert store.stats["bytes_written"] * 10 < sum(written)
+        assert delta_time < legacy_time
+
+        loaded = store.load()
+        assert [e["step"] for e in loaded["events"]] == list(range(STEPS))
+        assert loaded["flow_state"].step == flow.step
+    print("✅ Benchmark JSON OK")
+
+
+def test_exactly_once_restart_and_compaction():
+    """Test: Events genau einmal, Sequenz über Neustart, Compaction"""
+    for backend in ("sqlite", "json"):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = KernelStateStore(backend=backend, base_path=tmp, max_events=100, compact_every=50)
+            flow, graph, config = make_state()
+            events = kernel_loop(store.save, flow, graph, config)
+            assert store.stats["compactions"] >= 5
+
+            # Gleicher Aufruf erneut → nichts Neues
+            before = dict(store.stats)
+            store.save(flow, graph, config, events)
+            assert store.stats["events_appended"] == before["events_appended"]
+            assert store.stats["snapshot_writes"] == before["snapshot_writes"]
+
+            # Neustart: Fenster wird erkannt, neue Events schließen lückenlos an
+            store.close()
+            reopened = KernelStateStore(backend=backend, base_path=tmp, max_events=100, compact_every=50)
+            events.append({"type": "plan", "message": "weiter", "step": STEPS})
+            reopened.save(flow, graph, config, events[-100:])
+            assert reopened.stats["events_appended"] == 1
+
+            loaded = reopened.load()
+            steps = [e["step"] for e in loaded["events"]]
+            assert steps == list(range(STEPS - 99, STEPS + 1)), backend
+            assert loaded["flow_state"].todo == flow.todo
+            assert [n["status"] for n in loaded["action_graph"]._saved_state] == [n.status.value for n in graph.nodes.values()]
+            assert loaded["runtime_config"] == config
+
+            if backend == "sqlite":
+                ids = [row[0] for row in reopened._conn.execute("SELECT id FROM events ORDER BY id")]
+                assert ids == list(range(ids[0], STEPS + 2)) and len(ids) <= 150
+
+            reopened.clear()
+            assert reopened.load() is None
+            reopened.close()
+    print("✅ Exactly-once + Neustart + Compaction OK")
+
+
+def test_legacy_json_format():
+    """Test: alter kernel_state.json (Events im Snapshot) wird weiter geladen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = {
+            "timestamp": "2026-01-01T10:00:00",
+            "flow_state": {"active": True, "mode": "react", "project": "alt", "step": 3, "todo": ["a"]},
+            "action_graph": {"nodes": [{"id": "x", "status": "completed", "requires": [], "reversible": True}]},
+            "runtime_config": {"version": "1.1"},
+            "events": [{"type": "thought", "message": "alt"}],
+        }
+        with open(os.path.join(tmp, "kernel_state.json"), "w") as f:
+            json.dump(legacy, f, indent=2)
+        loaded = KernelStateStore(backend="json", base_path=tmp).load()
+        assert loaded["flow_state"].project == "alt" and loaded["events"] == legacy["events"]
+    print("✅ Altes JSON-Format OK")
+
+
+async def test_redis_backend_fake():
+    """Test: "redis" Backend gegen InMemoryKV (async)"""
+    kv = InMemoryKV()
+    store = KernelStateStore(backend="redis", kv=kv, max_events=100, compact_every=50)
+    flow, graph, config = make_state()
+
+    events = []
+    for step in range(300):
+        events.append({"type": "thought", "message": f"s{step}", "step": step})
+        assert await store.asave(flow, graph, config, events[-100:])
+    assert store.stats["events_appended"] == 300
+    assert await kv.llen("vibeai:kernel:events") <= 150
+
+    try:
+        store.save(flow, graph, config, events)
+        assert False, "sync save() muss für redis abgelehnt werden"
+    except RuntimeError:
+        pass
+
+    # Neuer Prozess, gleicher KV-Store
+    reopened = KernelStateStore(backend="redis", kv=kv, max_events=100, compact_every=50)
+    events.append({"type": "plan", "message": "weiter", "step": 300})
+    await reopened.asave(flow, graph, config, events[-100:])
+    assert reopened.stats["events_appended"] == 1 and reopened.stats["snapshot_writes"] == 3
+
+    loaded = await reopened.aload()
+    assert [e["step"] for e in loaded["events"]] == list(range(201, 301))
+    assert loaded["flow_state"].project == "shop_app" and loaded["runtime_config"] == config
+    assert int(await kv.get("vibeai:kernel:seq")) == 301
+
+    await reopened.aclear()
+    assert await reopened.aload() is None
+    print("✅ Redis Backend (InMemoryKV) OK")
+
+
+class YieldingKV(InMemoryKV):
+    """InMemoryKV, das bei jedem Aufruf an den Loop abgibt (wie ein echter Netzwerk-Client)"""
+
+    def __getattribute__(self, name):
+        attr = super().__getattribute__(name)
+        if name.startswith("_") or not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        async def yielding(*args, **kwargs):
+            await asyncio.sleep(0)
+            return await attr(*args, **kwargs)
+        return yielding
+
+
+async def test_redis_concurrent_asave():
+    """Test: gleichzeitige asave() Aufrufe schreiben Events genau einmal, Sequenz lückenlos"""
+    kv = YieldingKV()
+    store = KernelStateStore(backend="redis", kv=kv, max_events=100, compact_every=50)
+    flow, graph, config = make_state()
+
+    events = []
+    for step in range(20):
+        events.append({"type": "thought", "message": f"s{step}", "step": step})
+        # Jeder Aufruf sieht dasselbe (wachsende) Fenster – wie parallele Kernel-Callbacks
+        await asyncio.gather(*[store.asave(flow, graph, config, list(events)) for _ in range(4)])
+
+    stored = [json.loads(line) for line in await kv.lrange("vibeai:kernel:events", 0, -1)]
+    assert [e["seq"] for e in stored] == list(range(1, 21))
+    assert [e["event"]["step"] for e in stored] == list(range(20))
+    assert store.stats["events_appended"] == 20
+    print("✅ Redis parallele asave() OK")
+
+
+async def test_redis_atomic_save():
+    """Test: Save ist ein MULTI/EXEC (Abbruch schreibt nichts), seq wird nach Neustart nie wiederverwendet"""
+    class CrashingKV(InMemoryKV):
+        crash = False
+
+        def pipeline(self, transaction=True):
+            pipe = super().pipeline(transaction)
+            if self.crash:
+                async def execute():
+                    raise ConnectionError("connection lost")
+                pipe.execute = execute
+            return pipe
+
+    kv = CrashingKV()
+    store = KernelStateStore(backend="redis", kv=kv, max_events=100, compact_every=50)
+    flow, graph, config = make_state()
+    events = [{"type": "thought", "message": f"s{step}", "step": step} for step in range(3)]
+    assert await store.asave(flow, graph, config, events)
+
+    kv.crash = True
+    events.append({"type": "thought", "message": "s3", "step": 3})
+    assert await store.asave(flow, graph, config, events) is False
+    assert await kv.llen("vibeai:kernel:events") == 3 and await kv.get("vibeai:kernel:seq") == "3"
+
+    # Stand eines nicht-atomaren Saves: Events gepusht, seq nicht mehr gesetzt
+    await kv.rpush("vibeai:kernel:events", json.dumps({"seq": 4, "event": events[3]}))
+    kv.crash = False
+    reopened = KernelStateStore(backend="redis", kv=kv, max_events=100, compact_every=50)
+    events.append({"type": "thought", "message": "s4", "step": 4})
+    assert await reopened.asave(flow, graph, config, events)
+    stored = [json.loads(line) for line in await kv.lrange("vibeai:kernel:events", 0, -1)]
+    assert [e["seq"] for e in stored] == [1, 2, 3, 4, 5]
+    assert await kv.get("vibeai:kernel:seq") == "5"
+    print("✅ Redis atomarer Save OK")
+
+
+if __name__ == "__main__":
+    test_benchmark_sqlite()
+    test_benchmark_json()
+    test_exactly_once_restart_and_compaction()
+    test_legacy_json_format()
+    asyncio.run(test_redis_backend_fake())
+    asyncio.run(test_redis_concurrent_asave())
+    asyncio.run(test_redis_atomic_save())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+MessageStore - Indizierter Nachrichten-Store statt messages_db Scans
+Vergleicht den alten linearen Scan über alle Nachrichten mit Ring-Buffer
+und Index-Queries und prüft Cursor-Pagination, Bulk-Insert und Zähler.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from message_store import MessageStore, decode_cursor
+
+SESSIONS = 200
+PER_SESSION = 100
+
+
+def make_store(tmp: str, ring_size: int = 50) -> MessageStore:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'messages.db')}")
+    return MessageStore(sessionmaker(bind=engine), ring_size=ring_size)
+
+
+def seed(store: MessageStore):
+    """SESSIONS x PER_SESSION Nachrichten + gleiche Daten als altes Dict"""
+    base = datetime(2026, 1, 1)
+    legacy = {}
+    rows = []
+    for i in range(PER_SESSION):
+        for session_id in range(1, SESSIONS + 1):
+            created_at = base + timedelta(seconds=i)
+            rows.append({"session_id": session_id, "role": "user", "content": f"m{i}", "created_at": created_at})
+            legacy[len(legacy) + 1] = {**rows[-1], "id": len(legacy) + 1}
+    store.add_many(rows)
+    return legacy
+
+
+def test_schema_index():
+    """Test: Composite-Index (session_id, created_at, id) existiert"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        store.total()
+        engine = store.session_factory.kw["bind"]
+        indexes = {ix["name"]: ix["column_names"] for ix in inspect(engine).get_indexes("messages")}
+        assert indexes["ix_messages_session_created"] == ["session_id", "created_at", "id"]
+    print("✅ Index OK")
+
+
+def test_index_migration():
+    """Test: bestehende messages-Tabelle ohne Index bekommt ihn per migrate_db"""
+    from sqlalchemy import text
+
+    from db import migrate_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'old.db')}")
+        # Schema wie vor user-017 (ohne Composite-Index)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE messages (id INTEGER PRIMARY KEY, session_id INTEGER NOT NULL, role VARCHAR NOT NULL, "
+                "content TEXT NOT NULL, model_used VARCHAR, tokens_used INTEGER, created_at DATETIME)"
+            ))
+
+        def plan():
+            with engine.connect() as conn:
+                return " ".join(row[-1] for row in conn.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE session_id = 1 ORDER BY created_at DESC, id DESC"
+                )))
+
+        assert "SCAN messages" in plan()
+        assert migrate_db(engine) == ["messages.ix_messages_session_created"]
+        assert migrate_db(engine) == []
+        assert "ix_messages_session_created" in plan() and "TEMP B-TREE" not in plan()
+    print("✅ Index-Migration OK")
+
+
+def test_messages_without_session_row():
+    """Test: Nachrichten für In-Memory-Sessions verletzen keinen FK (auch mit erzwungenen FKs)"""
+    from sqlalchemy import event
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'messages.db')}")
+
+        @event.listens_for(engine, "connect")
+        def enforce_foreign_keys(dbapi_connection, _):
+            dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+        store = MessageStore(sessionmaker(bind=engine))
+        store.add_many([{"session_id": 42, "role": "user", "content": "hallo"}])
+        assert store.count(42) == 1
+        assert inspect(engine).get_foreign_keys("messages") == []
+    print("✅ Nachrichten ohne chat_sessions-Zeile OK")
+
+
+def test_reads_vs_linear_scan():
+    """Test: letzte Nachrichten + Counts ohne Scan über alle Nachrichten"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        legacy = seed(store)
+        session_ids = list(range(1, 21))
+
+        start = time.perf_counter()
+        for session_id in session_ids:
+            old = sorted((m for m in legacy.values() if m["session_id"] == session_id), key=lambda m: m["created_at"])
+            old_count = sum(1 for m in legacy.values() if m["session_id"] == session_id)
+        legacy_time = time.perf_counter() - start
+
+        for session_id in session_ids:
+            store.get_messages(session_id, limit=50)  # Ring-Buffer laden
+
+        start = time.perf_counter()
+        for session_id in session_ids:
+            page, cursor = store.get_messages(session_id, limit=50)
+        counts = store.counts(session_ids)
+        store_time = time.perf_counter() - start
+
+        print(f"   {len(legacy)} Nachrichten, {len(session_ids)} Sessions lesen (letzte 50 + Anzahl):")
+        print(f"      Vorher (Scan messages_db): {legacy_time * 1000:.1f} ms")
+        print(f"      Nachher (Ring-Buffer):     {store_time * 1000:.2f} ms")
+
+        assert [m["content"] for m in page] == [m["content"] for m in old[-50:]]
+        assert counts[20] == old_count == PER_SESSION
+        assert cursor is not None
+        assert store.stats["ring_hits"] == 2 * len(session_ids)
+        assert store_time < legacy_time
+    print("✅ Reads OK")
+
+
+def test_cursor_pagination():
+    """Test: Seiten über Cursor sind lückenlos und chronologisch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, ring_size=10)
+        seed(store)
+
+        pages = []
+        page, cursor = store.get_messages(7, limit=30)
+        pages.append(page)
+        while cursor:
+            page, cursor = store.get_messages(7, limit=30, before=cursor)
+            pages.append(page)
+
+        contents = [m["content"] for page in reversed(pages) for m in page]
+        assert contents == [f"m{i}" for i in range(PER_SESSION)]
+        assert [len(p) for p in pages] == [30, 30, 30, 10]
+
+        everything, cursor = store.get_messages(7)
+        assert len(everything) == PER_SESSION and cursor is None
+
+        try:
+            store.get_messages(7, limit=10, before="kaputt")
+            assert False, "ungültiger Cursor muss ValueError werfen"
+        except ValueError:
+            pass
+    print("✅ Cursor-Pagination OK")
+
+
+def test_add_many_and_counts():
+    """Test: Bulk-Insert in einer Transaktion, Ring-Buffer + Zähler aktuell"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, ring_size=3)
+        store.add(1, "user", "hallo")
+        assert store.count(1) == 1  # Fenster geladen
+
+        saved = store.add_many(
+            [
+                {"session_id": 1, "role": "user", "content": "frage"},
+                {"session_id": 1, "role": "assistant", "content": "antwort", "model_used": "gpt-4o", "tokens_used": 12.7},
+                {"session_id": 2, "role": "user", "content": "andere"},
+            ]
+        )
+        assert [m["id"] for m in saved] == [2, 3, 4]
+        assert saved[1]["tokens_used"] == 12
+        assert store.stats["insert_batches"] == 2
+
+        page, cursor = store.get_messages(1, limit=3)
+        assert [m["content"] for m in page] == ["hallo", "frage", "antwort"] and cursor is None
+        assert decode_cursor(store.get_messages(1, limit=2)[1])[1] == 2
+        assert store.counts([1, 2, 3]) == {1: 3, 2: 1, 3: 0}
+        assert store.total() == 4 and store.max_session_id() == 2
+
+        # Neuer Store auf gleicher DB (z.B. nach Neustart)
+        fresh = MessageStore(store.session_factory)
+        assert [m["content"] for m in fresh.get_messages(1, limit=10)[0]] == ["hallo", "frage", "antwort"]
+    print("✅ Bulk-Insert + Zähler OK")
+
+
+def test_write_during_window_load():
+    """Test: add_many, das zwischen Query und Fenster-Install committet, geht nicht verloren"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, ring_size=5)
+        store.add(1, "user", "alt")
+        store = MessageStore(store.session_factory, ring_size=5)  # Fenster noch nicht geladen
+
+        to_dict = MessageStore._to_dict
+        injected = []
+
+        def write_after_query(message):
+            # Läuft nach der Fenster-Query → simuliert einen parallelen Request
+            if not injected:
+                injected.append(True)
+                store.add(1, "assistant", "neu")
+            return to_dict(message)
+
+        store._to_dict = write_after_query
+        assert store.count(1) == 1  # Snapshot vor dem Write, wird nicht gecacht
+        store._to_dict = to_dict
+        assert 1 not in store._windows
+
+        assert store.count(1) == 2
+        assert [m["content"] for m in store.get_messages(1, limit=5)[0]] == ["alt", "neu"]
+        store.add(1, "user", "danach")
+        assert store.count(1) == 3
+        assert not store._writing and not store._loading
+    print("✅ Write während Fenster-Load OK")
+
+
+if __name__ == "__main__":
+    test_schema_index()
+    test_index_migration()
+    test_messages_without_session_row()
+    test_reads_vs_linear_scan()
+    test_cursor_pagination()
+    test_add_many_and_counts()
+    test_write_during_window_load()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+PasswordHasher - Event-Loop Blockade bei Login-Bursts
+Misst die maximale Verzögerung eines Ticker-Tasks (simuliert SSE-Stream),
+während 16 Logins gleichzeitig bcrypt ausführen – einmal direkt im
+Handler (alt), einmal über den Hash-Pool. Prüft 429 bei Überlast und
+Rehash bei geänderten Cost-Parametern.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import bcrypt
+from fastapi import HTTPException
+
+from password_hasher import PasswordHasher, needs_rehash
+
+ROUNDS = 10
+LOGINS = 16
+STORED = bcrypt.hashpw(b"secret-password", bcrypt.gensalt(rounds=ROUNDS)).decode()
+
+
+def verify(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=ROUNDS)).decode()
+
+
+async def max_loop_lag(burst) -> float:
+    """Maximale Ticker-Verzögerung (ms) während burst() läuft"""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - start - 0.005)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+    await burst()
+    done = True
+    await task
+    return lag * 1000
+
+
+async def test_loop_not_blocked():
+    """Test: Login-Burst blockiert den Event-Loop nicht mehr"""
+    hasher = PasswordHasher(max_workers=4, max_pending=64)
+
+    async def inline_login():
+        return verify("secret-password", STORED)
+
+    async def pooled_login():
+        return await hasher.run(verify, "secret-password", STORED)
+
+    async def inline_burst():
+        assert all(await asyncio.gather(*(inline_login() for _ in range(LOGINS))))
+
+    async def pooled_burst():
+        assert all(await asyncio.gather(*(pooled_login() for _ in range(LOGINS))))
+
+    inline_lag = await max_loop_lag(inline_burst)
+    pooled_lag = await max_loop_lag(pooled_burst)
+
+    print(f"   {LOGINS} Logins gleichzeitig (bcrypt cost {ROUNDS}):")
+    print(f"      Vorher (im Handler): max. Loop-Lag {inline_lag:.0f} ms")
+    print(f"      Nachher (Hash-Pool): max. Loop-Lag {pooled_lag:.0f} ms")
+    print(f"      Stats: {hasher.get_stats()}")
+    assert pooled_lag < inline_lag / 4
+    hasher.shutdown()
+    print("✅ Event-Loop OK")
+
+
+async def test_overload_returns_429():
+    """Test: volle Queue → 429 mit Retry-After"""
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+
+    results = await asyncio.gather(
+        *(hasher.run(verify, "secret-password", STORED) for _ in range(5)),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 3
+    assert rejected[0].status_code == 429 and rejected[0].headers["Retry-After"] == "1"
+    assert hasher.get_stats()["rejected"] == 3
+    hasher.shutdown()
+    print("✅ 429 bei Überlast OK")
+
+
+async def test_rehash_on_cost_change():
+    """Test: Hash mit altem Cost-Faktor wird beim Login erneuert"""
+    hasher = PasswordHasher(max_workers=2)
+    old_hash = bcrypt.hashpw(b"secret-password", bcrypt.gensalt(rounds=4)).decode()
+
+    assert needs_rehash(old_hash, rounds=ROUNDS)
+    assert not needs_rehash(STORED, rounds=ROUNDS)
+
+    def check(hashed):
+        return needs_rehash(hashed, rounds=ROUNDS)
+    valid, new_hash = await hasher.verify_and_rehash(
+        verify, hash_password, "secret-password", old_hash, rehash_check=check
+    )
+    assert valid and new_hash.startswith(f"$2b${ROUNDS:02d}$")
+    assert verify("secret-password", new_hash)
+
+    valid, new_hash = await hasher.verify_and_rehash(
+        verify, hash_password, "wrong-password", old_hash, rehash_check=check
+    )
+    assert not valid and new_hash is None
+    assert hasher.get_stats()["rehashed"] == 1
+    hasher.shutdown()
+    print("✅ Rehash OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_loop_not_blocked())
+    asyncio.run(test_overload_returns_429())
+    asyncio.run(test_rehash_on_cost_change())
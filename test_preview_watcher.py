@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Preview File Watcher - Test
+Prüft den gemeinsamen FileWatcherService (event-basiert und Stat-Polling):
+Änderungen werden gebündelt (Debounce) gemeldet, ein reines "touch" ohne
+Inhaltsänderung löst keinen Reload aus und ignorierte Ordner bleiben stumm.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from preview.file_watcher import WATCHDOG_AVAILABLE, FileWatcherService
+
+EXTENSIONS = {".js", ".css"}
+
+
+def write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+async def wait_for(reloads: list, count: int, timeout: float = 3.0):
+    deadline = time.monotonic() + timeout
+    while len(reloads) < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+
+
+async def run_watcher(use_events: bool):
+    watcher = FileWatcherService(debounce=0.1, poll_interval=0.2, use_events=use_events)
+    reloads = []
+
+    async def on_change(user, files):
+        reloads.append((user, time.monotonic(), [os.path.basename(f) for f in files]))
+
+    with tempfile.TemporaryDirectory() as project:
+        write(os.path.join(project, "src", "app.js"), "console.log(1)")
+        write(os.path.join(project, "src", "style.css"), "body {}")
+
+        await watcher.watch("user@test", project, EXTENSIONS, on_change)
+        await asyncio.sleep(0.3)
+
+        # Burst von Änderungen → ein einziger Reload
+        start = time.monotonic()
+        for i in range(5):
+            write(os.path.join(project, "src", "app.js"), f"console.log({i + 2})")
+            write(os.path.join(project, "src", "new.js"), f"export const x = {i}")
+        await wait_for(reloads, 1)
+        latency = reloads[0][1] - start if reloads else None
+
+        assert len(reloads) == 1, reloads
+        assert reloads[0][2] == ["app.js", "new.js"], reloads
+
+        # touch ohne Inhaltsänderung / ignorierte Ordner → kein Reload
+        os.utime(os.path.join(project, "src", "style.css"))
+        write(os.path.join(project, "node_modules", "lib", "index.js"), "x")
+        await asyncio.sleep(0.6)
+        assert len(reloads) == 1, reloads
+
+        # Löschen wird gemeldet
+        os.remove(os.path.join(project, "src", "new.js"))
+        await wait_for(reloads, 2)
+        assert reloads[-1][2] == ["new.js"], reloads
+
+        stats = watcher.get_stats()
+        watcher.stop()
+
+    print(f"   Modus: {stats['mode']}, Reload-Latenz: {latency * 1000:.0f} ms (vorher bis zu 2000 ms)")
+    print(f"   Rehashes: {stats['rehashes']}, Events: {stats['events']}")
+    print(f"✅ Watcher ({stats['mode']}) OK")
+
+
+async def check_no_shared_mutation():
+    """Während des Thread-Checks verändert nur der Loop watch.files"""
+    watcher = FileWatcherService(debounce=0.05, poll_interval=0.05, use_events=False)
+    reloads = []
+
+    async def on_change(user, files):
+        reloads.append(files)
+
+    with tempfile.TemporaryDirectory() as project:
+        for i in range(200):
+            write(os.path.join(project, "src", f"f{i}.js"), "x")
+        await watcher.watch("user@test", project, EXTENSIONS, on_change)
+        watch = watcher.watches["user@test"]
+
+        original_check = watcher._check
+        snapshots = []
+
+        def checking(known):
+            before = dict(watch.files)
+            result = original_check(known)
+            snapshots.append(before == watch.files)
+            return result
+
+        watcher._check = checking
+        for i in range(200):
+            write(os.path.join(project, "src", f"f{i}.js"), f"y{i}")
+        await wait_for(reloads, 1)
+        await asyncio.sleep(0.2)
+        watcher.stop()
+
+    assert snapshots and all(snapshots)
+    assert sum(len(files) for files in reloads) == 200
+    print("✅ Watcher ohne geteilte Mutation OK")
+
+
+def test_watcher_events():
+    """Test: event-basierter Modus (watchdog)"""
+    if not WATCHDOG_AVAILABLE:
+        print("   watchdog nicht installiert – Event-Modus übersprungen")
+        return
+    asyncio.run(run_watcher(use_events=True))
+
+
+def test_watcher_polling():
+    """Test: Stat-Polling Fallback"""
+    asyncio.run(run_watcher(use_events=False))
+
+
+def test_check_runs_on_copy():
+    """Test: _check im Thread verändert watch.files nicht"""
+    asyncio.run(check_no_shared_mutation())
+
+
+if __name__ == "__main__":
+    test_watcher_events()
+    test_watcher_polling()
+    test_check_runs_on_copy()
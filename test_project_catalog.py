@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Project Catalog - Persistenter Index für list_projects
+Vergleicht den alten os.walk über alle Projekte mit dem Katalog, prüft
+Keyset-Pagination, inkrementelle Updates aus den Write-Pfaden und den
+Abgleich nach Änderungen außerhalb der API.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from project_generator.project_catalog import (
+    EXCLUDE_DIRS,
+    EXCLUDE_EXTENSIONS,
+    ProjectCatalog,
+    detect_platform,
+    read_project_info,
+)
+from project_generator import project_router
+
+PROJECTS = 150
+FILES_PER_PROJECT = 60
+
+
+def make_projects(base: Path):
+    for i in range(PROJECTS):
+        project = base / f"app{i:03d}"
+        for j in range(FILES_PER_PROJECT):
+            sub = project / ("lib" if j % 2 else "src") / f"pkg{j % 5}"
+            sub.mkdir(parents=True, exist_ok=True)
+            ext = ".dart" if i % 3 == 0 else ".tsx" if i % 3 == 1 else ".py"
+            (sub / f"file{j}{ext}").write_text("x" * (j + i))
+        (project / "node_modules" / "dep").mkdir(parents=True)
+        (project / "node_modules" / "dep" / "index.js").write_text("ignored")
+        (project / ".env").write_text("SECRET=1")
+        (project / "README.md").write_text(f"# App Nummer {i}\n")
+        mtime = 1_700_000_000 + i * 60
+        for path in project.rglob("*"):
+            os.utime(path, (mtime, mtime))
+
+
+def legacy_list(base_dirs):
+    """Alter list_projects Pfad (os.walk über jedes Projekt)"""
+    projects = []
+    for base_dir in base_dirs:
+        for project_dir in Path(base_dir).iterdir():
+            if not project_dir.is_dir() or project_dir.name.startswith('.'):
+                continue
+            file_count, last_modified, platform = 0, 0, None
+            for root, dirs, filenames in os.walk(project_dir):
+                dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+                for filename in filenames:
+                    if filename.startswith(".") or any(filename.endswith(ext) for ext in EXCLUDE_EXTENSIONS):
+                        continue
+                    file_path = Path(root) / filename
+                    file_count += 1
+                    last_modified = max(last_modified, os.path.getmtime(file_path))
+                    platform = platform or detect_platform(str(file_path.relative_to(project_dir)))
+            name, _ = read_project_info(str(project_dir))
+            projects.append({
+                "id": project_dir.name,
+                "name": name,
+                "platform": platform or "unknown",
+                "file_count": file_count,
+                "last_modified": int(last_modified) if last_modified > 0 else None,
+            })
+    projects.sort(key=lambda x: (x.get("last_modified") or 0, x["id"]), reverse=True)
+    return projects
+
+
+def strip(projects):
+    keys = ("id", "name", "platform", "file_count", "last_modified")
+    return [{k: p[k] for k in keys} for p in projects]
+
+
+def test_list_matches_legacy():
+    """Test: Katalog liefert dasselbe wie der alte Walk, nur schneller"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "projects"
+        make_projects(base)
+        catalog = ProjectCatalog(os.path.join(tmp, "catalog.sqlite3"))
+
+        start = time.perf_counter()
+        legacy = legacy_list([base])
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        catalog.reconcile([base], force=True)
+        first_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            catalog.reconcile([base], force=True)
+            projects, _, total = catalog.list([base])
+        catalog_time = (time.perf_counter() - start) / 10
+
+        print(f"   {PROJECTS} Projekte x {FILES_PER_PROJECT} Dateien:")
+        print(f"      Vorher (os.walk pro Request):     {legacy_time * 1000:.1f} ms")
+        print(f"      Erster Aufbau des Katalogs:       {first_time * 1000:.1f} ms")
+        print(f"      Nachher (Abgleich + Query):       {catalog_time * 1000:.1f} ms")
+
+        assert total == PROJECTS
+        assert strip(projects) == legacy
+        assert projects[0]["name"] == f"App Nummer {PROJECTS - 1}"
+        assert catalog_time < legacy_time
+
+        # Ohne Abgleich (innerhalb des Intervalls): reine Query
+        start = time.perf_counter()
+        catalog.reconcile([base])
+        catalog.list([base], limit=20)
+        print(f"      Nachher (gedrosselt, 20er Seite): {(time.perf_counter() - start) * 1000:.2f} ms")
+        catalog.close()
+    print("✅ Liste wie bisher OK")
+
+
+def test_pagination():
+    """Test: Keyset-Seiten lückenlos und ohne Duplikate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "projects"
+        make_projects(base)
+        catalog = ProjectCatalog(os.path.join(tmp, "catalog.sqlite3"))
+        catalog.reconcile([base], force=True)
+
+        full, _, _ = catalog.list([base])
+        seen, cursor = [], None
+        while True:
+            page, cursor, _ = catalog.list([base], limit=32, before=cursor)
+            seen.extend(p["id"] for p in page)
+            if not cursor:
+                break
+        assert seen == [p["id"] for p in full]
+
+        try:
+            catalog.list([base], before="kaputt")
+            assert False, "ungültiger Cursor muss ValueError werfen"
+        except ValueError:
+            pass
+        catalog.close()
+    print("✅ Pagination OK")
+
+
+def test_incremental_and_reconcile():
+    """Test: write_files/create/delete pflegen den Katalog, externe Änderungen werden erkannt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "projects"
+        make_projects(base)
+        catalog = ProjectCatalog(os.path.join(tmp, "catalog.sqlite3"))
+        catalog.reconcile([base], force=True)
+        project_router.project_catalog = catalog
+
+        # Inkrementell über write_files (kein Rescan)
+        project = base / "app010"
+        before = catalog.get(project)
+        scans = catalog.stats["project_scans"]
+        project_router.write_files(project, {"src/new/feature.py": "print(1)\n", "src/pkg0/file0.tsx": "y" * 500})
+        after = catalog.get(project)
+        assert catalog.stats["project_scans"] == scans
+        assert after["file_count"] == before["file_count"] + 1
+        assert after["size_bytes"] == before["size_bytes"] + len("print(1)\n") + 500 - 10
+        assert after["last_modified"] > before["last_modified"]
+        assert catalog.list([base], limit=1)[0][0]["id"] == "app010"
+
+        # Abgleich erkennt die eigenen Writes nicht als Änderung
+        catalog.reconcile([base], force=True)
+        assert catalog.stats["project_scans"] == scans
+        assert catalog.get(project) == after
+
+        # Änderungen außerhalb der API: neue Datei, neues und gelöschtes Projekt
+        (base / "app020" / "lib" / "pkg1" / "extern.dart").write_text("void main() {}")
+        (base / "manual").mkdir()
+        (base / "manual" / "main.swift").write_text("print()")
+        shutil.rmtree(base / "app030")
+        catalog.reconcile([base], force=True)
+        _, _, total = catalog.list([base])
+        assert total == PROJECTS
+        assert catalog.get(base / "app020")["file_count"] == FILES_PER_PROJECT + 2
+        assert catalog.get(base / "manual")["platform"] == "ios-swift"
+        assert catalog.get(base / "app030") is None
+        assert strip(catalog.list([base])[0]) == legacy_list([base])
+        catalog.close()
+    print("✅ Inkrementell + Abgleich OK")
+
+
+if __name__ == "__main__":
+    test_list_matches_legacy()
+    test_pagination()
+    test_incremental_and_reconcile()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ProjectContext - LRU Cache + Split Storage Test
+Misst Bytes pro add_code() (vorher: ganzer Context inkl. aller Code-Blobs
+und History) und list_projects() über viele Projekte, prüft LRU-Grenzen,
+Lazy Loading und die Migration alter Context-Dateien.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from ai.orchestrator.memory.project_context import LazyCodeMap, ProjectContext
+
+CODE = "import React from 'react';\n" + "export const Button = () => <button>Click</button>;\n" * 400
+
+
+def test_code_split_and_lazy_load():
+    """Test: Code liegt in Blobs, Core-Datei bleibt klein"""
+    storage = tempfile.mkdtemp()
+    ctx = ProjectContext(storage)
+
+    for i, framework in enumerate(["react", "flutter", "vue"] * 4):
+        ctx.add_code("u1", "app", framework, CODE + str(i))
+
+    core_size = os.path.getsize(os.path.join(storage, "u1_app.json"))
+    legacy_size = len(json.dumps({"code": {f: CODE for f in ("react", "flutter", "vue")},
+                                  "code_history": [{"code": CODE}] * 10}, indent=2))
+    print(f"   Core-Datei: {core_size / 1024:.1f} KB (vorher pro Save: {legacy_size / 1024:.1f} KB)")
+    assert core_size < legacy_size / 20
+
+    fresh = ProjectContext(storage)
+    loaded = fresh.load("u1", "app")
+    assert isinstance(loaded["code"], LazyCodeMap)
+    assert loaded["code"].loaded_bytes == 0
+    assert loaded.get("code", {}).get("vue") == CODE + "11"
+    assert len(fresh.get_code_history("u1", "app")) == 10
+    assert fresh.get_code_history("u1", "app", "react")[-1]["code"] == CODE + "9"
+
+    shutil.rmtree(storage)
+    print("✅ Split Storage OK")
+
+
+def test_lru_bounds():
+    """Test: Cache bleibt innerhalb von max_entries / max_bytes"""
+    storage = tempfile.mkdtemp()
+    ctx = ProjectContext(storage, max_entries=5)
+    for i in range(20):
+        ctx.add_screen("u1", f"p{i}", {"name": f"Screen{i}"})
+    assert len(ctx.contexts) == 5
+    assert list(ctx.contexts)[-1] == "u1_p19"
+
+    # Verdrängte Projekte kommen unverändert von Disk zurück
+    assert ctx.get_all_screens("u1", "p0") == [{"name": "Screen0"}]
+
+    ctx = ProjectContext(storage, max_bytes=4 * 1024)
+    for i in range(20):
+        ctx.update("u1", f"p{i}", {"description": "x" * 1024})
+    assert ctx.get_stats()["cached_bytes"] <= 4 * 1024
+
+    shutil.rmtree(storage)
+    print("✅ LRU Bounds OK")
+
+
+def test_list_projects_uses_index():
+    """Test: list_projects liest nur den Summary-Index"""
+    storage = tempfile.mkdtemp()
+    ctx = ProjectContext(storage)
+    for i in range(200):
+        ctx.add_code("u1", f"p{i}", "react", CODE)
+        ctx.add_code("u10", f"q{i}", "react", CODE)
+
+    fresh = ProjectContext(storage)
+    start = time.perf_counter()
+    projects = fresh.list_projects("u1")
+    elapsed = time.perf_counter() - start
+
+    assert len(projects) == 200
+    assert all(p["has_code"] for p in projects)
+    assert not fresh.contexts, "list_projects darf keine Contexts laden"
+    assert fresh.get_summary("u1", "p5")["project_id"] == "p5" and not fresh.contexts
+    print(f"   list_projects (200 Projekte): {elapsed * 1000:.1f} ms")
+
+    shutil.rmtree(storage)
+    print("✅ Summary Index OK")
+
+
+def test_legacy_migration():
+    """Test: Alte Dateien (Code inline, kein Index) werden migriert"""
+    storage = tempfile.mkdtemp()
+    legacy = {
+        "user_id": "u1", "project_id": "old", "name": "Old", "framework": "react",
+        "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00",
+        "screens": [], "code": {"react": CODE},
+        "code_history": [{"framework": "react", "code": CODE, "timestamp": "2024-01-01T00:00:00"}],
+    }
+    with open(os.path.join(storage, "u1_old.json"), "w") as f:
+        json.dump(legacy, f)
+
+    ctx = ProjectContext(storage)
+    assert ctx.list_projects("u1")[0]["has_code"]
+    assert ctx.get_code("u1", "old", "react") == CODE
+    assert ctx.get_code_history("u1", "old")[0]["code"] == CODE
+    with open(os.path.join(storage, "u1_old.json")) as f:
+        migrated = json.load(f)
+    assert "code" not in migrated and "code_refs" in migrated
+    assert migrated["updated_at"] == "2024-01-01T00:00:00"
+
+    shutil.rmtree(storage)
+    print("✅ Legacy Migration OK")
+
+
+if __name__ == "__main__":
+    test_code_split_and_lazy_load()
+    test_lru_bounds()
+    test_list_projects_uses_index()
+    test_legacy_migration()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+ProjectScanner - Pruning, Head-Reads und Scan-Cache
+Vergleicht den alten _collect_code_files Walk (ohne Pruning, komplette
+Reads) mit dem geteilten Scanner auf einem Projekt mit großem
+node_modules / .dart_tool / build und prüft .gitignore, Kürzung und
+Cache-Invalidierung.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import ai.pricing  # noqa: F401  (zuerst laden: zirkulärer Import agent_dispatcher ↔ pricing)
+from ai.optimizer.project_scanner import GitIgnore, ProjectScanner
+
+EXTENSIONS = [".py", ".js", ".jsx", ".ts", ".tsx", ".dart"]
+
+
+def legacy_collect(project_path: str):
+    """Alter Pfad aus ProjectOptimizer._collect_code_files"""
+    code_map = {}
+    for root, dirs, files in os.walk(project_path):
+        for file in files:
+            if not any(file.endswith(ext) for ext in EXTENSIONS):
+                continue
+            file_path = os.path.join(root, file)
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+                if len(content) > 10000:
+                    content = content[:10000] + "\n... (truncated)"
+                code_map[os.path.relpath(file_path, project_path)] = content
+    return code_map
+
+
+def make_project(root: Path):
+    (root / "lib").mkdir()
+    (root / "lib" / "main.dart").write_text("void main() {}\n")
+    (root / "src").mkdir()
+    (root / "src" / "app.js").write_text("export const app = 1;\n")
+    (root / "src" / "big.js").write_text("x" * 500_000)
+    (root / "src" / "secret.generated.js").write_text("ignored\n")
+    (root / "tmp").mkdir()
+    (root / "tmp" / "cache.py").write_text("ignored\n")
+    (root / ".gitignore").write_text("*.generated.js\n/tmp/\n")
+
+    for heavy in ("node_modules", ".dart_tool", "build"):
+        for i in range(40):
+            package = root / heavy / f"pkg{i}"
+            package.mkdir(parents=True)
+            for j in range(10):
+                (package / f"index{j}.js").write_text("module.exports = {};\n" * 2000)
+
+
+def test_gitignore():
+    """Test: Negation, Anker, Verzeichnis-Regeln, **"""
+    ignore = GitIgnore()
+    ignore.add_patterns(["*.log", "!keep.log", "/dist", "cache/", "docs/**/*.md"])
+    ignore.add_patterns(["*.tmp"], base_dir="sub")
+
+    assert ignore.is_ignored("a/b/error.log", False)
+    assert not ignore.is_ignored("a/keep.log", False)
+    assert ignore.is_ignored("dist", True)
+    assert not ignore.is_ignored("src/dist", True)
+    assert ignore.is_ignored("x/cache", True) and not ignore.is_ignored("x/cache", False)
+    assert ignore.is_ignored("docs/a/b/readme.md", False)
+    assert ignore.is_ignored("sub/x.tmp", False) and not ignore.is_ignored("x.tmp", False)
+    print("✅ GitIgnore OK")
+
+
+def test_scan_and_cache():
+    """Test: Pruning, Head-Reads, Cache-Hit und Invalidierung"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+        scanner = ProjectScanner()
+
+        start = time.perf_counter()
+        legacy = legacy_collect(tmp)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scan = scanner.scan(tmp, EXTENSIONS)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert scanner.scan(tmp, EXTENSIONS) is scan
+        cached_time = time.perf_counter() - start
+
+        print(f"   Projekt mit node_modules/.dart_tool/build ({len(legacy)} Code-Dateien gesamt):")
+        print(f"      Vorher (voller Walk + Reads): {legacy_time * 1000:.0f} ms")
+        print(f"      Nachher (Scanner):            {scan_time * 1000:.1f} ms")
+        print(f"      Nachher (Cache-Hit):          {cached_time * 1000:.2f} ms")
+
+        assert set(scan.files) == {"lib/main.dart", "src/app.js", "src/big.js"}
+        assert scan.files["src/big.js"] == legacy[os.path.join("src", "big.js")]
+        assert not any("node_modules" in line for line in scan.structure)
+        assert scan_time < legacy_time and cached_time < scan_time
+        assert scanner.stats["cache_hits"] == 1
+
+        # In-place Edit (Verzeichnis-mtime bleibt gleich) → Rescan, Rest wiederverwendet
+        (root / "src" / "app.js").write_text("export const app = 22;\n")
+        rescan = scanner.scan(tmp, EXTENSIONS)
+        assert rescan.files["src/app.js"] == "export const app = 22;\n"
+        assert scanner.stats["files_reused"] == 2
+
+        # Neue Datei → Verzeichnis-mtime ändert sich
+        (root / "lib" / "widget.dart").write_text("class Widget {}\n")
+        assert "lib/widget.dart" in scanner.scan(tmp, EXTENSIONS).files
+
+        # In-place Edit der .gitignore → Rescan mit neuen Regeln
+        (root / ".gitignore").write_text("*.generated.js\n")
+        assert "tmp/cache.py" in scanner.scan(tmp, EXTENSIONS).files
+    print("✅ Scan + Cache OK")
+
+
+def test_structure_prompt():
+    """Test: "structure"-Analyse bekommt die echte Projektstruktur (kein Coroutine-Objekt)"""
+    import asyncio
+    import warnings
+
+    from ai.optimizer.project_optimizer import ProjectOptimizer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+        optimizer = ProjectOptimizer()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            structure = asyncio.run(optimizer._get_project_structure(tmp))
+            prompt = optimizer._build_analysis_prompt({"lib/main.dart": "void main() {}"}, "structure", structure)
+        assert "coroutine" not in prompt
+        assert "main.dart" in prompt and "node_modules" not in prompt
+    print("✅ Structure-Prompt OK")
+
+
+if __name__ == "__main__":
+    test_gitignore()
+    test_scan_and_cache()
+    test_structure_prompt()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Sliding Window Microbenchmark
+Vergleicht den alten In-Memory Check (Timestamp-Listen pro Fenster, bei
+jedem Request per List-Comprehension neu gebaut) mit dem O(1)
+Sliding-Window-Counter und prüft, dass die Limits weiterhin greifen –
+im Speicher und über das Lua-Script (async Redis, gegen fakeredis).
+Modul-Globals werden nur per monkeypatch verändert.
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import fakeredis
+import pytest
+from fakeredis import aioredis as fake_aioredis
+from fastapi import HTTPException
+
+import billing.limiter_production as limiter_production
+from billing.limiter_production import RateLimiter, SlidingWindowCounter, TIER_LIMITS
+
+CHECKS = 5_000
+
+
+def use_memory(monkeypatch):
+    """In-Memory Pfad erzwingen"""
+    monkeypatch.setattr(limiter_production, "USE_REDIS", False)
+
+
+def use_fake_redis(monkeypatch):
+    """Sync + async Client auf EINEM fakeredis-Server (Lua läuft wirklich)"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(limiter_production, "USE_REDIS", True)
+    monkeypatch.setattr(limiter_production, "redis_client", fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(
+        limiter_production, "async_redis_client", fake_aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+
+
+class LegacyLimiter:
+    """Alter In-Memory Pfad (Listen mit Timestamps)"""
+
+    def __init__(self):
+        self.requests = defaultdict(lambda: {"minute": [], "hour": [], "day": []})
+
+    def check(self, user_id: str, tier: str):
+        limits = TIER_LIMITS[tier]
+        now = time.time()
+        for window, seconds in (("minute", 60), ("hour", 3600), ("day", 86400)):
+            max_requests = limits[f"requests_per_{window}"]
+            self.requests[user_id][window] = [t for t in self.requests[user_id][window] if now - t < seconds]
+            if len(self.requests[user_id][window]) >= max_requests:
+                raise HTTPException(status_code=429, detail="limit")
+            self.requests[user_id][window].append(now)
+
+
+def test_sliding_window_counter():
+    """Test: Gewichtung des vorherigen Buckets"""
+    counter = SlidingWindowCounter(60)
+    for _ in range(30):
+        counter.hit(0.0)
+    assert counter.estimate(59.0) == 30
+    # 15s ins nächste Fenster → 75% des vorherigen Buckets zählen noch
+    assert counter.estimate(75.0) == 30 * 0.75
+    # Zwei Fenster später ist alles verfallen
+    assert counter.estimate(180.0) == 0
+    print("✅ SlidingWindowCounter OK")
+
+
+async def enforce_minute_limit():
+    """Minute-Limit greift, kein Zählen bei Ablehnung"""
+    limiter = RateLimiter()
+    user = SimpleNamespace(id="u1", subscription_level="free")
+
+    allowed = 0
+    try:
+        for _ in range(TIER_LIMITS["free"]["requests_per_minute"] + 5):
+            await limiter.enforce(user)
+            allowed += 1
+    except HTTPException as e:
+        assert e.status_code == 429
+
+    assert allowed == TIER_LIMITS["free"]["requests_per_minute"]
+    assert limiter.get_quota_status("u1", "free")["requests"]["minute"] == allowed
+    return limiter
+
+
+def test_limits_enforced(monkeypatch):
+    """Test: Minute-Limit greift (In-Memory)"""
+    use_memory(monkeypatch)
+    asyncio.run(enforce_minute_limit())
+    print("✅ Limits OK")
+
+
+def test_limits_enforced_redis_lua(monkeypatch):
+    """Test: async Lua-Pfad (ein Round Trip) – Fenster, Tokens, Kosten"""
+    use_fake_redis(monkeypatch)
+
+    async def run():
+        limiter = await enforce_minute_limit()
+        assert limiter._limits_script_async is not None
+
+        pro = SimpleNamespace(id="u2", subscription_level="pro")
+        limits = TIER_LIMITS["pro"]
+
+        # Tokens: Ablehnung zählt nicht mit
+        await limiter.enforce(pro, tokens_expected=limits["tokens_per_day"] - 10)
+        try:
+            await limiter.enforce(pro, tokens_expected=20)
+            assert False, "Tages-Token-Limit muss greifen"
+        except HTTPException as e:
+            assert e.status_code == 429 and "token" in e.detail
+        await limiter.enforce(pro, tokens_expected=10)
+
+        # Kosten: 402 mit aktuellem Stand
+        await limiter.enforce(pro, cost_estimate=limits["cost_per_month"] - 1)
+        try:
+            await limiter.enforce(pro, cost_estimate=2)
+            assert False, "Kosten-Limit muss greifen"
+        except HTTPException as e:
+            assert e.status_code == 402 and "Current" in e.detail
+
+        status = limiter.get_quota_status("u2", "pro")
+        assert status["tokens"]["day"] == limits["tokens_per_day"]
+        assert status["costs"]["month"] == limits["cost_per_month"] - 1
+        assert status["requests"]["minute"] == 3
+
+    asyncio.run(run())
+    print("✅ Limits (Redis Lua) OK")
+
+
+def test_benchmark(monkeypatch):
+    """Test: O(1) Counter ist schneller als die Listen-Variante"""
+    use_memory(monkeypatch)
+    # Benchmark-Tier ohne praktische Limits (nur Durchsatz messen)
+    monkeypatch.setitem(
+        TIER_LIMITS, "bench", dict(TIER_LIMITS["enterprise"], requests_per_minute=10**9, requests_per_hour=10**9)
+    )
+    legacy = LegacyLimiter()
+    limiter = RateLimiter()
+
+    start = time.perf_counter()
+    for _ in range(CHECKS):
+        legacy.check("bench", "bench")
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(CHECKS):
+        limiter._check_windows_memory("bench", "bench")
+    new_time = time.perf_counter() - start
+
+    print(f"   {CHECKS} Checks (1 User, volles Minuten-Fenster):")
+    print(f"      Vorher (Listen):         {CHECKS / legacy_time:,.0f} checks/s")
+    print(f"      Nachher (Sliding Window): {CHECKS / new_time:,.0f} checks/s")
+    assert new_time < legacy_time
+    print("✅ Benchmark OK")
+
+
+if __name__ == "__main__":
+    test_sliding_window_counter()
+    for test in (test_limits_enforced, test_limits_enforced_redis_lua, test_benchmark):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test(monkeypatch)
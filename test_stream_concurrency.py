@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+LLM Streaming - Concurrency Load Test
+Prüft, dass N parallele OpenAIClient-Streams sich nicht mehr serialisieren
+(kein blockierendes Iterieren auf dem Event-Loop) und dass ein Abbruch
+den HTTP-Stream schließt.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from llm.openai_client import OpenAIClient
+
+STREAMS = 20
+CHUNKS = 10
+CHUNK_DELAY = 0.02  # simulierte Netzwerk-Latenz pro Token
+
+
+class FakeStream:
+    """Simuliert openai.AsyncStream mit Netzwerk-Latenz pro Chunk"""
+
+    def __init__(self):
+        self.closed = False
+        self.sent = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent >= CHUNKS:
+            raise StopAsyncIteration
+        await asyncio.sleep(CHUNK_DELAY)
+        self.sent += 1
+        delta = SimpleNamespace(content=f"tok{self.sent} ")
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncOpenAI:
+    def __init__(self):
+        self.streams = []
+
+        async def create(**kwargs):
+            stream = FakeStream()
+            self.streams.append(stream)
+            return stream
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+async def consume(client: OpenAIClient) -> str:
+    text = ""
+    async for chunk in client.stream("hallo"):
+        text += chunk
+    return text
+
+
+async def test_concurrent_streams():
+    """Test: N Streams laufen parallel statt nacheinander"""
+    client = OpenAIClient(model="gpt-4o-mini", client=FakeAsyncOpenAI())
+
+    start = time.perf_counter()
+    await consume(client)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(consume(client) for _ in range(STREAMS)))
+    elapsed = time.perf_counter() - start
+
+    print(f"   1 Stream:  {single * 1000:.1f} ms")
+    print(f"   {STREAMS} Streams: {elapsed * 1000:.1f} ms (seriell wären ~{single * STREAMS * 1000:.0f} ms)")
+
+    assert all(r.count("tok") == CHUNKS for r in results)
+    assert elapsed < single * 3, "Streams serialisieren sich"
+    print("✅ Concurrent Streams OK")
+
+
+async def test_cancel_closes_stream():
+    """Test: Client-Disconnect schließt den HTTP-Stream"""
+    fake = FakeAsyncOpenAI()
+    client = OpenAIClient(model="gpt-4o-mini", client=fake)
+
+    gen = client.stream("hallo")
+    await gen.__anext__()
+    await gen.aclose()
+
+    assert fake.streams[0].closed
+    assert fake.streams[0].sent < CHUNKS
+    print("✅ Cancellation OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_concurrent_streams())
+    asyncio.run(test_cancel_closes_stream())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+TeamEngine - Concurrent Fan-out Benchmark
+Prüft, dass 4 Agents im "parallel"-Modus ungefähr so lange brauchen wie
+der langsamste einzelne Agent (nicht die Summe), dass der Quorum-Modus
+nach den ersten Antworten zurückkehrt und dass Timeouts greifen.
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from ai.team.team_engine import TeamEngine
+
+# Simulierte Provider-Latenz pro Modell (Sekunden)
+LATENCY = {
+    "gpt-4o": 0.30,
+    "claude-3-5-sonnet-20241022": 0.50,
+    "gemini-1.5-flash": 0.40,
+}
+
+
+def fake_openai():
+    async def create(model, **kwargs):
+        await asyncio.sleep(LATENCY.get(model, 0.2))
+        message = SimpleNamespace(content=f"{model} answer")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def fake_anthropic():
+    async def create(model, **kwargs):
+        await asyncio.sleep(LATENCY.get(model, 0.2))
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{model} answer")])
+
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+def make_engine(**kwargs) -> TeamEngine:
+    engine = TeamEngine(**kwargs)
+    engine.openai_client = fake_openai()
+    engine.anthropic_client = fake_anthropic()
+
+    async def fake_gemini(model, prompt, config):
+        await asyncio.sleep(LATENCY[model])
+        return f"{model} answer"
+
+    engine._call_gemini = fake_gemini
+    return engine
+
+
+AGENTS = ["frontend", "backend", "designer", "testing"]
+
+
+async def test_parallel_fan_out():
+    """Test: Wall-Clock ≈ langsamster Agent"""
+    engine = make_engine()
+
+    start = time.perf_counter()
+    result = await engine.collaborate("Build a login form", agents=AGENTS, mode="parallel")
+    elapsed = time.perf_counter() - start
+
+    slowest = max(LATENCY.values())
+    total = sum(LATENCY[engine.agents[a]["model"]] for a in AGENTS)
+    print(f"   4 Agents parallel: {elapsed * 1000:.0f} ms")
+    print(f"   Langsamster Agent: {slowest * 1000:.0f} ms, Summe (seriell): {total * 1000:.0f} ms")
+
+    assert all(r["success"] for r in result["results"].values())
+    assert elapsed < slowest * 1.5
+    print("✅ Parallel Fan-out OK")
+
+
+async def test_quorum_returns_early():
+    """Test: Quorum-Modus wartet nicht auf den langsamsten Agent"""
+    engine = make_engine()
+
+    start = time.perf_counter()
+    result = await engine.collaborate("Build a login form", agents=AGENTS, mode="quorum", quorum=2)
+    elapsed = time.perf_counter() - start
+
+    print(f"   Quorum 2/4: {elapsed * 1000:.0f} ms")
+    assert result["results"]["consensus"]["total_votes"] == 2
+    assert elapsed < LATENCY["claude-3-5-sonnet-20241022"]
+    print("✅ Quorum OK")
+
+
+async def test_agent_timeout():
+    """Test: Per-Agent Timeout bricht hängende Provider ab"""
+    engine = make_engine(agent_timeout=0.1)
+
+    start = time.perf_counter()
+    result = await engine.ask("backend", "Design an API")
+    elapsed = time.perf_counter() - start
+
+    # Claude (0.5s) läuft in den Timeout, Fallback gpt-4o (0.3s) ebenfalls
+    assert not result["success"]
+    assert elapsed < 0.5
+    print("✅ Timeout OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_parallel_fan_out())
+    asyncio.run(test_quorum_returns_early())
+    asyncio.run(test_agent_timeout())
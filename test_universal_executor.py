@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+UniversalExecutor - Async Subprocess Test
+Prüft, dass Ausführungen den Event-Loop nicht blockieren, Output live
+gestreamt wird, Timeouts die ganze Prozessgruppe killen und die
+Per-Sprache Caps greifen.
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import codestudio.universal_executor as universal_executor_module
+from codestudio.universal_executor import ExecutionPool, UniversalExecutor
+
+
+async def test_event_loop_not_blocked():
+    """Test: Ticker läuft weiter, während 4 Programme je 0.5s laufen"""
+    executor = UniversalExecutor(pool=ExecutionPool(max_concurrent=8))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        executor.execute("Python", "import time; time.sleep(0.5); print('ok')") for _ in range(4)
+    ])
+    elapsed = time.perf_counter() - start
+    ticker_task.cancel()
+
+    print(f"   4 Runs à 0.5s: {elapsed * 1000:.0f} ms, Ticker-Ticks: {ticks}")
+    assert all(r["success"] and r["output"] == "ok\n" for r in results)
+    assert elapsed < 1.5
+    assert ticks > 20
+    print("✅ Event-Loop OK")
+
+
+async def test_streaming_output():
+    """Test: Chunks kommen an, bevor der Prozess fertig ist"""
+    executor = UniversalExecutor()
+    code = "import sys, time\nprint('first', flush=True)\ntime.sleep(0.3)\nprint('second', file=sys.stderr, flush=True)"
+
+    start = time.perf_counter()
+    events = []
+    async for event in executor.stream("Python", code):
+        events.append((time.perf_counter() - start, event))
+
+    first_at, first = events[0]
+    assert first["type"] == "output" and first["stream"] == "stdout" and first["text"].startswith("first")
+    assert any(e.get("stream") == "stderr" for _, e in events)
+    assert events[-1][1]["type"] == "result" and events[-1][1]["success"]
+    assert first_at < 0.25
+    print(f"   Erster Chunk nach {first_at * 1000:.0f} ms")
+    print("✅ Streaming OK")
+
+
+async def test_timeout_kills_process_group():
+    """Test: Timeout killt auch Kind-Prozesse"""
+    universal_executor_module.RUN_TIMEOUT = 0.5
+    executor = UniversalExecutor()
+
+    marker = f"/tmp/vibeai_timeout_{os.getpid()}"
+    code = f"(sleep 1.5; touch {marker}) &\nsleep 30\n"
+    start = time.perf_counter()
+    result = await executor.execute("Bash", code)
+    elapsed = time.perf_counter() - start
+
+    await asyncio.sleep(1.5)
+    assert result["timed_out"] and not result["success"]
+    assert elapsed < 1.0
+    assert not os.path.exists(marker), "Kind-Prozess hat den Timeout überlebt"
+    universal_executor_module.RUN_TIMEOUT = 10
+    print(f"   Timeout nach {elapsed * 1000:.0f} ms, Kind-Prozesse beendet")
+    print("✅ Timeout OK")
+
+
+async def test_language_cap():
+    """Test: Cap von 1 serialisiert Runs einer Sprache"""
+    executor = UniversalExecutor(pool=ExecutionPool(max_concurrent=8, language_limits={"Python": 1}))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[executor.execute("Python", "import time; time.sleep(0.2)") for _ in range(3)])
+    elapsed = time.perf_counter() - start
+
+    print(f"   3 Runs mit Cap 1: {elapsed * 1000:.0f} ms")
+    assert elapsed >= 0.6
+    print("✅ Language Cap OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_event_loop_not_blocked())
+    asyncio.run(test_streaming_output())
+    asyncio.run(test_timeout_kills_process_group())
+    asyncio.run(test_language_cap())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Code Studio Worker Pool - Benchmark
+Vergleicht Cold Start (Sandbox: TemporaryDirectory + neuer Prozess) mit
+warmen Workern für Python/JavaScript, prüft State-Reset zwischen Runs,
+Timeouts, Compile Cache und Idle Eviction.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from codestudio.languages.javascript_executor import JavaScriptExecutor
+from codestudio.languages.python_executor import PythonExecutor
+from codestudio.sandbox import Sandbox
+from codestudio.worker_pool import CompileCache, WorkerPool
+
+RUNS = 20
+
+
+async def bench(name: str, run) -> float:
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = await run()
+        samples.append(time.perf_counter() - start)
+        assert result["status"] == "success", result
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1000
+    print(f"      {name}: p50 {p50:.1f} ms, p95 {samples[int(len(samples) * 0.95) - 1] * 1000:.1f} ms")
+    return p50
+
+
+async def test_warm_vs_cold():
+    """Test: warme Worker schlagen Cold Start"""
+    pool = WorkerPool()
+    await pool.warmup()
+
+    cases = [
+        ("python", PythonExecutor(), "import json\nprint(json.dumps({'a': 1}))"),
+        ("javascript", JavaScriptExecutor(), "console.log(JSON.stringify({a: 1}))"),
+    ]
+    for language, executor, code in cases:
+        print(f"   {language}:")
+        cold = await bench("Vorher (Sandbox)", lambda: Sandbox(timeout=10).execute(executor, code))
+        warm = await bench("Nachher (warm)  ", lambda: pool.execute(language, executor, code, timeout=10))
+        assert warm < cold
+
+    print(f"   Stats: {pool.get_stats()['languages']}")
+    await pool.shutdown()
+    print("✅ Warm Pool OK")
+
+
+async def test_state_reset_and_timeout():
+    """Test: kein State zwischen Runs, Timeout killt nur den Run"""
+    pool = WorkerPool()
+
+    py = PythonExecutor()
+    await pool.execute("python", py, "import sys\nsys.modules['leak'] = 1\nx = 42")
+    result = await pool.execute("python", py, "import sys\nprint('leak' in sys.modules, 'x' in globals())")
+    assert result["stdout"] == "False False\n", result
+
+    js = JavaScriptExecutor()
+    await pool.execute("javascript", js, "globalThis.leak = 1; var x = 42;")
+    result = await pool.execute("javascript", js, "console.log(typeof leak, typeof x)")
+    assert result["stdout"] == "undefined undefined\n", result
+
+    result = await pool.execute("python", py, "print(input().upper())", stdin="hallo\n")
+    assert result["stdout"] == "HALLO\n", result
+
+    start = time.perf_counter()
+    result = await pool.execute("python", py, "while True: pass", timeout=1)
+    assert result["status"] == "timeout" and time.perf_counter() - start < 2
+    result = await pool.execute("javascript", js, "setTimeout(() => console.log('late'), 50)", timeout=2)
+    assert result["stdout"] == "late\n", result
+
+    # Worker überlebt den Timeout
+    result = await pool.execute("python", py, "print('still alive')")
+    assert result["stdout"] == "still alive\n"
+    assert pool.get_stats()["languages"]["python"]["spawned"] == 1
+
+    await pool.shutdown()
+    print("✅ State Reset + Timeout OK")
+
+
+async def test_js_isolation_and_memory_limit():
+    """Test: JS-Run kann den nächsten Run nicht manipulieren, memory_limit greift"""
+    pool = WorkerPool()
+    js = JavaScriptExecutor()
+
+    # Kein Host-require/process im Context
+    result = await pool.execute("javascript", js, "console.log(typeof require, typeof Buffer, typeof process.binding)")
+    assert result["stdout"] == "undefined undefined undefined\n", result
+
+    # Manipulation von Prototypen/console/process wirkt nicht auf den nächsten Run
+    await pool.execute("javascript", js, (
+        "Object.prototype.hijack = 'HIJACKED'; Array.prototype.join = () => 'HIJACKED';"
+        "console.log = () => {}; process.stdin.read = () => 'HIJACKED';"
+        "setInterval(() => {}, 10); process.exit(0)"
+    ))
+    result = await pool.execute("javascript", js, "console.log(({}).hijack, [1, 2].join('-'), process.stdin.read())", stdin="ok")
+    assert result["stdout"] == "undefined 1-2 ok\n", result
+
+    start = time.perf_counter()
+    result = await pool.execute("javascript", js, "const a = []; while (true) a.push(new Array(1e5).fill(1))",
+                                timeout=20, memory_limit=64)
+    assert result["status"] == "error" and "64MB memory limit" in result["stderr"], result
+    assert time.perf_counter() - start < 10
+
+    # Code mit Modulen → Sandbox (echter Node-Prozess pro Run)
+    result = await pool.execute("javascript", js, "const os = require('os'); console.log(typeof os.cpus)")
+    assert result["stdout"] == "function\n", result
+    stats = pool.get_stats()["languages"]["javascript"]
+    assert stats["sandbox"] == 1 and stats["spawned"] == 1
+
+    await pool.shutdown()
+    print("✅ JS Isolation + Memory Limit OK")
+
+
+async def test_compile_cache_and_eviction():
+    """Test: Compile nur einmal pro Source, Idle Worker werden beendet"""
+    calls = []
+
+    class FakeCompiledExecutor(PythonExecutor):
+        def get_execution_command(self, code_file):
+            calls.append(code_file)
+            time.sleep(0.2)  # simulierter Compiler
+            return super().get_execution_command(code_file)
+
+    cache_dir = tempfile.mkdtemp()
+    pool = WorkerPool(idle_ttl=0.2, compile_cache=CompileCache(cache_dir))
+    executor = FakeCompiledExecutor()
+
+    results = await asyncio.gather(*[pool.execute("java", executor, "print('compiled')") for _ in range(3)])
+    assert all(r["stdout"] == "compiled\n" for r in results)
+    assert len(calls) == 1
+    assert pool.get_stats()["languages"]["java"]["compile_cache_hit"] == 2
+
+    await pool.execute("python", PythonExecutor(), "print(1)")
+    assert pool.get_stats()["idle_workers"]["python"] == 1
+    await asyncio.sleep(0.5)
+    assert pool.get_stats()["idle_workers"]["python"] == 0
+
+    await pool.shutdown()
+    shutil.rmtree(cache_dir)
+    print("✅ Compile Cache + Idle Eviction OK")
+
+
+async def test_cancelled_run_does_not_leak():
+    """Test: abgebrochener Run gibt seinen Worker nicht mit ungelesener Antwort zurück"""
+    pool = WorkerPool(max_workers=1)
+    py = PythonExecutor()
+
+    task = asyncio.ensure_future(pool.execute(
+        "python", py, "import time\ntime.sleep(1)\nprint('SECRET of user A')"
+    ))
+    await asyncio.sleep(0.3)
+    task.cancel()
+    try:
+        await task
+        assert False, "Run muss abgebrochen sein"
+    except asyncio.CancelledError:
+        pass
+
+    result = await pool.execute("python", py, "print('hello from B')")
+    assert result["stdout"] == "hello from B\n", result
+    assert pool.get_stats()["languages"]["python"]["spawned"] == 2
+
+    await pool.shutdown()
+
+    # Ohne cache_dir: eigenes Verzeichnis pro Cache statt geteiltem /tmp-Pfad
+    first, second = CompileCache(), CompileCache()
+    assert first.cache_dir != second.cache_dir
+    assert os.stat(first.cache_dir).st_mode & 0o077 == 0
+    shutil.rmtree(first.cache_dir)
+    shutil.rmtree(second.cache_dir)
+    print("✅ Cancel ohne Output-Leak + eigener Cache OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_warm_vs_cold())
+    asyncio.run(test_state_reset_and_timeout())
+    asyncio.run(test_js_isolation_and_memory_limit())
+    asyncio.run(test_compile_cache_and_eviction())
+    asyncio.run(test_cancelled_run_does_not_leak())
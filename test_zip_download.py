@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+ZIP Download - Streaming statt Temp-Datei
+Prüft, dass das Archiv gestreamt wird (erstes Byte sofort, Event-Loop
+frei), gültig ist, komprimierte Formate STORED abgelegt werden und der
+optionale Cache ETag/304 und HTTP Range liefert.
+"""
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from builder import download_routes, zip_stream
+
+
+def make_project(root):
+    project = os.path.join(root, "shop")
+    os.makedirs(os.path.join(project, "src"))
+    os.makedirs(os.path.join(project, "assets"))
+    os.makedirs(os.path.join(project, "node_modules", "x"))
+    for i in range(40):
+        with open(os.path.join(project, "src", f"module{i}.js"), "w") as f:
+            f.write(f"export const value{i} = {i};\n" * 20000)
+    with open(os.path.join(project, "assets", "logo.png"), "wb") as f:
+        f.write(os.urandom(2 * 1024 * 1024))
+    with open(os.path.join(project, "node_modules", "x", "index.js"), "w") as f:
+        f.write("ignored")
+    with open(os.path.join(project, ".env"), "w") as f:
+        f.write("SECRET=1")
+    return project
+
+
+def legacy_zip(project_path, zip_path):
+    """Alter Pfad: komplettes Archiv (alles deflated) vor dem ersten Byte"""
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '__pycache__', '.venv', 'venv', 'build', 'dist', '.next', '.vscode']]
+            for file in files:
+                if not file.startswith('.') and not file.endswith(('.pyc', '.pyo', '.log')):
+                    file_path = os.path.join(root, file)
+                    zipf.write(file_path, os.path.relpath(file_path, project_path))
+
+
+def make_client(project):
+    app = FastAPI()
+    app.include_router(download_routes.router)
+    download_routes.get_project_path = lambda project_id: project
+    return TestClient(app)
+
+
+def test_streaming():
+    """Test: erstes Byte sofort, gültiges Archiv, PNG gespeichert statt deflated"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_project(tmp)
+
+        start = time.perf_counter()
+        legacy_zip(project, os.path.join(tmp, "legacy.zip"))
+        legacy_time = time.perf_counter() - start
+
+        manifest = zip_stream.build_manifest(project)
+        start = time.perf_counter()
+        chunks = zip_stream.iter_zip(manifest)
+        first = next(chunks)
+        first_byte = time.perf_counter() - start
+        data = first + b"".join(chunks)
+        total = time.perf_counter() - start
+
+        print(f"   Projekt mit {len(manifest)} Dateien (~{sum(m[2] for m in manifest) // 1024 // 1024} MB):")
+        print(f"      Vorher: erstes Byte nach {legacy_time * 1000:.0f} ms (komplettes Archiv + /tmp-Datei)")
+        print(f"      Nachher: erstes Byte nach {first_byte * 1000:.1f} ms, komplett nach {total * 1000:.0f} ms")
+
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.testzip() is None
+        names = set(archive.namelist())
+        assert names == set(zipfile.ZipFile(os.path.join(tmp, "legacy.zip")).namelist())
+        assert "node_modules/x/index.js" not in names and ".env" not in names
+        assert archive.getinfo("assets/logo.png").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("src/module0.js").compress_type == zipfile.ZIP_DEFLATED
+        assert first_byte < legacy_time
+    print("✅ Streaming OK")
+
+
+def test_event_loop_not_blocked():
+    """Test: Download über die Route blockiert den Loop nicht"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_project(tmp)
+        download_routes.zip_stream.zip_cache = None
+        app = FastAPI()
+        app.include_router(download_routes.router)
+        download_routes.get_project_path = lambda project_id: project
+
+        async def run():
+            import httpx
+
+            transport = httpx.ASGITransport(app=app)
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.005)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            tick = asyncio.create_task(ticker())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/api/download/zip/shop")
+            tick.cancel()
+            return response, max(gaps)
+
+        response, max_gap = asyncio.run(run())
+        print(f"      Längste Loop-Pause während des Downloads: {max_gap * 1000:.0f} ms")
+        assert response.status_code == 200
+        assert zipfile.ZipFile(io.BytesIO(response.content)).testzip() is None
+        assert max_gap < 0.25
+    print("✅ Event-Loop frei OK")
+
+
+def test_cache_etag_and_range():
+    """Test: Cache, ETag/If-None-Match, Range, Invalidierung bei Änderung"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_project(tmp)
+        cache = zip_stream.ZipCache(os.path.join(tmp, "cache"))
+        download_routes.zip_stream.zip_cache = cache
+        client = make_client(project)
+
+        first = client.get("/api/download/zip/shop")
+        etag = first.headers["etag"]
+        assert first.status_code == 200 and etag
+        assert len(os.listdir(cache.cache_dir)) == 1
+
+        start = time.perf_counter()
+        second = client.get("/api/download/zip/shop")
+        cached_time = time.perf_counter() - start
+        print(f"      Wiederholter Download aus dem Cache: {cached_time * 1000:.0f} ms")
+        assert second.content == first.content and second.headers["etag"] == etag
+        assert second.headers.get("accept-ranges") == "bytes"
+
+        not_modified = client.get("/api/download/zip/shop", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304 and not not_modified.content
+
+        partial = client.get("/api/download/zip/shop", headers={"Range": "bytes=100-1099"})
+        assert partial.status_code == 206 and partial.content == first.content[100:1100]
+
+        # Projekt ändert sich → neuer ETag, alter Cache-Eintrag verschwindet
+        with open(os.path.join(project, "src", "new.js"), "w") as f:
+            f.write("export default 1;\n")
+        third = client.get("/api/download/zip/shop", headers={"If-None-Match": etag})
+        assert third.status_code == 200 and third.headers["etag"] != etag
+        assert "src/new.js" in zipfile.ZipFile(io.BytesIO(third.content)).namelist()
+        assert len(os.listdir(cache.cache_dir)) == 1
+
+        download_routes.zip_stream.zip_cache = None
+    print("✅ Cache + ETag + Range OK")
+
+
+if __name__ == "__main__":
+    test_streaming()
+    test_event_loop_not_blocked()
+    test_cache_etag_and_range()